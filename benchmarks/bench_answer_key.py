@@ -0,0 +1,119 @@
+'''
+Benchmark: answer key lookups for quiz evaluation, IN (...) query vs the AnswerKey cache.
+
+Seeds an SQLite database with questions and their options, then looks up the answer key
+of `--submissions` submissions of 10 questions each, drawn from the whole bank, the way
+evaluate_player_answers does. The cache is warmed by as many submissions first. Reports the
+mean latency of the query and of the warm cache with its hit rate and the number of queries
+it sent, and checks both return the same rows.
+
+Usage:
+    python benchmarks/bench_answer_key.py [--questions 10000] [--submissions 5000] [--cache-size 10000]
+'''
+
+import argparse
+import logging
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'src'))
+
+DATABASE_DIR = tempfile.mkdtemp(prefix='quizapp-bench-')
+os.environ.update({'DB_BACKEND': 'sqlite', 'SQLITE_PATH': os.path.join(DATABASE_DIR, 'quizapp.db')})
+
+# pylint: disable=wrong-import-position
+from config.queries import Queries
+from database.database_access import DatabaseAccess
+from database.database_connection import DatabaseConnection
+from database.migrations import MigrationRunner
+from helpers.answer_key import AnswerKey
+
+CATEGORIES = 20
+QUESTIONS_PER_SUBMISSION = 10
+
+
+def seed(db: DatabaseAccess, questions: int) -> list:
+    'Inserts categories, questions and their options, returns the question ids'
+
+    db.write(Queries.INSERT_USER_DATA, ('A00001', 'Admin', 'admin@quiz.com', 'admin', '2024-01-01'))
+    category_ids = [f'C{i:05d}' for i in range(CATEGORIES)]
+    db.write_many(Queries.INSERT_CATEGORY, [(c, 'A00001', f'Category {c}') for c in category_ids])
+    question_ids = [f'Q{i:06d}' for i in range(questions)]
+    db.write_many(Queries.INSERT_QUESTION, [
+        (q, category_ids[i % CATEGORIES], 'A00001', f'Question text {q}', 'mcq') for i, q in enumerate(question_ids)
+    ])
+    db.write_many(Queries.INSERT_OPTION, [
+        (f'O{i:07d}', question_ids[i // 4], f'option {i % 4}', int(i % 4 == 0)) for i in range(questions * 4)
+    ])
+    return question_ids
+
+
+def query_answer_key(db: DatabaseAccess, question_ids: tuple) -> dict:
+    'Answer key lookup before the cache'
+
+    query = Queries.GET_QUESTION_DATA_BY_QUESTION_ID % ', '.join(['%s'] * len(question_ids))
+    return {row['question_id']: row for row in db.read(query, question_ids)}
+
+
+def mean_ms(call, submissions: list) -> float:
+    'Returns the mean milliseconds of a call per submission'
+
+    start = time.perf_counter()
+    for question_ids in submissions:
+        call(question_ids)
+    return (time.perf_counter() - start) / len(submissions) * 1000
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--questions', type=int, default=10000)
+    parser.add_argument('--submissions', type=int, default=5000)
+    parser.add_argument('--cache-size', type=int, default=10000)
+    arguments = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    database = DatabaseAccess()
+    database.create_tables()
+    MigrationRunner(database).migrate()
+    bank = seed(database, arguments.questions)
+    submissions = [tuple(random.sample(bank, QUESTIONS_PER_SUBMISSION)) for _ in range(arguments.submissions)]
+
+    answer_key = AnswerKey(max_size=arguments.cache_size, ttl=float('inf'))
+    match = all(
+        answer_key.lookup(database, question_ids) == query_answer_key(database, question_ids)
+        for question_ids in submissions[:100]
+    )
+    for question_ids in submissions:
+        answer_key.lookup(database, question_ids)
+    answer_key.cache.counters.update(dict.fromkeys(answer_key.cache.counters, 0))
+    submissions = [tuple(random.sample(bank, QUESTIONS_PER_SUBMISSION)) for _ in range(arguments.submissions)]
+
+    queries_sent = 0
+    original_read = database.read
+
+    def counting_read(*args, **kwargs):
+        'Counts the queries the cache sends'
+
+        global queries_sent  # pylint: disable=global-statement
+        queries_sent += 1
+        return original_read(*args, **kwargs)
+
+    database.read = counting_read
+    cached = mean_ms(lambda question_ids: answer_key.lookup(database, question_ids), submissions)
+    database.read = original_read
+    uncached = mean_ms(lambda question_ids: query_answer_key(database, question_ids), submissions)
+
+    stats = answer_key.stats()
+    print(f'answer key of {arguments.submissions:,} submissions over {arguments.questions:,} questions, match: {match}')
+    print(f'IN (...) query    {uncached:>8.3f} ms per submission')
+    print(f'AnswerKey, warm   {cached:>8.3f} ms per submission  x{uncached / cached:.0f}')
+    print(f'hit rate {stats["hit_rate"]:.2%}, {queries_sent:,} queries for {arguments.submissions:,} submissions, '
+          f'{stats["size"]:,} entries, ~{stats["bytes"] / 1024:.0f} KiB')
+
+    DatabaseConnection.get_pool().close_all()
+    shutil.rmtree(DATABASE_DIR, ignore_errors=True)
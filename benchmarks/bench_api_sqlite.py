@@ -0,0 +1,162 @@
+'''
+Benchmark: the full API under load on the embedded SQLite backend, no external service.
+
+Builds the Flask app with DB_BACKEND=sqlite on a temporary database file, seeds categories
+and questions, registers players and then has every player run quiz rounds concurrently:
+fetch a quiz, submit answers, read their scores, the leaderboard and their rank. Reports requests/sec
+and per endpoint p50/p99 latency, followed by the slowest queries.
+
+Usage:
+    python benchmarks/bench_api_sqlite.py [--players 20] [--rounds 20] [--questions 500]
+'''
+
+import argparse
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'src'))
+
+DATABASE_DIR = tempfile.mkdtemp(prefix='quizapp-bench-')
+os.environ.update({
+    'DB_BACKEND': 'sqlite',
+    'SQLITE_PATH': os.path.join(DATABASE_DIR, 'quizapp.db'),
+    'JWT_SECRET_KEY': 'benchmark-secret-key-of-32-bytes!',
+    'QUIZ_ALLOW_UNTICKETED_ANSWERS': 'true',
+    'SUPER_ADMIN_MAPPING': 'sa',
+    'ADMIN_MAPPING': 'ad',
+    'PLAYER_MAPPING': 'pl',
+    'SUPER_ADMIN_NAME': 'Super Admin',
+    'SUPER_ADMIN_EMAIL': 'super@quiz.com',
+    'SUPER_ADMIN_USERNAME': 'superadmin',
+    'SUPER_ADMIN_PASSWORD': 'superadmin'
+})
+
+# pylint: disable=wrong-import-position
+from flask import Flask
+
+from config.flask_configs import register_blueprints, register_error_handlers, set_app_configs, set_jwt_configs
+from config.initialize_app import Initializer
+from config.queries import Queries
+from config.string_constants import QuestionTypes
+from database.database_access import DatabaseAccess
+from utils.id_generator import generate_id
+
+CATEGORIES = 5
+PREFIX = '/v1'
+
+
+def create_app(db: DatabaseAccess) -> Flask:
+    'Builds the app like server.create_app, without the remote log handler'
+
+    Initializer(db).initialize_app()
+    app = Flask(__name__)
+    set_app_configs(app)
+    register_error_handlers(app)
+    set_jwt_configs(app)
+    register_blueprints(app)
+    return app
+
+
+def seed(db: DatabaseAccess, questions: int) -> None:
+    'Inserts categories and MCQ questions with four options each'
+
+    category_ids = [generate_id(entity='category', length=5) for _ in range(CATEGORIES)]
+    db.write_many(
+        Queries.INSERT_CATEGORY, [(category_id, None, f'Category {i}') for i, category_id in enumerate(category_ids)]
+    )
+
+    question_rows, option_rows = [], []
+    for i in range(questions):
+        question_id = generate_id(entity='question', length=5)
+        question_rows.append(
+            (question_id, category_ids[i % CATEGORIES], None, f'Benchmark question number {i}?', QuestionTypes.MCQ)
+        )
+        for option in range(4):
+            option_rows.append((generate_id(entity='option', length=5), question_id, f'answer {option}', int(option == 0)))
+    db.write_many(Queries.INSERT_QUESTION, question_rows)
+    db.write_many(Queries.INSERT_OPTION, option_rows)
+
+
+def register_players(app: Flask, players: int) -> list:
+    'Registers and logs in players, returns their authorization headers'
+
+    client = app.test_client()
+    headers = []
+    for i in range(players):
+        credentials = {'username': f'player{i}', 'password': 'password'}
+        client.post(PREFIX + '/register', json={**credentials, 'name': 'Player', 'email': f'player{i}@quiz.com'})
+        response = client.post(PREFIX + '/login', json=credentials)
+        headers.append({'Authorization': f'Bearer {response.get_json()["data"]["access_token"]}'})
+    return headers
+
+
+def play(app: Flask, header: dict, rounds: int) -> list:
+    'Plays quiz rounds as one player, returns (endpoint, seconds) samples'
+
+    client = app.test_client()
+    samples = []
+
+    def timed(endpoint, call):
+        start = time.perf_counter()
+        response = call()
+        samples.append((endpoint, time.perf_counter() - start))
+        return response
+
+    for _ in range(rounds):
+        quiz = timed('GET /quiz', lambda: client.get(PREFIX + '/quiz?limit=10', headers=header))
+        answers = [
+            {'question_id': question['question_id'], 'user_answer': 'answer 0'}
+            for question in quiz.get_json()['data']
+        ]
+        timed('POST /quiz/answers', lambda: client.post(PREFIX + '/quiz/answers', json=answers, headers=header))
+        timed('GET /scores/me', lambda: client.get(PREFIX + '/scores/me', headers=header))
+        timed('GET /leaderboard', lambda: client.get(PREFIX + '/leaderboard', headers=header))
+        timed('GET /leaderboard/me', lambda: client.get(PREFIX + '/leaderboard/me', headers=header))
+        timed('GET /categories', lambda: client.get(PREFIX + '/categories', headers=header))
+    return samples
+
+
+def percentile(samples: list, percent: int) -> float:
+    'Nearest rank percentile in milliseconds'
+
+    samples = sorted(samples)
+    return samples[max(0, -(-percent * len(samples) // 100) - 1)] * 1000
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--players', type=int, default=20)
+    parser.add_argument('--rounds', type=int, default=20, help='quiz rounds per player')
+    parser.add_argument('--questions', type=int, default=500)
+    arguments = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    database = DatabaseAccess()
+    flask_app = create_app(database)
+    seed(database, arguments.questions)
+    player_headers = register_players(flask_app, arguments.players)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=arguments.players) as executor:
+        results = list(executor.map(lambda header: play(flask_app, header, arguments.rounds), player_headers))
+    elapsed = time.perf_counter() - started
+
+    by_endpoint = defaultdict(list)
+    for endpoint, seconds in (sample for result in results for sample in result):
+        by_endpoint[endpoint].append(seconds)
+    total = sum(len(samples) for samples in by_endpoint.values())
+
+    print(f'{total} requests from {arguments.players} players in {elapsed:.2f}s, {total / elapsed:,.0f} requests/sec')
+    for endpoint, samples in by_endpoint.items():
+        print(f'{endpoint:<20} p50 {percentile(samples, 50):>7.2f} ms  p99 {percentile(samples, 99):>7.2f} ms')
+    for name, stats in list(database.query_stats()['queries'].items())[:5]:
+        print(f'{name:<36} {stats["calls"]:>6} calls  p50 {stats["p50_ms"]:>6.3f} ms  p99 {stats["p99_ms"]:>6.3f} ms')
+    print(database.pool_stats())
+    shutil.rmtree(DATABASE_DIR, ignore_errors=True)
@@ -0,0 +1,121 @@
+'''
+Benchmark: grading answer sheets one request at a time vs in one batch.
+
+Seeds an SQLite database with players and questions, then grades `--sheets` answer sheets
+of 10 questions with QuizBusiness, once calling evaluate_player_answers per sheet (one
+transaction per score) and once with a single evaluate_answer_sheets call (one answer key
+lookup, one transaction for all the scores). Runs for 1 sheet and for `--sheets` sheets,
+with a cold answer key cache, and checks both ways save the same number of scores.
+
+Usage:
+    python benchmarks/bench_batch_evaluation.py [--sheets 1000] [--questions 500]
+'''
+
+import argparse
+import logging
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'src'))
+
+DATABASE_DIR = tempfile.mkdtemp(prefix='quizapp-bench-')
+os.environ.update({
+    'DB_BACKEND': 'sqlite',
+    'SQLITE_PATH': os.path.join(DATABASE_DIR, 'quizapp.db'),
+    'QUIZ_ALLOW_UNTICKETED_ANSWERS': 'true'
+})
+
+# pylint: disable=wrong-import-position
+from business.quiz_business import QuizBusiness
+from config.queries import Queries
+from database.database_access import DatabaseAccess
+from database.database_connection import DatabaseConnection
+from database.migrations import MigrationRunner
+from helpers.answer_key import answer_key
+
+CATEGORIES = 5
+QUESTIONS_PER_SHEET = 10
+COUNT_SCORES = 'SELECT COUNT(*) AS scores FROM scores'
+
+
+def seed(db: DatabaseAccess, players: int, questions: int) -> tuple:
+    'Inserts players, categories and MCQ questions, returns the player ids and question ids'
+
+    player_ids = [f'P{i:05d}' for i in range(players)]
+    db.write_many(Queries.INSERT_USER_DATA, [(p, 'Player', f'{p}@quiz.com', 'player', '2024-01-01') for p in player_ids])
+    db.write_many(Queries.INSERT_CREDENTIALS, [(p, p.lower(), 'hash', 1) for p in player_ids])
+    category_ids = [f'C{i:05d}' for i in range(CATEGORIES)]
+    db.write_many(Queries.INSERT_CATEGORY, [(c, None, f'Category {c}') for c in category_ids])
+    question_ids = [f'Q{i:05d}' for i in range(questions)]
+    db.write_many(Queries.INSERT_QUESTION, [
+        (q, category_ids[i % CATEGORIES], None, f'Question text {q}', 'mcq') for i, q in enumerate(question_ids)
+    ])
+    db.write_many(Queries.INSERT_OPTION, [
+        (f'O{i:07d}', question_ids[i // 4], f'option {i % 4}', int(i % 4 == 0)) for i in range(questions * 4)
+    ])
+    return player_ids, question_ids
+
+
+def answer_sheets(player_ids: list, question_ids: list, sheets: int) -> list:
+    'Returns answer sheets of 10 random questions answered at random'
+
+    return [
+        {
+            'player_id': player_ids[i % len(player_ids)],
+            'answers': [
+                {'question_id': question_id, 'user_answer': f'option {random.randrange(4)}'}
+                for question_id in random.sample(question_ids, QUESTIONS_PER_SHEET)
+            ]
+        }
+        for i in range(sheets)
+    ]
+
+
+def timed_ms(call) -> float:
+    'Returns the milliseconds of a call, with a cold answer key cache'
+
+    answer_key.cache.clear()
+    start = time.perf_counter()
+    call()
+    return (time.perf_counter() - start) * 1000
+
+
+def one_by_one(quiz: QuizBusiness, sheets: list) -> None:
+    'Grades every sheet in its own call'
+
+    for sheet in sheets:
+        quiz.evaluate_player_answers(sheet['player_id'], sheet['answers'])
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sheets', type=int, default=1000)
+    parser.add_argument('--questions', type=int, default=500)
+    arguments = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    database = DatabaseAccess()
+    database.create_tables()
+    MigrationRunner(database).migrate()
+    players, questions = seed(database, arguments.sheets, arguments.questions)
+    quiz_business = QuizBusiness(database)
+
+    for count in (1, arguments.sheets):
+        sheets = answer_sheets(players, questions, count)
+        before = database.read(COUNT_SCORES)[0]['scores']
+        single = timed_ms(lambda: one_by_one(quiz_business, sheets))
+        middle = database.read(COUNT_SCORES)[0]['scores']
+        batch = timed_ms(lambda: quiz_business.evaluate_answer_sheets(sheets))
+        after = database.read(COUNT_SCORES)[0]['scores']
+        print(
+            f'{count:>5} sheets  one by one {single:>9.2f} ms  batch {batch:>9.2f} ms  x{single / batch:.1f}  '
+            f'scores saved match: {middle - before == after - middle == count}'
+        )
+
+    DatabaseConnection.get_pool().close_all()
+    shutil.rmtree(DATABASE_DIR, ignore_errors=True)
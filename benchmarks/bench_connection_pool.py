@@ -0,0 +1,163 @@
+'''
+Benchmark: queries/sec with the legacy per-checkout bootstrap vs the bound connection pool.
+
+The legacy DatabaseConnection ran CREATE DATABASE IF NOT EXISTS and USE on every checkout
+before the actual query. The pool now creates the database once and binds every connection
+to it at connect time, so each checkout costs exactly one statement.
+
+By default a SQLite file stands in for MySQL and every statement is charged a simulated
+network round trip (--latency-ms). Pass --mysql to run against the MySQL server configured
+through the MYSQL_* environment variables instead.
+
+Usage:
+    python benchmarks/bench_connection_pool.py [--threads 8] [--queries 500] [--latency-ms 0.3] [--mysql]
+'''
+
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'src'))
+
+from database.connection_pool import ConnectionPool  # pylint: disable=wrong-import-position
+
+QUERY = 'SELECT status FROM tokens WHERE access_token = {}'
+
+
+class RoundTripConnection:
+    '''SQLite connection that charges a simulated network round trip per statement'''
+
+    def __init__(self, path: str, latency: float) -> None:
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.latency = latency
+
+    def execute(self, statement: str, params=()) -> list:
+        'Executes a statement and waits for the simulated round trip'
+
+        time.sleep(self.latency)
+        return self.connection.execute(statement, params).fetchall()
+
+    def commit(self) -> None:
+        'Commits the connection'
+        self.connection.commit()
+
+    def close(self) -> None:
+        'Closes the connection'
+        self.connection.close()
+
+
+def seed(path: str) -> None:
+    'Creates the token table probed by the benchmark'
+
+    connection = sqlite3.connect(path)
+    connection.execute('CREATE TABLE tokens (access_token TEXT PRIMARY KEY, status TEXT)')
+    connection.executemany('INSERT INTO tokens VALUES (?, ?)', ((f'jti{i}', 'active') for i in range(1000)))
+    connection.commit()
+    connection.close()
+
+
+def run(pool: ConnectionPool, threads: int, queries: int, per_checkout) -> float:
+    'Runs the workload and returns queries per second'
+
+    def worker():
+        for i in range(queries):
+            connection = pool.acquire()
+            try:
+                per_checkout(connection, i)
+            finally:
+                pool.release(connection)
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return threads * queries / (time.perf_counter() - start)
+
+
+def sqlite_benchmark(args) -> None:
+    'Compares both checkout patterns on the SQLite stand-in'
+
+    latency = args.latency_ms / 1000
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'bench.db')
+        seed(path)
+        query = QUERY.format('?')
+
+        def legacy(connection, i):
+            connection.execute('CREATE TABLE IF NOT EXISTS quizapp_bootstrap (id INTEGER)')
+            connection.execute('PRAGMA schema_version')
+            connection.execute(query, (f'jti{i % 1000}', ))
+            connection.commit()
+
+        def pooled(connection, i):
+            connection.execute(query, (f'jti{i % 1000}', ))
+            connection.commit()
+
+        for name, per_checkout in (('legacy bootstrap per checkout', legacy), ('bound pool', pooled)):
+            pool = ConnectionPool(lambda: RoundTripConnection(path, latency), size=3, overflow=args.overflow)
+            qps = run(pool, args.threads, args.queries, per_checkout)
+            print(f'{name:<32} {qps:>10.0f} queries/sec  {pool.stats()}')
+            pool.close_all()
+
+
+def mysql_benchmark(args) -> None:
+    'Compares both checkout patterns on a real MySQL server'
+
+    import mysql.connector  # pylint: disable=import-outside-toplevel
+    from config.queries import InitializationQueries  # pylint: disable=import-outside-toplevel
+    from database.backends.mysql_backend import MySQLBackend  # pylint: disable=import-outside-toplevel
+
+    backend = MySQLBackend()
+    backend.bootstrap()
+    query = QUERY.format('%s')
+    config = {
+        'user': backend.MYSQL_USER,
+        'password': backend.MYSQL_PASSWORD,
+        'host': backend.MYSQL_HOST
+    }
+
+    def legacy(connection, i):
+        cursor = connection.cursor()
+        cursor.execute(InitializationQueries.CREATE_DATABASE.format(backend.MYSQL_DB))
+        cursor.execute(InitializationQueries.USE_DATABASE.format(backend.MYSQL_DB))
+        cursor.execute(query, (f'jti{i}', ))
+        cursor.fetchall()
+        connection.commit()
+
+    def pooled(connection, i):
+        cursor = connection.cursor()
+        cursor.execute(query, (f'jti{i}', ))
+        cursor.fetchall()
+        connection.commit()
+
+    legacy_pool = ConnectionPool(lambda: mysql.connector.connect(**config), size=3, overflow=args.overflow)
+    bound_pool = ConnectionPool(backend.connect, size=3, overflow=args.overflow)
+    for name, pool, per_checkout in (
+        ('legacy bootstrap per checkout', legacy_pool, legacy),
+        ('bound pool', bound_pool, pooled)
+    ):
+        qps = run(pool, args.threads, args.queries, per_checkout)
+        print(f'{name:<32} {qps:>10.0f} queries/sec  {pool.stats()}')
+        pool.close_all()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--queries', type=int, default=500, help='queries per thread')
+    parser.add_argument('--overflow', type=int, default=0)
+    parser.add_argument('--latency-ms', type=float, default=0.3, help='simulated round trip for SQLite')
+    parser.add_argument('--mysql', action='store_true', help='run against the configured MySQL server')
+    arguments = parser.parse_args()
+
+    if arguments.mysql:
+        mysql_benchmark(arguments)
+    else:
+        sqlite_benchmark(arguments)
@@ -0,0 +1,159 @@
+'''
+Benchmark: leaderboard from the scores aggregate vs the player_best_scores table.
+
+Seeds an SQLite database on the migrated schema with players and scores, backfills
+player_best_scores, then saves more scores the way QuizBusiness does (score insert and
+best score upsert in one transaction, then the in-memory Leaderboard ranking). Checks that
+the best score table and the top 10 match the GROUP BY aggregate over scores and that the
+ranking matches the database, then reports the latency of the leaderboard queries, of the
+in-memory top 10 and rank lookup against a COUNT(*) rank query, and the cost the upsert
+adds to saving a score.
+
+Usage:
+    python benchmarks/bench_leaderboard.py [--players 5000] [--scores 100] [--saves 2000] [--repeat 50]
+'''
+
+import argparse
+import logging
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'src'))
+
+DATABASE_DIR = tempfile.mkdtemp(prefix='quizapp-bench-')
+os.environ.update({'DB_BACKEND': 'sqlite', 'SQLITE_PATH': os.path.join(DATABASE_DIR, 'quizapp.db')})
+
+# pylint: disable=wrong-import-position
+from config.queries import Queries
+from database.database_access import DatabaseAccess
+from database.database_connection import DatabaseConnection
+from database.migrations import MigrationRunner
+from helpers.leaderboard import Leaderboard
+
+# GET_LEADERBOARD before player_best_scores
+AGGREGATE_LEADERBOARD = '''
+    SELECT player_id, username, MAX(score) as score, MIN(timestamp) as timestamp
+    FROM scores
+    INNER JOIN credentials ON scores.player_id = credentials.user_id
+    GROUP BY player_id
+    ORDER BY score DESC, timestamp ASC
+    LIMIT 10
+'''
+AGGREGATE_BEST_SCORES = 'SELECT player_id, MAX(score), MIN(timestamp) FROM scores GROUP BY player_id ORDER BY player_id'
+BEST_SCORES = 'SELECT player_id, score, timestamp FROM player_best_scores ORDER BY player_id'
+# Rank of a player without the in-memory ranking
+SQL_RANK = '''
+    SELECT COUNT(*) + 1 AS player_rank
+    FROM player_best_scores
+    WHERE score > (SELECT score FROM player_best_scores WHERE player_id = %s)
+    OR (score = (SELECT score FROM player_best_scores WHERE player_id = %s)
+        AND timestamp < (SELECT timestamp FROM player_best_scores WHERE player_id = %s))
+'''
+START = datetime(2024, 1, 1)
+
+
+def random_score() -> tuple:
+    'Returns a (score, timestamp) pair'
+
+    timestamp = START + timedelta(seconds=random.randint(0, 365 * 86400))
+    return round(random.uniform(0, 100), 2), timestamp.strftime('%Y-%m-%d %H:%M:%S')
+
+
+def seed(db: DatabaseAccess, players: int, scores: int) -> list:
+    'Inserts players with their scores, returns the player ids'
+
+    player_ids = [f'P{i:05d}' for i in range(players)]
+    db.write_many(Queries.INSERT_USER_DATA, [(p, 'Player', f'{p}@quiz.com', 'player', '2024-01-01') for p in player_ids])
+    db.write_many(Queries.INSERT_CREDENTIALS, [(p, p.lower(), 'hash', 1) for p in player_ids])
+    db.write_many(
+        Queries.INSERT_PLAYER_QUIZ_SCORE,
+        [(f'S{i:07d}', player_ids[i % players], *random_score(), None, None) for i in range(players * scores)],
+        chunk_size=10000
+    )
+    return player_ids
+
+
+def save_scores(db: DatabaseAccess, player_ids: list, saves: int, ranking: Leaderboard = None) -> float:
+    'Saves scores one transaction each, with the best score upsert if given a ranking, returns the mean ms per save'
+
+    start = time.perf_counter()
+    for _ in range(saves):
+        player_id = random.choice(player_ids)
+        score, timestamp = random_score()
+        with db.transaction():
+            db.write(
+                Queries.INSERT_PLAYER_QUIZ_SCORE, (f'N{random.getrandbits(32):08x}', player_id, score, timestamp, None, None)
+            )
+            if ranking is not None:
+                db.write(Queries.UPSERT_PLAYER_BEST_SCORE, (player_id, score, timestamp))
+        if ranking is not None:
+            ranking.record(db, player_id, score, datetime.fromisoformat(timestamp))
+    return (time.perf_counter() - start) / saves * 1000
+
+
+def normalize(rows: list) -> list:
+    'Returns rows as tuples of text and floats, aggregates over SQLite columns lose their declared type'
+
+    return [
+        tuple(float(value) if 'score' in name else str(value) for name, value in row.items())
+        for row in rows
+    ]
+
+
+def mean_ms(call, repeat: int) -> float:
+    'Returns the mean milliseconds of a call'
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        call()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--players', type=int, default=5000)
+    parser.add_argument('--scores', type=int, default=100, help='seeded scores per player')
+    parser.add_argument('--saves', type=int, default=2000, help='scores saved after the backfill')
+    parser.add_argument('--repeat', type=int, default=50)
+    arguments = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    database = DatabaseAccess()
+    database.create_tables()
+    players = seed(database, arguments.players, arguments.scores)
+    print(f'applied migrations: {MigrationRunner(database).migrate()}')
+
+    without_upsert = save_scores(database, players, arguments.saves)
+    # Scores saved without the upsert are merged in by running the backfill again
+    database.write(Queries.BACKFILL_PLAYER_BEST_SCORES)
+    ranking = Leaderboard(ttl=float('inf'))
+    build = mean_ms(lambda: ranking.rebuild(database), 1)
+    with_upsert = save_scores(database, players, arguments.saves, ranking)
+
+    best_scores_match = normalize(database.read(AGGREGATE_BEST_SCORES)) == normalize(database.read(BEST_SCORES))
+    top_10_match = normalize(database.read(AGGREGATE_LEADERBOARD)) == normalize(database.read(Queries.GET_LEADERBOARD))
+    print(f'best scores match the aggregate: {best_scores_match}, top 10 matches: {top_10_match}')
+    print(f'in-memory ranking positions differing from the database: {ranking.verify(database)}')
+
+    player = players[len(players) // 2]
+    aggregate = mean_ms(lambda: database.read(AGGREGATE_LEADERBOARD), arguments.repeat)
+    best = mean_ms(lambda: database.read(Queries.GET_LEADERBOARD), arguments.repeat)
+    top = mean_ms(lambda: ranking.top(database, 10), arguments.repeat)
+    sql_rank = mean_ms(lambda: database.read(SQL_RANK, (player, player, player)), arguments.repeat)
+    around = mean_ms(lambda: ranking.around(database, player, 2), arguments.repeat)
+    print(f'leaderboard over {arguments.players * arguments.scores + 2 * arguments.saves:,} scores')
+    print(f'GROUP BY scores      {aggregate:>9.3f} ms')
+    print(f'player_best_scores   {best:>9.3f} ms  x{aggregate / best:.0f}')
+    print(f'in-memory top 10     {top:>9.3f} ms  (built in {build:.0f} ms)')
+    print(f'rank, COUNT(*)       {sql_rank:>9.3f} ms')
+    print(f'rank, in-memory      {around:>9.3f} ms  x{sql_rank / around:.0f}')
+    print(f'save score           {without_upsert:>9.3f} ms, with best score upsert and ranking {with_upsert:>9.3f} ms')
+
+    DatabaseConnection.get_pool().close_all()
+    shutil.rmtree(DATABASE_DIR, ignore_errors=True)
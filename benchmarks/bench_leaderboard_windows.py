@@ -0,0 +1,130 @@
+'''
+Benchmark: day, week and per category leaderboards from the scores vs the leaderboard buckets.
+
+Seeds an SQLite database with players and scores spread over `--days` days and `--categories`
+categories, fills leaderboard_buckets through the migrations, then checks that every window
+read from the buckets matches the same aggregate over scores and reports the latency of both.
+The aggregate reads every score of the window, the bucket query at most one row per player
+and day of the window.
+
+Usage:
+    python benchmarks/bench_leaderboard_windows.py [--players 5000] [--scores 100] [--days 90] [--categories 20] [--repeat 20]
+'''
+
+import argparse
+import logging
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'src'))
+
+DATABASE_DIR = tempfile.mkdtemp(prefix='quizapp-bench-')
+os.environ.update({'DB_BACKEND': 'sqlite', 'SQLITE_PATH': os.path.join(DATABASE_DIR, 'quizapp.db')})
+
+# pylint: disable=wrong-import-position
+from config.queries import Queries
+from database.database_access import DatabaseAccess
+from database.database_connection import DatabaseConnection
+from database.migrations import MigrationRunner
+
+# Windowed leaderboard without the buckets
+AGGREGATE_WINDOW = '''
+    SELECT player_id, username, MAX(score) AS score, MIN(timestamp) AS timestamp
+    FROM scores
+    INNER JOIN credentials ON scores.player_id = credentials.user_id
+    WHERE timestamp >= %s AND timestamp < %s AND (%s = '' OR category_id = %s)
+    GROUP BY player_id, username
+    ORDER BY score DESC, timestamp ASC, player_id ASC
+    LIMIT 10
+'''
+END = datetime(2024, 4, 1)
+
+
+def seed(db: DatabaseAccess, players: int, scores: int, days: int, categories: int) -> None:
+    'Inserts players with their scores, one category per score'
+
+    player_ids = [f'P{i:05d}' for i in range(players)]
+    db.write_many(Queries.INSERT_USER_DATA, [(p, 'Player', f'{p}@quiz.com', 'player', '2024-01-01') for p in player_ids])
+    db.write_many(Queries.INSERT_CREDENTIALS, [(p, p.lower(), 'hash', 1) for p in player_ids])
+    db.write_many(
+        Queries.INSERT_PLAYER_QUIZ_SCORE,
+        [
+            (
+                f'S{i:07d}',
+                player_ids[i % players],
+                round(random.uniform(0, 100), 2),
+                (END - timedelta(seconds=random.randint(1, days * 86400))).strftime('%Y-%m-%d %H:%M:%S'),
+                f'C{random.randrange(categories):04d}',
+                'mcq'
+            )
+            for i in range(players * scores)
+        ],
+        chunk_size=10000
+    )
+
+
+def windows() -> dict:
+    'Returns the aggregate and bucket parameters of every window'
+
+    last_day = END - timedelta(days=1)
+    week = last_day - timedelta(days=6)
+    return {
+        'day': ((last_day, END, '', ''), (last_day.date().isoformat(), last_day.date().isoformat(), '', 10)),
+        'week': ((week, END, '', ''), (week.date().isoformat(), last_day.date().isoformat(), '', 10)),
+        'category': ((datetime.min, END, 'C0000', 'C0000'), ('all', 'all', 'C0000', 10))
+    }
+
+
+def normalize(rows: list) -> list:
+    'Returns rows as tuples of text and floats, aggregates over SQLite columns lose their declared type'
+
+    return [
+        tuple(float(value) if 'score' in name else str(value) for name, value in row.items())
+        for row in rows
+    ]
+
+
+def mean_ms(call, repeat: int) -> float:
+    'Returns the mean milliseconds of a call'
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        call()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--players', type=int, default=5000)
+    parser.add_argument('--scores', type=int, default=100, help='seeded scores per player')
+    parser.add_argument('--days', type=int, default=90, help='days the scores are spread over')
+    parser.add_argument('--categories', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=20)
+    arguments = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    database = DatabaseAccess()
+    database.create_tables()
+    seed(database, arguments.players, arguments.scores, arguments.days, arguments.categories)
+    start = time.perf_counter()
+    print(f'applied migrations: {MigrationRunner(database).migrate()} in {time.perf_counter() - start:.1f} s')
+
+    print(f'leaderboard windows over {arguments.players * arguments.scores:,} scores')
+    for window, (aggregate_params, bucket_params) in windows().items():
+        aggregate_params = tuple(str(value) for value in aggregate_params)
+        match = (
+            normalize(database.read(AGGREGATE_WINDOW, aggregate_params))
+            == normalize(database.read(Queries.GET_BUCKET_LEADERBOARD, bucket_params))
+        )
+        aggregate = mean_ms(lambda: database.read(AGGREGATE_WINDOW, aggregate_params), arguments.repeat)
+        buckets = mean_ms(lambda: database.read(Queries.GET_BUCKET_LEADERBOARD, bucket_params), arguments.repeat)
+        print(f'{window:<9} scores {aggregate:>9.3f} ms  buckets {buckets:>9.3f} ms  x{aggregate / buckets:.0f}  match: {match}')
+
+    DatabaseConnection.get_pool().close_all()
+    shutil.rmtree(DATABASE_DIR, ignore_errors=True)
@@ -0,0 +1,133 @@
+'''
+Benchmark: p99 latency of concurrent logins.
+
+Seeds an SQLite database with `--concurrency` players and applies the migrations, then logs
+every player in at once from `--concurrency` threads, `--rounds` times, with a cold token
+cache each round as for players not seen recently. The connection pool has MYSQL_POOL_SIZE
+connections (default 3), so every statement of a login waits for one of them. A login reads
+the credentials and role in one statement, then bumps the token epoch of the player and reads
+it back in one transaction. The key derivation cost is set low
+by default so the database round trips are measured, set PASSWORD_KDF_COST to include it.
+Reports the mean, p50, p99 and max latency and the reads per login.
+
+Usage:
+    python benchmarks/bench_login_latency.py [--concurrency 500] [--rounds 5]
+'''
+
+import argparse
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'src'))
+
+DATABASE_DIR = tempfile.mkdtemp(prefix='quizapp-bench-')
+os.environ.update({'DB_BACKEND': 'sqlite', 'SQLITE_PATH': os.path.join(DATABASE_DIR, 'quizapp.db')})
+os.environ.setdefault('PASSWORD_KDF', 'pbkdf2_sha256')
+os.environ.setdefault('PASSWORD_KDF_COST', '1000')
+
+# pylint: disable=wrong-import-position
+from flask import Flask
+from flask_jwt_extended import JWTManager
+
+from business.auth_business import AuthBusiness
+from config.queries import Queries
+from database.database_access import DatabaseAccess
+from database.database_connection import DatabaseConnection
+from database.migrations import MigrationRunner
+from helpers.password_pool import PasswordPool
+from helpers.token_cache import token_cache
+from utils.password_hasher import hash_password, kdf
+
+PASSWORD = 'Bench@123'
+
+
+def seed(db: DatabaseAccess, users: int) -> list:
+    'Inserts players sharing one hashed password, returns their usernames'
+
+    usernames = [f'player{i:05d}' for i in range(users)]
+    stored_password = hash_password(PASSWORD)
+    db.write_many(Queries.INSERT_USER_DATA, [
+        (f'P{i:05d}', 'Player', f'{u}@quiz.com', 'player', '2024-01-01') for i, u in enumerate(usernames)
+    ])
+    db.write_many(Queries.INSERT_CREDENTIALS, [(f'P{i:05d}', u, stored_password, 1) for i, u in enumerate(usernames)])
+    return usernames
+
+
+def run(app: Flask, db: DatabaseAccess, usernames: list, rounds: int) -> tuple:
+    'Logs every player in at once, `rounds` times, returns the sorted milliseconds and reads per login'
+
+    auth_business = AuthBusiness(db)
+    latencies, lock = [], threading.Lock()
+    statements = [0]
+    original_read = db.read
+
+    def counting_read(*args, **kwargs):
+        'Counts the reads sent'
+
+        with lock:
+            statements[0] += 1
+        return original_read(*args, **kwargs)
+
+    def log_in(username: str, barrier: threading.Barrier) -> None:
+        'Logs a player in once every thread is ready'
+
+        with app.app_context():
+            barrier.wait()
+            start = time.perf_counter()
+            auth_business.login({'username': username, 'password': PASSWORD})
+            elapsed = (time.perf_counter() - start) * 1000
+        with lock:
+            latencies.append(elapsed)
+
+    db.read = counting_read
+    for _ in range(rounds):
+        token_cache.epochs.clear()
+        barrier = threading.Barrier(len(usernames))
+        threads = [threading.Thread(target=log_in, args=(username, barrier)) for username in usernames]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    db.read = original_read
+    return sorted(latencies), statements[0] / len(latencies)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--concurrency', type=int, default=500)
+    parser.add_argument('--rounds', type=int, default=5)
+    arguments = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    flask_app = Flask(__name__)
+    flask_app.config['JWT_SECRET_KEY'] = 'benchmark-secret-key-of-32-bytes!'
+    JWTManager(flask_app)
+    database = DatabaseAccess()
+    database.create_tables()
+    MigrationRunner(database).migrate()
+    players = seed(database, arguments.concurrency)
+    token_cache.sync(database)
+
+    print(
+        f'{arguments.concurrency} concurrent logins x {arguments.rounds}, '
+        f'{DatabaseConnection.POOL_SIZE} pooled connections, {kdf.name} cost {kdf.cost}'
+    )
+    password_pool = PasswordPool(os.cpu_count() or 1, arguments.concurrency, threading.TIMEOUT_MAX)
+    with mock.patch('business.auth_business.password_pool', password_pool):
+        samples, per_login = run(flask_app, database, players, arguments.rounds)
+    password_pool.stop()
+    print(
+        f'mean {sum(samples) / len(samples):>7.1f} ms  p50 {samples[len(samples) // 2]:>7.1f} ms  '
+        f'p99 {samples[int(len(samples) * 0.99)]:>7.1f} ms  max {samples[-1]:>7.1f} ms  '
+        f'{per_login:.2f} reads/login'
+    )
+
+    DatabaseConnection.get_pool().close_all()
+    shutil.rmtree(DATABASE_DIR, ignore_errors=True)
@@ -0,0 +1,148 @@
+'''
+Benchmark: login throughput under concurrency, hashing in the request threads vs on the bounded pool.
+
+Seeds an SQLite database with `--users` players whose passwords are hashed with the
+configured key derivation function (PASSWORD_KDF, PASSWORD_KDF_COST). Then `--concurrency`
+threads log in as fast as they can for `--duration` seconds while one more thread stands for
+the other endpoints, timing a cheap read in a loop. Runs twice: with a pool of one worker per
+login thread and no admission limit, the same as hashing in every request thread, and with
+the bounded pool of `--workers` workers admitting `--queue-size` more hashes. Reports the
+logins per second completed within the duration, their p50 and p99 latency, the logins
+turned away with 503 (retried after RETRY_AFTER seconds), and the p99 latency of the other
+endpoint.
+
+Usage:
+    python benchmarks/bench_login_throughput.py [--users 200] [--concurrency 32] [--duration 5]
+                                                [--workers <cpus>] [--queue-size <4 per worker>]
+'''
+
+import argparse
+import logging
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'src'))
+
+DATABASE_DIR = tempfile.mkdtemp(prefix='quizapp-bench-')
+os.environ.update({'DB_BACKEND': 'sqlite', 'SQLITE_PATH': os.path.join(DATABASE_DIR, 'quizapp.db')})
+
+# pylint: disable=wrong-import-position
+from flask import Flask
+from flask_jwt_extended import JWTManager
+
+from business.auth_business import AuthBusiness
+from config.queries import Queries
+from database.database_access import DatabaseAccess
+from database.database_connection import DatabaseConnection
+from helpers.password_pool import PasswordPool
+from utils.custom_error import ServiceUnavailableError
+from utils.password_hasher import hash_password, kdf
+
+PASSWORD = 'Bench@123'
+GET_CATEGORIES = 'SELECT category_id FROM categories LIMIT 10'
+# Seconds a client turned away waits before logging in again
+RETRY_AFTER = 0.1
+
+
+def seed(db: DatabaseAccess, users: int) -> list:
+    'Inserts players sharing one hashed password, returns their usernames'
+
+    usernames = [f'player{i:05d}' for i in range(users)]
+    stored_password = hash_password(PASSWORD)
+    db.write_many(Queries.INSERT_USER_DATA, [
+        (f'P{i:05d}', 'Player', f'{u}@quiz.com', 'player', '2024-01-01') for i, u in enumerate(usernames)
+    ])
+    db.write_many(Queries.INSERT_CREDENTIALS, [(f'P{i:05d}', u, stored_password, 1) for i, u in enumerate(usernames)])
+    return usernames
+
+
+def run(app: Flask, db: DatabaseAccess, pool: PasswordPool, usernames: list, arguments) -> dict:
+    'Logs in from every thread for the duration, returns the login and other endpoint latencies'
+
+    auth_business = AuthBusiness(db)
+    deadline = time.perf_counter() + arguments.duration
+    logins, others, rejected = [], [], [0]
+
+    def log_in() -> None:
+        'Logs in as random players until the deadline'
+
+        with app.app_context():
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                try:
+                    auth_business.login({'username': random.choice(usernames), 'password': PASSWORD})
+                    if time.perf_counter() < deadline:
+                        logins.append((time.perf_counter() - start) * 1000)
+                except ServiceUnavailableError:
+                    rejected[0] += 1
+                    time.sleep(RETRY_AFTER)
+
+    def other_endpoint() -> None:
+        'Times a cheap read until the deadline'
+
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            db.read(GET_CATEGORIES)
+            others.append((time.perf_counter() - start) * 1000)
+            time.sleep(0.005)
+
+    with mock.patch('business.auth_business.password_pool', pool):
+        threads = [threading.Thread(target=log_in) for _ in range(arguments.concurrency)]
+        threads.append(threading.Thread(target=other_endpoint))
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    pool.stop()
+    return {'logins': sorted(logins), 'others': sorted(others), 'rejected': rejected[0]}
+
+
+def percentile(samples: list, fraction: float) -> float:
+    'Percentile of sorted samples'
+
+    return samples[min(int(len(samples) * fraction), len(samples) - 1)] if samples else 0.0
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--duration', type=float, default=5)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--queue-size', type=int, help='hashes queued beyond the workers, default 4 per worker')
+    arguments = parser.parse_args()
+    arguments.queue_size = 4 * arguments.workers if arguments.queue_size is None else arguments.queue_size
+
+    logging.disable(logging.WARNING)
+    flask_app = Flask(__name__)
+    flask_app.config['JWT_SECRET_KEY'] = 'benchmark-secret-key-of-32-bytes!'
+    JWTManager(flask_app)
+    database = DatabaseAccess()
+    database.create_tables()
+    players = seed(database, arguments.users)
+
+    pools = {
+        'request threads': PasswordPool(arguments.concurrency, 0, threading.TIMEOUT_MAX),
+        'bounded pool': PasswordPool(arguments.workers, arguments.queue_size, 0.1)
+    }
+    print(
+        f'{kdf.name} cost {kdf.cost}, {arguments.concurrency} login threads for {arguments.duration:.0f} s, '
+        f'bounded pool of {arguments.workers} workers + {arguments.queue_size} queued'
+    )
+    for mode, password_pool in pools.items():
+        result = run(flask_app, database, password_pool, players, arguments)
+        print(
+            f'{mode:<16} {len(result["logins"]) / arguments.duration:>7.1f} logins/s  '
+            f'p50 {percentile(result["logins"], 0.5):>8.1f} ms  p99 {percentile(result["logins"], 0.99):>8.1f} ms  '
+            f'{result["rejected"]:>6,} rejected  other endpoint p99 {percentile(result["others"], 0.99):>7.2f} ms'
+        )
+
+    DatabaseConnection.get_pool().close_all()
+    shutil.rmtree(DATABASE_DIR, ignore_errors=True)
@@ -0,0 +1,130 @@
+'''
+Benchmark: hot query timings before and after the index migration.
+
+Seeds an SQLite database through DatabaseAccess (players, scores, questions and options),
+times the leaderboard, quiz fetch and evaluation queries,
+applies the pending migrations with MigrationRunner and times them again. The query
+plan is printed next to each timing.
+
+Usage:
+    python benchmarks/bench_migrations.py [--players 2000] [--scores 100] [--questions 20000] [--repeat 20]
+'''
+
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'src'))
+
+DATABASE_DIR = tempfile.mkdtemp(prefix='quizapp-bench-')
+os.environ.update({'DB_BACKEND': 'sqlite', 'SQLITE_PATH': os.path.join(DATABASE_DIR, 'quizapp.db')})
+
+# pylint: disable=wrong-import-position
+from config.queries import Queries
+from config.string_constants import QUESTION_TYPES
+from database.database_access import DatabaseAccess
+from database.database_connection import DatabaseConnection, backend
+from database.migrations import MigrationRunner
+
+CATEGORIES = 20
+# The leaderboard aggregate over scores the first migration indexes for
+LEADERBOARD = '''
+    SELECT player_id, username, MAX(score) as score, MIN(timestamp) as timestamp
+    FROM scores
+    INNER JOIN credentials ON scores.player_id = credentials.user_id
+    GROUP BY player_id
+    ORDER BY score DESC, timestamp ASC
+    LIMIT 10
+'''
+
+
+def seed(db: DatabaseAccess, players: int, scores: int, questions: int) -> dict:
+    'Inserts the dataset, returns sample parameters for the timed queries'
+
+    player_ids = [f'P{i:05d}' for i in range(players)]
+    db.write_many(Queries.INSERT_USER_DATA, [(p, 'Player', f'{p}@quiz.com', 'player', '2024-01-01') for p in player_ids])
+    db.write_many(Queries.INSERT_CREDENTIALS, [(p, p.lower(), 'hash', 1) for p in player_ids])
+    db.write_many(Queries.INSERT_PLAYER_QUIZ_SCORE, [
+        (f'S{i:07d}', player_ids[i % players], random.randint(0, 100), f'2024-01-{1 + i % 28:02d} 10:00:00', None, None)
+        for i in range(players * scores)
+    ])
+
+    category_ids = [f'C{i:05d}' for i in range(CATEGORIES)]
+    db.write_many(Queries.INSERT_CATEGORY, [(c, 'A00001', f'Category {c}') for c in category_ids])
+    question_ids = [f'Q{i:05d}' for i in range(questions)]
+    db.write_many(Queries.INSERT_QUESTION, [
+        (q, category_ids[i % CATEGORIES], 'A00001', f'Question text {q}', QUESTION_TYPES[i % len(QUESTION_TYPES)])
+        for i, q in enumerate(question_ids)
+    ])
+    db.write_many(Queries.INSERT_OPTION, [
+        (f'O{i:07d}', question_ids[i // 4], f'option {i % 4}', int(i % 4 == 0)) for i in range(questions * 4)
+    ])
+    return {'player_id': player_ids[0], 'category_id': category_ids[0], 'question_ids': tuple(question_ids[:10])}
+
+
+def timed_queries(sample: dict) -> dict:
+    'Returns the timed statements with their parameters'
+
+    evaluation = Queries.GET_QUESTION_DATA_BY_QUESTION_ID % ', '.join(['%s'] * len(sample['question_ids']))
+    return {
+        'leaderboard': (LEADERBOARD, None),
+        'player scores': (Queries.GET_PLAYER_SCORES_BY_ID, (sample['player_id'], )),
+        'quiz fetch': (
+            Queries.GET_RANDOM_QUESTIONS_BY_CATEGORY,
+            (sample['category_id'], sample['category_id'], QUESTION_TYPES[0], QUESTION_TYPES[0], 10)
+        ),
+        'evaluation': (evaluation, sample['question_ids'])
+    }
+
+
+def plan(query: str, data: tuple) -> str:
+    'Returns the query plan on one line'
+
+    with DatabaseConnection() as connection:
+        cursor = connection.cursor(dictionary=True)
+        cursor.execute(backend.EXPLAIN + query, data or ())
+        return '; '.join(row['detail'] for row in cursor.fetchall())
+
+
+def run(db: DatabaseAccess, queries: dict, repeat: int) -> dict:
+    'Times every query, returns the mean milliseconds per name'
+
+    timings = {}
+    for name, (query, data) in queries.items():
+        call = db.write if query.lstrip().upper().startswith('UPDATE') else db.read
+        start = time.perf_counter()
+        for _ in range(repeat):
+            call(query, data)
+        timings[name] = (time.perf_counter() - start) / repeat * 1000
+    return timings
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--players', type=int, default=2000)
+    parser.add_argument('--scores', type=int, default=100, help='scores per player')
+    parser.add_argument('--questions', type=int, default=20000)
+    parser.add_argument('--repeat', type=int, default=20)
+    arguments = parser.parse_args()
+
+    database = DatabaseAccess()
+    database.create_tables()
+    queries = timed_queries(seed(database, arguments.players, arguments.scores, arguments.questions))
+
+    before = run(database, queries, arguments.repeat)
+    plans_before = {name: plan(query, data) for name, (query, data) in queries.items()}
+    print(f'applied migrations: {MigrationRunner(database).migrate()}')
+    after = run(database, queries, arguments.repeat)
+
+    for name, (query, data) in queries.items():
+        print(f'{name:<18} before {before[name]:>9.3f} ms  after {after[name]:>9.3f} ms  x{before[name] / after[name]:.1f}')
+        print(f'{"":<18} before: {plans_before[name]}')
+        print(f'{"":<18} after:  {plan(query, data)}')
+
+    DatabaseConnection.get_pool().close_all()
+    shutil.rmtree(DATABASE_DIR, ignore_errors=True)
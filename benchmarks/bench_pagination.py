@@ -0,0 +1,113 @@
+'''
+Benchmark: unbounded list queries vs keyset pages.
+
+Seeds an SQLite database with `--players` players and one player with `--scores` scores,
+then times reading the whole score history and player list the way the endpoints did
+before pagination, and reading one page of `--limit` rows at the start and deep in the
+list through a cursor the way they do now. Checks walking every page returns the same
+scores as the unbounded query.
+
+Usage:
+    python benchmarks/bench_pagination.py [--players 20000] [--scores 50000] [--limit 20]
+'''
+
+import argparse
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'src'))
+
+DATABASE_DIR = tempfile.mkdtemp(prefix='quizapp-bench-')
+os.environ.update({'DB_BACKEND': 'sqlite', 'SQLITE_PATH': os.path.join(DATABASE_DIR, 'quizapp.db')})
+
+# pylint: disable=wrong-import-position
+from business.quiz_business import QuizBusiness
+from business.user_business import UserBusiness
+from config.queries import Queries
+from config.string_constants import Roles
+from database.database_access import DatabaseAccess
+from database.database_connection import DatabaseConnection
+from database.migrations import MigrationRunner
+
+REPEAT = 20
+
+
+def seed(db: DatabaseAccess, players: int, scores: int) -> str:
+    'Inserts players and the scores of one of them, returns its id'
+
+    player_ids = [f'P{i:05d}' for i in range(players)]
+    db.write_many(Queries.INSERT_USER_DATA, [(p, 'Player', f'{p}@quiz.com', 'player', '2024-01-01') for p in player_ids])
+    db.write_many(Queries.INSERT_CREDENTIALS, [(p, p.lower(), 'hash', 1) for p in player_ids])
+    db.write_many(Queries.INSERT_PLAYER_QUIZ_SCORE, [
+        (f'S{i:06d}', player_ids[0], i % 100, f'2024-{1 + i // 28 % 12:02d}-{1 + i % 28:02d} 10:00:00', None, None)
+        for i in range(scores)
+    ])
+    return player_ids[0]
+
+
+def mean_ms(call) -> float:
+    'Returns the mean milliseconds of a call'
+
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        call()
+    return (time.perf_counter() - start) / REPEAT * 1000
+
+
+def deep_cursor(call, pages: int) -> str:
+    'Returns the cursor of the page `pages` pages in'
+
+    cursor = None
+    for _ in range(pages):
+        _, cursor = call(cursor)
+    return cursor
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--players', type=int, default=20000)
+    parser.add_argument('--scores', type=int, default=50000)
+    parser.add_argument('--limit', type=int, default=20)
+    arguments = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    database = DatabaseAccess()
+    database.create_tables()
+    MigrationRunner(database).migrate()
+    player = seed(database, arguments.players, arguments.scores)
+    quiz, users, limit = QuizBusiness(database), UserBusiness(database), arguments.limit
+
+    walked, cursor = [], None
+    while True:
+        page, cursor = quiz.get_player_scores(player, 1000, cursor)
+        walked.extend(row['score_id'] for row in page)
+        if cursor is None:
+            break
+    unbounded = [row['score_id'] for row in database.read(Queries.GET_PLAYER_SCORES_BY_ID, (player, ))]
+    print(f'{arguments.scores:,} scores, {arguments.players:,} players, pages of {limit}, '
+          f'pages match: {sorted(walked) == sorted(unbounded) and len(walked) == len(unbounded)}')
+
+    lists = {
+        'scores': (
+            lambda: database.read(Queries.GET_PLAYER_SCORES_BY_ID, (player, )),
+            lambda cursor: quiz.get_player_scores(player, limit, cursor)
+        ),
+        'players': (
+            lambda: database.read(Queries.GET_USER_BY_ROLE, (Roles.PLAYER, )),
+            lambda cursor: users.get_all_users_by_role(Roles.PLAYER, limit, cursor)
+        )
+    }
+    for name, (read_all, read_page) in lists.items():
+        deep = deep_cursor(read_page, 500)
+        full = mean_ms(read_all)
+        first = mean_ms(lambda: read_page(None))
+        later = mean_ms(lambda: read_page(deep))
+        print(f'{name:<8} unbounded {full:>8.2f} ms  first page {first:>6.3f} ms  page 501 {later:>6.3f} ms')
+
+    DatabaseConnection.get_pool().close_all()
+    shutil.rmtree(DATABASE_DIR, ignore_errors=True)
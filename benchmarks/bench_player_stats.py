@@ -0,0 +1,90 @@
+'''
+Benchmark: player score summary aggregated from scores on demand vs read from player_stats.
+
+Seeds an SQLite database with one player per history length in `--histories`, saving their
+scores through write_scores so player_stats is maintained incrementally, then times the
+summary computed with COUNT/AVG/MAX over the scores of the player and read from the
+player_stats row, and checks both agree.
+
+Usage:
+    python benchmarks/bench_player_stats.py [--histories 10 1000 100000]
+'''
+
+import argparse
+import logging
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'src'))
+
+DATABASE_DIR = tempfile.mkdtemp(prefix='quizapp-bench-')
+os.environ.update({'DB_BACKEND': 'sqlite', 'SQLITE_PATH': os.path.join(DATABASE_DIR, 'quizapp.db')})
+
+# pylint: disable=wrong-import-position
+from config.queries import Queries
+from database.database_access import DatabaseAccess
+from database.database_connection import DatabaseConnection
+from database.migrations import MigrationRunner
+from helpers.score_writer import write_scores
+
+REPEAT = 50
+BATCH_SIZE = 1000
+AGGREGATE_PLAYER_SCORES = '''
+    SELECT COUNT(*) AS attempts, ROUND(AVG(score), 2) AS average_score, MAX(score) AS best_score,
+           MAX(timestamp) AS last_played
+    FROM scores WHERE player_id = %s
+'''
+
+
+def seed(db: DatabaseAccess, player_id: str, attempts: int) -> None:
+    'Inserts a player and saves `attempts` scores for them'
+
+    db.write(Queries.INSERT_USER_DATA, (player_id, 'Player', f'{player_id}@quiz.com', 'player', '2024-01-01'))
+    scores = [
+        (f'{player_id}{i:07d}', player_id, random.randrange(101), f'2024-01-01 10:{i // 60 % 60:02d}:{i % 60:02d}',
+         None, None)
+        for i in range(attempts)
+    ]
+    for start in range(0, attempts, BATCH_SIZE):
+        write_scores(db, scores[start:start + BATCH_SIZE])
+
+
+def mean_ms(call) -> float:
+    'Returns the mean milliseconds of a call'
+
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        call()
+    return (time.perf_counter() - start) / REPEAT * 1000
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--histories', type=int, nargs='+', default=[10, 1000, 100000])
+    arguments = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    database = DatabaseAccess()
+    database.create_tables()
+    MigrationRunner(database).migrate()
+
+    for number, history in enumerate(arguments.histories):
+        player = f'P{number:04d}'
+        seed(database, player, history)
+        aggregate = database.read(AGGREGATE_PLAYER_SCORES, (player, ))[0]
+        stats = database.read(Queries.GET_PLAYER_STATS, (player, ))[0]
+        match = (aggregate['attempts'], float(aggregate['best_score'])) == (stats['attempts'], float(stats['best_score']))
+        on_demand = mean_ms(lambda: database.read(AGGREGATE_PLAYER_SCORES, (player, )))
+        incremental = mean_ms(lambda: database.read(Queries.GET_PLAYER_STATS, (player, )))
+        print(
+            f'{history:>7,} scores  aggregate {on_demand:>8.3f} ms  player_stats {incremental:>6.3f} ms  '
+            f'x{on_demand / incremental:>5.0f}  match: {match}'
+        )
+
+    DatabaseConnection.get_pool().close_all()
+    shutil.rmtree(DATABASE_DIR, ignore_errors=True)
@@ -0,0 +1,96 @@
+'''
+Benchmark: quiz question sampling with ORDER BY RAND() vs the in-memory question index.
+
+Grows an SQLite question bank through 10k, 100k and 1M questions (20 categories, a third
+of them MCQ with four options). At each size the GET_RANDOM_QUESTIONS_BY_CATEGORY query is
+timed, on the migrated schema, against QuestionIndex: the time to build the index from the database and the time to
+sample 10 questions for a category and question type. The SQL query is skipped above
+--sql-max questions, where a single run takes seconds.
+
+Usage:
+    python benchmarks/bench_question_index.py [--sizes 10000,100000,1000000] [--sql-max 1000000] [--repeat 20]
+'''
+
+import argparse
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'src'))
+
+DATABASE_DIR = tempfile.mkdtemp(prefix='quizapp-bench-')
+os.environ.update({'DB_BACKEND': 'sqlite', 'SQLITE_PATH': os.path.join(DATABASE_DIR, 'quizapp.db')})
+
+# pylint: disable=wrong-import-position
+from config.queries import Queries
+from config.string_constants import QUESTION_TYPES, QuestionTypes
+from database.database_access import DatabaseAccess
+from database.database_connection import DatabaseConnection
+from database.migrations import MigrationRunner
+from helpers.question_index import QuestionIndex
+
+CATEGORIES = 20
+CATEGORY_ID = 'C00000'
+SAMPLE_SIZE = 10
+
+
+def seed(db: DatabaseAccess, start: int, end: int) -> None:
+    'Inserts questions start..end with their options'
+
+    question_rows, option_rows = [], []
+    for i in range(start, end):
+        question_id = f'Q{i:07d}'
+        question_type = QUESTION_TYPES[i // CATEGORIES % len(QUESTION_TYPES)]
+        question_rows.append((question_id, f'C{i % CATEGORIES:05d}', 'A00001', f'Question text {i}', question_type))
+        options = 4 if question_type == QuestionTypes.MCQ else 1
+        option_rows.extend((f'O{i:07d}{o}', question_id, f'option {o}', int(o == 0)) for o in range(options))
+    db.write_many(Queries.INSERT_QUESTION, question_rows, chunk_size=10000)
+    db.write_many(Queries.INSERT_OPTION, option_rows, chunk_size=10000)
+
+
+def mean_ms(call, repeat: int) -> float:
+    'Returns the mean milliseconds of a call'
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        call()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default='10000,100000,1000000', help='comma separated question counts')
+    parser.add_argument('--sql-max', type=int, default=1000000, help='largest size the SQL query is timed at')
+    parser.add_argument('--repeat', type=int, default=20)
+    arguments = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    database = DatabaseAccess()
+    database.create_tables()
+    MigrationRunner(database).migrate()
+    database.write_many(
+        Queries.INSERT_CATEGORY, [(f'C{i:05d}', 'A00001', f'Category {i}') for i in range(CATEGORIES)]
+    )
+    sql_parameters = (CATEGORY_ID, CATEGORY_ID, QuestionTypes.MCQ, QuestionTypes.MCQ, SAMPLE_SIZE)
+
+    seeded = 0
+    for size in sorted(int(size) for size in arguments.sizes.split(',')):
+        seed(database, seeded, size)
+        seeded = size
+
+        if size <= arguments.sql_max:
+            sql = f'{mean_ms(lambda: database.read(Queries.GET_RANDOM_QUESTIONS_BY_CATEGORY, sql_parameters), arguments.repeat):>10.3f} ms'
+        else:
+            sql = f'{"skipped":>13}'
+
+        index = QuestionIndex(ttl=float('inf'))
+        build = mean_ms(lambda: index.rebuild(database), 1)
+        sample = mean_ms(lambda: index.sample(database, CATEGORY_ID, QuestionTypes.MCQ, SAMPLE_SIZE), 1000)
+        print(f'{size:>9,} questions  ORDER BY RAND() {sql}  index build {build:>10.1f} ms  index sample {sample:>7.4f} ms')
+
+    DatabaseConnection.get_pool().close_all()
+    shutil.rmtree(DATABASE_DIR, ignore_errors=True)
@@ -0,0 +1,140 @@
+'''
+Benchmark: quiz submit latency graded from the answer key vs from the quiz ticket.
+
+Seeds an SQLite database with a question bank and players, hands out `--submissions`
+quizzes of 10 questions with QuizBusiness.get_random_questions, and times
+evaluate_player_answers for each of them: graded from the answer key with a cold cache
+(one query per submission), with a cache warmed with every handed out question, and from
+the quiz ticket (no query, one insert recording its nonce). Scores are saved
+write-behind so the time is the grading. Reports the mean and p99 latency and the queries
+sent while submitting, and checks the three ways give the same scores.
+
+Usage:
+    python benchmarks/bench_quiz_ticket.py [--questions 10000] [--submissions 2000]
+'''
+
+import argparse
+import logging
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'src'))
+
+DATABASE_DIR = tempfile.mkdtemp(prefix='quizapp-bench-')
+os.environ.update({
+    'DB_BACKEND': 'sqlite',
+    'SQLITE_PATH': os.path.join(DATABASE_DIR, 'quizapp.db'),
+    'JWT_SECRET_KEY': 'bench-secret',
+    'QUIZ_ALLOW_UNTICKETED_ANSWERS': 'true',
+    'SCORE_WRITE_BEHIND': 'true',
+    'SCORE_SPOOL_PATH': os.path.join(DATABASE_DIR, 'score_spool.jsonl'),
+    'SCORE_SPOOL_FSYNC': 'false'
+})
+
+# pylint: disable=wrong-import-position
+from business.quiz_business import QuizBusiness
+from config.queries import Queries
+from database.database_access import DatabaseAccess
+from database.database_connection import DatabaseConnection
+from database.migrations import MigrationRunner
+from helpers.answer_key import answer_key
+from helpers.score_writer import score_writer
+
+CATEGORIES = 20
+PLAYERS = 100
+QUESTIONS_PER_QUIZ = 10
+
+
+def seed(db: DatabaseAccess, questions: int) -> list:
+    'Inserts players, categories and MCQ questions, returns the player ids'
+
+    player_ids = [f'P{i:05d}' for i in range(PLAYERS)]
+    db.write_many(Queries.INSERT_USER_DATA, [(p, 'Player', f'{p}@quiz.com', 'player', '2024-01-01') for p in player_ids])
+    category_ids = [f'C{i:05d}' for i in range(CATEGORIES)]
+    db.write_many(Queries.INSERT_CATEGORY, [(c, None, f'Category {c}') for c in category_ids])
+    question_ids = [f'Q{i:06d}' for i in range(questions)]
+    db.write_many(Queries.INSERT_QUESTION, [
+        (q, category_ids[i % CATEGORIES], None, f'Question text {q}', 'mcq') for i, q in enumerate(question_ids)
+    ])
+    db.write_many(Queries.INSERT_OPTION, [
+        (f'O{i:07d}', question_ids[i // 4], f'option {i % 4}', int(i % 4 == 0)) for i in range(questions * 4)
+    ])
+    return player_ids
+
+
+def submit(quiz: QuizBusiness, quizzes: list, use_ticket: bool, cold: bool) -> tuple:
+    'Submits every quiz, returns the sorted milliseconds and the scores'
+
+    latencies, scores = [], []
+    for player_id, answers, ticket in quizzes:
+        if cold:
+            answer_key.cache.clear()
+        start = time.perf_counter()
+        result = quiz.evaluate_player_answers(player_id, answers, ticket if use_ticket else None)
+        latencies.append((time.perf_counter() - start) * 1000)
+        scores.append(result['score'])
+    return sorted(latencies), scores
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--questions', type=int, default=10000)
+    parser.add_argument('--submissions', type=int, default=2000)
+    arguments = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    database = DatabaseAccess()
+    database.create_tables()
+    MigrationRunner(database).migrate()
+    players = seed(database, arguments.questions)
+    quiz_business = QuizBusiness(database)
+    score_writer.start(database)
+
+    def hand_out(count: int) -> list:
+        'Returns (player_id, answers, ticket) of quizzes answered at random'
+
+        quizzes = []
+        for i in range(count):
+            player_id = players[i % PLAYERS]
+            questions, ticket = quiz_business.get_random_questions(player_id, limit=QUESTIONS_PER_QUIZ)
+            answers = [
+                {'question_id': question['question_id'], 'user_answer': random.choice(question['options'])}
+                for question in questions
+            ]
+            quizzes.append((player_id, answers, ticket))
+        return quizzes
+
+    handed_out = hand_out(arguments.submissions)
+    queries_sent = 0
+    original_read = database.read
+
+    def counting_read(*args, **kwargs):
+        'Counts the queries sent while submitting'
+
+        global queries_sent  # pylint: disable=global-statement
+        queries_sent += 1
+        return original_read(*args, **kwargs)
+
+    database.read = counting_read
+    modes = {'answer key, cold': (False, True), 'answer key, warm': (False, False), 'quiz ticket': (True, False)}
+    results = {}
+    print(f'{arguments.submissions:,} submissions of {QUESTIONS_PER_QUIZ} questions, {arguments.questions:,} questions')
+    for mode, (with_ticket, cold_cache) in modes.items():
+        if not cold_cache:
+            answer_key.lookup(database, [answer['question_id'] for _, answers, _ in handed_out for answer in answers])
+        queries_sent = 0
+        samples, results[mode] = submit(quiz_business, handed_out, with_ticket, cold_cache)
+        print(
+            f'{mode:<18} mean {sum(samples) / len(samples):>6.3f} ms  p99 {samples[int(len(samples) * 0.99)]:>6.3f} ms  '
+            f'{queries_sent:>5,} queries'
+        )
+    print(f'scores match: {len(set(map(tuple, results.values()))) == 1}')
+
+    score_writer.stop()
+    DatabaseConnection.get_pool().close_all()
+    shutil.rmtree(DATABASE_DIR, ignore_errors=True)
@@ -0,0 +1,112 @@
+'''
+Benchmark: latency of saving quiz scores in the request vs write-behind.
+
+Seeds an SQLite database with players, then has `--threads` threads save `--scores` scores
+each through ScoreWriter, the way QuizBusiness saves a submission: once written in the
+request, once write-behind with the spool fsynced and once without fsync. Reports the p50
+and p99 of the time a request spends saving its score, the total time until every score
+is in the database, the flushes, and checks every score was written.
+
+Usage:
+    python benchmarks/bench_score_writer.py [--players 1000] [--threads 8] [--scores 500]
+'''
+
+import argparse
+import logging
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'src'))
+
+DATABASE_DIR = tempfile.mkdtemp(prefix='quizapp-bench-')
+os.environ.update({'DB_BACKEND': 'sqlite', 'SQLITE_PATH': os.path.join(DATABASE_DIR, 'quizapp.db')})
+
+# pylint: disable=wrong-import-position
+from config.queries import Queries
+from database.database_access import DatabaseAccess
+from database.database_connection import DatabaseConnection
+from database.migrations import MigrationRunner
+from helpers.score_writer import ScoreWriter
+
+COUNT_SCORES = 'SELECT COUNT(*) AS scores FROM scores'
+
+
+def seed(db: DatabaseAccess, players: int) -> list:
+    'Inserts players, returns their ids'
+
+    player_ids = [f'P{i:05d}' for i in range(players)]
+    db.write_many(Queries.INSERT_USER_DATA, [(p, 'Player', f'{p}@quiz.com', 'player', '2024-01-01') for p in player_ids])
+    db.write_many(Queries.INSERT_CREDENTIALS, [(p, p.lower(), 'hash', 1) for p in player_ids])
+    return player_ids
+
+
+def save_scores(db: DatabaseAccess, writer: ScoreWriter, player_ids: list, prefix: str, scores: int) -> list:
+    'Saves scores one request at a time, returns the milliseconds each save took'
+
+    latencies = []
+    for i in range(scores):
+        score = (
+            f'{prefix}{i:05d}', random.choice(player_ids), round(random.uniform(0, 100), 2),
+            '2024-01-02 10:00:00', 'C0001', 'mcq'
+        )
+        start = time.perf_counter()
+        writer.save(db, [score])
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def run(db: DatabaseAccess, writer: ScoreWriter, player_ids: list, threads: int, scores: int) -> tuple:
+    'Saves scores from concurrent threads, returns the sorted latencies and the ms until all are written'
+
+    writer.start(db)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        results = executor.map(
+            lambda thread: save_scores(db, writer, player_ids, f'{id(writer) % 1000:03d}{thread:02d}', scores),
+            range(threads)
+        )
+        latencies = sorted(latency for result in results for latency in result)
+    writer.stop()
+    return latencies, (time.perf_counter() - start) * 1000
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--players', type=int, default=1000)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--scores', type=int, default=500, help='scores saved per thread')
+    arguments = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    database = DatabaseAccess()
+    database.create_tables()
+    MigrationRunner(database).migrate()
+    players = seed(database, arguments.players)
+    spool_path = os.path.join(DATABASE_DIR, 'score_spool.jsonl')
+
+    modes = {
+        'in request': ScoreWriter(False, 10000, 500, 0.2, spool_path),
+        'write-behind, fsync': ScoreWriter(True, 10000, 500, 0.2, spool_path, fsync=True),
+        'write-behind': ScoreWriter(True, 10000, 500, 0.2, spool_path, fsync=False)
+    }
+    total = arguments.threads * arguments.scores
+    print(f'{total:,} scores saved by {arguments.threads} threads')
+    for mode, score_writer in modes.items():
+        before = database.read(COUNT_SCORES)[0]['scores']
+        samples, elapsed = run(database, score_writer, players, arguments.threads, arguments.scores)
+        written = database.read(COUNT_SCORES)[0]['scores'] - before
+        p50, p99 = samples[len(samples) // 2], samples[int(len(samples) * 0.99)]
+        stats = score_writer.stats()
+        print(
+            f'{mode:<20} p50 {p50:>7.3f} ms  p99 {p99:>7.3f} ms  all written in {elapsed:>7.0f} ms  '
+            f'flushes {stats["flushes"]:>4}  written: {written == total}'
+        )
+
+    DatabaseConnection.get_pool().close_all()
+    shutil.rmtree(DATABASE_DIR, ignore_errors=True)
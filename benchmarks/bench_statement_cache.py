@@ -0,0 +1,96 @@
+'''
+Benchmark: login and token epoch lookups with and without statement reuse.
+
+Runs GET_CREDENTIALS_BY_USERNAME (login) and GET_USER_TOKEN_EPOCH (checked by authenticated
+requests missing the token cache) repeatedly and reports lookups/sec with the prepared
+statement cache disabled and enabled.
+
+By default SQLite stands in for MySQL, there the comparison is its own per connection
+statement cache (cached_statements=0 vs the default). Pass --mysql to run both queries
+through DatabaseAccess against the MySQL server configured through the MYSQL_* environment
+variables, toggling DB_STATEMENT_CACHE_SIZE, and print the hit/miss counters.
+
+Usage:
+    python benchmarks/bench_statement_cache.py [--lookups 20000] [--mysql]
+'''
+
+import argparse
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'src'))
+
+from config.queries import Queries  # pylint: disable=wrong-import-position
+
+USERS = 1000
+
+
+def sqlite_benchmark(lookups: int) -> None:
+    'Compares SQLite with and without its statement cache'
+
+    queries = {
+        'login': Queries.GET_CREDENTIALS_BY_USERNAME.replace('%s', '?'),
+        'token epoch': Queries.GET_USER_TOKEN_EPOCH.replace('%s', '?')
+    }
+    for cached_statements in (0, 128):
+        connection = sqlite3.connect(':memory:', cached_statements=cached_statements)
+        connection.executescript('''
+            CREATE TABLE users (user_id TEXT PRIMARY KEY, role TEXT);
+            CREATE TABLE credentials (user_id TEXT PRIMARY KEY, username TEXT UNIQUE, password TEXT,
+                                      isPasswordChanged INTEGER);
+            CREATE TABLE user_token_epochs (user_id TEXT PRIMARY KEY, epoch INTEGER);
+            CREATE INDEX idx_credentials_login ON credentials (username, password, isPasswordChanged, user_id);
+        ''')
+        connection.executemany('INSERT INTO users VALUES (?, ?)', ((f'P{i}', 'player') for i in range(USERS)))
+        connection.executemany(
+            'INSERT INTO credentials VALUES (?, ?, ?, 1)', ((f'P{i}', f'user{i}', 'x') for i in range(USERS))
+        )
+        connection.executemany('INSERT INTO user_token_epochs VALUES (?, 1)', ((f'P{i}', ) for i in range(USERS)))
+
+        for name, query in queries.items():
+            prefix = 'user' if name == 'login' else 'P'
+            start = time.perf_counter()
+            for i in range(lookups):
+                connection.execute(query, (f'{prefix}{i % USERS}', )).fetchall()
+            rate = lookups / (time.perf_counter() - start)
+            label = 'cached' if cached_statements else 'parsed every call'
+            print(f'{name:<14} {label:<18} {rate:>10,.0f} lookups/sec')
+        connection.close()
+
+
+def mysql_benchmark(lookups: int) -> None:
+    'Compares DatabaseAccess with the prepared statement cache disabled and enabled'
+
+    # pylint: disable=import-outside-toplevel
+    from database.database_access import DatabaseAccess
+    from database.statement_cache import StatementCache
+
+    db = DatabaseAccess()
+    queries = {
+        'login': (Queries.GET_CREDENTIALS_BY_USERNAME, 'user'),
+        'token epoch': (Queries.GET_USER_TOKEN_EPOCH, 'P')
+    }
+    for size in (0, 64):
+        StatementCache.MAX_SIZE = size
+        for name, (query, prefix) in queries.items():
+            start = time.perf_counter()
+            for i in range(lookups):
+                db.read(query, (f'{prefix}{i % USERS}', ))
+            rate = lookups / (time.perf_counter() - start)
+            label = 'prepared' if size else 'text protocol'
+            print(f'{name:<14} {label:<18} {rate:>10,.0f} lookups/sec')
+    print(db.statement_cache_stats())
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--lookups', type=int, default=20000)
+    parser.add_argument('--mysql', action='store_true', help='run against the configured MySQL server')
+    arguments = parser.parse_args()
+
+    if arguments.mysql:
+        mysql_benchmark(arguments.lookups)
+    else:
+        sqlite_benchmark(arguments.lookups)
@@ -0,0 +1,156 @@
+'''
+Benchmark: JWT blocklist check and token revocation, per token rows vs per user epochs.
+
+Seeds an SQLite database with `--users` users, and a legacy per token table holding
+`--history` logins per user. Times the writes of a login and of a logout with one row per
+token (revoke every row of the user, insert the new one) and with token epochs (nothing on
+login, bump the epoch on logout). Then replays `--checks` checks of tokens of users picked at
+random, as the blocklist loader does on every authenticated request: reading the epoch on
+every check, and through the token cache. Reports the mean and p99 latency and the queries
+sent, then revokes tokens through a second cache standing for another process and reports
+how long the first one kept accepting them.
+
+Usage:
+    python benchmarks/bench_token_cache.py [--users 1000] [--history 100] [--checks 100000]
+                                           [--sync-interval 0.2]
+'''
+
+import argparse
+import logging
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'src'))
+
+DATABASE_DIR = tempfile.mkdtemp(prefix='quizapp-bench-')
+os.environ.update({'DB_BACKEND': 'sqlite', 'SQLITE_PATH': os.path.join(DATABASE_DIR, 'quizapp.db')})
+
+# pylint: disable=wrong-import-position
+from config.queries import Queries
+from database.database_access import DatabaseAccess
+from database.database_connection import DatabaseConnection
+from helpers import token_helper
+from helpers.token_cache import TokenCache
+from helpers.token_helper import TokenHelper
+
+REVOCATIONS = 20
+# The per token table and statements token epochs replaced
+LEGACY_TOKENS = [
+    '''CREATE TABLE legacy_tokens (
+        user_id VARCHAR(10),
+        access_token VARCHAR(100) PRIMARY KEY,
+        refresh_token VARCHAR(100) UNIQUE NOT NULL,
+        status VARCHAR(20) DEFAULT 'active'
+    )''',
+    'CREATE INDEX idx_legacy_tokens_user_status ON legacy_tokens (user_id, status)'
+]
+LEGACY_REVOKE = "UPDATE legacy_tokens SET status = 'revoked' WHERE user_id = %s"
+LEGACY_INSERT = 'INSERT INTO legacy_tokens (user_id, access_token, refresh_token) VALUES (%s, %s, %s)'
+
+
+def seed(db: DatabaseAccess, users: int, history: int) -> list:
+    'Inserts users and `history` revoked legacy tokens per user, returns the user ids'
+
+    user_ids = [f'U{i:05d}' for i in range(users)]
+    db.write_many(Queries.INSERT_USER_DATA, [(u, 'Player', f'{u}@quiz.com', 'player', '2024-01-01') for u in user_ids])
+    for statement in LEGACY_TOKENS:
+        db.write(statement)
+    db.write_many(LEGACY_INSERT, [(u, f'access-{u}-{i}', f'refresh-{u}-{i}') for u in user_ids for i in range(history)])
+    db.write("UPDATE legacy_tokens SET status = 'revoked'")
+    return user_ids
+
+
+def login_logout(db: DatabaseAccess, users: list) -> dict:
+    'Returns the mean milliseconds of the writes of a login and a logout with per token rows and epochs'
+
+    helper = TokenHelper(db)
+    legacy = []
+    for number, user_id in enumerate(users):
+        start = time.perf_counter()
+        with db.transaction():
+            db.write(LEGACY_REVOKE, (user_id, ))
+            db.write(LEGACY_INSERT, (user_id, f'access-{user_id}-new{number}', f'refresh-{user_id}-new{number}'))
+        legacy.append(time.perf_counter() - start)
+    epochs = []
+    for user_id in users:
+        start = time.perf_counter()
+        helper.revoke_token(user_id)
+        epochs.append(time.perf_counter() - start)
+    return {
+        'per token rows': (sum(legacy) / len(legacy) * 1000, sum(legacy) / len(legacy) * 1000),
+        'token epochs': (0.0, sum(epochs) / len(epochs) * 1000)
+    }
+
+
+def check(db: DatabaseAccess, cache: TokenCache, users: list) -> tuple:
+    'Checks a token of every user, returns the sorted milliseconds and the queries sent'
+
+    queries, original_read = [0], db.read
+
+    def counting_read(*args, **kwargs):
+        'Counts the queries sent'
+
+        queries[0] += 1
+        return original_read(*args, **kwargs)
+
+    db.read = counting_read
+    latencies = []
+    for user_id in users:
+        start = time.perf_counter()
+        if cache is None:
+            db.read(Queries.GET_USER_TOKEN_EPOCH, (user_id, ), use_primary=True)
+        else:
+            cache.is_active(db, user_id, 1)
+        latencies.append((time.perf_counter() - start) * 1000)
+    db.read = original_read
+    return sorted(latencies), queries[0]
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--history', type=int, default=100, help='legacy tokens per user')
+    parser.add_argument('--checks', type=int, default=100000)
+    parser.add_argument('--sync-interval', type=float, default=0.2)
+    arguments = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    database = DatabaseAccess()
+    database.create_tables()
+    users = seed(database, arguments.users, arguments.history)
+    local, remote = (TokenCache(arguments.users, 300, arguments.sync_interval) for _ in range(2))
+    token_helper.token_cache = remote
+
+    print(f'{arguments.users:,} users, {arguments.history:,} legacy tokens per user')
+    for mode, (login, logout) in login_logout(database, users).items():
+        print(f'{mode:<15} login writes {login:>6.3f} ms  logout writes {logout:>6.3f} ms')
+
+    checked = [random.choice(users) for _ in range(arguments.checks)]
+    print(f'{arguments.checks:,} checks')
+    for mode, cache in {'epoch read': None, 'token cache': local}.items():
+        samples, sent = check(database, cache, checked)
+        print(
+            f'{mode:<15} mean {sum(samples) / len(samples) * 1000:>7.2f} us  '
+            f'p99 {samples[int(len(samples) * 0.99)] * 1000:>7.2f} us  {sent:>7,} queries'
+        )
+
+    remote.sync(database)
+    delays = []
+    for user_id in random.sample(users, REVOCATIONS):
+        TokenHelper(database).revoke_token(user_id)
+        revoked_at = time.perf_counter()
+        while local.is_active(database, user_id, 1):
+            time.sleep(0.001)
+        delays.append((time.perf_counter() - revoked_at) * 1000)
+    print(
+        f'revoked by another process: accepted for at most {max(delays):.1f} ms '
+        f'(mean {sum(delays) / len(delays):.1f} ms, sync interval {arguments.sync_interval * 1000:.0f} ms)'
+    )
+
+    DatabaseConnection.get_pool().close_all()
+    shutil.rmtree(DATABASE_DIR, ignore_errors=True)
@@ -0,0 +1,113 @@
+'''
+Benchmark: size of token_revocations and latency of its reads before and after a purge.
+
+Seeds an SQLite database with `--rows` token revocations spread over the last `--days` days,
+all expired except the ones of the last hour, as a table never purged grows. Reports the
+pages of the table, keyed by version and the latency of the two reads of the token cache sync
+(the latest version, and the revocations after a recent version), then purges the expired
+revocations with TokenPurger in batches of `--batch-size` rows and reports the purge duration
+and rate and the same figures after it.
+
+Usage:
+    python benchmarks/bench_token_purge.py [--rows 2000000] [--days 30] [--batch-size 5000]
+'''
+
+import argparse
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'src'))
+
+DATABASE_DIR = tempfile.mkdtemp(prefix='quizapp-bench-')
+os.environ.update({'DB_BACKEND': 'sqlite', 'SQLITE_PATH': os.path.join(DATABASE_DIR, 'quizapp.db')})
+
+# pylint: disable=wrong-import-position
+from config.queries import Queries
+from database.database_access import DatabaseAccess
+from database.database_connection import DatabaseConnection
+from helpers.token_purger import TokenPurger
+
+PROBES = 2000
+SEED_BATCH = 50000
+TABLE_SIZE = "SELECT COUNT(*) AS pages, SUM(pgsize) AS bytes FROM dbstat WHERE name = 'token_revocations'"
+COUNT_ROWS = 'SELECT COUNT(*) AS count FROM token_revocations'
+
+
+def seed(db: DatabaseAccess, rows: int, days: int) -> None:
+    'Inserts `rows` revocations evenly spread over the last `days` days, each kept for an hour'
+
+    now = datetime.now(timezone.utc)
+    step = timedelta(days=days) / rows
+    for first in range(0, rows, SEED_BATCH):
+        batch = []
+        for number in range(first, min(first + SEED_BATCH, rows)):
+            revoked_at = now - timedelta(days=days) + step * number
+            batch.append((
+                f'U{number % 100000:05d}',
+                revoked_at.strftime('%Y-%m-%d %H:%M:%S'),
+                (revoked_at + timedelta(hours=1)).strftime('%Y-%m-%d %H:%M:%S')
+            ))
+        db.write_many(Queries.INSERT_TOKEN_REVOCATION, batch)
+
+
+def probe(db: DatabaseAccess) -> dict:
+    'Returns the mean and p99 microseconds of the reads of a token cache sync'
+
+    latest = db.read(Queries.GET_TOKEN_REVOCATION_VERSION)[0]['version']
+    reads = {
+        'latest version': (Queries.GET_TOKEN_REVOCATION_VERSION, None),
+        'revocations since': (Queries.GET_TOKEN_REVOCATIONS, (latest - 10, ))
+    }
+    results = {}
+    for name, (query, data) in reads.items():
+        samples = []
+        for _ in range(PROBES):
+            start = time.perf_counter()
+            db.read(query, data)
+            samples.append((time.perf_counter() - start) * 1e6)
+        samples.sort()
+        results[name] = (sum(samples) / len(samples), samples[int(len(samples) * 0.99)])
+    return results
+
+
+def report(db: DatabaseAccess, title: str) -> None:
+    'Prints the rows, the size and the read latencies of token_revocations'
+
+    table = db.read(TABLE_SIZE)[0]
+    print(f'{title}: {db.read(COUNT_ROWS)[0]["count"]:,} rows, {table["pages"]:,} pages, {table["bytes"] / 2**20:.1f} MiB')
+    for name, (mean, p99) in probe(db).items():
+        print(f'  {name:<18} mean {mean:>7.2f} us  p99 {p99:>7.2f} us')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=2000000)
+    parser.add_argument('--days', type=int, default=30)
+    parser.add_argument('--batch-size', type=int, default=5000)
+    arguments = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    database = DatabaseAccess()
+    database.create_tables()
+    seed(database, arguments.rows, arguments.days)
+    report(database, 'before purge')
+
+    purger = TokenPurger(interval=0, batch_size=arguments.batch_size, pause=0)
+    start = time.perf_counter()
+    deleted = purger.purge(database)
+    elapsed = time.perf_counter() - start
+    database.write('VACUUM')
+    print(
+        f'purged {deleted:,} rows in {elapsed:.2f} s ({deleted / elapsed:,.0f} rows/s, '
+        f'{purger.stats()["batches"]:,} batches of {arguments.batch_size:,})'
+    )
+    report(database, 'after purge')
+
+    DatabaseConnection.get_pool().close_all()
+    shutil.rmtree(DATABASE_DIR, ignore_errors=True)
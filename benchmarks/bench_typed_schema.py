@@ -0,0 +1,148 @@
+'''
+Benchmark: row size and leaderboard sort time with VARCHAR vs native column types.
+
+Creates the scores table twice, once with the old layout (score INTEGER, timestamp VARCHAR(20))
+and once with the typed layout (score DECIMAL(5, 2), timestamp DATETIME), with an index on
+(player_id, score) each. Both are filled with the same rows, then the table and index sizes and
+the leaderboard query time are reported for each.
+
+By default this runs on SQLite, which stores values by their affinity rather than the declared
+type, so it mostly shows the cost of the sort. The per row sizes MySQL needs for each layout
+are printed as well. Pass --mysql to measure both tables on the MySQL server configured
+through the MYSQL_* environment variables, with sizes taken from information_schema.
+
+Usage:
+    python benchmarks/bench_typed_schema.py [--players 5000] [--scores 40] [--repeat 10] [--mysql]
+'''
+
+import argparse
+import random
+import sqlite3
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'src'))
+
+LAYOUTS = {
+    'varchar': 'score INTEGER, timestamp VARCHAR(20)',
+    'typed': 'score DECIMAL(5, 2), timestamp DATETIME'
+}
+# Bytes MySQL (InnoDB) stores for the changed columns of a scores row
+MYSQL_COLUMN_BYTES = {
+    'varchar': {'score INTEGER': 4, 'timestamp VARCHAR(20), 19 chars': 20},
+    'typed': {'score DECIMAL(5, 2)': 3, 'timestamp DATETIME': 5}
+}
+LEADERBOARD = '''
+    SELECT player_id, MAX(score) AS score, MIN(timestamp) AS timestamp
+    FROM {table}
+    GROUP BY player_id
+    ORDER BY score DESC, timestamp ASC
+    LIMIT 10
+'''
+
+
+def generate_rows(players: int, scores: int) -> list:
+    'Returns score rows as (score_id, player_id, score, timestamp)'
+
+    start = datetime(2024, 1, 1)
+    return [
+        (
+            f'S{i:07d}',
+            f'P{i % players:05d}',
+            round(random.randint(0, 10) * 10 / 3, 2),
+            (start + timedelta(seconds=random.randint(0, 365 * 86400))).strftime('%Y-%m-%d %H:%M:%S')
+        )
+        for i in range(players * scores)
+    ]
+
+
+def time_query(cursor, query: str, repeat: int) -> float:
+    'Returns the mean milliseconds of a query'
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        cursor.execute(query)
+        cursor.fetchall()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def sqlite_benchmark(rows: list, repeat: int) -> None:
+    'Measures both layouts in an in-memory SQLite database'
+
+    connection = sqlite3.connect(':memory:')
+    cursor = connection.cursor()
+    for layout, columns in LAYOUTS.items():
+        table = f'scores_{layout}'
+        cursor.execute(f'CREATE TABLE {table} (score_id VARCHAR(10) PRIMARY KEY, player_id VARCHAR(10), {columns})')
+        cursor.execute(f'CREATE INDEX idx_{table} ON {table} (player_id, score)')
+        values = rows if layout == 'typed' else [(s, p, int(score), ts) for s, p, score, ts in rows]
+        cursor.executemany(f'INSERT INTO {table} VALUES (?, ?, ?, ?)', values)
+    connection.commit()
+
+    for layout in LAYOUTS:
+        table = f'scores_{layout}'
+        cursor.execute('SELECT name, SUM(pgsize) FROM dbstat WHERE name IN (?, ?) GROUP BY name', (table, f'idx_{table}'))
+        sizes = dict(cursor.fetchall())
+        elapsed = time_query(cursor, LEADERBOARD.format(table=table), repeat)
+        print(
+            f'{layout:<8} table {sizes[table] / len(rows):>6.1f} B/row  index {sizes[f"idx_{table}"] / len(rows):>6.1f} '
+            f'B/row  leaderboard {elapsed:>8.2f} ms'
+        )
+    connection.close()
+
+    print('MySQL bytes for the changed columns of a scores row:')
+    for layout, columns in MYSQL_COLUMN_BYTES.items():
+        print(f'{layout:<8} {sum(columns.values()):>3} B  ({", ".join(f"{c}: {b}" for c, b in columns.items())})')
+
+
+def mysql_benchmark(rows: list, repeat: int) -> None:
+    'Measures both layouts on the configured MySQL server'
+
+    from database.backends.mysql_backend import MySQLBackend  # pylint: disable=import-outside-toplevel
+
+    backend = MySQLBackend()
+    backend.bootstrap()
+    connection = backend.connect()
+    cursor = connection.cursor()
+    for layout, columns in LAYOUTS.items():
+        table = f'bench_scores_{layout}'
+        cursor.execute(f'DROP TABLE IF EXISTS {table}')
+        cursor.execute(f'CREATE TABLE {table} (score_id VARCHAR(10) PRIMARY KEY, player_id VARCHAR(10), {columns})')
+        cursor.execute(f'CREATE INDEX idx_{table} ON {table} (player_id, score)')
+        for start in range(0, len(rows), 5000):
+            cursor.executemany(f'INSERT INTO {table} VALUES (%s, %s, %s, %s)', rows[start:start + 5000])
+        connection.commit()
+        cursor.execute(f'ANALYZE TABLE {table}')
+        cursor.fetchall()
+
+    for layout in LAYOUTS:
+        table = f'bench_scores_{layout}'
+        cursor.execute(
+            'SELECT avg_row_length, data_length, index_length FROM information_schema.tables '
+            'WHERE table_schema = DATABASE() AND table_name = %s', (table, )
+        )
+        avg_row_length, data_length, index_length = cursor.fetchone()
+        elapsed = time_query(cursor, LEADERBOARD.format(table=table), repeat)
+        print(
+            f'{layout:<8} avg row {avg_row_length:>5} B  data {data_length / 2**20:>7.2f} MiB  '
+            f'index {index_length / 2**20:>7.2f} MiB  leaderboard {elapsed:>8.2f} ms'
+        )
+        cursor.execute(f'DROP TABLE {table}')
+    connection.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--players', type=int, default=5000)
+    parser.add_argument('--scores', type=int, default=40, help='scores per player')
+    parser.add_argument('--repeat', type=int, default=10)
+    parser.add_argument('--mysql', action='store_true', help='run against the configured MySQL server')
+    arguments = parser.parse_args()
+
+    score_rows = generate_rows(arguments.players, arguments.scores)
+    if arguments.mysql:
+        mysql_benchmark(score_rows, arguments.repeat)
+    else:
+        sqlite_benchmark(score_rows, arguments.repeat)
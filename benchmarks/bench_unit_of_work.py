@@ -0,0 +1,153 @@
+'''
+Benchmark: pool checkouts and commits per request with and without the unit of work.
+
+Runs the login, signup and question-create business paths against an in-memory stand-in
+connection that counts statements, and reports how many pooled connections each request
+checks out and how many commits it issues. The "without" run replaces
+DatabaseAccess.transaction with a no-op so every call checks out its own connection,
+which is how these paths behaved before.
+
+Usage:
+    python benchmarks/bench_unit_of_work.py [--requests 1000]
+'''
+
+import argparse
+import contextlib
+import os
+import sys
+import time
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'src'))
+# Connections and commits are counted, the key derivation cost would only slow the run down
+os.environ.update({'PASSWORD_KDF': 'pbkdf2_sha256', 'PASSWORD_KDF_COST': '1'})
+
+# pylint: disable=wrong-import-position
+from flask import Flask
+from flask_jwt_extended import JWTManager
+
+from business.auth_business import AuthBusiness
+from business.question_business import QuestionBusiness
+from config.queries import Queries
+from database.connection_pool import ConnectionPool
+from database.database_access import DatabaseAccess
+from database.database_connection import DatabaseConnection
+from database.statement_cache import StatementCache
+from utils.password_hasher import hash_password
+
+PASSWORD = 'Bench@123'
+STORED_PASSWORD = hash_password(PASSWORD)
+# The stand-in connection has no server side prepared statements
+StatementCache.MAX_SIZE = 0
+
+
+class StandInCursor:
+    '''Cursor returning canned rows for the queries used by the benchmarked paths'''
+
+    def __init__(self, connection) -> None:
+        self.connection = connection
+        self.rows = []
+        self.rowcount = 0
+
+    def execute(self, query, data=None) -> None:
+        'Records the statement and prepares its result'
+
+        self.connection.statements += 1
+        self.rowcount = 1
+        self.rows = []
+        if query == Queries.GET_CREDENTIALS_BY_USERNAME:
+            self.rows = [{
+                'user_id': 'P12345',
+                'password': STORED_PASSWORD,
+                'role': 'player',
+                'isPasswordChanged': 1
+            }]
+        elif query == Queries.GET_TOKEN_REVOCATION_VERSION:
+            self.rows = [{'version': 0}]
+        elif query == Queries.GET_USER_TOKEN_EPOCH:
+            self.rows = [{'epoch': 0}]
+
+    def executemany(self, query, rows) -> None:
+        'Records one batched statement'
+        self.execute(query)
+
+    def fetchall(self) -> list:
+        'Returns the canned rows'
+        return self.rows
+
+
+class StandInConnection:
+    '''Connection counting statements and commits'''
+
+    statements = 0
+    commits = 0
+
+    def cursor(self, **_kwargs) -> StandInCursor:
+        'Returns a new cursor'
+        return StandInCursor(StandInConnection)
+
+    def commit(self) -> None:
+        'Counts a commit'
+        StandInConnection.commits += 1
+
+    def rollback(self) -> None:
+        'Nothing to roll back'
+
+    def close(self) -> None:
+        'Nothing to close'
+
+
+def run(name: str, requests: int, call) -> None:
+    'Runs one path and prints checkouts, statements and commits per request'
+
+    pool = DatabaseConnection.pool = ConnectionPool(StandInConnection, size=3)
+    StandInConnection.statements = StandInConnection.commits = 0
+    start = time.perf_counter()
+    for i in range(requests):
+        call(i)
+    elapsed = time.perf_counter() - start
+
+    checkouts = pool.stats()['checkouts'] / requests
+    statements = StandInConnection.statements / requests
+    commits = StandInConnection.commits / requests
+    print(
+        f'{name:<40} checkouts/req={checkouts:.1f}  statements/req={statements:.1f}  '
+        f'commits/req={commits:.1f}  {requests / elapsed:,.0f} req/sec'
+    )
+
+
+def main(requests: int) -> None:
+    'Benchmarks every path with and without the unit of work'
+
+    app = Flask(__name__)
+    app.config['JWT_SECRET_KEY'] = 'benchmark-secret-key-of-32-bytes!'
+    JWTManager(app)
+
+    db = DatabaseAccess()
+    auth_business = AuthBusiness(db)
+    question_business = QuestionBusiness(db)
+    paths = {
+        'login': lambda i: auth_business.login({'username': 'player', 'password': PASSWORD}),
+        'signup': lambda i: auth_business.register({
+            'name': 'Bench Player', 'email': f'p{i}@bench.io', 'username': f'player{i}', 'password': PASSWORD
+        }),
+        'question create': lambda i: question_business.create_question('C12345', {
+            'question_text': f'Benchmark question number {i}?',
+            'question_type': 'mcq',
+            'answer': 'A',
+            'other_options': ['B', 'C', 'D']
+        }, 'A12345')
+    }
+
+    with app.app_context():
+        for path, call in paths.items():
+            with mock.patch.object(DatabaseAccess, 'transaction', lambda self: contextlib.nullcontext()):
+                run(f'{path} (connection per call)', requests, call)
+            run(f'{path} (unit of work)', requests, call)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=1000)
+    main(parser.parse_args().requests)
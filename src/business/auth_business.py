@@ -3,16 +3,15 @@
 import logging
 from typing import Dict, Tuple
 
-import mysql.connector
-
 from config.queries import Queries
 from config.string_constants import ErrorMessage, LogMessage, StatusCodes, PasswordTypes
 from database.database_access import DatabaseAccess
+from database.database_connection import IntegrityError
+from helpers.password_pool import password_pool
 from helpers.token_helper import TokenHelper
 from helpers.user_helper import UserHelper
 from models.users.player import Player
-from utils.custom_error import DuplicateEntryError, InvalidCredentialsError
-from utils.password_hasher import hash_password
+from utils.custom_error import DuplicateEntryError, InvalidCredentialsError, ServiceUnavailableError
 from utils.rbac import ROLE_MAPPING
 
 logger = logging.getLogger(__name__)
@@ -27,20 +26,30 @@ class AuthBusiness:
         self.token_helper = TokenHelper(self.db)
 
     def login(self, login_data: Dict) -> Dict:
-        '''Method for user login'''
+        '''
+        Method for user login.
+
+        A login reads the credentials and role of the user in one statement on one pooled
+        connection, and verifies the password on the password pool without holding the
+        connection. The tokens issued revoke the previous session of the user.
+        '''
 
         logger.info(LogMessage.LOGIN_INITIATED)
 
         username, password = login_data['username'], login_data['password']
-        hashed_password = hash_password(password)
-        user_data = self.db.read(Queries.GET_CREDENTIALS_BY_USERNAME, (username, ))
-
-        user_id, role, is_password_changed = self.__verify_credentials(user_data, password, hashed_password)
-        mapped_role = ROLE_MAPPING.get(role)
-        password_type = PasswordTypes.PERMANENT if is_password_changed else PasswordTypes.DEFAULT
-
-        token_data = self.token_helper.generate_token_data(
-            identity=user_id,
+        # From the primary, a lagging replica could miss a password change or a revocation
+        user_data = self.db.read(Queries.GET_CREDENTIALS_BY_USERNAME, (username, ), use_primary=True)
+        credentials, new_hash = self.__verify_credentials(user_data, password)
+        mapped_role = ROLE_MAPPING.get(credentials['role'])
+        password_type = PasswordTypes.PERMANENT if credentials['isPasswordChanged'] else PasswordTypes.DEFAULT
+
+        if new_hash:
+            # Only replaces the hash verified, a password changed meanwhile is kept
+            logger.info(LogMessage.REHASH_PASSWORD, credentials['user_id'])
+            self.db.write(Queries.REHASH_USER_PASSWORD, (new_hash, credentials['user_id'], credentials['password']))
+
+        token_data = self.token_helper.rotate_token_data(
+            identity=credentials['user_id'],
             mapped_role=mapped_role,
             is_fresh=True
         )
@@ -49,28 +58,37 @@ class AuthBusiness:
         logger.info(LogMessage.TOKEN_CREATED)
         return token_data
 
-    def __verify_credentials(self, user_data, password, hashed_password) -> Tuple:
-        '''Match the password'''
+    def __verify_credentials(self, user_data, password) -> Tuple:
+        '''Match the password, and hash it again if it is stored in a legacy form'''
 
         if not user_data:
             raise InvalidCredentialsError(status=StatusCodes.UNAUTHORIZED, message=ErrorMessage.INVALID_CREDENTIALS)
-        user_id, user_password, role, is_password_changed = user_data[0].values()
+        credentials = user_data[0]
 
-        if user_password not in (password, hashed_password):
+        verification = password_pool.verify(password, credentials['password'])
+        if not verification.valid:
             raise InvalidCredentialsError(status=StatusCodes.UNAUTHORIZED, message=ErrorMessage.INVALID_CREDENTIALS)
 
-        return user_id, role, is_password_changed
+        new_hash = None
+        if verification.needs_rehash:
+            # The login goes ahead without the rehash when the pool is full
+            try:
+                new_hash = password_pool.hash(password)
+            except ServiceUnavailableError:
+                logger.warning(LogMessage.REHASH_PASSWORD_SKIPPED, credentials['user_id'])
+
+        return credentials, new_hash
 
     def register(self, player_data: Dict) -> None:
         '''Method for signup, only for player'''
 
         logger.info(LogMessage.SIGNUP_INITIATED)
 
-        player_data['password'] = hash_password(player_data['password'])
+        player_data['password'] = password_pool.hash(player_data['password'])
         player = Player.get_instance(player_data)
         try:
             self.user_helper.save_user(player)
-        except mysql.connector.IntegrityError as e:
+        except IntegrityError as e:
             logger.exception(e)
             raise DuplicateEntryError(status=StatusCodes.CONFLICT, message=ErrorMessage.USER_EXISTS) from e
 
@@ -84,11 +102,11 @@ class AuthBusiness:
         logger.info(LogMessage.LOGOUT_SUCCESS)
 
     def refresh(self, user_id: str, mapped_role: str) -> Dict:
-        '''Method to get a non fresh access token'''
+        '''Method to get a non fresh access token, the refresh token used is revoked'''
 
         logger.info(LogMessage.REFRESH_INITIATED)
 
-        token_data = self.token_helper.generate_token_data(
+        token_data = self.token_helper.rotate_token_data(
             identity=user_id,
             mapped_role=mapped_role,
             is_fresh=False
@@ -1,9 +1,7 @@
 '''Business logic for Operations related to Category'''
 
 import logging
-from typing import Dict, List
-
-import mysql.connector
+from typing import Dict, List, Optional, Tuple
 
 from config.queries import Queries
 from config.string_constants import (
@@ -13,8 +11,12 @@ from config.string_constants import (
     StatusCodes
 )
 from database.database_access import DatabaseAccess
+from database.database_connection import IntegrityError
+from helpers.answer_key import answer_key
+from helpers.question_index import question_index
 from models.quiz.category import Category
 from utils.custom_error import DataNotFoundError, DuplicateEntryError
+from utils.pagination import DEFAULT_PAGE_SIZE, decode_cursor, paginate
 
 logger = logging.getLogger(__name__)
 
@@ -25,15 +27,23 @@ class CategoryBusiness:
     def __init__(self, database: DatabaseAccess) -> None:
         self.db = database
 
-    def get_all_categories(self) -> List[Dict]:
-        '''Return all Quiz Categories'''
+    def get_all_categories(
+        self,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: str = None
+    ) -> Tuple[List[Dict], Optional[str]]:
+        '''Return a page of Quiz Categories by name with the cursor of the next page'''
 
         logger.info(LogMessage.GET_ALL_CATEGORIES)
 
-        data = self.db.read(Queries.GET_ALL_CATEGORIES)
-        if not data:
+        if cursor is None:
+            rows = self.db.read(Queries.GET_CATEGORIES_PAGE, (limit + 1, ))
+        else:
+            category_name, = decode_cursor(cursor, 1)
+            rows = self.db.read(Queries.GET_CATEGORIES_PAGE_AFTER, (category_name, limit + 1))
+        if not rows and cursor is None:
             raise DataNotFoundError(status=StatusCodes.NOT_FOUND, message=ErrorMessage.NO_CATEGORY)
-        return data
+        return paginate(rows, limit, ('category_name', ))
 
     def create_category(self, category_data: Dict) -> None:
         '''Add a Quiz Category'''
@@ -43,7 +53,7 @@ class CategoryBusiness:
         category = Category.get_instance(category_data)
         try:
             self.__save_category(category)
-        except mysql.connector.IntegrityError as e:
+        except IntegrityError as e:
             logger.exception(e)
             raise DuplicateEntryError(status=StatusCodes.CONFLICT, message=ErrorMessage.CATEGORY_EXISTS) from e
 
@@ -66,7 +76,7 @@ class CategoryBusiness:
 
         try:
             row_affected = self.db.write(Queries.UPDATE_CATEGORY_BY_ID, (new_category_name, category_id))
-        except mysql.connector.IntegrityError as e:
+        except IntegrityError as e:
             logger.exception(e)
             raise DuplicateEntryError(status=StatusCodes.CONFLICT, message=ErrorMessage.CATEGORY_EXISTS) from e
         if not row_affected:
@@ -79,8 +89,14 @@ class CategoryBusiness:
 
         logger.warning(LogMessage.DELETE_CATEGORY, category_id)
 
-        row_affected = self.db.write(Queries.DELETE_CATEGORY_BY_ID, (category_id, ))
-        if not row_affected:
-            raise DataNotFoundError(status=StatusCodes.NOT_FOUND, message=ErrorMessage.CATEGORY_NOT_FOUND)
+        with self.db.transaction():
+            row_affected = self.db.write(Queries.DELETE_CATEGORY_BY_ID, (category_id, ))
+            if not row_affected:
+                raise DataNotFoundError(status=StatusCodes.NOT_FOUND, message=ErrorMessage.CATEGORY_NOT_FOUND)
+            # Its leaderboard goes with it, the scores keep their category_id
+            self.db.write(Queries.DELETE_CATEGORY_LEADERBOARD_BUCKETS, (category_id, ))
 
+        # Deleting a category cascades to its questions
+        question_index.remove_category(category_id)
+        answer_key.invalidate_category(category_id)
         logger.info(LogMessage.DELETE_CATEGORY_SUCCESS, category_id)
@@ -0,0 +1,40 @@
+'''Business logic for Operations related to Metrics'''
+
+import logging
+from typing import Dict
+
+from config.string_constants import LogMessage
+from database.database_access import DatabaseAccess
+from helpers.answer_key import answer_key
+from helpers.password_pool import password_pool
+from helpers.score_writer import score_writer
+from helpers.token_cache import token_cache
+from helpers.token_purger import token_purger
+
+logger = logging.getLogger(__name__)
+
+
+class MetricsBusiness:
+    '''MetricsBusiness class for runtime performance metrics'''
+
+    def __init__(self, database: DatabaseAccess) -> None:
+        self.db = database
+
+    def get_database_metrics(self) -> Dict:
+        '''
+        Return per query latency statistics, the slow query log, connection pool usage, the
+        hit rates of the statement, answer key and token caches, the score queue depth, the
+        expired token revocations purged and the password hashing pool admissions
+        '''
+
+        logger.info(LogMessage.GET_DATABASE_METRICS)
+
+        metrics = self.db.query_stats()
+        metrics['pool'] = self.db.pool_stats()
+        metrics['statement_cache'] = self.db.statement_cache_stats()
+        metrics['answer_key_cache'] = answer_key.stats()
+        metrics['score_queue'] = score_writer.stats()
+        metrics['token_cache'] = token_cache.stats()
+        metrics['token_purge'] = token_purger.stats()
+        metrics['password_pool'] = password_pool.stats()
+        return metrics
@@ -1,9 +1,7 @@
 '''Business logic for Operations related to Question'''
 
 import logging
-from typing import Dict, List
-
-import mysql.connector
+from typing import Dict, Iterable, List
 
 from config.queries import Queries
 from config.string_constants import (
@@ -14,6 +12,9 @@ from config.string_constants import (
     StatusCodes
 )
 from database.database_access import DatabaseAccess
+from database.database_connection import IntegrityError
+from helpers.answer_key import answer_key
+from helpers.question_index import question_index
 from models.quiz.option import Option
 from models.quiz.question import Question
 from utils.custom_error import DataNotFoundError, DuplicateEntryError
@@ -40,15 +41,19 @@ class QuestionBusiness:
             params = (category_id, )
 
         query += ' ORDER BY c.category_id, q.question_id, o.option_id'
-        data = self.db.read(query, params)
-        if not data:
+        data = self.db.iter_read(query, params)
+        quiz_data = self.__format_quiz_data(data)
+        if not quiz_data:
             raise DataNotFoundError(status=StatusCodes.NOT_FOUND, message=ErrorMessage.QUIZ_NOT_FOUND)
 
-        quiz_data = self.__format_quiz_data(data)
         return quiz_data
 
-    def __format_quiz_data(self, data):
-        '''Organize the data into the desired format'''
+    def __format_quiz_data(self, data: Iterable[Dict]) -> List[Dict]:
+        '''
+        Organize the data into the desired format
+
+        Consumes the rows one at a time, so the rows can be streamed from the database.
+        '''
 
         quiz_data = []
         current_category = None
@@ -125,10 +130,17 @@ class QuestionBusiness:
             question.add_option(option)
         try:
             self.__save_question(question)
-        except mysql.connector.IntegrityError as e:
+        except IntegrityError as e:
             logger.exception(e)
             raise DuplicateEntryError(status=StatusCodes.CONFLICT, message=ErrorMessage.QUESTION_EXISTS) from e
 
+        question_index.add(
+            question.entity_id,
+            question.category_id,
+            question.text,
+            question.question_type,
+            [option.text for option in question.options]
+        )
         logger.info(LogMessage.CREATE_SUCCESS, Headers.QUES)
 
     def __save_question(self, entity: Question) -> None:
@@ -144,34 +156,25 @@ class QuestionBusiness:
         if not entity.options:
             raise DataNotFoundError(status=StatusCodes.NOT_FOUND, message=ErrorMessage.NO_OPTIONS)
 
-        self.db.write(Queries.INSERT_QUESTION, question_data)
-        for option in entity.options:
-            self.__save_option(option)
-
-    def __save_option(self, entity: Option) -> None:
-        '''Adds the option to the database.'''
-
-        option_data = (
-            entity.entity_id,
-            entity.question_id,
-            entity.text,
-            entity.is_correct
-        )
-        self.db.write(Queries.INSERT_OPTION, option_data)
+        option_data = [
+            (option.entity_id, option.question_id, option.text, option.is_correct)
+            for option in entity.options
+        ]
+        with self.db.transaction():
+            self.db.write(Queries.INSERT_QUESTION, question_data)
+            self.db.write_many(Queries.INSERT_OPTION, option_data)
 
     def post_quiz_data(self, quiz_data: Dict, admin_id: str) -> None:
         '''Posts quiz data to the database'''
 
         logger.info(LogMessage.POST_QUIZ_DATA)
 
-        # Organize the data into the desired format
+        # Organize the data into rows for batched inserts
+        category_rows, question_rows, option_rows = [], [], {}
         for category_data in quiz_data['quiz_data']:
             category_id = generate_id(entity='category')
             category_name = category_data['category']
-            try:
-                self.db.write(Queries.INSERT_CATEGORY, (category_id, admin_id, category_name))
-            except mysql.connector.IntegrityError as e:
-                logger.info(e)
+            category_rows.append((category_id, admin_id, category_name))
 
             for question_data in category_data['question_data']:
                 question_id = generate_id(entity='question')
@@ -179,21 +182,32 @@ class QuestionBusiness:
                 question_type = question_data['question_type']
                 answer_id = generate_id(entity='option')
                 answer_text = question_data['options']['answer']
-                try:
-                    self.db.write(
-                        Queries.INSERT_QUESTION,
-                        (question_id, category_id, admin_id, question_text, question_type)
-                    )
-                    self.db.write(Queries.INSERT_OPTION, (answer_id, question_id, answer_text, 1))
-
-                    if question_type.lower() == QuestionTypes.MCQ:
-                        for i in range(3):
-                            other_option_id = generate_id(entity='option')
-                            other_option = question_data['options']['other_options'][i]
-
-                            self.db.write(Queries.INSERT_OPTION, (other_option_id, question_id, other_option, 0))
-                except mysql.connector.IntegrityError as e:
-                    logger.info(e)
+                question_rows.append((question_id, category_id, admin_id, question_text, question_type))
+                option_rows[question_id] = [(answer_id, question_id, answer_text, 1)]
+
+                if question_type.lower() == QuestionTypes.MCQ:
+                    for i in range(3):
+                        other_option_id = generate_id(entity='option')
+                        other_option = question_data['options']['other_options'][i]
+                        option_rows[question_id].append((other_option_id, question_id, other_option, 0))
+
+        # Rows referencing a category or question that could not be inserted are skipped
+        with self.db.transaction():
+            outcomes = self.db.write_many(Queries.INSERT_CATEGORY, category_rows, skip_failed_rows=True)
+            saved_categories = {row[0] for row, saved in zip(category_rows, outcomes) if saved}
+            question_rows = [row for row in question_rows if row[1] in saved_categories]
+
+            outcomes = self.db.write_many(Queries.INSERT_QUESTION, question_rows, skip_failed_rows=True)
+            saved_questions = [row for row, saved in zip(question_rows, outcomes) if saved]
+            saved_options = [option for row in saved_questions for option in option_rows[row[0]]]
+            outcomes = self.db.write_many(Queries.INSERT_OPTION, saved_options, skip_failed_rows=True)
+
+        options = {}
+        for option, saved in zip(saved_options, outcomes):
+            if saved:
+                options.setdefault(option[1], []).append(option[2])
+        for question_id, category_id, _, question_text, question_type in saved_questions:
+            question_index.add(question_id, category_id, question_text, question_type, options.get(question_id, []))
 
     def update_question(self, question_id: str, new_ques_text: str) -> None:
         '''Update question text by question id'''
@@ -202,12 +216,14 @@ class QuestionBusiness:
 
         try:
             row_affected = self.db.write(Queries.UPDATE_QUESTION_TEXT_BY_ID, (new_ques_text, question_id))
-        except mysql.connector.IntegrityError as e:
+        except IntegrityError as e:
             logger.exception(e)
             raise DuplicateEntryError(status=StatusCodes.CONFLICT, message=ErrorMessage.QUESTION_EXISTS) from e
         if not row_affected:
             raise DataNotFoundError(status=StatusCodes.NOT_FOUND, message=ErrorMessage.QUESTION_NOT_FOUND)
 
+        question_index.update_text(question_id, new_ques_text)
+        answer_key.invalidate(question_id)
         logger.info(LogMessage.UPDATE_SUCCESS, Headers.QUES)
 
     def delete_question(self, question_id: str) -> None:
@@ -219,4 +235,6 @@ class QuestionBusiness:
         if not row_affected:
             raise DataNotFoundError(status=StatusCodes.NOT_FOUND, message=ErrorMessage.QUESTION_NOT_FOUND)
 
+        question_index.remove(question_id)
+        answer_key.invalidate(question_id)
         logger.info(LogMessage.DELETE_SUCCESS, Headers.QUES)
@@ -1,14 +1,21 @@
 '''Business logic for Operations related to Quiz'''
 
 import logging
-from datetime import datetime, timezone
-from typing import Dict, List
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
 
 from config.queries import Queries
-from config.string_constants import ErrorMessage, LogMessage, StatusCodes, QuestionTypes
+from config.string_constants import ErrorMessage, LeaderboardWindows, LogMessage, Roles, StatusCodes
 from database.database_access import DatabaseAccess
-from utils.custom_error import DataNotFoundError
+from helpers.answer_key import answer_key
+from helpers.leaderboard import leaderboard
+from helpers.question_index import question_index
+from helpers.quiz_ticket import IssuedQuiz, quiz_tickets
+from helpers.score_writer import ALL_CATEGORIES, ALL_TIME_BUCKET, score_writer
+from utils.custom_error import DataNotFoundError, InvalidInputError
 from utils.id_generator import generate_id
+from utils.pagination import DEFAULT_PAGE_SIZE, decode_cursor, paginate
 
 logger = logging.getLogger(__name__)
 
@@ -19,108 +26,300 @@ class QuizBusiness:
     def __init__(self, database: DatabaseAccess) -> None:
         self.db = database
 
-    def get_leaderboard(self) -> List[Dict]:
-        '''Return top 10 scores for leaderboard'''
+    def get_leaderboard(
+        self,
+        limit: int = 10,
+        window: str = LeaderboardWindows.ALL,
+        category_id: str = None
+    ) -> List[Dict]:
+        '''
+        Return the top `limit` players of the leaderboard with their rank
+        Filters: window (day, week or all, in UTC days), category_id
+        '''
 
         logger.info(LogMessage.GET_LEADERBOARD)
 
-        data = self.db.read(Queries.GET_LEADERBOARD)
+        if window == LeaderboardWindows.ALL and category_id is None:
+            data = leaderboard.top(self.db, limit)
+        else:
+            first_bucket, last_bucket = self.__bucket_range(window)
+            rows = self.db.read(
+                Queries.GET_BUCKET_LEADERBOARD, (first_bucket, last_bucket, category_id or ALL_CATEGORIES, limit)
+            )
+            data = [{'rank': rank, **row} for rank, row in enumerate(rows, 1)]
         if not data:
             raise DataNotFoundError(status=StatusCodes.NOT_FOUND, message=ErrorMessage.LEADERBOARD_NOT_FOUND)
         return data
 
-    def get_player_scores(self, player_id: str) -> List[Dict]:
-        '''Return user's scores'''
+    def get_player_rank(self, player_id: str, neighbors: int = 2) -> Dict:
+        '''Return the leaderboard rank of a player with the players ranked around them'''
+
+        logger.info(LogMessage.GET_PLAYER_RANK, player_id)
+
+        data = leaderboard.around(self.db, player_id, neighbors)
+        if data is None:
+            raise DataNotFoundError(status=StatusCodes.NOT_FOUND, message=ErrorMessage.RANK_NOT_FOUND)
+        return data
+
+    def get_player_scores(
+        self,
+        player_id: str,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: str = None
+    ) -> Tuple[List[Dict], Optional[str]]:
+        '''Return a page of user's scores, newest first, with the cursor of the next page'''
 
         logger.info(LogMessage.GET_SCORES, player_id)
 
-        data = self.db.read(Queries.GET_PLAYER_SCORES_BY_ID, (player_id, ))
+        if cursor is None:
+            rows = self.db.read(Queries.GET_PLAYER_SCORES_PAGE, (player_id, limit + 1))
+        else:
+            timestamp, score_id = decode_cursor(cursor, 2)
+            rows = self.db.read(
+                Queries.GET_PLAYER_SCORES_PAGE_AFTER,
+                (player_id, timestamp, timestamp, timestamp, score_id, limit + 1)
+            )
+        if not rows and cursor is None:
+            raise DataNotFoundError(status=StatusCodes.NOT_FOUND, message=ErrorMessage.SCORES_NOT_FOUND)
+        return paginate(rows, limit, ('timestamp', 'score_id'))
+
+    def get_player_summary(self, player_id: str) -> Dict:
+        '''Return user's attempt count, average score, best score and last played time'''
+
+        logger.info(LogMessage.GET_PLAYER_SUMMARY, player_id)
+
+        data = self.db.read(Queries.GET_PLAYER_STATS, (player_id, ))
         if not data:
             raise DataNotFoundError(status=StatusCodes.NOT_FOUND, message=ErrorMessage.SCORES_NOT_FOUND)
-        return data
+        return data[0]
 
-    def get_random_questions(self, category_id: str = None, question_type: str = None, limit: int = 10) -> List[Dict]:
+    def get_random_questions(
+        self,
+        player_id: str,
+        category_id: str = None,
+        question_type: str = None,
+        limit: int = 10
+    ) -> Tuple[List[Dict], str]:
         '''
-        Return random questions for quiz
+        Return random questions for quiz with the quiz ticket to submit the answers with
         Filters: category_id, question_type, limit
         '''
 
         logger.info(LogMessage.GET_QUES_FOR_QUIZ)
 
-        question_data = self.db.read(
-            Queries.GET_RANDOM_QUESTIONS_BY_CATEGORY, (category_id, category_id, question_type, question_type, limit)
-        )
-        if len(question_data) < limit:
+        questions = question_index.sample(self.db, category_id, question_type, limit)
+        if len(questions) < limit:
             raise DataNotFoundError(status=StatusCodes.NOT_FOUND, message=ErrorMessage.QUESTIONS_NOT_FOUND)
 
-        # Organize the data into the desired format
-        result = [
-            {
-                'question_id': question['question_id'],
-                'question_text': question['question_text'],
-                'question_type': question['question_type'],
-                'options': question['options'].split(',') if question['question_type'].lower() == QuestionTypes.MCQ else []
-            }
-            for question in question_data
-        ]
-        return result
+        question_ids = [question['question_id'] for question in questions]
+        answer_keys = self.__answer_keys(question_ids)
+        ticket = quiz_tickets.issue(
+            player_id,
+            [(question_id, answer_keys[question_id]['correct_answer']) for question_id in question_ids],
+            *self.__attempt_category(answer_keys, question_ids)
+        )
+        return questions, ticket
 
-    def evaluate_player_answers(self, player_id: str, player_answers: List[Dict]) -> Dict:
-        'Evaluate player answers and return score with correct answers'
+    def evaluate_player_answers(self, player_id: str, player_answers: List[Dict], ticket: str = None) -> Dict:
+        '''
+        Evaluate player answers and return score with correct answers
+        The answers are graded from the ticket of the quiz without reading the answer key, the
+        responses then tell whether each answer is correct but not the answer. Answers without a
+        ticket are graded from the answer key only if QUIZ_ALLOW_UNTICKETED_ANSWERS is set
+        '''
 
         logger.info(LogMessage.EVALUATE_RESPONSE, player_id)
 
-        question_ids = tuple(response['question_id'] for response in player_answers)
-        no_of_questions = len(question_ids)
-        formatted_query = Queries.GET_QUESTION_DATA_BY_QUESTION_ID % (', '.join(['%s'] * no_of_questions))
-        question_data = self.db.read(formatted_query, question_ids)
+        question_ids = self.__question_ids(player_answers)
+        if ticket is None:
+            if not quiz_tickets.allow_unticketed:
+                raise InvalidInputError(status=StatusCodes.UNPROCESSABLE_ENTITY, message=ErrorMessage.TICKET_REQUIRED)
+            answer_keys = self.__answer_keys(question_ids)
+            result = self.__grade(answer_keys, player_answers)
+            self.__save_quiz_scores([(player_id, result['score'], *self.__attempt_category(answer_keys, question_ids))])
+            return result
 
-        question_data = sorted(question_data, key=lambda x: x['question_id'])
-        player_answers = sorted(player_answers, key=lambda x: x['question_id'])
+        # The ticket stays unredeemed if the score cannot be saved
+        with self.db.transaction():
+            quiz = quiz_tickets.redeem(self.db, ticket, player_id, question_ids)
+            result = self.__grade_ticket(quiz, player_answers)
+            self.__save_quiz_scores([(player_id, result['score'], quiz.category_id, quiz.question_type)])
+        return result
 
-        result = self.__format_result(question_data, player_answers)
-        normalized_score = self.__normalize_score(result['score'], no_of_questions)
-        result['score'] = normalized_score
+    def evaluate_answer_sheets(self, answer_sheets: List[Dict]) -> List[Dict]:
+        '''
+        Evaluate the answer sheets of many players, e.g. of a proctored session, and return the
+        score with correct answers of each sheet
 
-        self.__save_quiz_score(player_id, normalized_score)
-        return result
+        The answer key of all the sheets is fetched once and the scores are saved together in
+        one transaction. Nothing is saved if a sheet answers an unknown question, answers a
+        question twice or belongs to an unknown player.
+        '''
+
+        logger.info(LogMessage.EVALUATE_ANSWER_SHEETS, len(answer_sheets))
+
+        sheet_question_ids = [self.__question_ids(sheet['answers']) for sheet in answer_sheets]
+        answer_keys = self.__answer_keys({
+            question_id: None for question_ids in sheet_question_ids for question_id in question_ids
+        })
+        self.__check_players({sheet['player_id']: None for sheet in answer_sheets})
+
+        results, scores = [], []
+        for sheet, question_ids in zip(answer_sheets, sheet_question_ids):
+            result = self.__grade(answer_keys, sheet['answers'])
+            results.append({'player_id': sheet['player_id'], **result})
+            scores.append((sheet['player_id'], result['score'], *self.__attempt_category(answer_keys, question_ids)))
+
+        self.__save_quiz_scores(scores)
+        return results
+
+    def __question_ids(self, player_answers: List[Dict]) -> List[str]:
+        'Return the question ids of an answer sheet, rejecting empty sheets and questions answered twice'
+
+        if not player_answers:
+            raise InvalidInputError(status=StatusCodes.UNPROCESSABLE_ENTITY, message=ErrorMessage.NO_ANSWERS)
+
+        question_ids = [response['question_id'] for response in player_answers]
+        duplicates = [question_id for question_id, count in Counter(question_ids).items() if count > 1]
+        if duplicates:
+            raise InvalidInputError(
+                status=StatusCodes.UNPROCESSABLE_ENTITY,
+                message=ErrorMessage.DUPLICATE_ANSWERS.format(question_ids=', '.join(duplicates))
+            )
+        return question_ids
+
+    def __answer_keys(self, question_ids: Iterable[str]) -> Dict[str, Dict]:
+        'Return the answer key of questions by question id, rejecting unknown questions'
+
+        answer_keys = answer_key.lookup(self.db, question_ids)
+        unknown = [question_id for question_id in question_ids if question_id not in answer_keys]
+        if unknown:
+            raise DataNotFoundError(
+                status=StatusCodes.NOT_FOUND,
+                message=ErrorMessage.UNKNOWN_QUESTIONS.format(question_ids=', '.join(unknown))
+            )
+        return answer_keys
+
+    def __check_players(self, player_ids: Iterable[str]) -> None:
+        'Reject answer sheets of users that do not exist or are not players'
+
+        player_ids = tuple(player_ids)
+        query = Queries.GET_USER_ROLES_BY_USER_IDS % ', '.join(['%s'] * len(player_ids))
+        players = {row['user_id'] for row in self.db.read(query, player_ids) if row['role'] == Roles.PLAYER}
+        unknown = [player_id for player_id in player_ids if player_id not in players]
+        if unknown:
+            raise DataNotFoundError(
+                status=StatusCodes.NOT_FOUND,
+                message=ErrorMessage.UNKNOWN_PLAYERS.format(player_ids=', '.join(unknown))
+            )
 
-    def __format_result(self, question_data, player_answers):
-        'Organize the result into the desired format'
+    def __attempt_category(self, answer_keys: Dict[str, Dict], question_ids: List[str]) -> Tuple[str, str]:
+        'Return the category and question type shared by all the questions of an attempt, None if they differ'
+
+        question_data = [answer_keys[question_id] for question_id in question_ids]
+        return self.__common_value(question_data, 'category_id'), self.__common_value(question_data, 'question_type')
+
+    def __common_value(self, question_data: List[Dict], column: str) -> Optional[str]:
+        'Return the value of a column shared by all the questions of an attempt, None if they differ'
+
+        values = {question[column] for question in question_data}
+        return values.pop() if len(values) == 1 else None
+
+    def __bucket_range(self, window: str) -> Tuple[str, str]:
+        'Return the first and last leaderboard bucket of a window, buckets are UTC days and `all`'
+
+        if window == LeaderboardWindows.ALL:
+            return ALL_TIME_BUCKET, ALL_TIME_BUCKET
+
+        today = datetime.now(timezone.utc).date()
+        days = 7 if window == LeaderboardWindows.WEEK else 1
+        return (today - timedelta(days=days - 1)).isoformat(), today.isoformat()
+
+    def __grade(self, answer_keys: Dict[str, Dict], player_answers: List[Dict]) -> Dict:
+        'Grade an answer sheet against the answer key, responses keep the order of the answers'
 
         result = {
             'score': 0,
             'responses': []
         }
-        for question_data, player_answers in zip(question_data, player_answers):
+        for player_answer in player_answers:
+            question_data = answer_keys[player_answer['question_id']]
             correct_answer = question_data['correct_answer']
-            is_correct = player_answers['user_answer'].lower() == correct_answer.lower()
+            is_correct = player_answer['user_answer'].lower() == correct_answer.lower()
             result['responses'].append({
                 'question_id': question_data['question_id'],
                 'question_text': question_data['question_text'],
-                'user_answer': player_answers['user_answer'],
+                'user_answer': player_answer['user_answer'],
                 'correct_answer': correct_answer,
                 'is_correct': is_correct
             })
             if is_correct:
                 result['score'] += 1
 
+        result['score'] = self.__normalize_score(result['score'], len(player_answers))
+        return result
+
+    def __grade_ticket(self, quiz: IssuedQuiz, player_answers: List[Dict]) -> Dict:
+        'Grade an answer sheet against the answer digests of a ticket, unanswered questions count as wrong'
+
+        result = {
+            'score': 0,
+            'responses': []
+        }
+        for player_answer in player_answers:
+            is_correct = quiz_tickets.is_correct(quiz, player_answer['question_id'], player_answer['user_answer'])
+            result['responses'].append({
+                'question_id': player_answer['question_id'],
+                'user_answer': player_answer['user_answer'],
+                'is_correct': is_correct
+            })
+            if is_correct:
+                result['score'] += 1
+
+        result['score'] = self.__normalize_score(result['score'], len(quiz.digests))
         return result
 
-    def __normalize_score(self, score: int, no_of_questions):
-        'Normalize the score obtained on a scale of [0, 100]'
+    def __normalize_score(self, score: int, no_of_questions) -> float:
+        'Normalize the score obtained on a scale of [0, 100], rounded to the DECIMAL(5, 2) column'
 
-        normalized_score = (score/no_of_questions) * 100
+        normalized_score = round((score/no_of_questions) * 100, 2)
         return normalized_score
 
-    def __save_quiz_score(self, player_id: str, score: int) -> None:
-        '''Save Player's Quiz Score'''
+    def __save_quiz_scores(self, scores: List[Tuple[str, float, str, str]]) -> None:
+        '''
+        Save quiz scores given as (player_id, score, category_id, question_type) with their best
+        scores and leaderboard buckets, in the request or write-behind, see ScoreWriter
+        '''
 
-        logger.info(LogMessage.SAVE_QUIZ_SCORE, player_id)
+        logger.info(LogMessage.SAVE_QUIZ_SCORES, len(scores))
 
-        score_id = generate_id(entity='score')
         time = datetime.now(timezone.utc) # current utc time
-        timestamp = time.strftime('%Y-%m-%d %H:%M:%S') # yyyy-mm-dd
+        timestamp = time.strftime('%Y-%m-%d %H:%M:%S') # DATETIME literal, yyyy-mm-dd hh:mm:ss
+
+        score_writer.save(self.db, [
+            (generate_id(entity='score'), player_id, score, timestamp, category_id, question_type)
+            for player_id, score, category_id, question_type in scores
+        ])
+
+        # Ranked once the scores are committed, when saved in the caller's transaction
+        self.db.after_commit(lambda: self.__rank(scores, time.replace(tzinfo=None, microsecond=0)))
+        logger.info(LogMessage.SAVE_QUIZ_SCORES_SUCCESS, len(scores))
+
+    def __rank(self, scores: List[Tuple[str, float, str, str]], timestamp: datetime) -> None:
+        'Record saved scores in the in-memory leaderboard'
+
+        for player_id, score, _, _ in scores:
+            leaderboard.record(self.db, player_id, score, timestamp)
+
+    def backfill_best_scores(self) -> None:
+        '''
+        Rebuild the per player best scores and leaderboard buckets read by the leaderboard, and the
+        player stats read by the score summary, from all saved scores
+        '''
+
+        logger.info(LogMessage.BACKFILL_BEST_SCORES)
 
-        self.db.write(Queries.INSERT_PLAYER_QUIZ_SCORE, (score_id, player_id, score, timestamp))
-        logger.info(LogMessage.SAVE_QUIZ_SCORE_SUCCESS, player_id)
+        self.db.write(Queries.BACKFILL_PLAYER_BEST_SCORES)
+        self.db.write(Queries.BACKFILL_PLAYER_STATS)
+        self.db.write(Queries.BACKFILL_LEADERBOARD_BUCKETS)
+        logger.info(LogMessage.BACKFILL_BEST_SCORES_SUCCESS)
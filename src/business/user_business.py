@@ -1,9 +1,7 @@
 '''Business logic for Operations related to Users: SuperAdmin, Admin, Player'''
 
 import logging
-from typing import Dict, List
-
-import mysql.connector
+from typing import Dict, List, Optional, Tuple
 
 from config.queries import Queries
 from config.string_constants import (
@@ -13,6 +11,10 @@ from config.string_constants import (
     Roles,
     StatusCodes
 )
+from database.database_connection import IntegrityError
+from helpers.leaderboard import leaderboard
+from helpers.password_pool import password_pool
+from helpers.token_helper import TokenHelper
 from helpers.user_helper import UserHelper
 from models.users.admin import Admin
 from utils.custom_error import (
@@ -20,8 +22,8 @@ from utils.custom_error import (
     DuplicateEntryError,
     InvalidCredentialsError
 )
+from utils.pagination import DEFAULT_PAGE_SIZE, decode_cursor, paginate
 from utils.password_generator import generate_password
-from utils.password_hasher import hash_password
 
 logger = logging.getLogger(__name__)
 
@@ -32,16 +34,34 @@ class UserBusiness:
     def __init__(self, database) -> None:
         self.db = database
         self.user_helper = UserHelper(self.db)
-
-    def get_all_users_by_role(self, role: str) -> List[Dict]:
-        '''Return all users with their details'''
+        self.token_helper = TokenHelper(self.db)
+
+    def get_all_users_by_role(
+        self,
+        role: str,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: str = None
+    ) -> Tuple[List[Dict], Optional[str]]:
+        '''
+        Return a page of users with their details by user id with the cursor of the next page,
+        players with their attempt count, average score, best score and last played time
+        '''
 
         logger.info(LogMessage.GET_ALL_USERS, role)
 
-        data = self.db.read(Queries.GET_USER_BY_ROLE, (role, ))
-        if not data:
+        if role == Roles.PLAYER:
+            first_page, next_page = Queries.GET_PLAYERS_PAGE, Queries.GET_PLAYERS_PAGE_AFTER
+        else:
+            first_page, next_page = Queries.GET_USERS_BY_ROLE_PAGE, Queries.GET_USERS_BY_ROLE_PAGE_AFTER
+
+        if cursor is None:
+            rows = self.db.read(first_page, (role, limit + 1))
+        else:
+            user_id, = decode_cursor(cursor, 1)
+            rows = self.db.read(next_page, (role, user_id, limit + 1))
+        if not rows and cursor is None:
             raise DataNotFoundError(status=StatusCodes.NOT_FOUND, message=ErrorMessage.USER_NOT_FOUND)
-        return data
+        return paginate(rows, limit, ('user_id', ))
 
     def get_user_profile_data(self, user_id: str) -> str:
         '''Return user's profile data'''
@@ -62,7 +82,7 @@ class UserBusiness:
         admin = Admin.get_instance(admin_data)
         try:
             self.user_helper.save_user(admin)
-        except mysql.connector.IntegrityError as e:
+        except IntegrityError as e:
             logger.exception(e)
             raise DuplicateEntryError(status=StatusCodes.CONFLICT, message=ErrorMessage.USER_EXISTS) from e
 
@@ -76,15 +96,16 @@ class UserBusiness:
         name, email, username = user_data['name'], user_data['email'], user_data['username']
         try:
             self.db.write(Queries.UPDATE_USER_PROFILE, (name, email, user_id))
-        except mysql.connector.IntegrityError as e:
+        except IntegrityError as e:
             logger.exception(e)
             raise DuplicateEntryError(status=StatusCodes.CONFLICT, message=ErrorMessage.EMAIL_TAKEN) from e
         try:
             self.db.write(Queries.UPDATE_USERNAME, (username, user_id))
-        except mysql.connector.IntegrityError as e:
+        except IntegrityError as e:
             logger.exception(e)
             raise DuplicateEntryError(status=StatusCodes.CONFLICT, message=ErrorMessage.USERNAME_TAKEN) from e
 
+        leaderboard.rename(user_id, username)
         logger.info(LogMessage.UPDATE_SUCCESS, Headers.PROFILE)
 
     def update_user_password(self, user_id: str, password_data: Dict) -> None:
@@ -93,15 +114,17 @@ class UserBusiness:
         logger.info(LogMessage.UPDATE_ENTITY, Headers.PASSWORD)
 
         current_password, new_password = password_data['current_password'], password_data['new_password']
-        hashed_current_password = hash_password(current_password)
         user_password_data = self.db.read(Queries.GET_PASSWORD_BY_USER_ID, (user_id, ))
         user_password = user_password_data[0]['password']
 
-        if user_password not in (current_password, hashed_current_password):
+        if not password_pool.verify(current_password, user_password).valid:
             raise InvalidCredentialsError(status=StatusCodes.UNAUTHORIZED, message=ErrorMessage.INVALID_CREDENTIALS)
 
-        new_password = hash_password(new_password)
-        self.db.write(Queries.UPDATE_USER_PASSWORD, (new_password, user_id))
+        new_password = password_pool.hash(new_password)
+        # Tokens issued with the old password are revoked
+        with self.db.transaction():
+            self.db.write(Queries.UPDATE_USER_PASSWORD, (new_password, user_id))
+            self.token_helper.revoke_token(user_id)
 
         logger.info(LogMessage.UPDATE_SUCCESS, Headers.PASSWORD)
 
@@ -114,5 +137,7 @@ class UserBusiness:
         if not row_affected:
             raise DataNotFoundError(status=StatusCodes.NOT_FOUND, message=ErrorMessage.USER_NOT_FOUND)
 
+        leaderboard.remove(user_id)
+        self.token_helper.revoke_deleted_user(user_id)
         logger.info(LogMessage.DELETE_SUCCESS, Roles.PLAYER)
         return row_affected
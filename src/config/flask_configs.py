@@ -3,14 +3,18 @@
 import logging
 import os
 
+import click
 from flask_jwt_extended import JWTManager
 from flask_smorest import Api
 
-from config.string_constants import ErrorMessage, StatusCodes
+from business.quiz_business import QuizBusiness
+from config.string_constants import ErrorMessage, Message, StatusCodes
 from database.database_access import DatabaseAccess
+from database.read_your_writes import read_your_writes
 from helpers.token_helper import TokenHelper
 from routes.auth_routes import blp as AuthBlueprint
 from routes.category_routes import blp as CategoryBlueprint
+from routes.metrics_routes import blp as MetricsBlueprint
 from routes.question_routes import blp as QuestionBlueprint
 from routes.quiz_routes import blp as QuizBlueprint
 from routes.user_routes import blp as UserBlueprint
@@ -52,6 +56,10 @@ def set_app_configs(app):
         global request_id
         request_id = generate_id(entity='Request', length=6)
 
+    @app.before_request
+    def reset_read_your_writes():
+        read_your_writes.reset()
+
 
 def register_error_handlers(app):
     'Register error handlers'
@@ -71,9 +79,7 @@ def set_jwt_configs(app):
     def check_if_token_in_blocklist(_jwt_header, jwt_payload):
         'Checks if the token is present in the blocklist'
 
-        token_id = jwt_payload["jti"]
-        token_type = jwt_payload["type"]
-        return not token_helper.check_token_status(token_id, token_type)
+        return not token_helper.check_token_status(jwt_payload)
 
     @jwt.revoked_token_loader
     def revoked_token_callback(_jwt_header, _jwt_payload):
@@ -125,6 +131,7 @@ def register_blueprints(app):
     api = Api(app)
     api.register_blueprint(AuthBlueprint, url_prefix='/v1')
     api.register_blueprint(CategoryBlueprint, url_prefix='/v1')
+    api.register_blueprint(MetricsBlueprint, url_prefix='/v1')
     api.register_blueprint(QuestionBlueprint, url_prefix='/v1')
     api.register_blueprint(QuizBlueprint, url_prefix='/v1')
     api.register_blueprint(UserBlueprint, url_prefix='/v1')
@@ -136,3 +143,14 @@ class CustomFilter(logging.Filter):
     def filter(self, record):
         record.request_id = request_id
         return True
+
+
+def register_commands(app):
+    'Register flask CLI commands, run as `flask --app server <command>`'
+
+    @app.cli.command('backfill-best-scores')
+    def backfill_best_scores():
+        'Rebuilds the per player best scores, the player stats and the leaderboard buckets from the scores table'
+
+        QuizBusiness(db).backfill_best_scores()
+        click.echo(Message.BEST_SCORES_BACKFILLED)
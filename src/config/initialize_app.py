@@ -3,11 +3,14 @@
 import logging
 import os
 
-import mysql.connector
-
 from config.string_constants import Headers, LogMessage, Roles
 from config.queries import Queries
 from database.database_access import DatabaseAccess
+from database.database_connection import IntegrityError
+from database.migrations import MigrationRunner
+from helpers.leaderboard import leaderboard
+from helpers.score_writer import score_writer
+from helpers.token_purger import token_purger
 from helpers.user_helper import UserHelper
 from models.users.super_admin import SuperAdmin
 from utils.password_hasher import hash_password
@@ -60,18 +63,24 @@ class Initializer:
 
         try:
             self.user_helper.save_user(super_admin)
-        except mysql.connector.IntegrityError as e:
+        except IntegrityError as e:
             logger.exception(e)
 
         logger.info(LogMessage.CREATE_SUCCESS, Headers.SUPER_ADMIN)
 
     def initialize_app(self) -> None:
         '''
-        Initializes the application by creating necessary tables and the super admin.
+        Initializes the application by creating necessary tables, applying pending
+        schema migrations, creating the super admin, starting the write-behind score writer
+        if enabled and the purge of expired token revocations, and building the leaderboard ranking.
         Returns:
             None
         '''
         self.db.create_tables()
+        MigrationRunner(self.db).migrate()
         self.create_super_admin()
+        score_writer.start(self.db)
+        token_purger.start(self.db)
+        leaderboard.rebuild(self.db)
 
         logger.info(LogMessage.INITIALIZE_APP_SUCCESS)
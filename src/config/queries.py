@@ -17,7 +17,7 @@ class InitializationQueries:
             user_id VARCHAR(10) PRIMARY KEY,
             username VARCHAR(25) UNIQUE,
             password VARCHAR(100),
-            isPasswordChanged INTEGER,
+            isPasswordChanged TINYINT UNSIGNED,
             FOREIGN KEY (user_id) REFERENCES users (user_id) ON DELETE CASCADE ON UPDATE CASCADE
         )'''
     CREATE_OPTIONS_TABLE = '''
@@ -25,7 +25,7 @@ class InitializationQueries:
             option_id VARCHAR(10) PRIMARY KEY,
             question_id VARCHAR(10),
             option_text VARCHAR(100),
-            isCorrect INTEGER,
+            isCorrect TINYINT UNSIGNED,
             FOREIGN KEY (question_id) REFERENCES questions (question_id) ON DELETE CASCADE ON UPDATE CASCADE
         )'''
     CREATE_QUESTIONS_TABLE = '''
@@ -41,8 +41,36 @@ class InitializationQueries:
         CREATE TABLE IF NOT EXISTS scores (
             score_id VARCHAR(10) PRIMARY KEY,
             player_id VARCHAR(10),
-            score INTEGER,
-            timestamp VARCHAR(20),
+            score DECIMAL(5, 2),
+            timestamp DATETIME,
+            category_id VARCHAR(10),
+            question_type VARCHAR(25),
+            FOREIGN KEY (player_id) REFERENCES users (user_id) ON DELETE CASCADE ON UPDATE CASCADE
+        )'''
+    CREATE_PLAYER_BEST_SCORES_TABLE = '''
+        CREATE TABLE IF NOT EXISTS player_best_scores (
+            player_id VARCHAR(10) PRIMARY KEY,
+            score DECIMAL(5, 2),
+            timestamp DATETIME,
+            FOREIGN KEY (player_id) REFERENCES users (user_id) ON DELETE CASCADE ON UPDATE CASCADE
+        )'''
+    CREATE_PLAYER_STATS_TABLE = '''
+        CREATE TABLE IF NOT EXISTS player_stats (
+            player_id VARCHAR(10) PRIMARY KEY,
+            attempts INT UNSIGNED,
+            total_score DECIMAL(12, 2),
+            best_score DECIMAL(5, 2),
+            last_played DATETIME,
+            FOREIGN KEY (player_id) REFERENCES users (user_id) ON DELETE CASCADE ON UPDATE CASCADE
+        )'''
+    CREATE_LEADERBOARD_BUCKETS_TABLE = '''
+        CREATE TABLE IF NOT EXISTS leaderboard_buckets (
+            bucket VARCHAR(10),
+            category_id VARCHAR(10),
+            player_id VARCHAR(10),
+            score DECIMAL(5, 2),
+            timestamp DATETIME,
+            PRIMARY KEY (bucket, category_id, player_id),
             FOREIGN KEY (player_id) REFERENCES users (user_id) ON DELETE CASCADE ON UPDATE CASCADE
         )'''
     CREATE_USERS_TABLE = '''
@@ -51,17 +79,27 @@ class InitializationQueries:
             name VARCHAR(50),
             email VARCHAR(50) UNIQUE,
             role VARCHAR(20),
-            registration_date VARCHAR(10)
+            registration_date DATE
         )'''
-    CREATE_TOKEN_TABLE = '''
-        CREATE TABLE IF NOT EXISTS tokens (
-            user_id VARCHAR(10),
-            access_token VARCHAR(100) PRIMARY KEY,
-            refresh_token VARCHAR(100) UNIQUE NOT NULL,
-            status VARCHAR(20) DEFAULT "active",
+    CREATE_USER_TOKEN_EPOCHS_TABLE = '''
+        CREATE TABLE IF NOT EXISTS user_token_epochs (
+            user_id VARCHAR(10) PRIMARY KEY,
+            epoch INT UNSIGNED NOT NULL,
             FOREIGN KEY (user_id) REFERENCES users (user_id) ON DELETE CASCADE ON UPDATE CASCADE
-        )
-    '''
+        )'''
+    CREATE_TOKEN_REVOCATIONS_TABLE = '''
+        CREATE TABLE IF NOT EXISTS token_revocations (
+            version BIGINT UNSIGNED AUTO_INCREMENT,
+            user_id VARCHAR(10),
+            revoked_at DATETIME,
+            expires_at DATETIME NOT NULL,
+            PRIMARY KEY (version, expires_at)
+        )'''
+    CREATE_REDEEMED_TICKETS_TABLE = '''
+        CREATE TABLE IF NOT EXISTS redeemed_tickets (
+            nonce VARCHAR(16) PRIMARY KEY,
+            expires_at DATETIME NOT NULL
+        )'''
 
 
 class Queries:
@@ -72,12 +110,83 @@ class Queries:
     INSERT_OPTION = 'INSERT INTO options VALUES (%s, %s, %s, %s)'
     INSERT_QUESTION = 'INSERT INTO questions VALUES (%s, %s, %s, %s, %s)'
     INSERT_USER_DATA = 'INSERT INTO users VALUES (%s, %s, %s, %s, %s)'
-    INSERT_PLAYER_QUIZ_SCORE = 'INSERT INTO scores VALUES (%s, %s, %s, %s)'
-    INSERT_TOKEN_DATA = 'INSERT INTO tokens (user_id, access_token, refresh_token) VALUES (%s, %s, %s)'
+    INSERT_PLAYER_QUIZ_SCORE = '''
+        INSERT INTO scores (score_id, player_id, score, timestamp, category_id, question_type)
+        VALUES (%s, %s, %s, %s, %s, %s)
+    '''
+    GET_SCORE_ID = 'SELECT score_id FROM scores WHERE score_id = %s'
+    UPSERT_PLAYER_BEST_SCORE = '''
+        INSERT INTO player_best_scores VALUES (%s, %s, %s)
+        ON DUPLICATE KEY UPDATE score = GREATEST(score, VALUES(score)), timestamp = LEAST(timestamp, VALUES(timestamp))
+    '''
+    BACKFILL_PLAYER_BEST_SCORES = '''
+        INSERT INTO player_best_scores
+        SELECT player_id, MAX(score), MIN(timestamp) FROM scores GROUP BY player_id
+        ON DUPLICATE KEY UPDATE
+            score = GREATEST(player_best_scores.score, VALUES(score)),
+            timestamp = LEAST(player_best_scores.timestamp, VALUES(timestamp))
+    '''
+    UPSERT_PLAYER_STATS = '''
+        INSERT INTO player_stats VALUES (%s, %s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE
+            attempts = attempts + VALUES(attempts),
+            total_score = total_score + VALUES(total_score),
+            best_score = GREATEST(best_score, VALUES(best_score)),
+            last_played = GREATEST(last_played, VALUES(last_played))
+    '''
+    BACKFILL_PLAYER_STATS = '''
+        INSERT INTO player_stats
+        SELECT player_id, COUNT(*), SUM(score), MAX(score), MAX(timestamp) FROM scores GROUP BY player_id
+        ON DUPLICATE KEY UPDATE
+            attempts = VALUES(attempts),
+            total_score = VALUES(total_score),
+            best_score = VALUES(best_score),
+            last_played = VALUES(last_played)
+    '''
+    UPSERT_LEADERBOARD_BUCKET = '''
+        INSERT INTO leaderboard_buckets VALUES (%s, %s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE score = GREATEST(score, VALUES(score)), timestamp = LEAST(timestamp, VALUES(timestamp))
+    '''
+    BACKFILL_LEADERBOARD_BUCKETS = '''
+        INSERT INTO leaderboard_buckets
+        SELECT * FROM (
+            SELECT DATE(timestamp) AS bucket, '' AS category_id, player_id, MAX(score) AS score, MIN(timestamp) AS timestamp
+            FROM scores GROUP BY DATE(timestamp), player_id
+            UNION ALL
+            SELECT DATE(timestamp), category_id, player_id, MAX(score), MIN(timestamp)
+            FROM scores WHERE category_id IN (SELECT category_id FROM categories)
+            GROUP BY DATE(timestamp), category_id, player_id
+            UNION ALL
+            SELECT 'all', category_id, player_id, MAX(score), MIN(timestamp)
+            FROM scores WHERE category_id IN (SELECT category_id FROM categories) GROUP BY category_id, player_id
+        ) AS buckets
+        ON DUPLICATE KEY UPDATE
+            score = GREATEST(leaderboard_buckets.score, VALUES(score)),
+            timestamp = LEAST(leaderboard_buckets.timestamp, VALUES(timestamp))
+    '''
+    BUMP_USER_TOKEN_EPOCH = '''
+        INSERT INTO user_token_epochs VALUES (%s, 1)
+        ON DUPLICATE KEY UPDATE epoch = epoch + 1
+    '''
+    INSERT_TOKEN_REVOCATION = 'INSERT INTO token_revocations (user_id, revoked_at, expires_at) VALUES (%s, %s, %s)'
+    BACKFILL_TOKEN_REVOCATION_EXPIRY = 'UPDATE token_revocations SET expires_at = revoked_at WHERE expires_at IS NULL'
     GET_USERNAME = 'SELECT username FROM credentials WHERE username = %s'
     GET_ALL_CATEGORIES = '''
         SELECT *
         FROM categories ORDER BY category_name'''
+    GET_CATEGORIES_PAGE = '''
+        SELECT category_id, admin_id, category_name
+        FROM categories
+        ORDER BY category_name
+        LIMIT %s
+    '''
+    GET_CATEGORIES_PAGE_AFTER = '''
+        SELECT category_id, admin_id, category_name
+        FROM categories
+        WHERE category_name > %s
+        ORDER BY category_name
+        LIMIT %s
+    '''
     GET_ALL_QUESTIONS_DETAIL = '''
         SELECT category_name, question_text, question_type, option_text as answer, questions.admin_username
         FROM questions 
@@ -102,20 +211,36 @@ class Queries:
         LEFT JOIN Options o ON q.question_id = o.question_id
     '''
     GET_CATEGORY_ID_BY_NAME = 'SELECT category_id FROM categories WHERE category_name = %s'
+    # Everything a login needs in one round trip, idx_credentials_login (migration 9) can cover the credentials
     GET_CREDENTIALS_BY_USERNAME = '''
         SELECT credentials.user_id, password, role, isPasswordChanged
-        FROM credentials INNER JOIN users ON credentials.user_id = users.user_id 
+        FROM credentials
+        INNER JOIN users ON credentials.user_id = users.user_id
         WHERE username = %s
     '''
     GET_PASSWORD_BY_USER_ID = '''SELECT password FROM credentials WHERE user_id = %s'''
     GET_LEADERBOARD = '''
-        SELECT player_id, username, MAX(score) as score, MIN(timestamp) as timestamp
-        FROM scores
-        INNER JOIN credentials ON scores.player_id = credentials.user_id
-        GROUP BY player_id
+        SELECT player_id, username, score, timestamp
+        FROM player_best_scores
+        INNER JOIN credentials ON player_best_scores.player_id = credentials.user_id
         ORDER BY score DESC, timestamp ASC
         LIMIT 10
     '''
+    GET_BUCKET_LEADERBOARD = '''
+        SELECT player_id, username, MAX(score) AS score, MIN(timestamp) AS timestamp
+        FROM leaderboard_buckets
+        INNER JOIN credentials ON leaderboard_buckets.player_id = credentials.user_id
+        WHERE bucket BETWEEN %s AND %s AND category_id = %s
+        GROUP BY player_id, username
+        ORDER BY score DESC, timestamp ASC, player_id ASC
+        LIMIT %s
+    '''
+    GET_LEADERBOARD_RANKING = '''
+        SELECT player_id, username, score, timestamp
+        FROM player_best_scores
+        INNER JOIN credentials ON player_best_scores.player_id = credentials.user_id
+        ORDER BY score DESC, timestamp ASC, player_id ASC
+    '''
     GET_OPTIONS_FOR_MCQ = 'SELECT option_text FROM options WHERE question_id = %s ORDER BY RAND()'
     GET_QUESTIONS_BY_CATEGORY = '''
         SELECT question_text, question_type, option_text as answer, questions.admin_username
@@ -133,17 +258,62 @@ class Queries:
         GROUP BY q.question_id
         ORDER BY RAND() LIMIT %s;
     '''
+    GET_QUESTION_INDEX_DATA = '''
+        SELECT q.question_id, q.category_id, q.question_text, q.question_type, o.option_text
+        FROM questions q
+        LEFT JOIN options o ON q.question_id = o.question_id
+        ORDER BY q.question_id
+    '''
     GET_USER_BY_ROLE = '''
         SELECT users.user_id, username, name, email, registration_date
         FROM users INNER JOIN credentials ON users.user_id = credentials.user_id
         WHERE role = %s
     '''
+    GET_PLAYERS_PAGE = '''
+        SELECT
+            users.user_id, username, name, email, registration_date,
+            COALESCE(attempts, 0) AS attempts, ROUND(total_score / attempts, 2) AS average_score,
+            best_score, last_played
+        FROM users
+        INNER JOIN credentials ON users.user_id = credentials.user_id
+        LEFT JOIN player_stats ON users.user_id = player_stats.player_id
+        WHERE role = %s
+        ORDER BY users.user_id
+        LIMIT %s
+    '''
+    GET_PLAYERS_PAGE_AFTER = '''
+        SELECT
+            users.user_id, username, name, email, registration_date,
+            COALESCE(attempts, 0) AS attempts, ROUND(total_score / attempts, 2) AS average_score,
+            best_score, last_played
+        FROM users
+        INNER JOIN credentials ON users.user_id = credentials.user_id
+        LEFT JOIN player_stats ON users.user_id = player_stats.player_id
+        WHERE role = %s AND users.user_id > %s
+        ORDER BY users.user_id
+        LIMIT %s
+    '''
+    GET_USERS_BY_ROLE_PAGE = '''
+        SELECT users.user_id, username, name, email, registration_date
+        FROM users INNER JOIN credentials ON users.user_id = credentials.user_id
+        WHERE role = %s
+        ORDER BY users.user_id
+        LIMIT %s
+    '''
+    GET_USERS_BY_ROLE_PAGE_AFTER = '''
+        SELECT users.user_id, username, name, email, registration_date
+        FROM users INNER JOIN credentials ON users.user_id = credentials.user_id
+        WHERE role = %s AND users.user_id > %s
+        ORDER BY users.user_id
+        LIMIT %s
+    '''
     GET_USER_BY_USER_ID = '''
         SELECT username, name, email, registration_date
         FROM users 
         INNER JOIN credentials ON users.user_id = credentials.user_id
         WHERE users.user_id = %s
     '''
+    GET_USERNAME_BY_USER_ID = 'SELECT username FROM credentials WHERE user_id = %s'
     GET_USER_ID_BY_USERNAME = '''
         SELECT users.user_id
         FROM users 
@@ -157,14 +327,42 @@ class Queries:
         WHERE scores.player_id = %s
         ORDER BY timestamp DESC
     '''
+    GET_PLAYER_SCORES_PAGE = '''
+        SELECT score_id, score, timestamp
+        FROM scores
+        WHERE player_id = %s
+        ORDER BY timestamp DESC, score_id DESC
+        LIMIT %s
+    '''
+    # Spelled out rather than (timestamp, score_id) < (%s, %s), which MySQL cannot turn into a
+    # range of idx_scores_player_time; the redundant timestamp <= %s gives SQLite the range too
+    GET_PLAYER_SCORES_PAGE_AFTER = '''
+        SELECT score_id, score, timestamp
+        FROM scores
+        WHERE player_id = %s AND timestamp <= %s AND (timestamp < %s OR (timestamp = %s AND score_id < %s))
+        ORDER BY timestamp DESC, score_id DESC
+        LIMIT %s
+    '''
+    GET_PLAYER_STATS = '''
+        SELECT attempts, ROUND(total_score / attempts, 2) AS average_score, best_score, last_played
+        FROM player_stats
+        WHERE player_id = %s
+    '''
+    GET_USER_ROLES_BY_USER_IDS = 'SELECT user_id, role FROM users WHERE user_id IN (%s)'
     GET_QUESTION_DATA_BY_QUESTION_ID = '''
-        SELECT q.question_id, q.question_text, o.option_text as correct_answer
+        SELECT q.question_id, q.question_text, q.category_id, q.question_type, o.option_text as correct_answer
         FROM questions q
         LEFT JOIN options o ON q.question_id = o.question_id AND o.isCorrect = 1
         WHERE q.question_id IN (%s)
     '''
-    GET_ACCESS_TOKEN_STATUS = 'SELECT status FROM tokens WHERE access_token = %s'
-    GET_REFRESH_TOKEN_STATUS = 'SELECT status FROM tokens WHERE refresh_token = %s'
+    GET_USER_TOKEN_EPOCH = '''
+        SELECT COALESCE(epoch, 0) AS epoch
+        FROM users
+        LEFT JOIN user_token_epochs ON users.user_id = user_token_epochs.user_id
+        WHERE users.user_id = %s
+    '''
+    GET_TOKEN_REVOCATION_VERSION = 'SELECT COALESCE(MAX(version), 0) AS version FROM token_revocations'
+    GET_TOKEN_REVOCATIONS = 'SELECT version, user_id FROM token_revocations WHERE version > %s ORDER BY version'
     UPDATE_ADMIN_PASSWORD_BY_USERNAME = '''
         UPDATE credentials 
         SET password = %s, isPasswordChanged = %s 
@@ -176,9 +374,181 @@ class Queries:
     UPDATE_USER_PROFILE = 'UPDATE users SET name = %s, email = %s WHERE user_id = %s'
     UPDATE_USERNAME = 'UPDATE credentials SET username = %s WHERE user_id = %s'
     UPDATE_USER_PASSWORD = 'UPDATE credentials SET password = %s, isPasswordChanged = 1 WHERE user_id = %s'
-    UPDATE_TOKEN_STATUS = 'UPDATE tokens SET status = "revoked" WHERE user_id = %s'
+    REHASH_USER_PASSWORD = 'UPDATE credentials SET password = %s WHERE user_id = %s AND password = %s'
     DELETE_CATEGORY_BY_NAME = 'DELETE FROM categories WHERE category_name = %s'
     DELETE_CATEGORY_BY_ID = 'DELETE FROM categories WHERE category_id = %s'
+    # Bucket rows of all categories have category_id '', no foreign key can cascade to them
+    DELETE_CATEGORY_LEADERBOARD_BUCKETS = 'DELETE FROM leaderboard_buckets WHERE category_id = %s'
     DELETE_QUESTION_BY_ID = 'DELETE FROM questions WHERE question_id = %s'
     DELETE_USER_BY_EMAIL = 'DELETE FROM users WHERE email = %s'
     DELETE_USER_BY_ID_ROLE = 'DELETE FROM users WHERE user_id = %s and role = %s'
+    DELETE_EXPIRED_TOKEN_REVOCATIONS = 'DELETE FROM token_revocations WHERE expires_at < %s ORDER BY version LIMIT %s'
+    # Nothing inserted when the nonce is already recorded, the ticket was redeemed
+    INSERT_REDEEMED_TICKET = 'INSERT IGNORE INTO redeemed_tickets VALUES (%s, %s)'
+    DELETE_EXPIRED_REDEEMED_TICKETS = 'DELETE FROM redeemed_tickets WHERE expires_at < %s ORDER BY expires_at LIMIT %s'
+
+
+class MigrationQueries:
+    '''Contains queries used by the schema migrations'''
+
+    CREATE_SCHEMA_MIGRATIONS_TABLE = '''
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INTEGER PRIMARY KEY,
+            description VARCHAR(100),
+            applied_at DATETIME
+        )'''
+    GET_APPLIED_MIGRATIONS = 'SELECT version FROM schema_migrations ORDER BY version'
+    INSERT_MIGRATION = 'INSERT INTO schema_migrations VALUES (%s, %s, %s)'
+    GET_INDEX = '''
+        SELECT index_name
+        FROM information_schema.statistics
+        WHERE table_schema = DATABASE() AND table_name = %s AND index_name = %s
+        LIMIT 1
+    '''
+    CREATE_INDEX = 'CREATE INDEX {name} ON {table} ({columns}) ALGORITHM=INPLACE LOCK=NONE'
+    GET_TABLE = '''
+        SELECT table_name AS table_name
+        FROM information_schema.tables
+        WHERE table_schema = DATABASE() AND table_name = %s
+    '''
+    GET_COLUMN_TYPE = '''
+        SELECT column_type AS column_type
+        FROM information_schema.columns
+        WHERE table_schema = DATABASE() AND table_name = %s AND column_name = %s
+    '''
+    DROP_TABLE = 'DROP TABLE IF EXISTS {table}'
+    GET_PARTITIONS = '''
+        SELECT partition_name AS partition_name, partition_description AS bound
+        FROM information_schema.partitions
+        WHERE table_schema = DATABASE() AND table_name = %s AND partition_name IS NOT NULL
+        ORDER BY partition_ordinal_position
+    '''
+    SET_PRIMARY_KEY = '''
+        ALTER TABLE {table} MODIFY {column} DATETIME NOT NULL, DROP PRIMARY KEY, ADD PRIMARY KEY ({primary_key})
+    '''
+    PARTITION_BY_DAY = 'ALTER TABLE {table} PARTITION BY RANGE (TO_DAYS({column})) ({partitions})'
+    ADD_DAY_PARTITIONS = 'ALTER TABLE {table} REORGANIZE PARTITION pmax INTO ({partitions})'
+    DROP_PARTITIONS = 'ALTER TABLE {table} DROP PARTITION {partitions}'
+    MODIFY_COLUMNS = 'ALTER TABLE {table} {modifications}'
+    ADD_COLUMN = 'ALTER TABLE {table} ADD COLUMN {column} {column_type}'
+
+
+class SQLiteQueries:
+    '''
+    SQLite versions of the queries the dialect translation cannot rewrite,
+    named after the query they replace
+    '''
+
+    CREATE_TOKEN_REVOCATIONS_TABLE = '''
+        CREATE TABLE IF NOT EXISTS token_revocations (
+            version INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id VARCHAR(10),
+            revoked_at DATETIME,
+            expires_at DATETIME NOT NULL
+        )'''
+    GET_INDEX = "SELECT name AS index_name FROM sqlite_master WHERE type = 'index' AND tbl_name = %s AND name = %s"
+    GET_TABLE = "SELECT name AS table_name FROM sqlite_master WHERE type = 'table' AND name = %s"
+    CREATE_INDEX = 'CREATE INDEX IF NOT EXISTS {name} ON {table} ({columns})'
+    UPSERT_PLAYER_BEST_SCORE = '''
+        INSERT INTO player_best_scores VALUES (%s, %s, %s)
+        ON CONFLICT (player_id) DO UPDATE
+        SET score = MAX(score, excluded.score), timestamp = MIN(timestamp, excluded.timestamp)
+    '''
+    BACKFILL_PLAYER_BEST_SCORES = '''
+        INSERT INTO player_best_scores
+        SELECT player_id, MAX(score), MIN(timestamp) FROM scores WHERE true GROUP BY player_id
+        ON CONFLICT (player_id) DO UPDATE
+        SET score = MAX(score, excluded.score), timestamp = MIN(timestamp, excluded.timestamp)
+    '''
+    UPSERT_PLAYER_STATS = '''
+        INSERT INTO player_stats VALUES (%s, %s, %s, %s, %s)
+        ON CONFLICT (player_id) DO UPDATE
+        SET attempts = attempts + excluded.attempts,
+            total_score = total_score + excluded.total_score,
+            best_score = MAX(best_score, excluded.best_score),
+            last_played = MAX(last_played, excluded.last_played)
+    '''
+    BACKFILL_PLAYER_STATS = '''
+        INSERT INTO player_stats
+        SELECT player_id, COUNT(*), SUM(score), MAX(score), MAX(timestamp) FROM scores WHERE true GROUP BY player_id
+        ON CONFLICT (player_id) DO UPDATE
+        SET attempts = excluded.attempts,
+            total_score = excluded.total_score,
+            best_score = excluded.best_score,
+            last_played = excluded.last_played
+    '''
+    BUMP_USER_TOKEN_EPOCH = '''
+        INSERT INTO user_token_epochs VALUES (%s, 1)
+        ON CONFLICT (user_id) DO UPDATE SET epoch = epoch + 1
+    '''
+    # DELETE ... LIMIT needs SQLite built with SQLITE_ENABLE_UPDATE_DELETE_LIMIT
+    DELETE_EXPIRED_TOKEN_REVOCATIONS = '''
+        DELETE FROM token_revocations
+        WHERE version IN (SELECT version FROM token_revocations WHERE expires_at < %s ORDER BY version LIMIT %s)
+    '''
+    DELETE_EXPIRED_REDEEMED_TICKETS = '''
+        DELETE FROM redeemed_tickets
+        WHERE nonce IN (SELECT nonce FROM redeemed_tickets WHERE expires_at < %s ORDER BY expires_at LIMIT %s)
+    '''
+    UPSERT_LEADERBOARD_BUCKET = '''
+        INSERT INTO leaderboard_buckets VALUES (%s, %s, %s, %s, %s)
+        ON CONFLICT (bucket, category_id, player_id) DO UPDATE
+        SET score = MAX(score, excluded.score), timestamp = MIN(timestamp, excluded.timestamp)
+    '''
+    BACKFILL_LEADERBOARD_BUCKETS = '''
+        INSERT INTO leaderboard_buckets
+        SELECT * FROM (
+            SELECT DATE(timestamp) AS bucket, '' AS category_id, player_id, MAX(score) AS score, MIN(timestamp) AS timestamp
+            FROM scores GROUP BY DATE(timestamp), player_id
+            UNION ALL
+            SELECT DATE(timestamp), category_id, player_id, MAX(score), MIN(timestamp)
+            FROM scores WHERE category_id IN (SELECT category_id FROM categories)
+            GROUP BY DATE(timestamp), category_id, player_id
+            UNION ALL
+            SELECT 'all', category_id, player_id, MAX(score), MIN(timestamp)
+            FROM scores WHERE category_id IN (SELECT category_id FROM categories) GROUP BY category_id, player_id
+        ) WHERE true
+        ON CONFLICT (bucket, category_id, player_id) DO UPDATE
+        SET score = MAX(score, excluded.score), timestamp = MIN(timestamp, excluded.timestamp)
+    '''
+    # Aggregates are untyped in SQLite, the column name declares the type to convert them to
+    GET_BUCKET_LEADERBOARD = '''
+        SELECT player_id, username, MAX(score) AS "score [DECIMAL]", MIN(timestamp) AS "timestamp [DATETIME]"
+        FROM leaderboard_buckets
+        INNER JOIN credentials ON leaderboard_buckets.player_id = credentials.user_id
+        WHERE bucket BETWEEN %s AND %s AND category_id = %s
+        GROUP BY player_id, username
+        ORDER BY MAX(score) DESC, MIN(timestamp) ASC, player_id ASC
+        LIMIT %s
+    '''
+    # total_score DECIMAL values are stored as integers when whole, the average must not divide integers
+    GET_PLAYER_STATS = '''
+        SELECT attempts, ROUND(CAST(total_score AS REAL) / attempts, 2) AS average_score, best_score, last_played
+        FROM player_stats
+        WHERE player_id = %s
+    '''
+    GET_PLAYERS_PAGE = '''
+        SELECT
+            users.user_id, username, name, email, registration_date,
+            COALESCE(attempts, 0) AS attempts, ROUND(CAST(total_score AS REAL) / attempts, 2) AS average_score,
+            best_score, last_played
+        FROM users
+        INNER JOIN credentials ON users.user_id = credentials.user_id
+        LEFT JOIN player_stats ON users.user_id = player_stats.player_id
+        WHERE role = %s
+        ORDER BY users.user_id
+        LIMIT %s
+    '''
+    GET_PLAYERS_PAGE_AFTER = '''
+        SELECT
+            users.user_id, username, name, email, registration_date,
+            COALESCE(attempts, 0) AS attempts, ROUND(CAST(total_score AS REAL) / attempts, 2) AS average_score,
+            best_score, last_played
+        FROM users
+        INNER JOIN credentials ON users.user_id = credentials.user_id
+        LEFT JOIN player_stats ON users.user_id = player_stats.player_id
+        WHERE role = %s AND users.user_id > %s
+        ORDER BY users.user_id
+        LIMIT %s
+    '''
+    GET_COLUMN_TYPE = 'SELECT type AS column_type FROM pragma_table_info(%s) WHERE name = %s'
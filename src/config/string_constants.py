@@ -84,6 +84,7 @@ class Message:
     PROFILE_UPDATED = 'Profile updated successfully'
     PASSWORD_UPDATED = 'Password updated successfully'
     SUBMISSION_SUCCESS = 'Response submitted successfully'
+    BEST_SCORES_BACKFILLED = 'Player best scores, player stats and leaderboard buckets backfilled'
 
 
 class Headers:
@@ -143,8 +144,13 @@ class LogMessage:
     ASSIGN_MENU = 'Assigning menu according to the role'
     SUPER_ADMIN_PRESENT = 'Super Admin Present'
     TABULATE_ERROR = 'Tabulate error: %s'
-    SAVE_QUIZ_SCORE = 'Saving score for: %s'
-    SAVE_QUIZ_SCORE_SUCCESS = 'Score saved for: %s'
+    SAVE_QUIZ_SCORES = 'Saving %s quiz scores'
+    SAVE_QUIZ_SCORES_SUCCESS = '%s quiz scores saved'
+    REPLAY_SCORE_SPOOL = 'Writing %s quiz scores left in the spool %s by a previous process'
+    SCORE_SPOOLS_LOCKED = 'Every score spool of %s is held by another process, scores are written in the request'
+    DRAIN_SCORE_QUEUE = 'Writing %s queued quiz scores before stopping'
+    DROP_QUEUED_SCORE = 'Dropped queued score %s: %s'
+    TORN_SCORE_SPOOL_LINE = 'Skipped a partially written line of the score spool %s'
     DISPLAY_QUIZ_SCORE = 'Display score for: %s'
     DISPLAY_ALL_ENTITY = 'Display all %s'
     DISPLAY_QUES_BY_CATEGORY = 'Display Questions By Category'
@@ -164,9 +170,27 @@ class LogMessage:
     GET_PROFILE_DATA = 'Getting profile data'
     GET_ALL_USERS = 'Getting all users with role: %s'
     EVALUATE_RESPONSE = 'Evaluating answers for player_id: %s'
+    EVALUATE_ANSWER_SHEETS = 'Evaluating %s answer sheets'
     GET_QUES_FOR_QUIZ = 'Fetching questions for quiz'
     GET_SCORES = 'Fetching scores for player_id: %s'
+    GET_PLAYER_SUMMARY = 'Fetching score summary for player_id: %s'
     FUNCTION_CALL = 'method: %s() called in module: %s.py'
+    SLOW_QUERY = 'Slow query %s took %s ms, plan: %s'
+    GET_DATABASE_METRICS = 'Fetching database metrics'
+    APPLY_MIGRATION = 'Applying schema migration %s: %s'
+    APPLY_MIGRATION_SUCCESS = 'Schema migration %s applied in %s ms'
+    SKIP_MIGRATION_STEP = 'Skipping %s, already applied'
+    SKIP_MISSING_TABLE = 'Skipping %s, table %s does not exist'
+    REBUILD_QUESTION_INDEX = 'Rebuilding the question sampling index'
+    BACKFILL_BEST_SCORES = 'Backfilling player best scores, player stats and leaderboard buckets'
+    BACKFILL_BEST_SCORES_SUCCESS = 'Player best scores, player stats and leaderboard buckets backfilled'
+    REBUILD_LEADERBOARD = 'Rebuilding the leaderboard ranking'
+    LEADERBOARD_DRIFT = 'Leaderboard ranking was out of date for %s players'
+    GET_PLAYER_RANK = 'Fetching leaderboard rank for player_id: %s'
+    PURGE_TOKEN_REVOCATIONS = 'Purged %s expired token revocations and quiz tickets and partitions %s in %s ms'
+    PASSWORD_POOL_FULL = 'Password hashing rejected, %s hashes already admitted'
+    REHASH_PASSWORD = 'Rehashing the password of %s with the current key derivation function'
+    REHASH_PASSWORD_SKIPPED = 'Password of %s not rehashed, retried on the next login'
 
 
 class ErrorMessage:
@@ -187,9 +211,20 @@ class ErrorMessage:
     EMAIL_TAKEN = 'This email is not available'
     USERNAME_TAKEN = 'This username is not available'
     LEADERBOARD_NOT_FOUND = 'No data in the leaderboard'
+    RANK_NOT_FOUND = 'No rank yet, take a quiz first'
     SCORES_NOT_FOUND = 'No scores for this player'
     QUESTIONS_NOT_FOUND = 'No questions present'
     QUESTION_NOT_FOUND = 'Question not found'
+    UNKNOWN_QUESTIONS = 'Questions not found: {question_ids}'
+    UNKNOWN_PLAYERS = 'Players not found: {player_ids}'
+    DUPLICATE_ANSWERS = 'Questions answered more than once: {question_ids}'
+    NO_ANSWERS = 'No answers submitted'
+    INVALID_CURSOR = 'Invalid pagination cursor'
+    INVALID_TICKET = 'Invalid quiz ticket'
+    TICKET_EXPIRED = 'The quiz ticket has expired'
+    TICKET_REDEEMED = 'The quiz ticket has already been used'
+    TICKET_REQUIRED = 'Answers must be submitted with the quiz ticket returned with the questions'
+    QUESTIONS_NOT_IN_TICKET = 'Questions not issued with the quiz ticket: {question_ids}'
     QUIZ_NOT_FOUND = 'Quiz data not found'
     TOKEN_REVOKED = 'The token has been revoked'
     TOKEN_NOT_FRESH = 'The token is not fresh'
@@ -197,6 +232,7 @@ class ErrorMessage:
     INVALID_TOKEN = 'Signature verification failed'
     MISSING_TOKEN = 'Request does not contain an access token'
     SERVER_ERROR = 'Something went wrong'
+    SERVER_BUSY = 'Too many sign ins in progress, please retry shortly'
     BAD_REQUEST = 'Invalid request syntax'
     FORBIDDEN = 'Access denied'
     INVALID_URL = 'Invalid URL'
@@ -222,6 +258,7 @@ class StatusCodes:
     CONFLICT = INFO(code=409, status='Conflict')
     UNPROCESSABLE_ENTITY = INFO(code=422, status='Unprocessable Entity')
     INTERNAL_SERVER_ERROR = INFO(code=500, status='Internal Server Error')
+    SERVICE_UNAVAILABLE = INFO(code=503, status='Service Unavailable')
 
 
 class QuestionTypes:
@@ -232,6 +269,14 @@ class QuestionTypes:
     ONE_WORD = 'one-word'
 
 
+class LeaderboardWindows:
+    '''Contains the time windows of the leaderboard'''
+
+    DAY = 'day'
+    WEEK = 'week'
+    ALL = 'all'
+
+
 class PasswordTypes:
     '''Contains password types'''
 
@@ -242,15 +287,13 @@ class PasswordTypes:
 class TokenInfo:
     'Contains token related constants'
 
-    status = {
-        'active': True,
-        'revoked': False
-    }
+    CLAIM_EPOCH = 'epoch'
     TYPE_ACCESS = 'access'
     TYPE_REFRESH = 'refresh'
 
 
 QUESTION_TYPES = [QuestionTypes.MCQ, QuestionTypes.TRUE_FALSE, QuestionTypes.ONE_WORD]
+LEADERBOARD_WINDOWS = [LeaderboardWindows.DAY, LeaderboardWindows.WEEK, LeaderboardWindows.ALL]
 
 
 AUTHORIZATION_HEADER = {
@@ -8,6 +8,7 @@ from config.string_constants import Message, StatusCodes
 from database.database_access import DatabaseAccess
 from utils.custom_response import SuccessMessage
 from utils.error_handlers import handle_custom_errors
+from utils.pagination import DEFAULT_PAGE_SIZE
 
 logger = logging.getLogger(__name__)
 
@@ -20,11 +21,13 @@ class CategoryController:
         self.category_business = CategoryBusiness(self.db)
 
     @handle_custom_errors
-    def get_all_categories(self):
-        '''Return all Quiz Categories'''
+    def get_all_categories(self, limit: int = DEFAULT_PAGE_SIZE, cursor: str = None):
+        '''Return a page of Quiz Categories'''
 
-        category_data = self.category_business.get_all_categories()
-        return SuccessMessage(status=StatusCodes.OK, message=Message.SUCCESS, data=category_data).message_info
+        category_data, next_cursor = self.category_business.get_all_categories(limit, cursor)
+        return SuccessMessage(
+            status=StatusCodes.OK, message=Message.SUCCESS, data=category_data, next_cursor=next_cursor
+        ).message_info
 
     @handle_custom_errors
     def create_category(self, category_data: Dict, user_id: str):
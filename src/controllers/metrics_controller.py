@@ -0,0 +1,26 @@
+'''Controllers for Operations related to Metrics'''
+
+import logging
+
+from business.metrics_business import MetricsBusiness
+from config.string_constants import Message, StatusCodes
+from database.database_access import DatabaseAccess
+from utils.custom_response import SuccessMessage
+from utils.error_handlers import handle_custom_errors
+
+logger = logging.getLogger(__name__)
+
+
+class MetricsController:
+    '''MetricsController class for runtime performance metrics'''
+
+    def __init__(self, database: DatabaseAccess) -> None:
+        self.db = database
+        self.metrics_business = MetricsBusiness(self.db)
+
+    @handle_custom_errors
+    def get_database_metrics(self):
+        '''Return per query latency statistics, the slow query log and connection pool usage'''
+
+        metrics = self.metrics_business.get_database_metrics()
+        return SuccessMessage(status=StatusCodes.OK, message=Message.SUCCESS, data=metrics).message_info
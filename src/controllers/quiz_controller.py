@@ -4,10 +4,11 @@ import logging
 from typing import Dict, List
 
 from business.quiz_business import QuizBusiness
-from config.string_constants import Message, StatusCodes
+from config.string_constants import LeaderboardWindows, Message, StatusCodes
 from database.database_access import DatabaseAccess
 from utils.custom_response import SuccessMessage
 from utils.error_handlers import handle_custom_errors
+from utils.pagination import DEFAULT_PAGE_SIZE
 
 logger = logging.getLogger(__name__)
 
@@ -20,32 +21,66 @@ class QuizController:
         self.quiz_business = QuizBusiness(self.db)
 
     @handle_custom_errors
-    def get_leaderboard(self):
-        '''Return top 10 scores for leaderboard'''
+    def get_leaderboard(self, limit: int = 10, window: str = LeaderboardWindows.ALL, category_id: str = None):
+        '''
+        Return the top `limit` players of the leaderboard
+        Filters: window, category_id
+        '''
 
-        leaderboard_data = self.quiz_business.get_leaderboard()
+        leaderboard_data = self.quiz_business.get_leaderboard(limit, window, category_id)
         return SuccessMessage(status=StatusCodes.OK, message=Message.SUCCESS, data=leaderboard_data).message_info
 
     @handle_custom_errors
-    def get_player_scores(self, player_id: str):
-        '''Return user's scores'''
+    def get_player_rank(self, player_id: str, neighbors: int = 2):
+        '''Return the leaderboard rank of a player with the players ranked around them'''
+
+        rank_data = self.quiz_business.get_player_rank(player_id, neighbors)
+        return SuccessMessage(status=StatusCodes.OK, message=Message.SUCCESS, data=rank_data).message_info
+
+    @handle_custom_errors
+    def get_player_scores(self, player_id: str, limit: int = DEFAULT_PAGE_SIZE, cursor: str = None):
+        '''Return a page of user's scores, newest first'''
 
-        scores = self.quiz_business.get_player_scores(player_id)
-        return SuccessMessage(status=StatusCodes.OK, message=Message.SUCCESS, data=scores).message_info
+        scores, next_cursor = self.quiz_business.get_player_scores(player_id, limit, cursor)
+        return SuccessMessage(
+            status=StatusCodes.OK, message=Message.SUCCESS, data=scores, next_cursor=next_cursor
+        ).message_info
 
     @handle_custom_errors
-    def get_random_questions(self, category_id: str = None, question_type: str = None, limit: int = 10):
+    def get_player_summary(self, player_id: str):
+        '''Return user's attempt count, average score, best score and last played time'''
+
+        summary = self.quiz_business.get_player_summary(player_id)
+        return SuccessMessage(status=StatusCodes.OK, message=Message.SUCCESS, data=summary).message_info
+
+    @handle_custom_errors
+    def get_random_questions(
+        self,
+        player_id: str,
+        category_id: str = None,
+        question_type: str = None,
+        limit: int = 10
+    ):
         '''
-        Return random questions for quiz
+        Return random questions for quiz with the quiz ticket
         Filters: category_id, question_type, limit
         '''
 
-        question_data = self.quiz_business.get_random_questions(category_id, question_type, limit)
-        return SuccessMessage(status=StatusCodes.OK, message=Message.SUCCESS, data=question_data).message_info
+        question_data, ticket = self.quiz_business.get_random_questions(player_id, category_id, question_type, limit)
+        return SuccessMessage(
+            status=StatusCodes.OK, message=Message.SUCCESS, data=question_data, ticket=ticket
+        ).message_info
 
     @handle_custom_errors
-    def evaluate_player_answers(self, player_id: str, player_answers: List[Dict]):
-        'Evaluate player answers and return score with correct answers'
+    def evaluate_player_answers(self, player_id: str, player_answers: List[Dict], ticket: str = None):
+        'Evaluate player answers with the quiz ticket and return score with correct answers'
 
-        result = self.quiz_business.evaluate_player_answers(player_id, player_answers)
+        result = self.quiz_business.evaluate_player_answers(player_id, player_answers, ticket)
         return SuccessMessage(status=StatusCodes.CREATED, message=Message.SUBMISSION_SUCCESS, data=result).message_info
+
+    @handle_custom_errors
+    def evaluate_answer_sheets(self, answer_sheets: List[Dict]):
+        'Evaluate the answer sheets of many players and return the score with correct answers of each'
+
+        results = self.quiz_business.evaluate_answer_sheets(answer_sheets)
+        return SuccessMessage(status=StatusCodes.CREATED, message=Message.SUBMISSION_SUCCESS, data=results).message_info
@@ -7,6 +7,7 @@ from business.user_business import UserBusiness
 from config.string_constants import Message, Roles, StatusCodes
 from utils.custom_response import SuccessMessage
 from utils.error_handlers import handle_custom_errors
+from utils.pagination import DEFAULT_PAGE_SIZE
 
 logger = logging.getLogger(__name__)
 
@@ -19,18 +20,22 @@ class UserController:
         self.user_business = UserBusiness(self.db)
 
     @handle_custom_errors
-    def get_all_admins(self):
-        '''Return all admins with their details'''
+    def get_all_admins(self, limit: int = DEFAULT_PAGE_SIZE, cursor: str = None):
+        '''Return a page of admins with their details'''
 
-        admin_data = self.user_business.get_all_users_by_role(role=Roles.ADMIN)
-        return SuccessMessage(status=StatusCodes.OK, message=Message.SUCCESS, data=admin_data).message_info
+        admin_data, next_cursor = self.user_business.get_all_users_by_role(Roles.ADMIN, limit, cursor)
+        return SuccessMessage(
+            status=StatusCodes.OK, message=Message.SUCCESS, data=admin_data, next_cursor=next_cursor
+        ).message_info
 
     @handle_custom_errors
-    def get_all_players(self):
-        '''Return all players with their details'''
+    def get_all_players(self, limit: int = DEFAULT_PAGE_SIZE, cursor: str = None):
+        '''Return a page of players with their details'''
 
-        player_data = self.user_business.get_all_users_by_role(role=Roles.PLAYER)
-        return SuccessMessage(status=StatusCodes.OK, message=Message.SUCCESS, data=player_data).message_info
+        player_data, next_cursor = self.user_business.get_all_users_by_role(Roles.PLAYER, limit, cursor)
+        return SuccessMessage(
+            status=StatusCodes.OK, message=Message.SUCCESS, data=player_data, next_cursor=next_cursor
+        ).message_info
 
     @handle_custom_errors
     def get_user_profile_data(self, user_id: str):
@@ -0,0 +1,70 @@
+'''Interface implemented by the database backends'''
+
+import importlib
+from abc import ABC, abstractmethod
+
+BACKENDS = {
+    'mysql': ('database.backends.mysql_backend', 'MySQLBackend'),
+    'sqlite': ('database.backends.sqlite_backend', 'SQLiteBackend')
+}
+
+
+class Backend(ABC):
+    '''
+    Abstract class for a database backend.
+
+    A backend opens the connections handed out by the connection pools. Connections expose
+    the subset of the mysql.connector API used by DatabaseAccess: cursor(dictionary, buffered,
+    prepared), commit(), rollback(), close(), consume_results(), is_connected() and connection_id.
+
+    Attributes:
+        name (str): The value of DB_BACKEND selecting the backend.
+        Error (type): Base class of the errors raised by the driver.
+        IntegrityError (type): Raised by the driver when a constraint is violated.
+        EXPLAIN (str): Prefix returning the plan of a statement.
+        ENFORCES_COLUMN_TYPES (bool): Whether declared column types decide how values are stored.
+        SUPPORTS_PARTITIONING (bool): Whether tables can be range partitioned.
+    '''
+
+    name = None
+    Error = Exception
+    IntegrityError = Exception
+    EXPLAIN = 'EXPLAIN '
+    ENFORCES_COLUMN_TYPES = True
+    SUPPORTS_PARTITIONING = True
+
+    @property
+    def has_replica(self) -> bool:
+        'Checks whether read only connections go to a separate server'
+
+        return False
+
+    @abstractmethod
+    def bootstrap(self) -> None:
+        '''Prepares the database, runs once per process before the first connection.'''
+
+    @abstractmethod
+    def connect(self, read_only: bool = False):
+        '''Opens a new connection, to a replica if `read_only` is set and one is configured.'''
+
+    def dialect(self, query: str) -> str:
+        '''Returns the version of a query, or of a query template, for this backend.'''
+
+        return query
+
+    def is_usable(self, connection) -> bool:
+        '''Checks whether an idle pooled connection can still be used.'''
+
+        return connection.is_connected()
+
+
+def load_backend(name: str) -> Backend:
+    '''Imports and instantiates the backend selected by DB_BACKEND.'''
+
+    try:
+        module_name, class_name = BACKENDS[name.lower()]
+    except KeyError as e:
+        raise ValueError(f'Unknown DB_BACKEND {name!r}, expected one of: {", ".join(BACKENDS)}') from e
+
+    module = importlib.import_module(module_name)
+    return getattr(module, class_name)()
@@ -0,0 +1,63 @@
+'''MySQL backend using mysql.connector'''
+
+import os
+
+import mysql.connector
+
+from config.queries import InitializationQueries
+from database.backends.base import Backend
+
+
+class MySQLBackend(Backend):
+    '''
+    Backend for a MySQL server, optionally with a read replica.
+
+    The database is created once by bootstrap() and every connection is bound to it
+    at connect time. Read only connections go to MYSQL_REPLICA_HOST when it is set.
+    '''
+
+    name = 'mysql'
+    Error = mysql.connector.Error
+    IntegrityError = mysql.connector.IntegrityError
+
+    MYSQL_USER = os.getenv('MYSQL_USER')
+    MYSQL_PASSWORD = os.getenv('MYSQL_PASSWORD')
+    MYSQL_HOST = os.getenv('MYSQL_HOST')
+    MYSQL_PORT = int(os.getenv('MYSQL_PORT', '3306'))
+    MYSQL_DB = os.getenv('MYSQL_DB')
+    MYSQL_REPLICA_HOST = os.getenv('MYSQL_REPLICA_HOST')
+    MYSQL_REPLICA_PORT = int(os.getenv('MYSQL_REPLICA_PORT', os.getenv('MYSQL_PORT', '3306')))
+
+    @property
+    def has_replica(self) -> bool:
+        'Checks whether a replica host is configured'
+
+        return bool(self.MYSQL_REPLICA_HOST)
+
+    def bootstrap(self) -> None:
+        'Creates the application database'
+
+        connection = mysql.connector.connect(
+            user=self.MYSQL_USER,
+            password=self.MYSQL_PASSWORD,
+            host=self.MYSQL_HOST,
+            port=self.MYSQL_PORT
+        )
+        try:
+            cursor = connection.cursor()
+            cursor.execute(InitializationQueries.CREATE_DATABASE.format(self.MYSQL_DB))
+            cursor.close()
+        finally:
+            connection.close()
+
+    def connect(self, read_only: bool = False) -> mysql.connector.connection.MySQLConnection:
+        'Opens a new connection bound to the application database'
+
+        replica = read_only and self.has_replica
+        return mysql.connector.connect(
+            user=self.MYSQL_USER,
+            password=self.MYSQL_PASSWORD,
+            host=self.MYSQL_REPLICA_HOST if replica else self.MYSQL_HOST,
+            port=self.MYSQL_REPLICA_PORT if replica else self.MYSQL_PORT,
+            database=self.MYSQL_DB
+        )
@@ -0,0 +1,209 @@
+'''Embedded SQLite backend for single node deployments and hermetic benchmarks'''
+
+import os
+import re
+import sqlite3
+from datetime import date, datetime
+from decimal import Decimal
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
+
+from config.queries import InitializationQueries, MigrationQueries, Queries, SQLiteQueries
+from database.backends.base import Backend
+
+# Statements replaced as a whole, keyed by the MySQL statement
+SQLITE_OVERRIDES = {
+    getattr(queries, name): value
+    for name, value in vars(SQLiteQueries).items() if name.isupper()
+    for queries in (InitializationQueries, Queries, MigrationQueries) if hasattr(queries, name)
+}
+
+# MySQL constructs used by the queries, rewritten to their SQLite equivalent
+MYSQL_TO_SQLITE = (
+    (re.compile(r'\bRAND\(\)', re.IGNORECASE), 'RANDOM()'),
+    (re.compile(r'\bROW_COUNT\(\)', re.IGNORECASE), 'changes()'),
+    (re.compile(r'\bLAST_INSERT_ID\(\)', re.IGNORECASE), 'last_insert_rowid()'),
+    (re.compile(r'\bINSERT\s+IGNORE\b', re.IGNORECASE), 'INSERT OR IGNORE'),
+    # GROUP_CONCAT(x SEPARATOR ';') -> GROUP_CONCAT(x, ';')
+    (re.compile(r'\s+SEPARATOR\s+', re.IGNORECASE), ', '),
+    (re.compile(r'%s'), '?')
+)
+
+# Columns declared with these types are returned as the values mysql.connector returns
+sqlite3.register_converter('DATETIME', lambda value: datetime.fromisoformat(value.decode()))
+sqlite3.register_converter('DATE', lambda value: date.fromisoformat(value.decode()))
+sqlite3.register_converter('DECIMAL', lambda value: Decimal(value.decode()))
+
+
+@lru_cache(maxsize=1024)
+def translate(query: str) -> str:
+    '''Rewrites a MySQL statement into the SQLite dialect.'''
+
+    query = SQLITE_OVERRIDES.get(query, query)
+    for pattern, replacement in MYSQL_TO_SQLITE:
+        query = pattern.sub(replacement, query)
+    return query
+
+
+class SQLiteCursor:
+    '''Cursor translating statements and returning rows like a mysql.connector cursor'''
+
+    def __init__(self, cursor: sqlite3.Cursor, dictionary: bool) -> None:
+        self.cursor = cursor
+        self.dictionary = dictionary
+
+    @property
+    def column_names(self) -> Tuple[str]:
+        'Names of the columns of the last result'
+
+        return tuple(column[0] for column in self.cursor.description or ())
+
+    @property
+    def rowcount(self) -> int:
+        'Rows changed by the last statement, -1 for queries'
+
+        return self.cursor.rowcount
+
+    def execute(self, query: str, data: Sequence = None) -> None:
+        'Executes a statement'
+
+        self.cursor.execute(translate(query), data or ())
+
+    def executemany(self, query: str, rows: Sequence[Sequence]) -> None:
+        'Executes a statement for every row'
+
+        self.cursor.executemany(translate(query), rows)
+
+    def fetchall(self) -> List:
+        'Returns the remaining rows'
+
+        return self.__rows(self.cursor.fetchall())
+
+    def fetchmany(self, size: int) -> List:
+        'Returns the next `size` rows'
+
+        return self.__rows(self.cursor.fetchmany(size))
+
+    def close(self) -> None:
+        'Closes the cursor, discarding unread rows'
+
+        self.cursor.close()
+
+    def __rows(self, rows: List[Tuple]) -> List:
+        if not self.dictionary:
+            return rows
+        names = self.column_names
+        return [dict(zip(names, row)) for row in rows]
+
+
+class SQLiteConnection:
+    '''Connection exposing the subset of the mysql.connector API used by DatabaseAccess'''
+
+    def __init__(self, connection: sqlite3.Connection) -> None:
+        self.connection = connection
+        self.connection_id = id(connection)
+
+    def cursor(self, dictionary: bool = False, buffered: bool = True, prepared: bool = False) -> SQLiteCursor:
+        '''
+        Returns a new cursor.
+
+        `buffered` and `prepared` are accepted for compatibility, sqlite3 steps through results
+        lazily and caches prepared statements per connection.
+        '''
+        return SQLiteCursor(self.connection.cursor(), dictionary)
+
+    def commit(self) -> None:
+        'Commits the current transaction'
+
+        self.connection.commit()
+
+    def rollback(self) -> None:
+        'Rolls back the current transaction'
+
+        self.connection.rollback()
+
+    def close(self) -> None:
+        'Closes the connection'
+
+        self.connection.close()
+
+    def consume_results(self) -> None:
+        'Nothing to do, unread rows are discarded when their cursor is closed'
+
+    def is_connected(self) -> bool:
+        'Checks whether the connection is still open'
+
+        try:
+            self.connection.execute('SELECT 1')
+            return True
+        except sqlite3.Error:
+            return False
+
+
+class SQLiteBackend(Backend):
+    '''
+    Backend for an SQLite database file in WAL mode.
+
+    WAL lets readers run concurrently with the single writer. Writes take the write lock
+    when their transaction begins (BEGIN IMMEDIATE) and wait up to SQLITE_BUSY_TIMEOUT_MS
+    for it instead of failing on an upgrade from a read lock. Every connection gets the
+    `pragmas`, foreign keys are enforced to keep the ON DELETE CASCADE semantics.
+    '''
+
+    name = 'sqlite'
+    Error = sqlite3.Error
+    IntegrityError = sqlite3.IntegrityError
+    EXPLAIN = 'EXPLAIN QUERY PLAN '
+    ENFORCES_COLUMN_TYPES = False
+    SUPPORTS_PARTITIONING = False
+
+    SQLITE_PATH = os.getenv('SQLITE_PATH', 'quizapp.db')
+    SQLITE_BUSY_TIMEOUT_MS = int(os.getenv('SQLITE_BUSY_TIMEOUT_MS', '5000'))
+    SQLITE_CACHE_SIZE_KB = int(os.getenv('SQLITE_CACHE_SIZE_KB', '16384'))
+    SQLITE_MMAP_SIZE = int(os.getenv('SQLITE_MMAP_SIZE', str(256 * 1024 * 1024)))
+
+    def __init__(self, path: str = None) -> None:
+        self.path = path or self.SQLITE_PATH
+
+    @property
+    def pragmas(self) -> Dict[str, object]:
+        'Pragmas applied to every connection'
+
+        return {
+            'synchronous': 'NORMAL',
+            'foreign_keys': 'ON',
+            'busy_timeout': self.SQLITE_BUSY_TIMEOUT_MS,
+            'cache_size': -self.SQLITE_CACHE_SIZE_KB,
+            'temp_store': 'MEMORY',
+            'mmap_size': self.SQLITE_MMAP_SIZE
+        }
+
+    def bootstrap(self) -> None:
+        'Creates the database file and switches it to WAL, the journal mode persists in the file'
+
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(self.path)
+        try:
+            connection.execute('PRAGMA journal_mode = WAL')
+        finally:
+            connection.close()
+
+    def dialect(self, query: str) -> str:
+        'Returns the SQLite version of a query or query template'
+
+        return SQLITE_OVERRIDES.get(query, query)
+
+    def connect(self, read_only: bool = False) -> SQLiteConnection:
+        'Opens a new connection to the database file, there are no replicas'
+
+        connection = sqlite3.connect(
+            self.path,
+            timeout=self.SQLITE_BUSY_TIMEOUT_MS / 1000,
+            isolation_level='IMMEDIATE',
+            detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES,
+            check_same_thread=False
+        )
+        for pragma, value in self.pragmas.items():
+            connection.execute(f'PRAGMA {pragma} = {value}')
+        return SQLiteConnection(connection)
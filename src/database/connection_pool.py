@@ -0,0 +1,165 @@
+'''Thread safe connection pool with overflow and checkout statistics'''
+
+import logging
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict
+
+logger = logging.getLogger(__name__)
+
+
+class PoolTimeoutError(Exception):
+    '''Exception raised when no connection could be checked out within the pool timeout.'''
+
+
+class ConnectionPool:
+    '''
+    A pool of reusable database connections.
+
+    Connections are created lazily through the given factory. Up to `size` connections
+    are kept open once created, up to `overflow` extra connections may be opened under
+    load and are closed again as soon as they are returned. Connections that sat idle
+    for longer than `validate_after` seconds are checked with `validate` before reuse.
+
+    Methods:
+        acquire(): Checks out a connection, waiting up to `timeout` seconds.
+        release(): Returns a checked out connection to the pool.
+        stats(): Returns checkout wait time and usage counters.
+    '''
+
+    def __init__(
+        self,
+        connect: Callable[[], Any],
+        size: int = 3,
+        overflow: int = 0,
+        timeout: float = 30.0,
+        validate: Callable[[Any], bool] = None,
+        validate_after: float = 60.0
+    ) -> None:
+        if size < 1 or overflow < 0:
+            raise ValueError('Pool size must be positive and overflow cannot be negative')
+
+        self.connect = connect
+        self.size = size
+        self.overflow = overflow
+        self.timeout = timeout
+        self.validate = validate
+        self.validate_after = validate_after
+
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size + overflow)
+        self._lock = threading.Lock()
+        self._opened = 0
+        self._in_use = 0
+        self._peak_in_use = 0
+        self._checkouts = 0
+        self._timeouts = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    def acquire(self) -> Any:
+        '''Checks out a connection from the pool, opening a new one if none is idle.'''
+
+        start = time.perf_counter()
+        if not self._slots.acquire(timeout=self.timeout):
+            with self._lock:
+                self._timeouts += 1
+            raise PoolTimeoutError(f'No connection available within {self.timeout} seconds')
+        waited = time.perf_counter() - start
+
+        with self._lock:
+            self._checkouts += 1
+            self._in_use += 1
+            self._peak_in_use = max(self._peak_in_use, self._in_use)
+            self._total_wait += waited
+            self._max_wait = max(self._max_wait, waited)
+
+        while True:
+            try:
+                connection, returned_at = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            if self.__is_usable(connection, returned_at):
+                return connection
+            self.__close(connection)
+
+        try:
+            connection = self.connect()
+        except Exception:
+            self.__free_slot()
+            raise
+
+        with self._lock:
+            self._opened += 1
+        return connection
+
+    def release(self, connection: Any, discard: bool = False) -> None:
+        '''
+        Returns a connection to the pool.
+
+        Overflow connections and connections flagged with `discard` are closed instead of
+        being kept idle.
+        '''
+
+        if discard or self._idle.qsize() >= self.size:
+            self.__close(connection)
+        else:
+            self._idle.put((connection, time.monotonic()))
+        self.__free_slot()
+
+    def close_all(self) -> None:
+        '''Closes every idle connection in the pool.'''
+
+        while True:
+            try:
+                connection, _ = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            self.__close(connection)
+
+    def stats(self) -> Dict:
+        '''Returns checkout wait time and in-use counters of the pool.'''
+
+        with self._lock:
+            checkouts = self._checkouts
+            return {
+                'size': self.size,
+                'overflow': self.overflow,
+                'opened': self._opened,
+                'idle': self._idle.qsize(),
+                'in_use': self._in_use,
+                'peak_in_use': self._peak_in_use,
+                'checkouts': checkouts,
+                'timeouts': self._timeouts,
+                'avg_wait_ms': round(self._total_wait / checkouts * 1000, 3) if checkouts else 0.0,
+                'max_wait_ms': round(self._max_wait * 1000, 3)
+            }
+
+    def __is_usable(self, connection: Any, returned_at: float) -> bool:
+        '''Validates connections that have been idle for too long.'''
+
+        if not self.validate or time.monotonic() - returned_at < self.validate_after:
+            return True
+        try:
+            return self.validate(connection)
+        except Exception as e:
+            logger.warning(e)
+            return False
+
+    def __close(self, connection: Any) -> None:
+        '''Closes a connection that leaves the pool.'''
+
+        with self._lock:
+            self._opened -= 1
+        try:
+            connection.close()
+        except Exception as e:
+            logger.warning(e)
+
+    def __free_slot(self) -> None:
+        '''Marks a checkout slot as free again.'''
+
+        with self._lock:
+            self._in_use -= 1
+        self._slots.release()
@@ -1,44 +1,274 @@
 '''Contains methods for establishing database connection'''
 
 import logging
-from typing import Dict, List, Tuple
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Sequence, Tuple
 
 from config.queries import InitializationQueries
-from database.database_connection import DatabaseConnection
+from database.database_connection import DatabaseConnection, backend
+from database.query_metrics import estimate_size, is_explainable, query_metrics
+from database.read_your_writes import read_your_writes
+from database.statement_cache import StatementCache
 
 logger = logging.getLogger(__name__)
+transaction_state = threading.local()
 
 
 class DatabaseAccess:
-    '''A class for database methods.'''
+    '''
+    A class for database methods.
 
-    def read(self, query: str, data: Tuple = None) -> List[Dict]:
-        '''Reads data from database.'''
+    Reads go to the replica pool unless they run inside a transaction, ask for the primary,
+    or follow a write made by the same request or user within READ_YOUR_WRITES_WINDOW.
+    Writes always go to the primary.
+    '''
 
+    READ_BATCH_SIZE = int(os.getenv('DB_READ_BATCH_SIZE', '500'))
+    WRITE_CHUNK_SIZE = int(os.getenv('DB_WRITE_CHUNK_SIZE', '500'))
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        '''
+        Unit of work spanning several reads and writes.
+
+        Pins one pooled connection to the current thread, every DatabaseAccess call made
+        inside the block runs on it and everything is committed once when the block exits,
+        or rolled back if it raises. Nested blocks join the outermost transaction. Callbacks
+        registered with after_commit() run once the outermost block committed.
+        '''
+        if getattr(transaction_state, 'connection', None) is not None:
+            yield
+            return
+
+        callbacks = []
         with DatabaseConnection() as connection:
-            cursor = connection.cursor(dictionary=True)
-            if not data:
-                cursor.execute(query)
-            else:
+            transaction_state.connection = connection
+            transaction_state.after_commit = callbacks
+            try:
+                yield
+            finally:
+                transaction_state.connection = None
+                transaction_state.after_commit = None
+
+        for callback in callbacks:
+            callback()
+
+    def after_commit(self, callback: Callable[[], None]) -> None:
+        '''
+        Runs a callback once the current transaction committed, at once outside a transaction.
+        Dropped if the transaction rolls back.
+        '''
+        callbacks = getattr(transaction_state, 'after_commit', None)
+        if callbacks is None:
+            callback()
+        else:
+            callbacks.append(callback)
+
+    @contextmanager
+    def __connection(self, read_only: bool = False) -> Iterator:
+        '''Yields the connection pinned by a transaction, or a freshly checked out one.'''
+
+        connection = getattr(transaction_state, 'connection', None)
+        if connection is not None:
+            yield connection
+            return
+
+        read_only = read_only and not read_your_writes.needs_primary()
+        with DatabaseConnection(read_only=read_only) as connection:
+            yield connection
+
+    def read(self, query: str, data: Tuple = None, use_primary: bool = False) -> List[Dict]:
+        '''
+        Reads data from database.
+
+        Served by a replica unless `use_primary` is set or read-your-writes applies.
+        Static queries from Queries run as prepared statements cached per pooled connection.
+        '''
+
+        with self.__connection(read_only=not use_primary) as connection:
+            start = time.perf_counter()
+            if data and StatementCache.is_enabled_for(query):
+                cursor = StatementCache.for_connection(connection).cursor(query)
                 cursor.execute(query, data)
+                result = [dict(zip(cursor.column_names, row)) for row in cursor.fetchall()]
+            else:
+                cursor = connection.cursor(dictionary=True)
+                if not data:
+                    cursor.execute(query)
+                else:
+                    cursor.execute(query, data)
+                result = cursor.fetchall()
 
-            return cursor.fetchall()
+            elapsed = time.perf_counter() - start
+            self.__record(connection, query, data, elapsed, len(result), estimate_size(result))
+            return result
 
-    def write(self, query: str, data: Tuple = None) -> bool:
-        '''CREATE TABLE / Add / Update / Delete data from database.'''
+    def iter_read(self, query: str, data: Tuple = None, batch_size: int = None) -> Iterator[Dict]:
+        '''
+        Streams rows from the database instead of materializing the whole result.
 
-        with DatabaseConnection() as connection:
-            cursor = connection.cursor()
+        Uses an unbuffered cursor, rows are pulled from the server `batch_size` at a time
+        (defaults to DB_READ_BATCH_SIZE) and yielded one by one. The connection stays checked
+        out until the iterator is exhausted or closed, so consume it before issuing another
+        query inside the same transaction. Routed like read().
+        '''
+        batch_size = batch_size or DatabaseAccess.READ_BATCH_SIZE
+
+        with self.__connection(read_only=True) as connection:
+            start = time.perf_counter()
+            cursor = connection.cursor(dictionary=True, buffered=False)
             if not data:
                 cursor.execute(query)
             else:
                 cursor.execute(query, data)
-            cursor.execute('SELECT ROW_COUNT()')
 
-            rows_affected = cursor.fetchone()[0]
-            if rows_affected:
-                return True
-            return False
+            exhausted = False
+            row_count = fetched_bytes = 0
+            try:
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        exhausted = True
+                        break
+                    row_count += len(rows)
+                    fetched_bytes += estimate_size(rows)
+                    yield from rows
+            finally:
+                if not exhausted:
+                    connection.consume_results()
+                cursor.close()
+
+            # Timed until the stream is drained, so this includes the time spent by the consumer
+            elapsed = time.perf_counter() - start
+            self.__record(connection, query, data, elapsed, row_count, fetched_bytes)
+
+    def write(self, query: str, data: Tuple = None) -> int:
+        '''CREATE TABLE / Add / Update / Delete data from database, returns the number of rows affected.'''
+
+        with self.__connection() as connection:
+            start = time.perf_counter()
+            if data and StatementCache.is_enabled_for(query):
+                cursor = StatementCache.for_connection(connection).cursor(query)
+                cursor.execute(query, data)
+            else:
+                cursor = connection.cursor()
+                if not data:
+                    cursor.execute(query)
+                else:
+                    cursor.execute(query, data)
+
+            elapsed = time.perf_counter() - start
+            row_count = max(cursor.rowcount, 0)
+            self.__record(connection, query, data, elapsed, row_count)
+            read_your_writes.mark_write()
+            return row_count
+
+    def write_many(
+        self,
+        query: str,
+        rows: Sequence[Tuple],
+        chunk_size: int = None,
+        skip_failed_rows: bool = False
+    ) -> List[bool]:
+        '''
+        Writes many rows with one statement in a single transaction.
+
+        Rows are sent in chunks of `chunk_size` through executemany, which mysql.connector
+        rewrites into a multi-row INSERT for INSERT ... VALUES statements on MySQL. Inside a
+        transaction() block the rows are committed together with the rest of the block.
+
+        Args:
+            query (str): The parameterised statement to execute for every row.
+            rows (Sequence[Tuple]): The parameters for each row.
+            chunk_size (int): Rows per statement, defaults to DB_WRITE_CHUNK_SIZE.
+            skip_failed_rows (bool): If set, a chunk failing with an IntegrityError is retried
+                row by row and failing rows are logged and skipped instead of aborting the batch.
+
+        Returns:
+            List[bool]: The outcome for each row, in the order of `rows`.
+        '''
+        if not rows:
+            return []
+
+        chunk_size = chunk_size or DatabaseAccess.WRITE_CHUNK_SIZE
+        outcomes = []
+        with self.__connection() as connection:
+            started = time.perf_counter()
+            cursor = connection.cursor()
+            for start in range(0, len(rows), chunk_size):
+                chunk = rows[start:start + chunk_size]
+                if not skip_failed_rows:
+                    cursor.executemany(query, chunk)
+                    outcomes.extend([True] * len(chunk))
+                else:
+                    outcomes.extend(self.__write_chunk(cursor, query, chunk))
+
+            elapsed = time.perf_counter() - started
+            self.__record(connection, query, None, elapsed, sum(outcomes))
+            read_your_writes.mark_write()
+
+        return outcomes
+
+    def __write_chunk(self, cursor, query: str, chunk: Sequence[Tuple]) -> List[bool]:
+        '''Writes a chunk at once, falling back to row by row writes on an IntegrityError.'''
+
+        cursor.execute('SAVEPOINT write_many')
+        try:
+            cursor.executemany(query, chunk)
+            return [True] * len(chunk)
+        except backend.IntegrityError:
+            cursor.execute('ROLLBACK TO SAVEPOINT write_many')
+
+        outcomes = []
+        for row in chunk:
+            try:
+                cursor.execute(query, row)
+                outcomes.append(True)
+            except backend.IntegrityError as e:
+                logger.info(e)
+                outcomes.append(False)
+        return outcomes
+
+    def __record(self, connection, query: str, data: Tuple, elapsed: float, rows: int, fetched_bytes: int = 0):
+        '''Records the timing of a statement, capturing its plan when it was slow.'''
+
+        query_metrics.record(query, elapsed, rows, fetched_bytes)
+        if query_metrics.is_slow(elapsed):
+            query_metrics.record_slow_query(query, elapsed, self.__explain(connection, query, data))
+
+    def __explain(self, connection, query: str, data: Tuple) -> List[Dict]:
+        '''Returns the EXPLAIN plan of a statement, or an empty plan if it cannot be explained.'''
+
+        if not is_explainable(query) or ('%s' in query and not data):
+            return []
+        try:
+            cursor = connection.cursor(dictionary=True)
+            cursor.execute(backend.EXPLAIN + query, data or ())
+            return cursor.fetchall()
+        except backend.Error as e:
+            logger.warning(e)
+            return []
+
+    def query_stats(self) -> Dict:
+        '''Returns per query latency statistics and the slow query log.'''
+
+        return query_metrics.snapshot()
+
+    def pool_stats(self) -> Dict:
+        '''Returns checkout wait time and in-use counts of the primary and replica pools.'''
+
+        stats = {'primary': DatabaseConnection.get_pool().stats()}
+        if backend.has_replica:
+            stats['replica'] = DatabaseConnection.get_replica_pool().stats()
+        return stats
+
+    def statement_cache_stats(self) -> Dict:
+        '''Returns hit and miss counters of the prepared statement caches.'''
+
+        return StatementCache.stats()
 
     def create_tables(self) -> None:
         '''
@@ -48,10 +278,14 @@ class DatabaseAccess:
         - Users
         - Credentials
         - Scores
+        - Player best scores
+        - Player stats
         - Categories
         - Questions
         - Options
-        - Tokens
+        - User token epochs
+        - Token revocations
+        - Redeemed quiz tickets
 
         Returns: 
             None
@@ -61,7 +295,12 @@ class DatabaseAccess:
             cursor.execute(InitializationQueries.CREATE_USERS_TABLE)
             cursor.execute(InitializationQueries.CREATE_CREDENTIALS_TABLE)
             cursor.execute(InitializationQueries.CREATE_SCORES_TABLE)
+            cursor.execute(InitializationQueries.CREATE_PLAYER_BEST_SCORES_TABLE)
+            cursor.execute(InitializationQueries.CREATE_PLAYER_STATS_TABLE)
+            cursor.execute(InitializationQueries.CREATE_LEADERBOARD_BUCKETS_TABLE)
             cursor.execute(InitializationQueries.CREATE_CATEGORIES_TABLE)
             cursor.execute(InitializationQueries.CREATE_QUESTIONS_TABLE)
             cursor.execute(InitializationQueries.CREATE_OPTIONS_TABLE)
-            cursor.execute(InitializationQueries.CREATE_TOKEN_TABLE)
+            cursor.execute(InitializationQueries.CREATE_USER_TOKEN_EPOCHS_TABLE)
+            cursor.execute(InitializationQueries.CREATE_TOKEN_REVOCATIONS_TABLE)
+            cursor.execute(InitializationQueries.CREATE_REDEEMED_TICKETS_TABLE)
@@ -2,54 +2,96 @@
 
 import logging
 import os
+import threading
 
-import mysql.connector
-
-from config.queries import InitializationQueries
+from database.backends.base import load_backend
+from database.connection_pool import ConnectionPool
 
 logger = logging.getLogger(__name__)
 
+backend = load_backend(os.getenv('DB_BACKEND', 'mysql'))
+# Driver errors of the selected backend, caught by the business layer
+DatabaseError = backend.Error
+IntegrityError = backend.IntegrityError
+
 
 class DatabaseConnection:
     '''
-    A class for MySQL database connection
-    Automatically opens, commits, and closes the connections
-        
-    Implements Connection through MySQL connection pools
+    A class for the database connection
+    Automatically checks out, commits, and returns the connections
+
+    Implements Connection through process wide connection pools over the backend
+    selected by DB_BACKEND (mysql or sqlite). The backend is bootstrapped once when
+    the primary pool is built.
+
+    Read only connections come from a separate pool when the backend has a replica,
+    otherwise they are served by the primary pool.
     '''
 
-    MYSQL_USER = os.getenv('MYSQL_USER')
-    MYSQL_PASSWORD = os.getenv('MYSQL_PASSWORD')
-    MYSQL_HOST = os.getenv('MYSQL_HOST')
-    MYSQL_DB = os.getenv('MYSQL_DB')
-    MYSQL_POOL_NAME = 'quizapp_pool'
-    MYSQL_POOL_SIZE = 3
+    POOL_SIZE = int(os.getenv('MYSQL_POOL_SIZE', '3'))
+    POOL_OVERFLOW = int(os.getenv('MYSQL_POOL_OVERFLOW', '0'))
+    POOL_TIMEOUT = float(os.getenv('MYSQL_POOL_TIMEOUT', '30'))
+    REPLICA_POOL_SIZE = int(os.getenv('MYSQL_REPLICA_POOL_SIZE', os.getenv('MYSQL_POOL_SIZE', '3')))
+
+    pool = None
+    replica_pool = None
+    pool_lock = threading.Lock()
 
-    def __init__(self) -> None:
+    def __init__(self, read_only: bool = False) -> None:
         self.connection = None
-        self.cursor = None
-        self.setup_connection()
-
-    def setup_connection(self) -> None:
-        'sets up connection to MySQL'
-
-        self.connection = mysql.connector.connect(
-            user=DatabaseConnection.MYSQL_USER,
-            password=DatabaseConnection.MYSQL_PASSWORD,
-            host=DatabaseConnection.MYSQL_HOST,
-            pool_name=DatabaseConnection.MYSQL_POOL_NAME,
-            pool_size=DatabaseConnection.MYSQL_POOL_SIZE
-        )
-        self.cursor = self.connection.cursor()
-        self.cursor.execute(InitializationQueries.CREATE_DATABASE.format(DatabaseConnection.MYSQL_DB))
-        self.cursor.execute(InitializationQueries.USE_DATABASE.format(DatabaseConnection.MYSQL_DB))
-
-    def __enter__(self) -> mysql.connector.connection.MySQLConnection:
+        self.pool = DatabaseConnection.get_replica_pool() if read_only else DatabaseConnection.get_pool()
+
+    @classmethod
+    def get_pool(cls) -> ConnectionPool:
+        'Returns the primary connection pool, bootstrapping the backend and the pool on first use'
+
+        if cls.pool is None:
+            with cls.pool_lock:
+                if cls.pool is None:
+                    backend.bootstrap()
+                    cls.pool = ConnectionPool(
+                        connect=backend.connect,
+                        size=cls.POOL_SIZE,
+                        overflow=cls.POOL_OVERFLOW,
+                        timeout=cls.POOL_TIMEOUT,
+                        validate=backend.is_usable
+                    )
+        return cls.pool
+
+    @classmethod
+    def get_replica_pool(cls) -> ConnectionPool:
+        'Returns the read only connection pool, the primary pool when there is no replica'
+
+        if not backend.has_replica:
+            return cls.get_pool()
+
+        if cls.replica_pool is None:
+            with cls.pool_lock:
+                if cls.replica_pool is None:
+                    cls.replica_pool = ConnectionPool(
+                        connect=lambda: backend.connect(read_only=True),
+                        size=cls.REPLICA_POOL_SIZE,
+                        overflow=cls.POOL_OVERFLOW,
+                        timeout=cls.POOL_TIMEOUT,
+                        validate=backend.is_usable
+                    )
+        return cls.replica_pool
+
+    def __enter__(self):
+        self.connection = self.pool.acquire()
         return self.connection
 
     def __exit__(self, exc_type, exc_val, exc_tb) -> None:
-        if exc_type or exc_tb or exc_val:
-            self.connection.close()
-        else:
-            self.connection.commit()
-            self.connection.close()
+        pool = self.pool
+        try:
+            if exc_type or exc_tb or exc_val:
+                self.connection.rollback()
+            else:
+                self.connection.commit()
+        except backend.Error as e:
+            logger.exception(e)
+            pool.release(self.connection, discard=True)
+            if not exc_type:
+                raise
+            return
+        pool.release(self.connection)
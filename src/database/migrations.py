@@ -0,0 +1,357 @@
+'''Versioned schema migrations applied at start up'''
+
+import logging
+import re
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import List, Set, Tuple
+
+from config.queries import MigrationQueries, Queries
+from config.string_constants import LogMessage
+from database.database_access import DatabaseAccess
+from database.database_connection import IntegrityError, backend
+from database.partitions import DayPartitions
+
+logger = logging.getLogger(__name__)
+
+
+class MigrationStep(ABC):
+    '''
+    Abstract class for one step of a migration.
+
+    Steps must be idempotent: a migration interrupted half way is applied again from
+    its first step on the next start, DDL cannot be rolled back on MySQL.
+    '''
+
+    @abstractmethod
+    def apply(self, db: DatabaseAccess) -> None:
+        '''Applies the step unless it is already in place.'''
+
+
+@dataclass(frozen=True)
+class CreateIndex(MigrationStep):
+    '''
+    Creates an index if it does not exist yet, nothing if its table no longer exists.
+
+    On MySQL the index is built online (ALGORITHM=INPLACE, LOCK=NONE), reads and
+    writes to the table continue while it is built.
+    '''
+    table: str
+    name: str
+    columns: Tuple[str, ...]
+
+    def exists(self, db: DatabaseAccess) -> bool:
+        'Checks whether the index exists'
+
+        return bool(db.read(backend.dialect(MigrationQueries.GET_INDEX), (self.table, self.name), use_primary=True))
+
+    def table_exists(self, db: DatabaseAccess) -> bool:
+        'Checks whether the table exists, a later migration may have dropped it'
+
+        return bool(db.read(backend.dialect(MigrationQueries.GET_TABLE), (self.table, ), use_primary=True))
+
+    def apply(self, db: DatabaseAccess) -> None:
+        if not self.table_exists(db):
+            logger.info(LogMessage.SKIP_MISSING_TABLE, self.name, self.table)
+            return
+        if self.exists(db):
+            logger.info(LogMessage.SKIP_MIGRATION_STEP, self.name)
+            return
+
+        query = backend.dialect(MigrationQueries.CREATE_INDEX)
+        db.write(query.format(name=self.name, table=self.table, columns=', '.join(self.columns)))
+
+
+@dataclass(frozen=True)
+class ModifyColumns(MigrationStep):
+    '''
+    Changes the type of columns, with one ALTER TABLE for all columns of the table that differ.
+
+    A type change rebuilds the table on MySQL, writes to it wait until the copy finished.
+    Skipped on backends that do not enforce column types (SQLite keeps a type affinity and
+    converts values on read).
+    '''
+    table: str
+    columns: Tuple[Tuple[str, str], ...]
+
+    def current_type(self, db: DatabaseAccess, column: str) -> str:
+        'Returns the normalized type of a column'
+
+        rows = db.read(MigrationQueries.GET_COLUMN_TYPE, (self.table, column), use_primary=True)
+        return normalize_type(rows[0]['column_type']) if rows else ''
+
+    def apply(self, db: DatabaseAccess) -> None:
+        if not backend.ENFORCES_COLUMN_TYPES:
+            logger.info(LogMessage.SKIP_MIGRATION_STEP, f'{self.table} column types')
+            return
+
+        modifications = [
+            f'MODIFY {column} {column_type}' for column, column_type in self.columns
+            if self.current_type(db, column) != normalize_type(column_type)
+        ]
+        if not modifications:
+            logger.info(LogMessage.SKIP_MIGRATION_STEP, f'{self.table} column types')
+            return
+
+        query = MigrationQueries.MODIFY_COLUMNS
+        db.write(query.format(table=self.table, modifications=', '.join(modifications)))
+
+
+@dataclass(frozen=True)
+class AddColumns(MigrationStep):
+    '''
+    Adds the columns missing from a table, one ALTER TABLE per column.
+
+    Nullable columns without a default are added in place on MySQL 8 (ALGORITHM=INSTANT),
+    existing rows read NULL.
+    '''
+    table: str
+    columns: Tuple[Tuple[str, str], ...]
+
+    def exists(self, db: DatabaseAccess, column: str) -> bool:
+        'Checks whether the column exists'
+
+        return bool(db.read(MigrationQueries.GET_COLUMN_TYPE, (self.table, column), use_primary=True))
+
+    def apply(self, db: DatabaseAccess) -> None:
+        for column, column_type in self.columns:
+            if self.exists(db, column):
+                logger.info(LogMessage.SKIP_MIGRATION_STEP, f'{self.table}.{column}')
+                continue
+
+            query = MigrationQueries.ADD_COLUMN
+            db.write(query.format(table=self.table, column=column, column_type=column_type))
+
+
+@dataclass(frozen=True)
+class Backfill(MigrationStep):
+    '''
+    Fills a table from existing rows.
+
+    The query must be an upsert (INSERT ... SELECT ... ON DUPLICATE KEY UPDATE) merging with
+    rows already present, or an update of the rows not filled yet, so the step can run again
+    and races with live writes are harmless.
+    '''
+    table: str
+    query: str
+
+    def apply(self, db: DatabaseAccess) -> None:
+        db.write(self.query)
+
+
+@dataclass(frozen=True)
+class DropTable(MigrationStep):
+    '''
+    Drops a table that is no longer used, with its indexes.
+
+    Processes still running a version that uses the table fail on it, roll it out once no
+    such process is left.
+    '''
+    table: str
+
+    def apply(self, db: DatabaseAccess) -> None:
+        db.write(MigrationQueries.DROP_TABLE.format(table=self.table))
+
+
+@dataclass(frozen=True)
+class PartitionByDay(MigrationStep):
+    '''
+    Range partitions a table by the UTC day of a DATETIME column, starting with a partition
+    for today, see DayPartitions.
+
+    MySQL requires the partition column in every unique key: the column becomes NOT NULL and
+    the primary key `primary_key`. Both ALTER TABLE statements rebuild the table. Skipped on
+    backends without partitioning.
+    '''
+    table: str
+    column: str
+    primary_key: Tuple[str, ...]
+
+    def apply(self, db: DatabaseAccess) -> None:
+        partitions = DayPartitions(self.table, self.column)
+        if not backend.SUPPORTS_PARTITIONING or partitions.exists(db):
+            logger.info(LogMessage.SKIP_MIGRATION_STEP, f'{self.table} partitions')
+            return
+
+        query = MigrationQueries.SET_PRIMARY_KEY
+        db.write(query.format(table=self.table, column=self.column, primary_key=', '.join(self.primary_key)))
+        partitions.create(db, datetime.now(timezone.utc).date())
+
+
+def normalize_type(column_type: str) -> str:
+    '''Normalizes a column type for comparison, e.g. 'TINYINT(3) UNSIGNED' and 'tinyint unsigned'.'''
+
+    column_type = re.sub(r'\s+', ' ', column_type.lower().replace(', ', ',')).strip()
+    return re.sub(r'(int)\(\d+\)', r'\1', column_type)
+
+
+@dataclass(frozen=True)
+class Migration:
+    '''
+    A numbered schema change.
+
+    Attributes:
+        version (int): Applied in ascending order, recorded in schema_migrations.
+        description (str): Short summary of the change.
+        steps (Tuple[MigrationStep, ...]): The idempotent steps making up the change.
+    '''
+    version: int
+    description: str
+    steps: Tuple[MigrationStep, ...]
+
+
+MIGRATIONS = (
+    Migration(
+        version=1,
+        description='Indexes for the leaderboard, quiz fetch, token revocation and evaluation',
+        # The tokens table is dropped by migration 7 and no longer created, its index is skipped
+        steps=(
+            CreateIndex('scores', 'idx_scores_player_score', ('player_id', 'score')),
+            CreateIndex('questions', 'idx_questions_category_type', ('category_id', 'question_type')),
+            CreateIndex('tokens', 'idx_tokens_user_status', ('user_id', 'status')),
+            CreateIndex('options', 'idx_options_question_correct', ('question_id', 'isCorrect'))
+        )
+    ),
+    Migration(
+        version=2,
+        description='Native DATETIME, DATE, DECIMAL and TINYINT columns',
+        steps=(
+            ModifyColumns('scores', (('score', 'DECIMAL(5, 2)'), ('timestamp', 'DATETIME'))),
+            ModifyColumns('users', (('registration_date', 'DATE'), )),
+            ModifyColumns('credentials', (('isPasswordChanged', 'TINYINT UNSIGNED'), )),
+            ModifyColumns('options', (('isCorrect', 'TINYINT UNSIGNED'), ))
+        )
+    ),
+    Migration(
+        version=3,
+        description='Per player best scores for the leaderboard',
+        steps=(
+            Backfill('player_best_scores', Queries.BACKFILL_PLAYER_BEST_SCORES),
+            CreateIndex('player_best_scores', 'idx_best_scores_rank', ('score DESC', 'timestamp ASC'))
+        )
+    ),
+    Migration(
+        version=4,
+        description='Category and question type of scores, daily and per category leaderboard buckets',
+        steps=(
+            AddColumns('scores', (('category_id', 'VARCHAR(10)'), ('question_type', 'VARCHAR(25)'))),
+            Backfill('leaderboard_buckets', Queries.BACKFILL_LEADERBOARD_BUCKETS),
+            CreateIndex(
+                'leaderboard_buckets', 'idx_buckets_rank', ('bucket', 'category_id', 'score DESC', 'timestamp ASC')
+            )
+        )
+    ),
+    Migration(
+        version=5,
+        description='Indexes for keyset pagination of score history and users by role',
+        steps=(
+            CreateIndex('scores', 'idx_scores_player_time', ('player_id', 'timestamp', 'score_id')),
+            CreateIndex('users', 'idx_users_role_id', ('role', 'user_id'))
+        )
+    ),
+    Migration(
+        version=6,
+        description='Per player attempt count, score total, best score and last played time',
+        steps=(
+            Backfill('player_stats', Queries.BACKFILL_PLAYER_STATS),
+        )
+    ),
+    Migration(
+        version=7,
+        description='Per user token epochs replace the per token status rows',
+        steps=(
+            DropTable('tokens'),
+        )
+    ),
+    Migration(
+        version=8,
+        description='Expiry of token revocations, partitioned by day of expiry',
+        steps=(
+            AddColumns('token_revocations', (('expires_at', 'DATETIME'), )),
+            Backfill('token_revocations', Queries.BACKFILL_TOKEN_REVOCATION_EXPIRY),
+            PartitionByDay('token_revocations', 'expires_at', ('version', 'expires_at'))
+        )
+    ),
+    Migration(
+        version=9,
+        description='Covering index of the login credentials read',
+        steps=(
+            CreateIndex(
+                'credentials', 'idx_credentials_login', ('username', 'password', 'isPasswordChanged', 'user_id')
+            ),
+        )
+    ),
+    Migration(
+        version=10,
+        description='Expiry index of the redeemed quiz tickets, for their purge',
+        steps=(
+            CreateIndex('redeemed_tickets', 'idx_redeemed_tickets_expiry', ('expires_at', )),
+        )
+    ),
+    Migration(
+        version=11,
+        description='Native DATETIME applied time of schema migrations',
+        steps=(
+            ModifyColumns('schema_migrations', (('applied_at', 'DATETIME'), )),
+        )
+    ),
+)
+
+
+class MigrationRunner:
+    '''
+    Applies the pending migrations.
+
+    Methods:
+        applied_versions(): Returns the versions recorded in schema_migrations.
+        pending(): Returns the migrations not applied yet.
+        migrate(): Applies the pending migrations in order.
+    '''
+
+    def __init__(self, db: DatabaseAccess, migrations: Tuple[Migration, ...] = MIGRATIONS) -> None:
+        self.db = db
+        self.migrations = sorted(migrations, key=lambda migration: migration.version)
+
+    def applied_versions(self) -> Set[int]:
+        'Returns the versions recorded in schema_migrations'
+
+        self.db.write(MigrationQueries.CREATE_SCHEMA_MIGRATIONS_TABLE)
+        rows = self.db.read(MigrationQueries.GET_APPLIED_MIGRATIONS, use_primary=True)
+        return {row['version'] for row in rows}
+
+    def pending(self) -> List[Migration]:
+        'Returns the migrations not applied yet, in order'
+
+        applied = self.applied_versions()
+        return [migration for migration in self.migrations if migration.version not in applied]
+
+    def migrate(self) -> List[int]:
+        '''
+        Applies the pending migrations in order.
+
+        A migration is recorded once all its steps succeeded. If another process applied the
+        same migration concurrently its idempotent steps are skipped and the duplicate record
+        is ignored.
+
+        Returns:
+            List[int]: The versions applied by this call.
+        '''
+        applied = []
+        for migration in self.pending():
+            logger.info(LogMessage.APPLY_MIGRATION, migration.version, migration.description)
+            start = time.perf_counter()
+            for step in migration.steps:
+                step.apply(self.db)
+
+            applied_at = datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S') # DATETIME literal
+            try:
+                self.db.write(MigrationQueries.INSERT_MIGRATION, (migration.version, migration.description, applied_at))
+            except IntegrityError as e:
+                logger.info(e)
+
+            elapsed_ms = round((time.perf_counter() - start) * 1000, 3)
+            logger.info(LogMessage.APPLY_MIGRATION_SUCCESS, migration.version, elapsed_ms)
+            applied.append(migration.version)
+        return applied
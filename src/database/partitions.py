@@ -0,0 +1,82 @@
+'''Daily range partitions of a table, by the UTC day of a DATETIME column'''
+
+from datetime import date, timedelta
+from typing import Dict, List
+
+from config.queries import MigrationQueries
+from database.database_access import DatabaseAccess
+
+# TO_DAYS('0001-01-01') is 366 while date.toordinal() counts it as day 1
+TO_DAYS_OFFSET = 365
+CATCH_ALL_PARTITION = 'pmax'
+
+
+def to_days(day: date) -> int:
+    'MySQL TO_DAYS of a date'
+
+    return day.toordinal() + TO_DAYS_OFFSET
+
+
+class DayPartitions:
+    '''
+    One partition per day of `column`, named pYYYYMMDD, followed by a catch-all partition.
+
+    A partition holds the rows whose column falls on its day, so the rows of a day that is
+    over can be removed by dropping the partition, without touching the other rows or
+    logging every deleted row. Partitions are added ahead of time by reorganizing the empty
+    catch-all partition.
+
+    Methods:
+        exists(): Checks whether the table is partitioned.
+        bounds(): Returns the day partitions with their TO_DAYS upper bound.
+        create(): Partitions the table, from a day.
+        extend(): Adds the partitions of the days up to a day.
+        drop_before(): Drops the partitions of the days before a day.
+    '''
+
+    def __init__(self, table: str, column: str) -> None:
+        self.table = table
+        self.column = column
+
+    def exists(self, db: DatabaseAccess) -> bool:
+        '''Checks whether the table is partitioned.'''
+
+        return bool(db.read(MigrationQueries.GET_PARTITIONS, (self.table, ), use_primary=True))
+
+    def bounds(self, db: DatabaseAccess) -> Dict[str, int]:
+        '''Returns day partition name -> TO_DAYS of the day after it, empty if the table is not partitioned.'''
+
+        rows = db.read(MigrationQueries.GET_PARTITIONS, (self.table, ), use_primary=True)
+        return {row['partition_name']: int(row['bound']) for row in rows if row['partition_name'] != CATCH_ALL_PARTITION}
+
+    def create(self, db: DatabaseAccess, first_day: date) -> None:
+        '''Partitions the table with a partition for `first_day`, rows of earlier days go to it too.'''
+
+        query = MigrationQueries.PARTITION_BY_DAY
+        db.write(query.format(table=self.table, column=self.column, partitions=self.__definitions([first_day])))
+
+    def extend(self, db: DatabaseAccess, last_day: date) -> List[date]:
+        '''Adds the partitions missing for the days up to `last_day`, returns the days added.'''
+
+        last_bound = max(self.bounds(db).values(), default=to_days(last_day))
+        first_day = date.fromordinal(last_bound - TO_DAYS_OFFSET)
+        days = [first_day + timedelta(days=offset) for offset in range((last_day - first_day).days + 1)]
+        if days:
+            query = MigrationQueries.ADD_DAY_PARTITIONS
+            db.write(query.format(table=self.table, partitions=self.__definitions(days)))
+        return days
+
+    def drop_before(self, db: DatabaseAccess, day: date) -> List[str]:
+        '''Drops the partitions holding only rows of days before `day`, returns their names.'''
+
+        names = [name for name, bound in self.bounds(db).items() if bound <= to_days(day)]
+        if names:
+            db.write(MigrationQueries.DROP_PARTITIONS.format(table=self.table, partitions=', '.join(names)))
+        return names
+
+    def __definitions(self, days: List[date]) -> str:
+        'Definitions of the partitions of days, followed by the catch-all partition'
+
+        definitions = [f'PARTITION p{day:%Y%m%d} VALUES LESS THAN ({to_days(day + timedelta(days=1))})' for day in days]
+        definitions.append(f'PARTITION {CATCH_ALL_PARTITION} VALUES LESS THAN MAXVALUE')
+        return ', '.join(definitions)
@@ -0,0 +1,187 @@
+'''Per query latency statistics and slow query log for DatabaseAccess'''
+
+import logging
+import os
+import re
+import threading
+import time
+from collections import deque
+from functools import lru_cache
+from typing import Any, Dict, List, Tuple
+
+from config.queries import InitializationQueries, MigrationQueries, Queries
+from config.string_constants import LogMessage
+
+logger = logging.getLogger(__name__)
+
+QUERY_NAMES = {
+    value: name
+    for queries in (InitializationQueries, MigrationQueries, Queries)
+    for name, value in vars(queries).items() if name.isupper() and isinstance(value, str)
+}
+# Text before the first placeholder, used to name queries built from a constant at runtime
+QUERY_PREFIXES = sorted(
+    ((value.split('%s')[0], name) for value, name in QUERY_NAMES.items() if '%s' in value),
+    key=lambda prefix: len(prefix[0]),
+    reverse=True
+)
+
+
+@lru_cache(maxsize=1024)
+def name_query(query: str) -> str:
+    '''
+    Returns the name of the Queries constant a statement was built from.
+
+    Statements extended at runtime (an appended WHERE clause, an expanded IN list) are named
+    after the longest constant they start with, anything else after its first words.
+    '''
+    name = QUERY_NAMES.get(query)
+    if name:
+        return name
+
+    for prefix, name in QUERY_PREFIXES:
+        if query.startswith(prefix):
+            return name
+    for value, name in QUERY_NAMES.items():
+        if query.startswith(value):
+            return name
+    return 'AD_HOC: ' + ' '.join(query.split())[:60]
+
+
+class QueryStats:
+    '''Running statistics of a single named query'''
+
+    SAMPLE_SIZE = 1024
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.total_time = 0.0
+        self.rows = 0
+        self.bytes = 0
+        self.samples = deque(maxlen=QueryStats.SAMPLE_SIZE)
+
+    def add(self, elapsed: float, rows: int, fetched_bytes: int) -> None:
+        '''Adds one execution to the statistics.'''
+
+        self.calls += 1
+        self.total_time += elapsed
+        self.rows += rows
+        self.bytes += fetched_bytes
+        self.samples.append(elapsed)
+
+    def summary(self) -> Dict:
+        '''Returns call count, total time and latency percentiles in milliseconds.'''
+
+        samples = sorted(self.samples)
+        return {
+            'calls': self.calls,
+            'total_ms': round(self.total_time * 1000, 3),
+            'p50_ms': self.__percentile(samples, 50),
+            'p95_ms': self.__percentile(samples, 95),
+            'p99_ms': self.__percentile(samples, 99),
+            'rows': self.rows,
+            'bytes': self.bytes
+        }
+
+    def __percentile(self, samples: List[float], percentile: int) -> float:
+        '''Nearest rank percentile of the recent samples.'''
+
+        if not samples:
+            return 0.0
+        rank = max(0, -(-percentile * len(samples) // 100) - 1)
+        return round(samples[rank] * 1000, 3)
+
+
+class QueryMetrics:
+    '''
+    Collects timing statistics for every named query run through DatabaseAccess.
+
+    Statements slower than `slow_threshold_ms` are logged together with their EXPLAIN plan
+    and kept in a bounded slow query log.
+
+    Methods:
+        record(): Records one execution of a query.
+        is_slow(): Checks whether an execution crossed the slow query threshold.
+        record_slow_query(): Adds a statement and its plan to the slow query log.
+        snapshot(): Returns the per query statistics and the slow query log.
+        reset(): Clears all statistics.
+    '''
+
+    SLOW_LOG_SIZE = 50
+
+    def __init__(self, slow_threshold_ms: float) -> None:
+        self.slow_threshold = slow_threshold_ms / 1000
+        self.lock = threading.Lock()
+        self.queries = {}
+        self.slow_queries = deque(maxlen=QueryMetrics.SLOW_LOG_SIZE)
+
+    def record(self, query: str, elapsed: float, rows: int = 0, fetched_bytes: int = 0) -> None:
+        '''Records one execution of a query.'''
+
+        name = name_query(query)
+        with self.lock:
+            stats = self.queries.get(name)
+            if stats is None:
+                stats = self.queries[name] = QueryStats()
+            stats.add(elapsed, rows, fetched_bytes)
+
+    def is_slow(self, elapsed: float) -> bool:
+        '''Checks whether an execution crossed the slow query threshold.'''
+
+        return elapsed >= self.slow_threshold
+
+    def record_slow_query(self, query: str, elapsed: float, plan: List[Tuple]) -> None:
+        '''Logs a slow statement with its EXPLAIN plan and keeps it in the slow query log.'''
+
+        name = name_query(query)
+        elapsed_ms = round(elapsed * 1000, 3)
+        logger.warning(LogMessage.SLOW_QUERY, name, elapsed_ms, plan)
+        with self.lock:
+            self.slow_queries.append({
+                'query': name,
+                'statement': ' '.join(query.split()),
+                'elapsed_ms': elapsed_ms,
+                'plan': plan,
+                'timestamp': time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime())
+            })
+
+    def snapshot(self) -> Dict:
+        '''Returns the per query statistics, slowest total time first, and the slow query log.'''
+
+        with self.lock:
+            queries = {name: stats.summary() for name, stats in self.queries.items()}
+            slow_queries = list(self.slow_queries)
+
+        queries = dict(sorted(queries.items(), key=lambda item: item[1]['total_ms'], reverse=True))
+        return {
+            'slow_threshold_ms': round(self.slow_threshold * 1000, 3),
+            'queries': queries,
+            'slow_queries': slow_queries
+        }
+
+    def reset(self) -> None:
+        '''Clears all statistics and the slow query log.'''
+
+        with self.lock:
+            self.queries.clear()
+            self.slow_queries.clear()
+
+
+def estimate_size(rows: List[Any]) -> int:
+    '''Estimates the bytes fetched for a list of rows from the lengths of their values.'''
+
+    size = 0
+    for row in rows:
+        values = row.values() if isinstance(row, dict) else row
+        for value in values:
+            size += len(value) if isinstance(value, (str, bytes, bytearray)) else 8
+    return size
+
+
+def is_explainable(query: str) -> bool:
+    '''Checks whether EXPLAIN can be run for a statement.'''
+
+    return re.match(r'\s*(SELECT|INSERT|UPDATE|DELETE|REPLACE)\b', query, re.IGNORECASE) is not None
+
+
+query_metrics = QueryMetrics(slow_threshold_ms=float(os.getenv('DB_SLOW_QUERY_MS', '200')))
@@ -0,0 +1,78 @@
+'''Read-your-writes tracking for routing reads between the primary and the replicas'''
+
+import os
+import threading
+import time
+from typing import Dict
+
+
+class ReadYourWrites:
+    '''
+    Decides whether a read may be served by a replica.
+
+    Each request binds a scope, the authenticated user. Once a request writes, its later
+    reads and the reads of any request bound to the same user within `window` seconds go
+    to the primary, so a user never reads data older than their own last write.
+    The tracking is per process.
+
+    Methods:
+        bind(): Binds the current request to a user.
+        reset(): Clears the state of the current request.
+        mark_write(): Records a write made by the current request.
+        needs_primary(): Checks whether reads of the current request must go to the primary.
+    '''
+
+    MAX_TRACKED_SCOPES = 10000
+
+    def __init__(self, window: float) -> None:
+        self.window = window
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.last_writes: Dict[str, float] = {}
+
+    def bind(self, scope: str) -> None:
+        '''Binds the current request to a scope, such as the authenticated user id.'''
+
+        self.local.scope = scope
+
+    def reset(self) -> None:
+        '''Clears the scope and write flag of the current request.'''
+
+        self.local.scope = None
+        self.local.wrote = False
+
+    def mark_write(self) -> None:
+        '''Records that the current request wrote to the primary.'''
+
+        self.local.wrote = True
+        scope = getattr(self.local, 'scope', None)
+        if not scope:
+            return
+
+        now = time.monotonic()
+        with self.lock:
+            self.last_writes[scope] = now
+            if len(self.last_writes) > ReadYourWrites.MAX_TRACKED_SCOPES:
+                self.__prune(now)
+
+    def needs_primary(self) -> bool:
+        '''Checks whether the current request or its scope wrote within the window.'''
+
+        if getattr(self.local, 'wrote', False):
+            return True
+
+        scope = getattr(self.local, 'scope', None)
+        if not scope:
+            return False
+        last_write = self.last_writes.get(scope)
+        return last_write is not None and time.monotonic() - last_write < self.window
+
+    def __prune(self, now: float) -> None:
+        '''Drops scopes whose last write left the window.'''
+
+        self.last_writes = {
+            scope: written for scope, written in self.last_writes.items() if now - written < self.window
+        }
+
+
+read_your_writes = ReadYourWrites(window=float(os.getenv('READ_YOUR_WRITES_WINDOW', '5')))
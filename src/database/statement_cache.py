@@ -0,0 +1,114 @@
+'''Per connection cache of server side prepared statements'''
+
+import logging
+import os
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Any, Dict
+
+from config.queries import Queries
+
+logger = logging.getLogger(__name__)
+
+# Only the static statements in Queries are prepared, ad-hoc SQL is executed as plain text
+PREPARABLE_QUERIES = frozenset(
+    value for name, value in vars(Queries).items() if name.isupper() and isinstance(value, str)
+)
+
+
+class StatementCache:
+    '''
+    LRU cache of prepared cursors for a single pooled connection.
+
+    Every static query is prepared on the server the first time it runs on a connection
+    and its cursor is reused afterwards. The least recently used statement is closed once
+    the cache grows past `max_size`. The cache is emptied when the connection reconnects,
+    since the server drops prepared statements with the session.
+
+    Methods:
+        for_connection(): Returns the cache belonging to a connection.
+        cursor(): Returns the prepared cursor for a query.
+        stats(): Returns hit, miss and eviction counters across all connections.
+    '''
+
+    MAX_SIZE = int(os.getenv('DB_STATEMENT_CACHE_SIZE', '64'))
+
+    caches = weakref.WeakKeyDictionary()
+    caches_lock = threading.Lock()
+    counters = {'hits': 0, 'misses': 0, 'evictions': 0, 'resets': 0}
+    counters_lock = threading.Lock()
+
+    def __init__(self, connection: Any, max_size: int) -> None:
+        self.connection = connection
+        self.max_size = max_size
+        self.session_id = connection.connection_id
+        self.statements = OrderedDict()
+
+    @classmethod
+    def for_connection(cls, connection: Any) -> 'StatementCache':
+        '''Returns the statement cache of a connection, creating it on first use.'''
+
+        with cls.caches_lock:
+            cache = cls.caches.get(connection)
+            if cache is None:
+                cache = cls.caches[connection] = cls(connection, cls.MAX_SIZE)
+        return cache
+
+    @classmethod
+    def is_enabled_for(cls, query: str) -> bool:
+        '''Checks whether a query should run as a prepared statement.'''
+
+        return cls.MAX_SIZE > 0 and query in PREPARABLE_QUERIES
+
+    @classmethod
+    def stats(cls) -> Dict:
+        '''Returns hit, miss, eviction and reset counters summed over all connections.'''
+
+        with cls.counters_lock:
+            stats = dict(cls.counters)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = round(stats['hits'] / lookups, 4) if lookups else 0.0
+        stats['max_size'] = cls.MAX_SIZE
+        return stats
+
+    def cursor(self, query: str) -> Any:
+        '''Returns the prepared cursor for a query, preparing it on a miss.'''
+
+        if self.connection.connection_id != self.session_id:
+            self.reset()
+
+        cursor = self.statements.get(query)
+        if cursor is not None:
+            self.statements.move_to_end(query)
+            self.__count('hits')
+            return cursor
+
+        self.__count('misses')
+        cursor = self.statements[query] = self.connection.cursor(prepared=True)
+        if len(self.statements) > self.max_size:
+            _, evicted = self.statements.popitem(last=False)
+            self.__close(evicted)
+            self.__count('evictions')
+        return cursor
+
+    def reset(self) -> None:
+        '''Forgets every prepared statement, used after the connection reconnected.'''
+
+        self.statements.clear()
+        self.session_id = self.connection.connection_id
+        self.__count('resets')
+
+    def __close(self, cursor: Any) -> None:
+        '''Closes a cursor, deallocating its statement on the server.'''
+
+        try:
+            cursor.close()
+        except Exception as e:
+            logger.warning(e)
+
+    def __count(self, counter: str) -> None:
+        '''Increments a shared counter.'''
+
+        with StatementCache.counters_lock:
+            StatementCache.counters[counter] += 1
@@ -0,0 +1,64 @@
+'''Per process cache of the answer key read when evaluating quiz answers'''
+
+import os
+from typing import Dict, Iterable
+
+from config.queries import Queries
+from database.database_access import DatabaseAccess
+from database.query_metrics import estimate_size
+from utils.ttl_cache import TTLCache
+
+
+class AnswerKey:
+    '''
+    LRU and TTL cache of question_id -> question text, category, type and correct answer.
+
+    The questions of a submission missing from the cache are fetched with one query and
+    cached, so evaluating answers to cached questions does not read the database. Questions
+    updated or deleted through this process are invalidated right away, `ttl` bounds how long
+    changes made by other processes go unseen.
+
+    Methods:
+        lookup(): Returns the answer key of questions.
+        invalidate(): Removes questions from the cache.
+        invalidate_category(): Removes the questions of a category from the cache.
+        stats(): Returns the cache hit rate and size.
+    '''
+
+    def __init__(self, max_size: int, ttl: float) -> None:
+        self.cache = TTLCache(max_size, ttl, sizeof=lambda row: estimate_size([row]))
+
+    def lookup(self, db: DatabaseAccess, question_ids: Iterable[str]) -> Dict[str, Dict]:
+        '''
+        Returns question_id -> {question_id, question_text, category_id, question_type,
+        correct_answer} for the questions that exist.
+        '''
+        answer_key, missing, generation = self.cache.get_many(dict.fromkeys(question_ids))
+        if missing:
+            query = Queries.GET_QUESTION_DATA_BY_QUESTION_ID % ', '.join(['%s'] * len(missing))
+            # Read from the primary, a lagging replica would put an outdated answer in the cache
+            fetched = {row['question_id']: row for row in db.read(query, tuple(missing), use_primary=True)}
+            self.cache.put_many(fetched, generation)
+            answer_key.update(fetched)
+        return answer_key
+
+    def invalidate(self, question_id: str) -> None:
+        '''Removes a question from the cache.'''
+
+        self.cache.invalidate((question_id, ))
+
+    def invalidate_category(self, category_id: str) -> None:
+        '''Removes the questions of a category, as deleting the category cascades to them.'''
+
+        self.cache.invalidate_where(lambda row: row['category_id'] == category_id)
+
+    def stats(self) -> Dict:
+        '''Returns the hit rate, counters, entries and estimated bytes of the cache.'''
+
+        return self.cache.stats()
+
+
+answer_key = AnswerKey(
+    max_size=int(os.getenv('ANSWER_KEY_CACHE_SIZE', '10000')),
+    ttl=float(os.getenv('ANSWER_KEY_TTL', '300'))
+)
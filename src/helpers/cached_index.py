@@ -0,0 +1,98 @@
+'''Base class for per process in-memory indexes over database rows'''
+
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, Iterable
+
+from database.database_access import DatabaseAccess
+
+logger = logging.getLogger(__name__)
+
+
+class CachedIndex(ABC):
+    '''
+    In-memory index built from the rows of a query.
+
+    The index is loaded on first use and rebuilt from the database every `ttl` seconds, which
+    bounds how long writes made by other processes stay invisible. Writes made by this process
+    are applied incrementally through apply(). Only one thread rebuilds, others keep reading
+    the current index meanwhile, and changes applied while the rows are read are replayed onto
+    the rebuilt index.
+
+    Subclasses set QUERY and REBUILD_MESSAGE and implement build() and install().
+
+    Methods:
+        refresh(): Loads the index on first use and rebuilds it once it is older than the ttl.
+        rebuild(): Reloads the index from the database.
+        load(): Replaces the index with one built from rows.
+        apply(): Applies an incremental change.
+    '''
+
+    QUERY: str = None
+    REBUILD_MESSAGE: str = None
+
+    def __init__(self, ttl: float) -> None:
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.rebuild_lock = threading.Lock()
+        self.loaded_at = None
+        # Changes applied while a rebuild reads the database, replayed onto the rebuilt index
+        self.journal = None
+
+    @abstractmethod
+    def build(self, rows: Iterable[Dict]) -> Any:
+        '''Builds the index from the rows of QUERY, without touching the current one.'''
+
+    @abstractmethod
+    def install(self, index: Any) -> None:
+        '''Replaces the current index with a built one, called with the lock held.'''
+
+    def refresh(self, db: DatabaseAccess) -> None:
+        '''Loads the index on first use and rebuilds it once it is older than the ttl.'''
+
+        if self.loaded_at is not None and time.monotonic() - self.loaded_at < self.ttl:
+            return
+
+        if self.loaded_at is None:
+            self.rebuild_lock.acquire()
+        elif not self.rebuild_lock.acquire(blocking=False):
+            return
+        try:
+            if self.loaded_at is None or time.monotonic() - self.loaded_at >= self.ttl:
+                self.rebuild(db)
+        finally:
+            self.rebuild_lock.release()
+
+    def rebuild(self, db: DatabaseAccess) -> None:
+        '''Reloads the index from the database, streaming the rows.'''
+
+        logger.info(self.REBUILD_MESSAGE)
+        with self.lock:
+            self.journal = []
+        try:
+            self.load(db.iter_read(self.QUERY))
+        except Exception:
+            with self.lock:
+                self.journal = None
+            raise
+
+    def load(self, rows: Iterable[Dict]) -> None:
+        '''Replaces the index with one built from `rows`.'''
+
+        index = self.build(rows)
+        with self.lock:
+            self.install(index)
+            for change, args in self.journal or ():
+                change(*args)
+            self.journal = None
+            self.loaded_at = time.monotonic()
+
+    def apply(self, change: Callable, *args) -> None:
+        '''Applies a change to the current index, and journals it for the rebuild in progress.'''
+
+        with self.lock:
+            change(*args)
+            if self.journal is not None:
+                self.journal.append((change, args))
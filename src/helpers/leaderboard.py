@@ -0,0 +1,175 @@
+'''Per process ranking of players by best score, with O(log n) rank lookups'''
+
+import logging
+import os
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from config.queries import Queries
+from config.string_constants import LogMessage
+from database.database_access import DatabaseAccess
+from helpers.cached_index import CachedIndex
+from utils.skip_list import SkipList
+
+logger = logging.getLogger(__name__)
+
+# Ranking key, ascending order ranks the best score first, then the earliest first quiz
+Key = Tuple[float, datetime, str]
+
+
+class Leaderboard(CachedIndex):
+    '''
+    Players ranked by (best score desc, earliest timestamp, player_id) in an indexable skip list.
+
+    Mirrors player_best_scores joined with credentials, the order of GET_LEADERBOARD_RANKING.
+    The top N and the rank of a player with their neighbours are read in O(log n + N).
+    Scores saved by this process are applied through record(), see CachedIndex for the
+    rebuilds. A rebuild logs how many players the in-memory ranking got wrong.
+
+    Methods:
+        top(): Returns the first `limit` players.
+        around(): Returns the rank of a player with their neighbours.
+        record(): Merges a saved score into the ranking.
+        rename(): Updates the username of a player.
+        remove(): Removes a player.
+        verify(): Counts the positions differing from the ranking in the database.
+    '''
+
+    QUERY = Queries.GET_LEADERBOARD_RANKING
+    REBUILD_MESSAGE = LogMessage.REBUILD_LEADERBOARD
+
+    def __init__(self, ttl: float) -> None:
+        super().__init__(ttl)
+        self.ranking = SkipList()
+        self.players: Dict[str, Dict] = {}
+
+    def top(self, db: DatabaseAccess, limit: int = 10) -> List[Dict]:
+        '''Returns the first `limit` players with their rank.'''
+
+        self.refresh(db)
+        with self.lock:
+            return self.__entries(0, limit)
+
+    def around(self, db: DatabaseAccess, player_id: str, neighbors: int = 2) -> Optional[Dict]:
+        '''
+        Returns the rank of a player, the number of ranked players and the players ranked up to
+        `neighbors` places above and below, the player included. None if the player has no score.
+        '''
+        self.refresh(db)
+        with self.lock:
+            player = self.players.get(player_id)
+            if player is None:
+                return None
+
+            rank = self.ranking.rank(player['key']) + 1
+            start = max(rank - 1 - neighbors, 0)
+            return {
+                'rank': rank,
+                'total_players': len(self.ranking),
+                'neighbors': self.__entries(start, rank + neighbors - start)
+            }
+
+    def record(self, db: DatabaseAccess, player_id: str, score: float, timestamp: datetime) -> None:
+        '''Merges a saved score, keeping the best score and the earliest timestamp like the upsert.'''
+
+        if self.loaded_at is None and self.journal is None:
+            # Not loaded yet, the first load reads the committed score
+            return
+
+        player = self.players.get(player_id)
+        if player is not None:
+            username = player['username']
+        else:
+            rows = db.read(Queries.GET_USERNAME_BY_USER_ID, (player_id, ), use_primary=True)
+            if not rows:
+                return
+            username = rows[0]['username']
+
+        self.apply(self.__merge, player_id, username, float(score), timestamp)
+
+    def rename(self, player_id: str, username: str) -> None:
+        '''Updates the username shown for a player.'''
+
+        self.apply(self.__rename, player_id, username)
+
+    def remove(self, player_id: str) -> None:
+        '''Removes a player, as deleting the user cascades to their best score.'''
+
+        self.apply(self.__remove, player_id)
+
+    def verify(self, db: DatabaseAccess) -> int:
+        '''Returns the number of positions where the ranking differs from GET_LEADERBOARD_RANKING.'''
+
+        expected = [self.__key(row) for row in db.iter_read(Leaderboard.QUERY)]
+        with self.lock:
+            actual = list(self.ranking.iterate())
+        return sum(1 for a, b in zip(expected, actual) if a != b) + abs(len(expected) - len(actual))
+
+    def build(self, rows: Iterable[Dict]) -> Tuple[SkipList, Dict]:
+        '''Builds the ranking from rows of player_id, username, score and timestamp.'''
+
+        players = {}
+        for row in rows:
+            players[row['player_id']] = {'key': self.__key(row), 'username': row['username']}
+        # Sorted again as the collation may order player ids differently from Python
+        ranking = SkipList.from_sorted(sorted(player['key'] for player in players.values()))
+        return ranking, players
+
+    def install(self, index: Tuple[SkipList, Dict]) -> None:
+        ranking, players = index
+        if self.loaded_at is not None:
+            drift = sum(1 for player_id, player in players.items() if self.__differs(player_id, player))
+            drift += sum(1 for player_id in self.players if player_id not in players)
+            if drift:
+                logger.warning(LogMessage.LEADERBOARD_DRIFT, drift)
+        self.ranking, self.players = ranking, players
+
+    def __merge(self, player_id: str, username: str, score: float, timestamp: datetime) -> None:
+        player = self.players.get(player_id)
+        if player is not None:
+            old_key = player['key']
+            score, timestamp = max(score, -old_key[0]), min(timestamp, old_key[1])
+            if (-score, timestamp) == old_key[:2]:
+                return
+            self.ranking.remove(old_key)
+
+        key = (-score, timestamp, player_id)
+        self.ranking.insert(key)
+        self.players[player_id] = {'key': key, 'username': username}
+
+    def __rename(self, player_id: str, username: str) -> None:
+        player = self.players.get(player_id)
+        if player is not None:
+            player['username'] = username
+
+    def __remove(self, player_id: str) -> None:
+        player = self.players.pop(player_id, None)
+        if player is not None:
+            self.ranking.remove(player['key'])
+
+    def __differs(self, player_id: str, player: Dict) -> bool:
+        current = self.players.get(player_id)
+        return current is None or current['key'] != player['key']
+
+    def __entries(self, start: int, count: int) -> List[Dict]:
+        'Returns `count` ranked players from the 0 based position `start`'
+
+        entries = []
+        for rank, key in enumerate(self.ranking.iterate(start), start + 1):
+            if len(entries) == count:
+                break
+            negated_score, timestamp, player_id = key
+            entries.append({
+                'rank': rank,
+                'player_id': player_id,
+                'username': self.players[player_id]['username'],
+                'score': -negated_score,
+                'timestamp': timestamp
+            })
+        return entries
+
+    def __key(self, row: Dict) -> Key:
+        return (-float(row['score']), row['timestamp'], row['player_id'])
+
+
+leaderboard = Leaderboard(ttl=float(os.getenv('LEADERBOARD_TTL', '300')))
@@ -0,0 +1,116 @@
+'''Bounded pool hashing and verifying passwords off the request threads'''
+
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict
+
+from config.string_constants import ErrorMessage, LogMessage, StatusCodes
+from utils.custom_error import ServiceUnavailableError
+from utils.password_hasher import Verification, hash_password, kdf, verify_password
+
+logger = logging.getLogger(__name__)
+
+
+class PasswordPool:
+    '''
+    Runs the key derivation of logins, signups and password changes on `workers` threads.
+
+    hashlib releases the GIL while deriving a key, so the workers use up to `workers` cores
+    while the other request threads keep running. At most `workers + queue_size` hashes are
+    admitted at once. A request waits up to `admission_timeout` seconds for a slot, then gets
+    a ServiceUnavailableError: a burst of logins parks a bounded number of request threads
+    and the rest keep serving the other endpoints, instead of every thread queueing for the
+    CPU.
+
+    Methods:
+        hash(): Hashes a password.
+        verify(): Checks a password against its stored form.
+        stop(): Shuts the workers down.
+        stats(): Returns the admissions, rejections and wait and run times.
+    '''
+
+    def __init__(self, workers: int, queue_size: int, admission_timeout: float) -> None:
+        self.workers = workers
+        self.queue_size = queue_size
+        self.admission_timeout = admission_timeout
+        self.slots = threading.BoundedSemaphore(workers + queue_size)
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password-pool')
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.counters = {'admitted': 0, 'rejected': 0, 'rehashes': 0}
+        self.total_wait = 0.0
+        self.total_run = 0.0
+
+    def hash(self, password: str) -> str:
+        '''Hashes a password with the configured key derivation function.'''
+
+        return self.__run(hash_password, password)
+
+    def verify(self, password: str, stored_password: str) -> Verification:
+        '''Checks a password against its stored form, see verify_password.'''
+
+        verification = self.__run(verify_password, password, stored_password)
+        if verification.needs_rehash:
+            with self.lock:
+                self.counters['rehashes'] += 1
+        return verification
+
+    def stop(self) -> None:
+        '''Waits for the admitted hashes and shuts the workers down.'''
+
+        self.executor.shutdown(wait=True)
+
+    def stats(self) -> Dict:
+        '''Returns the counters, the mean wait for a worker and run time, and the settings.'''
+
+        admitted = self.counters['admitted'] or 1
+        stats = dict(self.counters)
+        stats['in_flight'] = self.in_flight
+        stats['mean_wait_ms'] = round(self.total_wait / admitted * 1000, 3)
+        stats['mean_run_ms'] = round(self.total_run / admitted * 1000, 3)
+        stats['workers'] = self.workers
+        stats['queue_size'] = self.queue_size
+        stats['kdf'] = kdf.name
+        stats['cost'] = kdf.cost
+        return stats
+
+    def __run(self, function: Callable, *args):
+        'Runs a function on a worker once admitted, raises ServiceUnavailableError if no slot frees up in time'
+
+        if not self.slots.acquire(timeout=self.admission_timeout):
+            with self.lock:
+                self.counters['rejected'] += 1
+            logger.warning(LogMessage.PASSWORD_POOL_FULL, self.workers + self.queue_size)
+            raise ServiceUnavailableError(status=StatusCodes.SERVICE_UNAVAILABLE, message=ErrorMessage.SERVER_BUSY)
+
+        submitted = time.perf_counter()
+        with self.lock:
+            self.in_flight += 1
+            self.counters['admitted'] += 1
+        try:
+            return self.executor.submit(self.__timed, submitted, function, *args).result()
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+            self.slots.release()
+
+    def __timed(self, submitted: float, function: Callable, *args):
+        'Runs a function on the worker, recording the wait for the worker and the run time'
+
+        started = time.perf_counter()
+        result = function(*args)
+        with self.lock:
+            self.total_wait += started - submitted
+            self.total_run += time.perf_counter() - started
+        return result
+
+
+PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS') or os.cpu_count() or 1)
+password_pool = PasswordPool(
+    workers=PASSWORD_HASH_WORKERS,
+    queue_size=int(os.getenv('PASSWORD_HASH_QUEUE_SIZE') or 4 * PASSWORD_HASH_WORKERS),
+    admission_timeout=float(os.getenv('PASSWORD_HASH_ADMISSION_TIMEOUT_MS', '100')) / 1000
+)
@@ -0,0 +1,212 @@
+'''Per process index of quiz questions for sampling without ORDER BY RAND()'''
+
+import os
+import random
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from config.queries import Queries
+from config.string_constants import LogMessage, QuestionTypes
+from database.database_access import DatabaseAccess
+from helpers.cached_index import CachedIndex
+
+# Partition key, None stands for any category or any question type
+Key = Tuple[Optional[str], Optional[str]]
+
+
+class Partition:
+    '''Question ids matching one (category_id, question_type) filter, removals are tombstoned'''
+
+    __slots__ = ('ids', 'dead')
+
+    def __init__(self) -> None:
+        self.ids: List[str] = []
+        self.dead = 0
+
+
+class QuestionIndex(CachedIndex):
+    '''
+    Index of question ids partitioned by (category_id, question_type), with cached payloads.
+
+    Every question is listed in four partitions: its category and type, its category with
+    any type, any category with its type, and all questions. Sampling k questions for a
+    filter draws from one partition with random.sample, O(k) whatever the size of the bank.
+    Removed questions stay in the lists as tombstones until a quarter of a partition is dead,
+    then the partition is compacted.
+
+    Writes made by this process are applied through add(), update_text(), remove() and
+    remove_category(), see CachedIndex for the rebuilds.
+
+    Methods:
+        sample(): Returns up to `limit` random questions matching a filter.
+        add(): Adds a question.
+        update_text(): Updates the text of a question.
+        remove(): Removes a question.
+        remove_category(): Removes every question of a category.
+    '''
+
+    QUERY = Queries.GET_QUESTION_INDEX_DATA
+    REBUILD_MESSAGE = LogMessage.REBUILD_QUESTION_INDEX
+    COMPACT_MIN_DEAD = 32
+
+    def __init__(self, ttl: float) -> None:
+        super().__init__(ttl)
+        self.questions: Dict[str, Dict] = {}
+        self.partitions: Dict[Key, Partition] = defaultdict(Partition)
+
+    def sample(
+        self,
+        db: DatabaseAccess,
+        category_id: str = None,
+        question_type: str = None,
+        limit: int = 10
+    ) -> List[Dict]:
+        '''Returns up to `limit` distinct random questions, MCQ options in random order.'''
+
+        self.refresh(db)
+        key = (category_id, question_type and question_type.lower())
+        with self.lock:
+            partition = self.partitions.get(key)
+            if partition is None:
+                return []
+            question_ids = self.__sample_ids(partition, key, limit)
+            questions = [self.questions[question_id] for question_id in question_ids]
+
+        return [
+            {
+                'question_id': question['question_id'],
+                'question_text': question['question_text'],
+                'question_type': question['question_type'],
+                'options': random.sample(question['options'], len(question['options']))
+            }
+            for question in questions
+        ]
+
+    def build(self, rows: Iterable[Dict]) -> Tuple[Dict, Dict]:
+        '''
+        Builds the questions and partitions.
+
+        Rows hold question_id, category_id, question_text, question_type and option_text,
+        one row per option, ordered by question_id.
+        '''
+        questions = {}
+        for row in rows:
+            question = questions.get(row['question_id'])
+            if question is None:
+                question = questions[row['question_id']] = {
+                    'question_id': row['question_id'],
+                    'category_id': row['category_id'],
+                    'question_text': row['question_text'],
+                    'question_type': row['question_type'],
+                    'options': []
+                }
+            if row['option_text'] is not None and row['question_type'].lower() == QuestionTypes.MCQ:
+                question['options'].append(row['option_text'])
+
+        partitions = defaultdict(Partition)
+        for question in questions.values():
+            for key in self.__keys(question):
+                partitions[key].ids.append(question['question_id'])
+        return questions, partitions
+
+    def install(self, index: Tuple[Dict, Dict]) -> None:
+        self.questions, self.partitions = index
+
+    def add(
+        self,
+        question_id: str,
+        category_id: str,
+        question_text: str,
+        question_type: str,
+        options: List[str]
+    ) -> None:
+        '''Adds a question, options are only kept for MCQ questions.'''
+
+        self.apply(self.__add, question_id, category_id, question_text, question_type, options)
+
+    def update_text(self, question_id: str, question_text: str) -> None:
+        '''Updates the text of a question.'''
+
+        self.apply(self.__update_text, question_id, question_text)
+
+    def remove(self, question_id: str) -> None:
+        '''Removes a question.'''
+
+        self.apply(self.__remove, question_id)
+
+    def remove_category(self, category_id: str) -> None:
+        '''Removes every question of a category, as deleting the category cascades to them.'''
+
+        self.apply(self.__remove_category, category_id)
+
+    def __add(self, question_id, category_id, question_text, question_type, options) -> None:
+        if question_id in self.questions:
+            self.__remove(question_id)
+
+        question = self.questions[question_id] = {
+            'question_id': question_id,
+            'category_id': category_id,
+            'question_text': question_text,
+            'question_type': question_type,
+            'options': list(options) if question_type.lower() == QuestionTypes.MCQ else []
+        }
+        for key in self.__keys(question):
+            self.partitions[key].ids.append(question_id)
+
+    def __update_text(self, question_id: str, question_text: str) -> None:
+        question = self.questions.get(question_id)
+        if question is not None:
+            question['question_text'] = question_text
+
+    def __remove(self, question_id: str) -> None:
+        question = self.questions.pop(question_id, None)
+        if question is None:
+            return
+
+        for key in self.__keys(question):
+            partition = self.partitions[key]
+            partition.dead += 1
+            if partition.dead > max(QuestionIndex.COMPACT_MIN_DEAD, len(partition.ids) // 4):
+                partition.ids = [i for i in dict.fromkeys(partition.ids) if self.__matches(i, key)]
+                partition.dead = 0
+
+    def __remove_category(self, category_id: str) -> None:
+        partition = self.partitions.get((category_id, None))
+        if partition is None:
+            return
+
+        for question_id in list(partition.ids):
+            if self.__matches(question_id, (category_id, None)):
+                self.__remove(question_id)
+
+    def __sample_ids(self, partition: Partition, key: Key, limit: int) -> List[str]:
+        'Draws distinct live ids, drawing more while tombstones are hit'
+
+        ids = partition.ids
+        draw = min(limit, len(ids))
+        while True:
+            sampled = [i for i in dict.fromkeys(random.sample(ids, draw)) if self.__matches(i, key)]
+            if len(sampled) >= limit or draw == len(ids):
+                return sampled[:limit]
+            draw = min(len(ids), draw * 2)
+
+    def __matches(self, question_id: str, key: Key) -> bool:
+        'Checks that an id is live and still belongs to a partition'
+
+        question = self.questions.get(question_id)
+        if question is None:
+            return False
+        category_id, question_type = key
+        return (
+            (category_id is None or question['category_id'] == category_id)
+            and (question_type is None or question['question_type'].lower() == question_type)
+        )
+
+    def __keys(self, question: Dict) -> Tuple[Key, ...]:
+        'Partitions listing a question, question types compare case insensitively like the MySQL collation'
+
+        category_id, question_type = question['category_id'], question['question_type'].lower()
+        return ((category_id, question_type), (category_id, None), (None, question_type), (None, None))
+
+
+question_index = QuestionIndex(ttl=float(os.getenv('QUESTION_INDEX_TTL', '300')))
@@ -0,0 +1,161 @@
+'''Signed quiz tickets, the issued questions of a quiz and their answer digests for grading without a read'''
+
+import base64
+import binascii
+import hashlib
+import hmac
+import json
+import os
+import secrets
+import time
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Dict, Iterable, NamedTuple, Optional, Tuple
+
+from config.queries import Queries
+from config.string_constants import ErrorMessage, StatusCodes
+from database.database_access import DatabaseAccess
+from utils.custom_error import DuplicateEntryError, InvalidInputError
+
+DIGEST_SIZE = 8
+
+
+class IssuedQuiz(NamedTuple):
+    '''The content of a verified ticket'''
+
+    nonce: str
+    expires: int
+    # question_id -> digest of the correct answer, in the order the questions were issued
+    digests: Dict[str, str]
+    category_id: Optional[str]
+    question_type: Optional[str]
+
+
+def b64encode(data: bytes) -> str:
+    'Url safe base64 without padding'
+
+    return base64.urlsafe_b64encode(data).decode().rstrip('=')
+
+
+def b64decode(data: str) -> bytes:
+    'Decodes url safe base64 without padding'
+
+    return base64.urlsafe_b64decode(data + '=' * (-len(data) % 4))
+
+
+@lru_cache(maxsize=8)
+def derive_key(secret: str, purpose: bytes) -> bytes:
+    'Key for one purpose derived from a secret'
+
+    return hmac.new(secret.encode(), b'quiz-' + purpose, hashlib.sha256).digest()
+
+
+class QuizTickets:
+    '''
+    Issues and redeems signed quiz tickets.
+
+    A ticket is `payload.signature`, the url safe base64 of a JSON payload holding the player
+    id, a random nonce, the expiry, the issued question ids with a digest of their correct
+    answer, and the category and question type of the quiz, signed with HMAC-SHA256. Answer
+    digests are HMACs of the nonce, the question id and the lowercased answer truncated to
+    DIGEST_SIZE bytes, keyed by the server so they cannot be matched against the options.
+    Both keys are derived from the JWT secret.
+
+    A redeemed nonce is recorded in redeemed_tickets with the expiry of its ticket, so a ticket
+    grades one submission across every process; TokenPurger deletes the expired ones. A
+    submission answering questions the ticket was not issued with is rejected before the
+    nonce is recorded, so the ticket can still grade a corrected one. Submissions without a
+    ticket are graded from the answer key only when `allow_unticketed` is set.
+
+    Methods:
+        issue(): Returns a ticket for questions issued to a player.
+        redeem(): Verifies a ticket and returns the issued quiz, once.
+        is_correct(): Checks an answer against the digest of the issued question.
+    '''
+
+    def __init__(self, ttl: float, secret: str = None, allow_unticketed: bool = False) -> None:
+        self.ttl = ttl
+        self.secret = secret
+        self.allow_unticketed = allow_unticketed
+
+    def issue(
+        self,
+        player_id: str,
+        answers: Iterable[Tuple[str, Optional[str]]],
+        category_id: Optional[str],
+        question_type: Optional[str]
+    ) -> str:
+        '''Returns a ticket for the (question_id, correct_answer) issued to a player.'''
+
+        nonce = b64encode(secrets.token_bytes(12))
+        payload = {
+            'p': player_id,
+            'n': nonce,
+            'e': int(time.time() + self.ttl),
+            'q': [[question_id, self.__digest(nonce, question_id, answer or '')] for question_id, answer in answers],
+            'c': category_id,
+            't': question_type
+        }
+        encoded = b64encode(json.dumps(payload, separators=(',', ':')).encode())
+        return f'{encoded}.{self.__sign(encoded)}'
+
+    def redeem(self, db: DatabaseAccess, ticket: str, player_id: str, question_ids: Iterable[str]) -> IssuedQuiz:
+        '''
+        Returns the quiz of a valid, unexpired ticket issued to the player for answers to
+        `question_ids`, all issued with the ticket. A ticket is redeemed once, the nonce is
+        recorded in the caller's transaction if there is one.
+        '''
+
+        encoded, _, signature = ticket.partition('.')
+        if not hmac.compare_digest(signature.encode(), self.__sign(encoded).encode()):
+            raise InvalidInputError(status=StatusCodes.UNPROCESSABLE_ENTITY, message=ErrorMessage.INVALID_TICKET)
+        try:
+            payload = json.loads(b64decode(encoded))
+        except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+            raise InvalidInputError(status=StatusCodes.UNPROCESSABLE_ENTITY, message=ErrorMessage.INVALID_TICKET) from e
+
+        now = time.time()
+        if payload['p'] != player_id:
+            raise InvalidInputError(status=StatusCodes.UNPROCESSABLE_ENTITY, message=ErrorMessage.INVALID_TICKET)
+        if payload['e'] < now:
+            raise InvalidInputError(status=StatusCodes.UNPROCESSABLE_ENTITY, message=ErrorMessage.TICKET_EXPIRED)
+        quiz = IssuedQuiz(payload['n'], payload['e'], dict(payload['q']), payload['c'], payload['t'])
+        not_issued = [question_id for question_id in question_ids if question_id not in quiz.digests]
+        if not_issued:
+            raise InvalidInputError(
+                status=StatusCodes.UNPROCESSABLE_ENTITY,
+                message=ErrorMessage.QUESTIONS_NOT_IN_TICKET.format(question_ids=', '.join(not_issued))
+            )
+
+        expires_at = datetime.fromtimestamp(quiz.expires, timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+        if not db.write(Queries.INSERT_REDEEMED_TICKET, (quiz.nonce, expires_at)):
+            raise DuplicateEntryError(status=StatusCodes.CONFLICT, message=ErrorMessage.TICKET_REDEEMED)
+
+        return quiz
+
+    def is_correct(self, quiz: IssuedQuiz, question_id: str, answer: str) -> bool:
+        '''Checks an answer to an issued question against the digest of its correct answer.'''
+
+        return hmac.compare_digest(quiz.digests[question_id], self.__digest(quiz.nonce, question_id, answer))
+
+    def __sign(self, encoded: str) -> str:
+        'Signature of an encoded payload'
+
+        return b64encode(hmac.new(self.__key(b'ticket'), encoded.encode(), hashlib.sha256).digest())
+
+    def __digest(self, nonce: str, question_id: str, answer: str) -> str:
+        'Keyed digest of an answer to a question of a ticket'
+
+        message = '\0'.join((nonce, question_id, answer.lower())).encode()
+        return b64encode(hmac.new(self.__key(b'answer'), message, hashlib.sha256).digest()[:DIGEST_SIZE])
+
+    def __key(self, purpose: bytes) -> bytes:
+        'Key derived from the JWT secret for one purpose, read at use as the secret is loaded after import'
+
+        return derive_key(self.secret or os.getenv('JWT_SECRET_KEY'), purpose)
+
+
+quiz_tickets = QuizTickets(
+    ttl=float(os.getenv('QUIZ_TICKET_TTL', '1800')),
+    allow_unticketed=os.getenv('QUIZ_ALLOW_UNTICKETED_ANSWERS', 'false').lower() == 'true'
+)
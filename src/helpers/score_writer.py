@@ -0,0 +1,330 @@
+'''Persistence of quiz scores, synchronous or write-behind through a spooled in-process queue'''
+
+import atexit
+import fcntl
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Sequence, Tuple
+
+from config.queries import Queries
+from config.string_constants import LogMessage
+from database.database_access import DatabaseAccess
+from database.database_connection import backend
+
+logger = logging.getLogger(__name__)
+
+# Leaderboard bucket keys, buckets are UTC days plus one all time bucket per category
+ALL_TIME_BUCKET = 'all'
+ALL_CATEGORIES = ''
+
+# (score_id, player_id, score, timestamp, category_id, question_type), the columns of INSERT_PLAYER_QUIZ_SCORE
+Score = Tuple[str, str, float, str, Optional[str], Optional[str]]
+
+
+def write_scores(db: DatabaseAccess, scores: Sequence[Score]) -> None:
+    '''
+    Inserts scores and, in the same transaction, upserts the best scores, the running stats of
+    the players and the leaderboard buckets of the day, of the day in the category and of all
+    time in the category.
+    '''
+    best_score_rows, bucket_rows = [], []
+    # player_id: [attempts, total score, best score, last played], added to the stored stats
+    stats: Dict[str, list] = {}
+    for _, player_id, score, timestamp, category_id, _ in scores:
+        day = timestamp[:10]
+        best_score_rows.append((player_id, score, timestamp))
+        bucket_rows.append((day, ALL_CATEGORIES, player_id, score, timestamp))
+        if category_id is not None:
+            bucket_rows.append((day, category_id, player_id, score, timestamp))
+            bucket_rows.append((ALL_TIME_BUCKET, category_id, player_id, score, timestamp))
+
+        player_stats = stats.setdefault(player_id, [0, 0, score, timestamp])
+        player_stats[0] += 1
+        player_stats[1] += score
+        player_stats[2] = max(player_stats[2], score)
+        player_stats[3] = max(player_stats[3], timestamp)
+
+    with db.transaction():
+        db.write_many(Queries.INSERT_PLAYER_QUIZ_SCORE, list(scores))
+        db.write_many(Queries.UPSERT_PLAYER_BEST_SCORE, best_score_rows)
+        db.write_many(Queries.UPSERT_PLAYER_STATS, [(player_id, *values) for player_id, values in stats.items()])
+        db.write_many(Queries.UPSERT_LEADERBOARD_BUCKET, bucket_rows)
+
+
+class ScoreWriter:
+    '''
+    Saves quiz scores, optionally write-behind.
+
+    Without write-behind, or until start() is called, save() writes the scores in the request.
+    With write-behind, save() appends the scores to a bounded queue and to an append-only spool
+    file, and a background thread writes them in batches of up to `flush_size` scores, once a
+    batch is full or `flush_interval` seconds after the first queued score. When the queue is
+    full the scores are written in the request instead.
+
+    Each process locks its own spool: `spool_path`, or `<spool_path stem>.<n><suffix>` when
+    another process holds it, so processes sharing SCORE_SPOOL_PATH never write to or truncate
+    each other's spool. Without a spool to lock the scores are written in the request. A flush
+    is checkpointed in the spool, which is truncated whenever the queue empties. On start the
+    scores spooled but not checkpointed by a previous process are written first, and the spool
+    is only truncated once they are. A score written before a crash but not checkpointed fails
+    its insert on replay and is counted as already written, its upserts were committed with it.
+    A batch failing with an integrity error, e.g. a player deleted meanwhile, is written one
+    score at a time and the failing scores are logged and dropped. On other errors the batch
+    stays queued and is retried. stop() drains the queue, it runs at interpreter exit.
+
+    Methods:
+        start(): Replays the spool and starts the background writer.
+        save(): Saves scores.
+        stop(): Writes the queued scores and stops the background writer.
+        stats(): Returns the queue depth, counters and flush latencies.
+    '''
+
+    # Spools tried before giving up write-behind, more than the processes of one host
+    MAX_SPOOLS = 64
+
+    def __init__(
+        self,
+        enabled: bool,
+        max_size: int,
+        flush_size: int,
+        flush_interval: float,
+        spool_path: str,
+        fsync: bool = True
+    ) -> None:
+        self.enabled = enabled
+        self.max_size = max_size
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.spool_path = spool_path
+        self.fsync = fsync
+        self.condition = threading.Condition()
+        # (sequence, score) in spool order, the oldest batch stays queued until it is written
+        self.pending: Deque[Tuple[int, Score]] = deque()
+        self.sequence = 0
+        self.spool = None
+        self.thread = None
+        self.db = None
+        self.stopping = False
+        self.flush_ms: Deque[float] = deque(maxlen=1000)
+        self.counters = {
+            'enqueued': 0, 'written': 0, 'already_written': 0, 'dropped': 0, 'replayed': 0,
+            'flushes': 0, 'failed_flushes': 0, 'direct_writes': 0
+        }
+
+    def start(self, db: DatabaseAccess) -> None:
+        '''Writes the scores left in the spool by a previous process, then starts the background writer.'''
+
+        if not self.enabled or self.thread is not None:
+            return
+
+        spool = self.__lock_spool()
+        if spool is None:
+            logger.warning(LogMessage.SCORE_SPOOLS_LOCKED, self.spool_path)
+            return
+
+        self.db = db
+        try:
+            replayed = self.__read_spool(spool)
+            if replayed:
+                logger.warning(LogMessage.REPLAY_SCORE_SPOOL, len(replayed), spool.name)
+                self.counters['replayed'] += len(replayed)
+                for start in range(0, len(replayed), self.flush_size):
+                    self.__write([score for _, score in replayed[start:start + self.flush_size]])
+        except Exception:
+            # Left in the spool, replayed by the next start
+            spool.close()
+            raise
+
+        spool.seek(0)
+        spool.truncate()
+        self.spool = spool
+        self.stopping = False
+        self.thread = threading.Thread(target=self.__run, name='score-writer', daemon=True)
+        self.thread.start()
+        atexit.register(self.stop)
+
+    def save(self, db: DatabaseAccess, scores: Sequence[Score]) -> None:
+        '''Saves scores, queued when the background writer runs and has room, in the request otherwise.'''
+
+        if self.thread is not None and self.__enqueue(scores):
+            return
+
+        write_scores(db, scores)
+        with self.condition:
+            self.counters['direct_writes'] += len(scores)
+
+    def stop(self, timeout: float = None) -> None:
+        '''Writes the queued scores and stops the background writer, scores left unwritten stay spooled.'''
+
+        thread = self.thread
+        if thread is None:
+            return
+
+        logger.info(LogMessage.DRAIN_SCORE_QUEUE, len(self.pending))
+        with self.condition:
+            self.stopping = True
+            self.condition.notify()
+        thread.join(timeout)
+        with self.condition:
+            self.thread = None
+            self.spool.close()
+
+    def stats(self) -> Dict:
+        '''Returns the queue depth, the counters and the latency of recent flushes.'''
+
+        with self.condition:
+            stats = dict(self.counters)
+            stats['depth'] = len(self.pending)
+            flush_ms = sorted(self.flush_ms)
+
+        stats['write_behind'] = self.thread is not None
+        stats['max_size'] = self.max_size
+        stats['flush_size'] = self.flush_size
+        stats['flush_interval_ms'] = round(self.flush_interval * 1000, 3)
+        stats['flush_p50_ms'] = flush_ms[len(flush_ms) // 2] if flush_ms else 0.0
+        stats['flush_p99_ms'] = flush_ms[max(0, -(-99 * len(flush_ms) // 100) - 1)] if flush_ms else 0.0
+        stats['flush_max_ms'] = flush_ms[-1] if flush_ms else 0.0
+        return stats
+
+    def __enqueue(self, scores: Sequence[Score]) -> bool:
+        'Spools and queues scores, False if the queue has no room or is stopping'
+
+        with self.condition:
+            if self.stopping or len(self.pending) + len(scores) > self.max_size:
+                return False
+
+            records = [(self.sequence + i, tuple(score)) for i, score in enumerate(scores, 1)]
+            self.spool.write(''.join(json.dumps({'seq': seq, 'score': score}) + '\n' for seq, score in records))
+            self.spool.flush()
+            if self.fsync:
+                os.fsync(self.spool.fileno())
+
+            self.sequence += len(records)
+            self.pending.extend(records)
+            self.counters['enqueued'] += len(records)
+            self.condition.notify()
+        return True
+
+    def __run(self) -> None:
+        'Background writer, writes batches until stopped and drained'
+
+        while True:
+            with self.condition:
+                while not self.pending and not self.stopping:
+                    self.condition.wait()
+                if not self.pending:
+                    return
+
+                deadline = time.monotonic() + self.flush_interval
+                while len(self.pending) < self.flush_size and not self.stopping:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self.condition.wait(remaining)
+                batch = [self.pending[i] for i in range(min(self.flush_size, len(self.pending)))]
+
+            if self.__flush(batch):
+                continue
+            if self.stopping:
+                # Left in the spool, written by the next process
+                return
+            time.sleep(self.flush_interval)
+
+    def __flush(self, batch: List[Tuple[int, Score]]) -> bool:
+        'Writes a batch and removes it from the queue and the spool, False if the database failed'
+
+        start = time.perf_counter()
+        try:
+            self.__write([score for _, score in batch])
+        except Exception as e:
+            logger.exception(e)
+            with self.condition:
+                self.counters['failed_flushes'] += 1
+            return False
+        elapsed_ms = round((time.perf_counter() - start) * 1000, 3)
+
+        with self.condition:
+            for _ in batch:
+                self.pending.popleft()
+            if self.pending:
+                self.spool.write(json.dumps({'flushed': batch[-1][0]}) + '\n')
+                self.spool.flush()
+            else:
+                self.spool.seek(0)
+                self.spool.truncate()
+            self.flush_ms.append(elapsed_ms)
+            self.counters['flushes'] += 1
+        return True
+
+    def __write(self, scores: List[Score]) -> None:
+        'Writes scores in one transaction, one at a time if the batch violates a constraint'
+
+        already_written = 0
+        try:
+            write_scores(self.db, scores)
+            written = len(scores)
+        except backend.IntegrityError:
+            written = 0
+            for score in scores:
+                try:
+                    write_scores(self.db, [score])
+                    written += 1
+                except backend.IntegrityError as e:
+                    if self.db.read(Queries.GET_SCORE_ID, (score[0], ), use_primary=True):
+                        already_written += 1
+                    else:
+                        logger.warning(LogMessage.DROP_QUEUED_SCORE, score[0], e)
+
+        with self.condition:
+            self.counters['written'] += written
+            self.counters['already_written'] += already_written
+            self.counters['dropped'] += len(scores) - written - already_written
+
+    def __lock_spool(self):
+        'Opens the first spool no other process holds and locks it, None if every spool is held'
+
+        root, suffix = os.path.splitext(self.spool_path)
+        for n in range(self.MAX_SPOOLS):
+            path = self.spool_path if n == 0 else f'{root}.{n}{suffix}'
+            spool = open(path, 'a+', encoding='utf-8')
+            try:
+                # Released when the spool is closed or the process dies
+                fcntl.flock(spool.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                spool.close()
+                continue
+            return spool
+        return None
+
+    @staticmethod
+    def __read_spool(spool) -> List[Tuple[int, Score]]:
+        'Returns the spooled scores after the last checkpoint'
+
+        records, flushed = [], 0
+        spool.seek(0)
+        for line in spool:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                # Only the line being written when the process died can be torn
+                logger.warning(LogMessage.TORN_SCORE_SPOOL_LINE, spool.name)
+                continue
+            if 'flushed' in entry:
+                flushed = entry['flushed']
+            else:
+                records.append((entry['seq'], tuple(entry['score'])))
+        return [record for record in records if record[0] > flushed]
+
+
+score_writer = ScoreWriter(
+    enabled=os.getenv('SCORE_WRITE_BEHIND', 'false').lower() == 'true',
+    max_size=int(os.getenv('SCORE_QUEUE_SIZE', '10000')),
+    flush_size=int(os.getenv('SCORE_FLUSH_SIZE', '500')),
+    flush_interval=float(os.getenv('SCORE_FLUSH_INTERVAL_MS', '200')) / 1000,
+    spool_path=os.getenv('SCORE_SPOOL_PATH', 'score_spool.jsonl'),
+    fsync=os.getenv('SCORE_SPOOL_FSYNC', 'true').lower() == 'true'
+)
@@ -0,0 +1,133 @@
+'''Per process cache of the token epochs of users, checked by the JWT blocklist loader'''
+
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+from config.queries import Queries
+from database.database_access import DatabaseAccess
+from utils.ttl_cache import TTLCache
+
+# Seconds a missing revocation version is waited for, a transaction holding an auto increment
+# value commits after revocations numbered above it
+GAP_TIMEOUT = 30
+MAX_GAPS = 1000
+
+
+class TokenCache:
+    '''
+    LRU and TTL cache of user_id -> token epoch of the users whose tokens this process checked.
+
+    Tokens carry the epoch of their user when they were issued, and are active while it is
+    still the current one: revoking the tokens of a user bumps the epoch. A token of a cached
+    user is checked without reading the database. Epochs bumped through this process are
+    evicted once written.
+
+    Every bump also appends the user to token_revocations, whose auto increment version is
+    the stamp other processes compare against: at most every `sync_interval` seconds a check
+    reads the revocations numbered above the last one seen, an indexed range read that is
+    empty most of the time, and evicts the epochs of those users. A token revoked by another
+    process is accepted here for at most `sync_interval` seconds. Revocations are kept for
+    `retention` seconds, at least the TTL: an epoch cached before a revocation was purged
+    has expired by then.
+
+    Methods:
+        current_epoch(): Returns the token epoch of a user.
+        is_active(): Checks whether a token of a user is still active.
+        invalidate(): Evicts the epoch of a user.
+        sync(): Evicts the epochs of users revoked by other processes.
+        stats(): Returns the hit rate and size of the cache.
+    '''
+
+    def __init__(self, max_size: int, ttl: float, sync_interval: float, retention: float = 0) -> None:
+        self.epochs = TTLCache(max_size, ttl)
+        self.sync_interval = sync_interval
+        self.retention = max(retention, ttl)
+        self.sync_lock = threading.Lock()
+        self.next_sync = 0.0
+        self.version: Optional[int] = None
+        # Versions below the last one seen that were not committed yet -> time to stop waiting
+        self.gaps: Dict[int, float] = {}
+        self.counters = {'syncs': 0, 'remote_revocations': 0}
+
+    def current_epoch(self, db: DatabaseAccess, user_id: str) -> Optional[int]:
+        '''Returns the token epoch of a user, None if the user does not exist.'''
+
+        self.sync(db)
+        found, _, generation = self.epochs.get_many((user_id, ))
+        if user_id in found:
+            return found[user_id]
+
+        # Read from the primary, a lagging replica would miss a revocation
+        rows = db.read(Queries.GET_USER_TOKEN_EPOCH, (user_id, ), use_primary=True)
+        epoch = rows[0]['epoch'] if rows else None
+        self.epochs.put_many({user_id: epoch}, generation)
+        return epoch
+
+    def is_active(self, db: DatabaseAccess, user_id: str, epoch: Optional[int]) -> bool:
+        '''Checks whether a token issued at `epoch` to an existing user was not revoked since.'''
+
+        return epoch is not None and epoch == self.current_epoch(db, user_id)
+
+    def invalidate(self, user_id: str) -> None:
+        '''Evicts the epoch of a user, once its bump is written.'''
+
+        self.epochs.invalidate((user_id, ))
+
+    def sync(self, db: DatabaseAccess) -> None:
+        '''
+        Evicts the epochs of the users revoked by other processes since the last sync, at most
+        once every `sync_interval` seconds. The first sync only records the latest version,
+        the cache is empty then.
+        '''
+        now = time.monotonic()
+        if now < self.next_sync:
+            return
+
+        with self.sync_lock:
+            if now < self.next_sync:
+                return
+
+            if self.version is None:
+                self.version = db.read(Queries.GET_TOKEN_REVOCATION_VERSION, use_primary=True)[0]['version']
+            else:
+                self.__apply_revocations(db, now)
+            self.counters['syncs'] += 1
+            self.next_sync = now + self.sync_interval
+
+    def stats(self) -> Dict:
+        '''Returns the counters of the cache and of the syncs.'''
+
+        stats = self.epochs.stats()
+        stats.update(self.counters, version=self.version, sync_interval=self.sync_interval)
+        return stats
+
+    def __apply_revocations(self, db: DatabaseAccess, now: float) -> None:
+        'Reads the revocations after the last version seen and the missing ones, evicts their users'
+
+        self.gaps = {version: deadline for version, deadline in self.gaps.items() if deadline > now}
+        since = min(self.gaps, default=self.version + 1) - 1
+        rows = db.read(Queries.GET_TOKEN_REVOCATIONS, (since, ), use_primary=True)
+
+        seen, user_ids = set(), set()
+        for row in rows:
+            seen.add(row['version'])
+            if row['version'] > self.version or self.gaps.pop(row['version'], None) is not None:
+                user_ids.add(row['user_id'])
+                self.counters['remote_revocations'] += 1
+        if user_ids:
+            self.epochs.invalidate(user_ids)
+
+        latest = max(seen | {self.version})
+        missing = [version for version in range(self.version + 1, latest) if version not in seen]
+        self.gaps.update(dict.fromkeys(missing[-MAX_GAPS:], now + GAP_TIMEOUT))
+        self.version = latest
+
+
+token_cache = TokenCache(
+    max_size=int(os.getenv('TOKEN_CACHE_SIZE', '10000')),
+    ttl=float(os.getenv('TOKEN_CACHE_TTL', '300')),
+    sync_interval=float(os.getenv('TOKEN_REVOCATION_SYNC_INTERVAL', '1')),
+    retention=float(os.getenv('TOKEN_REVOCATION_RETENTION', '3600'))
+)
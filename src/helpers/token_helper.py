@@ -1,59 +1,91 @@
 'Helpers for token related management'
 
 import logging
-from typing import Dict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
 
-from flask_jwt_extended import create_access_token, create_refresh_token, get_jti
+from flask_jwt_extended import create_access_token, create_refresh_token
 
 from config.queries import Queries
 from config.string_constants import TokenInfo
 from database.database_access import DatabaseAccess
+from helpers.token_cache import token_cache
 
 logger = logging.getLogger(__name__)
 
 
 class TokenHelper:
-    'Helper class for token management'
+    '''
+    Helper class for token management.
+
+    Tokens are not stored: they carry the token epoch of their user, and stay active until
+    the epoch is bumped by a login, a refresh, a logout or a password change, which revokes
+    every token issued to the user before.
+    '''
 
     def __init__(self, database: DatabaseAccess) -> None:
         self.db = database
 
-    def generate_token_data(self, identity: str, mapped_role: str, is_fresh: bool) -> Dict:
-        '''Generate token data containing access and refresh tokens'''
-
-        self.revoke_token(user_id=identity)
+    def generate_token_data(self, identity: str, mapped_role: str, is_fresh: bool, epoch: Optional[int] = None) -> Dict:
+        '''Generate token data containing access and refresh tokens, with the token epoch of the user if already read'''
 
+        if epoch is None:
+            epoch = token_cache.current_epoch(self.db, identity)
+        claims = {'cap': mapped_role, TokenInfo.CLAIM_EPOCH: epoch}
         access_token = create_access_token(
             identity=identity,
             fresh=is_fresh,
-            additional_claims={'cap': mapped_role}
+            additional_claims=claims
         )
         refresh_token = create_refresh_token(
             identity=identity,
-            additional_claims={'cap': mapped_role}
+            additional_claims=claims
         )
-        access_token_jti = get_jti(access_token)
-        refresh_token_jti = get_jti(refresh_token)
-        self.db.write(Queries.INSERT_TOKEN_DATA, (identity, access_token_jti, refresh_token_jti))
 
         token_data = {'access_token': access_token, 'refresh_token': refresh_token}
         return token_data
 
-    def revoke_token(self, user_id: str) -> None:
-        'Sets the status of token to revoked'
-
-        self.db.write(Queries.UPDATE_TOKEN_STATUS, (user_id, ))
-
-    def check_token_status(self, token_id: str, token_type: str) -> None:
-        'Checks if the token is revoked'
+    def rotate_token_data(self, identity: str, mapped_role: str, is_fresh: bool) -> Dict:
+        '''
+        Revoke every token of the user and generate token data at their new token epoch, a
+        user keeps one session and a refresh token already used to refresh is rejected
+        '''
 
-        match token_type:
+        with self.db.transaction():
+            self.revoke_token(identity)
+            # On the connection of the bump, a concurrent rotation cannot hand out the same epoch
+            epoch = self.db.read(Queries.GET_USER_TOKEN_EPOCH, (identity, ), use_primary=True)[0]['epoch']
+        return self.generate_token_data(identity, mapped_role, is_fresh, epoch=epoch)
 
-            case TokenInfo.TYPE_ACCESS:
-                status_info = self.db.read(Queries.GET_ACCESS_TOKEN_STATUS, (token_id, ))
-
-            case TokenInfo.TYPE_REFRESH:
-                status_info = self.db.read(Queries.GET_REFRESH_TOKEN_STATUS, (token_id, ))
-
-        status = status_info[0].get('status')
-        return TokenInfo.status.get(status)
+    def revoke_token(self, user_id: str) -> None:
+        'Revokes every token of a user by bumping their token epoch'
+
+        with self.db.transaction():
+            self.db.write(Queries.BUMP_USER_TOKEN_EPOCH, (user_id, ))
+            self.__record_revocation(user_id)
+            # Evicted once the bump is visible, also when the caller's transaction commits it
+            self.db.after_commit(lambda: token_cache.invalidate(user_id))
+
+    def revoke_deleted_user(self, user_id: str) -> None:
+        'Rejects the tokens of a deleted user at once, whose token epoch was deleted with them'
+
+        self.__record_revocation(user_id)
+        self.db.after_commit(lambda: token_cache.invalidate(user_id))
+
+    def check_token_status(self, jwt_payload: Dict) -> bool:
+        '''
+        Checks if the token was issued at the current token epoch of its user, from the token
+        cache or against the primary. Tokens revoked by another process are rejected within
+        TOKEN_REVOCATION_SYNC_INTERVAL.
+        '''
+        return token_cache.is_active(self.db, jwt_payload['sub'], jwt_payload.get(TokenInfo.CLAIM_EPOCH))
+
+    def __record_revocation(self, user_id: str) -> None:
+        'Records a revocation for the token caches of other processes, until it can be purged'
+
+        revoked_at = datetime.now(timezone.utc)
+        expires_at = revoked_at + timedelta(seconds=token_cache.retention)
+        self.db.write(
+            Queries.INSERT_TOKEN_REVOCATION,
+            (user_id, revoked_at.strftime('%Y-%m-%d %H:%M:%S'), expires_at.strftime('%Y-%m-%d %H:%M:%S'))
+        )
@@ -0,0 +1,135 @@
+'''Background removal of the expired token revocations and redeemed quiz tickets'''
+
+import atexit
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict
+
+from config.queries import Queries
+from config.string_constants import LogMessage
+from database.database_access import DatabaseAccess
+from database.database_connection import backend
+from database.partitions import DayPartitions
+
+logger = logging.getLogger(__name__)
+
+# Day partitions kept ready after today, revocations expire at most TOKEN_REVOCATION_RETENTION ahead
+PARTITION_DAYS_AHEAD = 3
+# Deletes of the rows expired before a time, a batch at a time
+EXPIRED_ROWS = (Queries.DELETE_EXPIRED_TOKEN_REVOCATIONS, Queries.DELETE_EXPIRED_REDEEMED_TICKETS)
+
+
+class TokenPurger:
+    '''
+    Deletes the token revocations and redeemed quiz tickets past their expiry from a
+    background thread.
+
+    Every `interval` seconds the partitions of days that are over are dropped, where the
+    backend partitions token_revocations, and partitions are added for the next
+    PARTITION_DAYS_AHEAD days. The expired rows left, all of them on backends without
+    partitions, and the expired redeemed tickets are deleted oldest first in batches of
+    `batch_size` rows, pausing `pause` seconds between batches so the purge does not hold locks or saturate the primary.
+    Purges of several processes can overlap, deleting an expired row twice is harmless.
+
+    Methods:
+        start(): Starts the background purge.
+        purge(): Removes the expired revocations and redeemed tickets once.
+        stop(): Stops the background purge.
+        stats(): Returns the rows and partitions removed and the last purge duration.
+    '''
+
+    def __init__(self, interval: float, batch_size: int, pause: float) -> None:
+        self.interval = interval
+        self.batch_size = batch_size
+        self.pause = pause
+        self.partitions = DayPartitions('token_revocations', 'expires_at')
+        self.stopped = threading.Event()
+        self.thread = None
+        self.counters = {'purges': 0, 'failed_purges': 0, 'rows': 0, 'batches': 0, 'partitions': 0}
+        self.last_purge_ms = 0.0
+
+    def start(self, db: DatabaseAccess) -> None:
+        '''Starts the background purge, unless the interval is 0.'''
+
+        if self.interval <= 0 or self.thread is not None:
+            return
+
+        self.stopped.clear()
+        self.thread = threading.Thread(target=self.__run, args=(db, ), name='token-purger', daemon=True)
+        self.thread.start()
+        atexit.register(self.stop)
+
+    def purge(self, db: DatabaseAccess) -> int:
+        '''Drops the partitions and deletes the rows of the expired revocations and tickets, returns the rows deleted.'''
+
+        start = time.perf_counter()
+        now = datetime.now(timezone.utc)
+        dropped = []
+        if backend.SUPPORTS_PARTITIONING and self.partitions.exists(db):
+            self.partitions.extend(db, now.date() + timedelta(days=PARTITION_DAYS_AHEAD))
+            dropped = self.partitions.drop_before(db, now.date())
+
+        expired_before = now.strftime('%Y-%m-%d %H:%M:%S')
+        deleted = 0
+        for query in EXPIRED_ROWS:
+            while not self.stopped.is_set():
+                rows = self.__delete_batch(db, query, expired_before)
+                deleted += rows
+                if rows < self.batch_size:
+                    break
+                self.stopped.wait(self.pause)
+
+        self.last_purge_ms = round((time.perf_counter() - start) * 1000, 3)
+        self.counters['purges'] += 1
+        self.counters['rows'] += deleted
+        self.counters['partitions'] += len(dropped)
+        logger.info(LogMessage.PURGE_TOKEN_REVOCATIONS, deleted, dropped, self.last_purge_ms)
+        return deleted
+
+    def stop(self) -> None:
+        '''Stops the background purge, waiting for the batch being deleted.'''
+
+        thread = self.thread
+        if thread is None:
+            return
+
+        self.stopped.set()
+        thread.join()
+        self.thread = None
+
+    def stats(self) -> Dict:
+        '''Returns the counters, the last purge duration and the settings.'''
+
+        stats = dict(self.counters)
+        stats['running'] = self.thread is not None
+        stats['last_purge_ms'] = self.last_purge_ms
+        stats['interval'] = self.interval
+        stats['batch_size'] = self.batch_size
+        stats['pause_ms'] = round(self.pause * 1000, 3)
+        return stats
+
+    def __run(self, db: DatabaseAccess) -> None:
+        'Background purge, every interval until stopped'
+
+        while not self.stopped.wait(self.interval):
+            try:
+                self.purge(db)
+            except Exception as e:
+                logger.exception(e)
+                self.counters['failed_purges'] += 1
+
+    def __delete_batch(self, db: DatabaseAccess, query: str, expired_before: str) -> int:
+        'Deletes up to `batch_size` rows expired before a time, in a transaction of its own'
+
+        self.counters['batches'] += 1
+        return db.write(query, (expired_before, self.batch_size))
+
+
+token_purger = TokenPurger(
+    interval=float(os.getenv('TOKEN_PURGE_INTERVAL', '300')),
+    batch_size=int(os.getenv('TOKEN_PURGE_BATCH_SIZE', '500')),
+    pause=float(os.getenv('TOKEN_PURGE_PAUSE_MS', '50')) / 1000
+)
@@ -2,10 +2,9 @@
 
 from dataclasses import astuple
 
-import mysql.connector
-
 from config.queries import Queries
 from config.string_constants import ErrorMessage
+from database.database_connection import IntegrityError
 from models.users.user import User
 
 
@@ -17,7 +16,7 @@ class UserHelper:
 
     def save_user(self, entity: User) -> None:
         '''
-        Saves the user data and their credentials to the database.
+        Saves the user data and their credentials to the database in one transaction.
 
         user_data = (
             user.user_id,
@@ -35,8 +34,9 @@ class UserHelper:
         '''
         user_data = astuple(entity)[:5]
         credentials = (astuple(entity)[0], ) + astuple(entity)[5:]
-        username = self.db.read(Queries.GET_USERNAME, (entity.username, ))
-        if username:
-            raise mysql.connector.IntegrityError(ErrorMessage.USER_EXISTS)
-        self.db.write(Queries.INSERT_USER_DATA, user_data)
-        self.db.write(Queries.INSERT_CREDENTIALS, credentials)
+        with self.db.transaction():
+            username = self.db.read(Queries.GET_USERNAME, (entity.username, ))
+            if username:
+                raise IntegrityError(ErrorMessage.USER_EXISTS)
+            self.db.write(Queries.INSERT_USER_DATA, user_data)
+            self.db.write(Queries.INSERT_CREDENTIALS, credentials)
@@ -12,7 +12,7 @@ from schemas.category import (
     CategorySchema,
     CategoryUpdateSchema
 )
-from schemas.config_schema import ResponseSchema
+from schemas.config_schema import PageParamsSchema, ResponseSchema
 from utils.rbac import access_level
 
 blp = Blueprint('Category', __name__, description='Routes for the Category related functionalities')
@@ -30,12 +30,16 @@ class Category(MethodView):
     '''
 
     @access_level(roles=[Roles.SUPER_ADMIN, Roles.ADMIN, Roles.PLAYER])
+    @blp.arguments(PageParamsSchema, location='query')
     @blp.response(200, CategoryResponseSchema)
     @blp.doc(parameters=[AUTHORIZATION_HEADER])
 
-    def get(self):
-        'Get all categories details'
-        return category_controller.get_all_categories()
+    def get(self, query_params):
+        '''
+        Get all categories details, by name
+        Pagination: limit, cursor
+        '''
+        return category_controller.get_all_categories(**query_params)
 
     @access_level(roles=[Roles.ADMIN])
     @blp.arguments(CategorySchema)
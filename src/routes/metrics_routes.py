@@ -0,0 +1,31 @@
+'Routes for the Metrics related functionalities'
+
+from flask.views import MethodView
+from flask_smorest import Blueprint
+
+from config.string_constants import AUTHORIZATION_HEADER, Roles
+from controllers.metrics_controller import MetricsController
+from database.database_access import DatabaseAccess
+from schemas.metrics import DatabaseMetricsResponseSchema
+from utils.rbac import access_level
+
+blp = Blueprint('Metrics', __name__, description='Routes for the Metrics related functionalities')
+
+db = DatabaseAccess()
+metrics_controller = MetricsController(db)
+
+
+@blp.route('/metrics/database')
+class DatabaseMetrics(MethodView):
+    '''
+    Routes to:
+        Get query latency statistics, slow queries, connection pool usage and cache hit rates
+    '''
+
+    @access_level(roles=[Roles.SUPER_ADMIN])
+    @blp.response(200, DatabaseMetricsResponseSchema)
+    @blp.doc(parameters=[AUTHORIZATION_HEADER])
+
+    def get(self):
+        'Get query latency statistics, slow queries, connection pool usage and cache hit rates'
+        return metrics_controller.get_database_metrics()
@@ -9,12 +9,20 @@ from controllers.quiz_controller import QuizController
 from database.database_access import DatabaseAccess
 from schemas.quiz import (
     AnswerSchema,
+    AnswerSheetsResponseSchema,
+    AnswerSheetsSchema,
+    LeaderboardParamsSchema,
     LeaderboardResponseSchema,
+    PlayerRankParamsSchema,
+    PlayerRankResponseSchema,
+    PlayerStatsResponseSchema,
     QuizAnswerResponseSchema,
     QuizParamsSchema,
     QuizQuestionResponseSchema,
+    QuizTicketParamsSchema,
     ScoreResponseSchema
 )
+from schemas.config_schema import PageParamsSchema
 from utils.rbac import access_level
 
 blp = Blueprint('Quiz', __name__, description='Routes for the Quiz related functionalities')
@@ -30,12 +38,37 @@ class Leaderboard(MethodView):
     '''
 
     @access_level(roles=[Roles.SUPER_ADMIN, Roles.ADMIN, Roles.PLAYER])
+    @blp.arguments(LeaderboardParamsSchema, location='query')
     @blp.response(200, LeaderboardResponseSchema)
     @blp.doc(parameters=[AUTHORIZATION_HEADER])
 
-    def get(self):
-        'Get leaderboard details'
-        return quiz_controller.get_leaderboard()
+    def get(self, query_params):
+        '''
+        Get leaderboard details
+        Query Parameters: limit, window, category_id
+        '''
+        return quiz_controller.get_leaderboard(**query_params)
+
+
+@blp.route('/leaderboard/me')
+class PlayerRank(MethodView):
+    '''
+    Routes to:
+        Get player's rank in the leaderboard
+    '''
+
+    @access_level(roles=[Roles.PLAYER])
+    @blp.arguments(PlayerRankParamsSchema, location='query')
+    @blp.response(200, PlayerRankResponseSchema)
+    @blp.doc(parameters=[AUTHORIZATION_HEADER])
+
+    def get(self, query_params):
+        '''
+        Get rank of a player with the players ranked around them
+        Query Parameters: neighbors
+        '''
+        player_id = get_jwt_identity()
+        return quiz_controller.get_player_rank(player_id, **query_params)
 
 
 @blp.route('/scores/me')
@@ -46,13 +79,34 @@ class Score(MethodView):
     '''
 
     @access_level(roles=[Roles.PLAYER])
+    @blp.arguments(PageParamsSchema, location='query')
     @blp.response(200, ScoreResponseSchema)
     @blp.doc(parameters=[AUTHORIZATION_HEADER])
 
+    def get(self, query_params):
+        '''
+        Get past scores of a player, newest first
+        Pagination: limit, cursor
+        '''
+        player_id = get_jwt_identity()
+        return quiz_controller.get_player_scores(player_id, **query_params)
+
+
+@blp.route('/scores/me/summary')
+class ScoreSummary(MethodView):
+    '''
+    Routes to:
+        Get player's score summary
+    '''
+
+    @access_level(roles=[Roles.PLAYER])
+    @blp.response(200, PlayerStatsResponseSchema)
+    @blp.doc(parameters=[AUTHORIZATION_HEADER])
+
     def get(self):
-        'Get past scores of a player'
+        'Get attempt count, average score, best score and last played time of a player'
         player_id = get_jwt_identity()
-        return quiz_controller.get_player_scores(player_id)
+        return quiz_controller.get_player_summary(player_id)
 
 
 @blp.route('/quiz')
@@ -69,10 +123,11 @@ class Quiz(MethodView):
 
     def get(self, query_params):
         '''
-        Get random questions for quiz
+        Get random questions for quiz with the ticket to submit the answers with
         Query Parameters: category_id, question_type, limit
         '''
-        return quiz_controller.get_random_questions(**query_params)
+        player_id = get_jwt_identity()
+        return quiz_controller.get_random_questions(player_id, **query_params)
 
 
 @blp.route('/quiz/answers')
@@ -84,10 +139,32 @@ class QuizAnswer(MethodView):
 
     @access_level(roles=[Roles.PLAYER])
     @blp.arguments(AnswerSchema(many=True))
+    @blp.arguments(QuizTicketParamsSchema, location='query')
     @blp.response(201, QuizAnswerResponseSchema)
     @blp.doc(parameters=[AUTHORIZATION_HEADER])
 
-    def post(self, player_answers):
-        'Post player responses to the questions'
+    def post(self, player_answers, query_params):
+        '''
+        Post player responses to the questions
+        Query Parameters: ticket, the quiz ticket returned with the questions, required unless
+        QUIZ_ALLOW_UNTICKETED_ANSWERS is set. A ticket grades one submission across every process
+        '''
         player_id = get_jwt_identity()
-        return quiz_controller.evaluate_player_answers(player_id, player_answers)
+        return quiz_controller.evaluate_player_answers(player_id, player_answers, **query_params)
+
+
+@blp.route('/quiz/answers/batch')
+class QuizAnswerBatch(MethodView):
+    '''
+    Routes to:
+        Post the answer sheets of many players, e.g. of a proctored session
+    '''
+
+    @access_level(roles=[Roles.SUPER_ADMIN, Roles.ADMIN])
+    @blp.arguments(AnswerSheetsSchema)
+    @blp.response(201, AnswerSheetsResponseSchema)
+    @blp.doc(parameters=[AUTHORIZATION_HEADER])
+
+    def post(self, request_data):
+        'Post the answer sheets of many players, graded and saved together'
+        return quiz_controller.evaluate_answer_sheets(request_data['answer_sheets'])
@@ -7,9 +7,10 @@ from flask_smorest import Blueprint
 from config.string_constants import AUTHORIZATION_HEADER, Roles
 from controllers.user_controller import UserController
 from database.database_access import DatabaseAccess
-from schemas.config_schema import ResponseSchema
+from schemas.config_schema import PageParamsSchema, ResponseSchema
 from schemas.user import (
     PasswordUpdateSchema,
+    PlayerResponseSchema,
     ProfileResponseSchema,
     UserResponseSchema,
     UserSchema,
@@ -77,12 +78,16 @@ class Player(MethodView):
     '''
 
     @access_level(roles=[Roles.SUPER_ADMIN, Roles.ADMIN])
-    @blp.response(200, UserResponseSchema)
+    @blp.arguments(PageParamsSchema, location='query')
+    @blp.response(200, PlayerResponseSchema)
     @blp.doc(parameters=[AUTHORIZATION_HEADER])
 
-    def get(self):
-        'Get all player details'
-        return user_controller.get_all_players()
+    def get(self, query_params):
+        '''
+        Get all player details with their attempt count, average score, best score and last played time
+        Pagination: limit, cursor
+        '''
+        return user_controller.get_all_players(**query_params)
 
 
 @blp.route('/admins')
@@ -94,12 +99,16 @@ class Admin(MethodView):
     '''
 
     @access_level(roles=[Roles.SUPER_ADMIN])
+    @blp.arguments(PageParamsSchema, location='query')
     @blp.response(200, UserResponseSchema)
     @blp.doc(parameters=[AUTHORIZATION_HEADER])
 
-    def get(self):
-        'Get all admin details'
-        return user_controller.get_all_admins()
+    def get(self, query_params):
+        '''
+        Get all admin details
+        Pagination: limit, cursor
+        '''
+        return user_controller.get_all_admins(**query_params)
 
 
     @access_level(roles=[Roles.SUPER_ADMIN])
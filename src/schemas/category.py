@@ -3,7 +3,7 @@
 from marshmallow import fields, validate
 
 from config.regex_patterns import RegexPattern
-from schemas.config_schema import CustomSchema, ResponseSchema
+from schemas.config_schema import CustomSchema, PageResponseSchema
 
 
 class CategorySchema(CustomSchema):
@@ -20,7 +20,7 @@ class CategoryUpdateSchema(CustomSchema):
     updated_category_name = fields.Str(required=True)
 
 
-class CategoryResponseSchema(ResponseSchema):
+class CategoryResponseSchema(PageResponseSchema):
     'Schema for response data of get all categories'
 
     data = fields.Nested(CategorySchema, many=True)
@@ -1,9 +1,10 @@
 'Configurations for marshmallow schemas'
 
-from marshmallow import Schema, fields
+from marshmallow import Schema, fields, validate
 
 from config.string_constants import StatusCodes
 from utils.custom_error import ValidationError
+from utils.pagination import MAX_PAGE_SIZE
 
 
 class CustomSchema(Schema):
@@ -21,3 +22,16 @@ class ResponseSchema(CustomSchema):
     status = fields.Str(required=True)
     message = fields.Str(required=True)
     data = None
+
+
+class PageParamsSchema(CustomSchema):
+    'Class to define the query parameters of paginated lists'
+
+    limit = fields.Int(required=False, validate=validate.Range(min=1, max=MAX_PAGE_SIZE))
+    cursor = fields.Str(required=False, validate=validate.Length(min=1, max=512))
+
+
+class PageResponseSchema(ResponseSchema):
+    'Class to define the response schema of paginated lists, next_cursor is null on the last page'
+
+    next_cursor = fields.Str(allow_none=True)
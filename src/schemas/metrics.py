@@ -0,0 +1,48 @@
+'Schema for Metrics data'
+
+from marshmallow import fields
+
+from schemas.config_schema import CustomSchema, ResponseSchema
+
+
+class QueryStatsSchema(CustomSchema):
+    'Schema for the statistics of a named query'
+
+    calls = fields.Int()
+    total_ms = fields.Float()
+    p50_ms = fields.Float()
+    p95_ms = fields.Float()
+    p99_ms = fields.Float()
+    rows = fields.Int()
+    bytes = fields.Int()
+
+
+class SlowQuerySchema(CustomSchema):
+    'Schema for a slow query log entry'
+
+    query = fields.Str()
+    statement = fields.Str()
+    elapsed_ms = fields.Float()
+    plan = fields.List(fields.Dict())
+    timestamp = fields.Str()
+
+
+class DatabaseMetricsSchema(CustomSchema):
+    'Schema for database metrics'
+
+    slow_threshold_ms = fields.Float()
+    queries = fields.Dict(keys=fields.Str(), values=fields.Nested(QueryStatsSchema))
+    slow_queries = fields.Nested(SlowQuerySchema, many=True)
+    pool = fields.Dict()
+    statement_cache = fields.Dict()
+    answer_key_cache = fields.Dict()
+    score_queue = fields.Dict()
+    token_cache = fields.Dict()
+    token_purge = fields.Dict()
+    password_pool = fields.Dict()
+
+
+class DatabaseMetricsResponseSchema(ResponseSchema):
+    'Schema for database metrics response'
+
+    data = fields.Nested(DatabaseMetricsSchema)
@@ -1,10 +1,10 @@
 'Schema for Quiz data'
 
 from marshmallow import fields, validate
-from config.string_constants import QUESTION_TYPES
+from config.string_constants import LEADERBOARD_WINDOWS, QUESTION_TYPES
 
 from config.regex_patterns import RegexPattern
-from schemas.config_schema import CustomSchema, ResponseSchema
+from schemas.config_schema import CustomSchema, PageResponseSchema, ResponseSchema
 
 
 class AnswerSchema(CustomSchema):
@@ -14,6 +14,21 @@ class AnswerSchema(CustomSchema):
     user_answer = fields.Str(required=True, validate=validate.Regexp(RegexPattern.OPTION_TEXT_PATTERN))
 
 
+class AnswerSheetSchema(CustomSchema):
+    'Schema for the answers of one player'
+
+    player_id = fields.Str(required=True, validate=validate.Regexp(RegexPattern.ID_PATTERN))
+    answers = fields.List(fields.Nested(AnswerSchema), required=True, validate=validate.Length(min=1))
+
+
+class AnswerSheetsSchema(CustomSchema):
+    'Schema for the answer sheets of many players graded together'
+
+    answer_sheets = fields.List(
+        fields.Nested(AnswerSheetSchema), required=True, validate=validate.Length(min=1, max=1000)
+    )
+
+
 class QuizParamsSchema(CustomSchema):
     'Schema for query parameters while fetching questions for quiz'
 
@@ -22,13 +37,34 @@ class QuizParamsSchema(CustomSchema):
     limit = fields.Int(required=False, validate=validate.Range(min=1))
 
 
+class QuizTicketParamsSchema(CustomSchema):
+    'Schema for query parameters while submitting quiz answers'
+
+    ticket = fields.Str(required=False, validate=validate.Length(min=1, max=4096))
+
+
+class LeaderboardParamsSchema(CustomSchema):
+    'Schema for query parameters while fetching the leaderboard'
+
+    limit = fields.Int(required=False, validate=validate.Range(min=1, max=100))
+    window = fields.Str(required=False, validate=validate.OneOf(LEADERBOARD_WINDOWS))
+    category_id = fields.Str(required=False, validate=validate.Regexp(RegexPattern.ID_PATTERN))
+
+
+class PlayerRankParamsSchema(CustomSchema):
+    'Schema for query parameters while fetching the rank of a player'
+
+    neighbors = fields.Int(required=False, validate=validate.Range(min=0, max=25))
+
+
 class LeaderboardDataSchema(CustomSchema):
     'Schema for leaderboard data'
 
+    rank = fields.Int(dump_only=True)
     player_id = fields.Str(dump_only=True, validate=validate.Regexp(RegexPattern.ID_PATTERN))
     username = fields.Str(required=True, validate=validate.Regexp(RegexPattern.USERNAME_PATTERN))
-    score = fields.Int(dump_only=True, validate=validate.Range(min=0, max=100))
-    timestamp = fields.Str(dump_only=True)
+    score = fields.Float(dump_only=True, validate=validate.Range(min=0, max=100))
+    timestamp = fields.DateTime(dump_only=True, format='%Y-%m-%d %H:%M:%S')
 
 
 class LeaderboardResponseSchema(ResponseSchema):
@@ -37,20 +73,49 @@ class LeaderboardResponseSchema(ResponseSchema):
     data = fields.Nested(LeaderboardDataSchema, many=True)
 
 
+class PlayerRankSchema(CustomSchema):
+    'Schema for the rank of a player'
+
+    rank = fields.Int(dump_only=True)
+    total_players = fields.Int(dump_only=True)
+    neighbors = fields.Nested(LeaderboardDataSchema, many=True, dump_only=True)
+
+
+class PlayerRankResponseSchema(ResponseSchema):
+    'Schema for player rank response'
+
+    data = fields.Nested(PlayerRankSchema)
+
+
 class ScoreDataSchema(CustomSchema):
     'Schema for score data'
 
     score_id = fields.Str(dump_only=True, validate=validate.Regexp(RegexPattern.ID_PATTERN))
-    score = fields.Int(dump_only=True, validate=validate.Range(min=0, max=100))
-    timestamp = fields.Str(dump_only=True)
+    score = fields.Float(dump_only=True, validate=validate.Range(min=0, max=100))
+    timestamp = fields.DateTime(dump_only=True, format='%Y-%m-%d %H:%M:%S')
 
 
-class ScoreResponseSchema(ResponseSchema):
+class ScoreResponseSchema(PageResponseSchema):
     'Schema for score response'
 
     data = fields.Nested(ScoreDataSchema, many=True)
 
 
+class PlayerStatsSchema(CustomSchema):
+    'Schema for the score summary of a player'
+
+    attempts = fields.Int(dump_only=True)
+    average_score = fields.Float(dump_only=True, validate=validate.Range(min=0, max=100))
+    best_score = fields.Float(dump_only=True, validate=validate.Range(min=0, max=100))
+    last_played = fields.DateTime(dump_only=True, format='%Y-%m-%d %H:%M:%S')
+
+
+class PlayerStatsResponseSchema(ResponseSchema):
+    'Schema for player score summary response'
+
+    data = fields.Nested(PlayerStatsSchema)
+
+
 class QuizQuestionDataSchema(CustomSchema):
     'Schema for quiz questions data'
 
@@ -61,9 +126,10 @@ class QuizQuestionDataSchema(CustomSchema):
 
 
 class QuizQuestionResponseSchema(ResponseSchema):
-    'Schema for quiz questions response'
+    'Schema for quiz questions response, with the ticket to submit the answers with'
 
     data = fields.Nested(QuizQuestionDataSchema, many=True)
+    ticket = fields.Str()
 
 
 class ResponseDataSchema(CustomSchema):
@@ -79,7 +145,7 @@ class ResponseDataSchema(CustomSchema):
 class QuizAnswerDataSchema(CustomSchema):
     'Schema for quiz answers data'
 
-    score = fields.Int(dump_only=True, validate=validate.Range(min=0, max=100))
+    score = fields.Float(dump_only=True, validate=validate.Range(min=0, max=100))
     responses = fields.Nested(ResponseDataSchema, many=True)
 
 
@@ -87,3 +153,15 @@ class QuizAnswerResponseSchema(ResponseSchema):
     'Schema for quiz answers response'
 
     data = fields.Nested(QuizAnswerDataSchema)
+
+
+class AnswerSheetResultSchema(QuizAnswerDataSchema):
+    'Schema for the graded answer sheet of a player'
+
+    player_id = fields.Str(dump_only=True, validate=validate.Regexp(RegexPattern.ID_PATTERN))
+
+
+class AnswerSheetsResponseSchema(ResponseSchema):
+    'Schema for graded answer sheets response'
+
+    data = fields.Nested(AnswerSheetResultSchema, many=True)
@@ -3,7 +3,7 @@
 from marshmallow import fields, validate
 
 from config.regex_patterns import RegexPattern
-from schemas.config_schema import CustomSchema, ResponseSchema
+from schemas.config_schema import CustomSchema, PageResponseSchema, ResponseSchema
 
 
 class UserSchema(CustomSchema):
@@ -13,7 +13,7 @@ class UserSchema(CustomSchema):
     username = fields.Str(required=True, validate=validate.Regexp(RegexPattern.USERNAME_PATTERN))
     name = fields.Str(required=True, validate=validate.Regexp(RegexPattern.NAME_PATTERN))
     email = fields.Str(required=True, validate=validate.Regexp(RegexPattern.EMAIL_PATTERN))
-    registration_date = fields.Str(dump_only=True)
+    registration_date = fields.Date(dump_only=True, format='%Y-%m-%d')
     password = fields.Str(load_only=True)
 
 class UserUpdateSchema(CustomSchema):
@@ -36,7 +36,22 @@ class ProfileResponseSchema(ResponseSchema):
     data = fields.Nested(UserSchema)
 
 
-class UserResponseSchema(ProfileResponseSchema):
+class PlayerSchema(UserSchema):
+    'Schema for player data with their score summary'
+
+    attempts = fields.Int(dump_only=True)
+    average_score = fields.Float(dump_only=True, allow_none=True)
+    best_score = fields.Float(dump_only=True, allow_none=True)
+    last_played = fields.DateTime(dump_only=True, allow_none=True, format='%Y-%m-%d %H:%M:%S')
+
+
+class UserResponseSchema(PageResponseSchema):
     'Schema for view users response'
 
     data = fields.Nested(UserSchema, many=True)
+
+
+class PlayerResponseSchema(PageResponseSchema):
+    'Schema for view players response'
+
+    data = fields.Nested(PlayerSchema, many=True)
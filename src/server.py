@@ -24,6 +24,7 @@ from flask import Flask
 
 from config.flask_configs import (
     register_blueprints,
+    register_commands,
     register_error_handlers,
     set_app_configs,
     set_jwt_configs
@@ -52,5 +53,6 @@ def create_app():
     register_error_handlers(app)
     set_jwt_configs(app)
     register_blueprints(app)
+    register_commands(app)
 
     return app
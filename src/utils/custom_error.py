@@ -69,3 +69,12 @@ class ValidationError(CustomError):
     This error signifies that the input provided does not meet the expected criteria or is invalid.
     It helps handle situations where incorrect or unacceptable input is detected.
     '''
+
+
+class ServiceUnavailableError(CustomError):
+    '''
+    Exception raised when a request is turned away to protect the server.
+
+    This error is raised when a bounded resource, e.g. the password hashing pool, has no
+    capacity left for the request. The client may retry shortly.
+    '''
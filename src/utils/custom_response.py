@@ -11,6 +11,8 @@ class SuccessMessage(Exception):
     status: NamedTuple
     message: str
     data: Dict = None
+    next_cursor: str = None
+    ticket: str = None
 
     @property
     def message_info(self):
@@ -20,5 +22,7 @@ class SuccessMessage(Exception):
             'code': self.status.code,
             'status': self.status.status,
             'message': self.message,
-            'data': self.data
+            'data': self.data,
+            'next_cursor': self.next_cursor,
+            'ticket': self.ticket
         }, self.status.code
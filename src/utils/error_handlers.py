@@ -9,7 +9,8 @@ from utils.custom_error import (
     DataNotFoundError,
     DuplicateEntryError,
     InvalidCredentialsError,
-    InvalidInputError
+    InvalidInputError,
+    ServiceUnavailableError
 )
 
 logger = logging.getLogger(__name__)
@@ -73,6 +74,10 @@ def handle_custom_errors(func):
             logger.error(e.message)
             return e.error_info, e.code
 
+        except ServiceUnavailableError as e:
+            logger.error(e.message)
+            return e.error_info, e.code
+
         return res
 
     return wrapper
@@ -0,0 +1,44 @@
+'''Keyset pagination: opaque cursors over the sort key of the last row of a page'''
+
+import base64
+import binascii
+import json
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from config.string_constants import ErrorMessage, StatusCodes
+from utils.custom_error import InvalidInputError
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+def encode_cursor(values: Sequence) -> str:
+    'Encodes the sort key of a row as an url safe cursor'
+
+    data = json.dumps(list(values), default=str, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(data).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str, size: int) -> Tuple:
+    'Decodes a cursor into a sort key of `size` values'
+
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise InvalidInputError(status=StatusCodes.UNPROCESSABLE_ENTITY, message=ErrorMessage.INVALID_CURSOR) from e
+
+    if not isinstance(values, list) or len(values) != size or not all(isinstance(v, str) for v in values):
+        raise InvalidInputError(status=StatusCodes.UNPROCESSABLE_ENTITY, message=ErrorMessage.INVALID_CURSOR)
+    return tuple(values)
+
+
+def paginate(rows: List[Dict], limit: int, key: Sequence[str]) -> Tuple[List[Dict], Optional[str]]:
+    '''
+    Splits the `limit + 1` rows read for a page into the page and the cursor of the next page,
+    None on the last page. `key` names the columns the rows are sorted by.
+    '''
+    if len(rows) <= limit:
+        return rows, None
+
+    page = rows[:limit]
+    return page, encode_cursor([page[-1][column] for column in key])
@@ -1,19 +1,165 @@
-'''Hash the passwords using hashlib library'''
+'''Hash and verify the passwords with a key derivation function from the hashlib library'''
 
+import base64
 import hashlib
+import hmac
+import os
+from abc import ABC, abstractmethod
+from typing import Dict, NamedTuple, Optional, Tuple
+
+SALT_BYTES = 16
+KEY_BYTES = 32
+SEPARATOR = '$'
+
+
+class Verification(NamedTuple):
+    'Result of a password check, and whether the stored hash should be replaced'
+
+    valid: bool
+    needs_rehash: bool
+
+
+class KDF(ABC):
+    '''
+    Abstract key derivation function stretching a password with a random salt, so a leaked
+    hash costs `cost` work per guess.
+
+    Hashes are stored as name$cost$salt$key with the salt and key in unpadded base64, and
+    carry their cost: raising it leaves the existing hashes valid, they are rehashed on the
+    next login.
+
+    Methods:
+        derive(): Derives the key of a password, implemented by each function.
+        hash(): Returns the stored form of the hash of a password.
+        verify(): Checks a password against a stored hash of this function.
+    '''
+
+    name = ''
+    default_cost = 0
+
+    def __init__(self, cost: int = 0) -> None:
+        self.cost = cost or self.default_cost
+
+    @abstractmethod
+    def derive(self, password: bytes, salt: bytes, cost: int) -> bytes:
+        '''Returns the key derived from a password and salt.'''
+
+    def hash(self, password: str) -> str:
+        '''Returns name$cost$salt$key for a password and a new random salt.'''
+
+        salt = os.urandom(SALT_BYTES)
+        key = self.derive(password.encode('utf-8'), salt, self.cost)
+        return SEPARATOR.join((self.name, str(self.cost), encode(salt), encode(key)))
+
+    def verify(self, password: str, cost: int, salt: bytes, key: bytes) -> bool:
+        '''Checks a password against the parts of a stored hash, in constant time.'''
+
+        return hmac.compare_digest(self.derive(password.encode('utf-8'), salt, cost), key)
+
+
+class ScryptKDF(KDF):
+    '''scrypt with N = 2 ** cost, r = 8 and p = 1, using 128 * r * N bytes of memory (16 MiB at cost 14)'''
+
+    name = 'scrypt'
+    default_cost = 14
+    block_size = 8
+
+    def derive(self, password: bytes, salt: bytes, cost: int) -> bytes:
+        memory = 128 * self.block_size * 2 ** cost
+        return hashlib.scrypt(
+            password, salt=salt, n=2 ** cost, r=self.block_size, p=1, maxmem=2 * memory, dklen=KEY_BYTES
+        )
+
+
+class PBKDF2KDF(KDF):
+    '''PBKDF2-HMAC-SHA256 with `cost` iterations'''
+
+    name = 'pbkdf2_sha256'
+    default_cost = 600000
+
+    def derive(self, password: bytes, salt: bytes, cost: int) -> bytes:
+        return hashlib.pbkdf2_hmac('sha256', password, salt, cost, dklen=KEY_BYTES)
+
+
+KDFS: Dict[str, type] = {function.name: function for function in (ScryptKDF, PBKDF2KDF)}
+
+
+def encode(value: bytes) -> str:
+    'Unpadded base64 of bytes'
+
+    return base64.b64encode(value).decode('ascii').rstrip('=')
+
+
+def decode(value: str) -> bytes:
+    'Bytes of unpadded base64'
+
+    return base64.b64decode(value + '=' * (-len(value) % 4))
+
+
+def get_kdf() -> KDF:
+    '''Returns the function new hashes use, PASSWORD_KDF (scrypt or pbkdf2_sha256) at PASSWORD_KDF_COST.'''
+
+    name = os.getenv('PASSWORD_KDF') or ScryptKDF.name
+    return KDFS[name](int(os.getenv('PASSWORD_KDF_COST') or '0'))
+
+
+kdf = get_kdf()
+
+
+def legacy_hash_password(password: str) -> str:
+    '''Single SHA-256 pass of a password, the form stored before key derivation functions.'''
+
+    return hashlib.sha256(password.encode('utf-8')).hexdigest()
 
 
 def hash_password(password: str) -> str:
     '''
-    Hashes a password using hashlib.
+    Hashes a password using the configured key derivation function.
 
     Args:
         password (str): The password to be hashed.
 
-    Uses the hashlib library to securely hash the provided password using SHA-256 algorithm.
+    Returns:
+        str: The hashed password, name$cost$salt$key.
+    '''
+    return kdf.hash(password)
+
+
+def verify_password(password: str, stored_password: str) -> Verification:
+    '''
+    Checks a password against its stored form.
+
+    Hashes of another function or cost than the configured one, legacy SHA-256 hashes and
+    passwords still stored in plain text (default admin passwords) are accepted and flagged
+    for rehashing.
+
+    Args:
+        password (str): The password given.
+        stored_password (str): The password stored in credentials.
 
     Returns:
-        str: The hashed password as a string.
+        Verification: Whether the password matches, and whether to store a new hash of it.
     '''
-    hashed_password = hashlib.sha256(password.encode('utf-8')).hexdigest()
-    return hashed_password
+    parsed = parse(stored_password)
+    if parsed is None:
+        candidates = (password, legacy_hash_password(password))
+        valid = any(
+            hmac.compare_digest(candidate.encode('utf-8'), stored_password.encode('utf-8')) for candidate in candidates
+        )
+        return Verification(valid, valid)
+
+    name, cost, salt, key = parsed
+    valid = KDFS[name]().verify(password, cost, salt, key)
+    return Verification(valid, valid and (name, cost) != (kdf.name, kdf.cost))
+
+
+def parse(stored_password: str) -> Optional[Tuple]:
+    'Returns (name, cost, salt, key) of a stored hash, None for a legacy password'
+
+    parts = stored_password.split(SEPARATOR)
+    if len(parts) != 4 or parts[0] not in KDFS or not parts[1].isdigit():
+        return None
+    try:
+        return parts[0], int(parts[1]), decode(parts[2]), decode(parts[3])
+    except ValueError:
+        return None
@@ -8,6 +8,7 @@ from typing import List
 from flask_jwt_extended import get_jwt, verify_jwt_in_request
 
 from config.string_constants import ErrorMessage, LogMessage, Roles, StatusCodes
+from database.read_your_writes import read_your_writes
 from utils.custom_error import CustomError
 
 logger = logging.getLogger(__name__)
@@ -28,6 +29,7 @@ def access_level(roles: List, check_fresh=False):
         def wrapper(*args, **kwargs):
             verify_jwt_in_request(fresh=check_fresh)
             claims = get_jwt()
+            read_your_writes.bind(claims['sub'])
             mapped_roles = [ROLE_MAPPING.get(role) for role in roles]
 
             if claims["cap"] not in mapped_roles:
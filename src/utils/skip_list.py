@@ -0,0 +1,161 @@
+'''Indexable skip list, a sorted sequence with O(log n) rank and select'''
+
+import random
+from typing import Any, Iterable, Iterator, List, Optional
+
+
+class Node:
+    '''
+    Skip list node.
+
+    width[level] is the number of positions the link next[level] skips, so the position of
+    a node is the sum of the widths followed to reach it.
+    '''
+
+    __slots__ = ('key', 'next', 'width')
+
+    def __init__(self, key: Any, levels: int) -> None:
+        self.key = key
+        self.next: List[Optional['Node']] = [None] * levels
+        self.width: List[int] = [1] * levels
+
+
+class SkipList:
+    '''
+    Sorted list of distinct, comparable keys.
+
+    Insert, remove, rank() and select() are O(log n) expected. Keys are stored in ascending
+    order, so a descending ranking is expressed through the key, e.g. (-score, timestamp).
+
+    Methods:
+        from_sorted(): Builds a skip list from sorted keys.
+        insert(): Adds a key.
+        remove(): Removes a key.
+        rank(): Returns the 0 based position of a key.
+        select(): Returns the key at a 0 based position.
+        iterate(): Yields keys in order from a 0 based position.
+    '''
+
+    MAX_LEVEL = 24
+
+    def __init__(self) -> None:
+        self.head = Node(None, SkipList.MAX_LEVEL)
+        self.size = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    @classmethod
+    def from_sorted(cls, keys: Iterable[Any]) -> 'SkipList':
+        '''Builds a skip list in O(n) from distinct keys in ascending order.'''
+
+        skip_list = cls()
+        tails = [skip_list.head] * SkipList.MAX_LEVEL
+        positions = [0] * SkipList.MAX_LEVEL
+        position = 0
+        for position, key in enumerate(keys, 1):
+            node = Node(key, skip_list.__random_levels())
+            for level in range(len(node.next)):
+                tails[level].next[level] = node
+                tails[level].width[level] = position - positions[level]
+                tails[level], positions[level] = node, position
+
+        for level in range(SkipList.MAX_LEVEL):
+            tails[level].width[level] = position + 1 - positions[level]
+        skip_list.size = position
+        return skip_list
+
+    def insert(self, key: Any) -> None:
+        '''Adds a key, which must not be in the list already.'''
+
+        chain, steps_at_level = self.__find(key)
+        levels = self.__random_levels()
+        node = Node(key, levels)
+        steps = 0
+        for level in range(levels):
+            previous = chain[level]
+            node.next[level] = previous.next[level]
+            previous.next[level] = node
+            node.width[level] = previous.width[level] - steps
+            previous.width[level] = steps + 1
+            steps += steps_at_level[level]
+        for level in range(levels, SkipList.MAX_LEVEL):
+            chain[level].width[level] += 1
+        self.size += 1
+
+    def remove(self, key: Any) -> None:
+        '''Removes a key, raises KeyError if it is not in the list.'''
+
+        chain, _ = self.__find(key)
+        node = chain[0].next[0]
+        if node is None or node.key != key:
+            raise KeyError(key)
+
+        for level in range(len(node.next)):
+            previous = chain[level]
+            previous.width[level] += node.width[level] - 1
+            previous.next[level] = node.next[level]
+        for level in range(len(node.next), SkipList.MAX_LEVEL):
+            chain[level].width[level] -= 1
+        self.size -= 1
+
+    def rank(self, key: Any) -> int:
+        '''Returns the 0 based position of a key, raises KeyError if it is not in the list.'''
+
+        node, position = self.head, 0
+        for level in reversed(range(SkipList.MAX_LEVEL)):
+            while node.next[level] is not None and node.next[level].key < key:
+                position += node.width[level]
+                node = node.next[level]
+
+        node = node.next[0]
+        if node is None or node.key != key:
+            raise KeyError(key)
+        return position
+
+    def select(self, index: int) -> Any:
+        '''Returns the key at a 0 based position, raises IndexError if out of range.'''
+
+        return self.__node_at(index).key
+
+    def iterate(self, start: int = 0) -> Iterator[Any]:
+        '''Yields the keys in order, from the 0 based position `start`.'''
+
+        if start >= self.size:
+            return
+        node = self.__node_at(max(start, 0))
+        while node is not None:
+            yield node.key
+            node = node.next[0]
+
+    def __node_at(self, index: int) -> Node:
+        if not 0 <= index < self.size:
+            raise IndexError(index)
+
+        node, position = self.head, 0
+        for level in reversed(range(SkipList.MAX_LEVEL)):
+            while node.next[level] is not None and position + node.width[level] <= index + 1:
+                position += node.width[level]
+                node = node.next[level]
+        return node
+
+    def __find(self, key: Any):
+        'Returns the last node before `key` on every level, and the positions skipped at every level'
+
+        chain = [self.head] * SkipList.MAX_LEVEL
+        steps_at_level = [0] * SkipList.MAX_LEVEL
+        node = self.head
+        for level in reversed(range(SkipList.MAX_LEVEL)):
+            while node.next[level] is not None and node.next[level].key < key:
+                steps_at_level[level] += node.width[level]
+                node = node.next[level]
+            chain[level] = node
+        return chain, steps_at_level
+
+    def __random_levels(self) -> int:
+        'Levels of a new node, each level kept with probability 1/2'
+
+        levels = 1
+        while levels < SkipList.MAX_LEVEL and random.getrandbits(1):
+            levels += 1
+        return levels
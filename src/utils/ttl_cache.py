@@ -0,0 +1,127 @@
+'''Thread safe LRU cache whose entries expire after a time to live'''
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Tuple
+
+
+class TTLCache:
+    '''
+    LRU cache of at most `max_size` entries, each valid for `ttl` seconds after it was stored.
+
+    Lookups and stores work on batches of keys, so callers can fetch all their misses at once.
+    Every invalidation bumps a generation counter: a batch fetched before an invalidation is
+    not stored, so a read racing with a write cannot put the old value back.
+
+    Methods:
+        get_many(): Returns the cached values of keys and the keys missing.
+        put_many(): Stores values.
+        invalidate(): Removes keys.
+        invalidate_where(): Removes the entries whose value matches a predicate.
+        clear(): Removes every entry.
+        stats(): Returns hit, miss, eviction and expiration counters with the size.
+    '''
+
+    def __init__(self, max_size: int, ttl: float, sizeof: Callable[[Any], int] = None) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self.sizeof = sizeof or (lambda value: 0)
+        self.lock = threading.Lock()
+        # key -> (expires_at, size, value), least recently used first
+        self.entries: 'OrderedDict[Hashable, Tuple[float, int, Any]]' = OrderedDict()
+        self.generation = 0
+        self.bytes = 0
+        self.counters = {'hits': 0, 'misses': 0, 'evictions': 0, 'expirations': 0, 'invalidations': 0}
+
+    def get_many(self, keys: Iterable[Hashable]) -> Tuple[Dict[Hashable, Any], List[Hashable], int]:
+        '''
+        Returns the values found, the keys missing or expired, and the generation to pass to
+        put_many() with the values fetched for the missing keys.
+        '''
+        now = time.monotonic()
+        found, missing = {}, []
+        with self.lock:
+            for key in keys:
+                entry = self.entries.get(key)
+                if entry is not None and entry[0] <= now:
+                    self.__pop(key)
+                    self.counters['expirations'] += 1
+                    entry = None
+                if entry is None:
+                    missing.append(key)
+                    continue
+                self.entries.move_to_end(key)
+                found[key] = entry[2]
+            self.counters['hits'] += len(found)
+            self.counters['misses'] += len(missing)
+            return found, missing, self.generation
+
+    def put_many(self, items: Dict[Hashable, Any], generation: int = None) -> None:
+        '''Stores values, unless an invalidation happened since `generation` was read.'''
+
+        if self.max_size <= 0:
+            return
+
+        expires_at = time.monotonic() + self.ttl
+        with self.lock:
+            if generation is not None and generation != self.generation:
+                return
+            for key, value in items.items():
+                self.__pop(key)
+                size = self.sizeof(value)
+                self.entries[key] = (expires_at, size, value)
+                self.bytes += size
+            while len(self.entries) > self.max_size:
+                self.__pop(next(iter(self.entries)))
+                self.counters['evictions'] += 1
+
+    def invalidate(self, keys: Iterable[Hashable]) -> None:
+        '''Removes keys from the cache.'''
+
+        with self.lock:
+            self.generation += 1
+            for key in keys:
+                if self.__pop(key):
+                    self.counters['invalidations'] += 1
+
+    def invalidate_where(self, predicate: Callable[[Any], bool]) -> List[Hashable]:
+        '''Removes and returns the keys whose value matches `predicate`, O(n) in the size of the cache.'''
+
+        with self.lock:
+            self.generation += 1
+            keys = [key for key, entry in self.entries.items() if predicate(entry[2])]
+            for key in keys:
+                self.__pop(key)
+                self.counters['invalidations'] += 1
+            return keys
+
+    def clear(self) -> None:
+        '''Removes every entry.'''
+
+        with self.lock:
+            self.generation += 1
+            self.entries.clear()
+            self.bytes = 0
+
+    def stats(self) -> Dict:
+        '''Returns the counters, the hit rate, the number of entries and their estimated bytes.'''
+
+        with self.lock:
+            stats = dict(self.counters)
+            stats['size'] = len(self.entries)
+            stats['bytes'] = self.bytes
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = round(stats['hits'] / lookups, 4) if lookups else 0.0
+        stats['max_size'] = self.max_size
+        stats['ttl'] = self.ttl
+        return stats
+
+    def __pop(self, key: Hashable) -> bool:
+        'Removes an entry, called with the lock held'
+
+        entry = self.entries.pop(key, None)
+        if entry is None:
+            return False
+        self.bytes -= entry[1]
+        return True
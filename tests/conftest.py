@@ -4,6 +4,33 @@ import pytest
 
 from config.string_constants import Headers, LogMessage, ErrorMessage
 from config.queries import InitializationQueries, Queries
+from database.backends.sqlite_backend import SQLiteBackend
+from database.database_access import DatabaseAccess
+from database.database_connection import DatabaseConnection
+
+# Modules holding the backend picked at import time
+BACKEND_MODULES = (
+    'database.database_connection',
+    'database.database_access',
+    'database.migrations',
+    'helpers.score_writer',
+    'helpers.token_purger'
+)
+
+
+@pytest.fixture
+def db_access(mocker, tmp_path):
+    '''Test Fixture to run DatabaseAccess on a fresh SQLite database file with the tables created'''
+
+    backend = SQLiteBackend(path=str(tmp_path / 'quiz.db'))
+    for module in BACKEND_MODULES:
+        mocker.patch(f'{module}.backend', backend)
+    mocker.patch.object(DatabaseConnection, 'pool', None)
+    db_access = DatabaseAccess()
+    db_access.create_tables()
+
+    yield db_access
+    DatabaseConnection.pool.close_all()
 
 
 @pytest.fixture
@@ -0,0 +1,79 @@
+'''Test file for auth_business.py'''
+
+import pytest
+from flask import Flask
+from flask_jwt_extended import JWTManager, decode_token
+
+from business.auth_business import AuthBusiness
+from config.string_constants import TokenInfo
+from helpers.token_cache import token_cache
+from helpers.token_helper import TokenHelper
+from utils.custom_error import InvalidCredentialsError
+from utils.password_hasher import ScryptKDF
+
+
+class TestAuthBusiness:
+    '''Test class containing test methods to test AuthBusiness class methods'''
+
+    @pytest.fixture(autouse=True)
+    def app_context(self, mocker):
+        '''Test Fixture for an application context issuing tokens, with a cheap key derivation function'''
+
+        mocker.patch('utils.password_hasher.kdf', ScryptKDF(cost=4))
+        app = Flask(__name__)
+        app.config['JWT_SECRET_KEY'] = 'test-secret-key-of-at-least-32-bytes'
+        JWTManager(app)
+        with app.app_context():
+            yield
+
+    @pytest.fixture
+    def auth_business(self, db_access, user_data):
+        '''Test Fixture for AuthBusiness with a registered player'''
+
+        auth_business = AuthBusiness(db_access)
+        auth_business.register(dict(user_data))
+        return auth_business
+
+    def test_login(self, auth_business, db_access, user_data, mocker):
+        '''Test method to test that a login reads the user in one statement and issues tokens at a new epoch'''
+
+        user_id = db_access.read('SELECT user_id FROM users')[0]['user_id']
+        auth_business.logout(user_id)
+        token_cache.invalidate(user_id)
+        read = mocker.spy(db_access, 'read')
+
+        token_data = auth_business.login({'username': user_data['username'], 'password': user_data['password']})
+
+        # The credentials, then the epoch bumped by the login
+        assert read.call_count == 2
+        assert decode_token(token_data['access_token'])[TokenInfo.CLAIM_EPOCH] == 2
+        assert token_data['password_type'] == 'permanent'
+
+    def test_login_revokes_previous_session(self, auth_business, db_access, user_data):
+        '''Test method to test that a login revokes the tokens of the previous login'''
+
+        login_data = {'username': user_data['username'], 'password': user_data['password']}
+        old_tokens = auth_business.login(login_data)
+        auth_business.login(login_data)
+
+        assert not TokenHelper(db_access).check_token_status(decode_token(old_tokens['refresh_token']))
+
+    def test_refresh_token_reuse(self, auth_business, db_access, user_data):
+        '''Test method to test that a refresh token already used to refresh is rejected'''
+
+        token_helper = TokenHelper(db_access)
+        tokens = auth_business.login({'username': user_data['username'], 'password': user_data['password']})
+        old_refresh = decode_token(tokens['refresh_token'])
+
+        new_tokens = auth_business.refresh(old_refresh['sub'], old_refresh['cap'])
+
+        assert not token_helper.check_token_status(old_refresh)
+        assert not token_helper.check_token_status(decode_token(tokens['access_token']))
+        assert token_helper.check_token_status(decode_token(new_tokens['refresh_token']))
+        assert token_helper.check_token_status(decode_token(new_tokens['access_token']))
+
+    def test_login_invalid_password(self, auth_business, user_data):
+        '''Test method to test that a wrong password is rejected'''
+
+        with pytest.raises(InvalidCredentialsError):
+            auth_business.login({'username': user_data['username'], 'password': 'Wrong@123'})
@@ -0,0 +1,43 @@
+'''Test file for category_business.py'''
+
+import pytest
+
+from business.category_business import CategoryBusiness
+from config.queries import Queries
+from utils.custom_error import DataNotFoundError
+
+GET_BUCKET_CATEGORIES = 'SELECT DISTINCT category_id FROM leaderboard_buckets ORDER BY category_id'
+
+
+class TestCategoryBusiness:
+    '''Test class containing test methods to test CategoryBusiness class methods'''
+
+    @pytest.fixture
+    def db_access(self, db_access):
+        '''Test Fixture for the SQLite database with two categories and leaderboard buckets of both'''
+
+        db_access.write(Queries.INSERT_USER_DATA, ('P0001', 'Player', 'p@quiz.com', 'player', '2024-01-01'))
+        db_access.write_many(Queries.INSERT_CATEGORY, [('C0001', 'A0001', 'Geography'), ('C0002', 'A0001', 'Science')])
+        db_access.write_many(Queries.INSERT_PLAYER_QUIZ_SCORE, [
+            ('S0001', 'P0001', 40, '2024-01-02 10:00:00', 'C0001', 'mcq'),
+            ('S0002', 'P0001', 90, '2024-01-03 10:00:00', 'C0002', 'mcq')
+        ])
+        db_access.write(Queries.BACKFILL_LEADERBOARD_BUCKETS)
+        return db_access
+
+    def test_delete_category(self, db_access):
+        '''Test method to test that the leaderboard buckets of a deleted category are deleted, also on a backfill'''
+
+        CategoryBusiness(db_access).delete_category('C0001')
+        db_access.write(Queries.BACKFILL_LEADERBOARD_BUCKETS)
+
+        assert db_access.read(GET_BUCKET_CATEGORIES) == [{'category_id': ''}, {'category_id': 'C0002'}]
+        assert db_access.read(Queries.GET_BUCKET_LEADERBOARD, ('all', 'all', 'C0001', 10)) == []
+
+    def test_delete_unknown_category(self, db_access):
+        '''Test method to test that deleting an unknown category raises a 404 and keeps the buckets'''
+
+        with pytest.raises(DataNotFoundError):
+            CategoryBusiness(db_access).delete_category('C0404')
+
+        assert len(db_access.read(GET_BUCKET_CATEGORIES)) == 3
@@ -0,0 +1,219 @@
+'''Test file for quiz_business.py'''
+
+import pytest
+
+from business.quiz_business import QuizBusiness
+from config.queries import Queries
+from helpers.answer_key import AnswerKey
+from helpers.leaderboard import Leaderboard
+from helpers.question_index import QuestionIndex
+from helpers.quiz_ticket import QuizTickets
+from helpers.score_writer import score_writer
+from utils.custom_error import DataNotFoundError, DuplicateEntryError, InvalidInputError
+
+COUNT_SCORES = 'SELECT COUNT(*) AS scores FROM scores'
+
+
+class TestQuizBusiness:
+    '''Test class containing test methods to test QuizBusiness class methods'''
+
+    @pytest.fixture
+    def db_access(self, db_access):
+        '''Test Fixture for the SQLite database with two players, an admin and questions of two categories'''
+
+        db_access.write_many(Queries.INSERT_USER_DATA, [
+            ('P0001', 'Player', 'p1@quiz.com', 'player', '2024-01-01'),
+            ('P0002', 'Player', 'p2@quiz.com', 'player', '2024-01-01'),
+            ('A0001', 'Admin', 'a@quiz.com', 'admin', '2024-01-01')
+        ])
+        db_access.write_many(Queries.INSERT_CATEGORY, [('C0001', 'A0001', 'Geography'), ('C0002', 'A0001', 'Science')])
+        db_access.write_many(Queries.INSERT_QUESTION, [
+            ('Q0001', 'C0001', 'A0001', 'Capital of France?', 'one word'),
+            ('Q0002', 'C0001', 'A0001', 'Capital of Italy?', 'one word'),
+            ('Q0003', 'C0002', 'A0001', 'Water boils at 100 C at sea level', 'true/false')
+        ])
+        db_access.write_many(Queries.INSERT_OPTION, [
+            ('O0001', 'Q0001', 'Paris', 1),
+            ('O0002', 'Q0002', 'Rome', 1),
+            ('O0003', 'Q0003', 'True', 1)
+        ])
+        return db_access
+
+    @pytest.fixture
+    def quiz_business(self, db_access, mocker):
+        '''Test Fixture for QuizBusiness with empty caches and tickets signed with a test secret'''
+
+        mocker.patch('business.quiz_business.answer_key', AnswerKey(max_size=100, ttl=60))
+        mocker.patch('business.quiz_business.leaderboard', Leaderboard(ttl=60))
+        mocker.patch('business.quiz_business.question_index', QuestionIndex(ttl=60))
+        mocker.patch('business.quiz_business.quiz_tickets', QuizTickets(ttl=60, secret='test-secret'))
+        return QuizBusiness(db_access)
+
+    @pytest.fixture
+    def unticketed(self, quiz_business, mocker):
+        '''Test Fixture allowing the answers submitted to quiz_business without a ticket'''
+
+        mocker.patch('business.quiz_business.quiz_tickets.allow_unticketed', True)
+
+    @pytest.fixture
+    def answer_sheets(self):
+        '''Test Fixture for the answer sheets of two players, the second answering two categories'''
+
+        return [
+            {'player_id': 'P0002', 'answers': [
+                {'question_id': 'Q0002', 'user_answer': 'Rome'},
+                {'question_id': 'Q0001', 'user_answer': 'Lyon'}
+            ]},
+            {'player_id': 'P0001', 'answers': [
+                {'question_id': 'Q0003', 'user_answer': 'true'},
+                {'question_id': 'Q0001', 'user_answer': 'paris'}
+            ]}
+        ]
+
+    @pytest.fixture
+    def ticket(self, quiz_business):
+        '''Test Fixture for the ticket of a quiz of the two questions of a category'''
+
+        questions, ticket = quiz_business.get_random_questions('P0001', category_id='C0001', limit=2)
+
+        assert sorted(question['question_id'] for question in questions) == ['Q0001', 'Q0002']
+        return ticket
+
+    @pytest.mark.usefixtures('unticketed')
+    def test_evaluate_player_answers(self, quiz_business, db_access):
+        '''Test method to test that answers are graded against the answer key and the score saved'''
+
+        answers = [{'question_id': 'Q0002', 'user_answer': 'Milan'}, {'question_id': 'Q0001', 'user_answer': 'PARIS'}]
+
+        result = quiz_business.evaluate_player_answers('P0001', answers)
+
+        assert result['score'] == 50.0
+        assert [(response['question_id'], response['correct_answer'], response['is_correct'])
+                for response in result['responses']] == [('Q0002', 'Rome', False), ('Q0001', 'Paris', True)]
+        assert db_access.read('SELECT player_id, score, category_id, question_type FROM scores') == [
+            {'player_id': 'P0001', 'score': 50, 'category_id': 'C0001', 'question_type': 'one word'}
+        ]
+
+    @pytest.mark.parametrize('answers', [
+        [],
+        [{'question_id': 'Q0001', 'user_answer': 'Paris'}, {'question_id': 'Q0001', 'user_answer': 'Lyon'}]
+    ])
+    def test_evaluate_player_answers_invalid(self, quiz_business, db_access, answers):
+        '''Test method to test that empty sheets and questions answered twice are rejected with a 422'''
+
+        with pytest.raises(InvalidInputError) as error:
+            quiz_business.evaluate_player_answers('P0001', answers)
+
+        assert error.value.code == 422
+        assert db_access.read(COUNT_SCORES) == [{'scores': 0}]
+
+    @pytest.mark.usefixtures('unticketed')
+    def test_evaluate_player_answers_unknown_question(self, quiz_business, db_access):
+        '''Test method to test that unknown questions are rejected with a 404 naming them'''
+
+        answers = [{'question_id': 'Q0001', 'user_answer': 'Paris'}, {'question_id': 'Q0404', 'user_answer': 'x'}]
+
+        with pytest.raises(DataNotFoundError) as error:
+            quiz_business.evaluate_player_answers('P0001', answers)
+
+        assert error.value.code == 404
+        assert 'Q0404' in error.value.message
+        assert db_access.read(COUNT_SCORES) == [{'scores': 0}]
+
+    def test_evaluate_player_answers_without_ticket(self, quiz_business, db_access):
+        '''Test method to test that answers without a ticket are rejected unless allowed'''
+
+        with pytest.raises(InvalidInputError) as error:
+            quiz_business.evaluate_player_answers('P0001', [{'question_id': 'Q0001', 'user_answer': 'Paris'}])
+
+        assert error.value.code == 422
+        assert db_access.read(COUNT_SCORES) == [{'scores': 0}]
+
+    def test_evaluate_answer_sheets(self, quiz_business, db_access, answer_sheets, mocker):
+        '''Test method to test that sheets are graded in request order and their scores saved in one call'''
+
+        save = mocker.spy(score_writer, 'save')
+        read = mocker.spy(db_access, 'read')
+
+        results = quiz_business.evaluate_answer_sheets(answer_sheets)
+
+        assert [(result['player_id'], result['score']) for result in results] == [('P0002', 50.0), ('P0001', 100.0)]
+        assert [response['question_id'] for response in results[0]['responses']] == ['Q0002', 'Q0001']
+        save.assert_called_once()
+        assert [score[1:3] + score[4:] for score in save.call_args.args[1]] == [
+            ('P0002', 50.0, 'C0001', 'one word'), ('P0001', 100.0, None, None)
+        ]
+        assert read.call_count == 2
+        assert db_access.read(COUNT_SCORES) == [{'scores': 2}]
+
+    @pytest.mark.parametrize('player_id', ['P0404', 'A0001'])
+    def test_evaluate_answer_sheets_unknown_player(self, quiz_business, db_access, answer_sheets, player_id):
+        '''Test method to test that a batch with an unknown or non player id is rejected and saves nothing'''
+
+        answer_sheets.append({'player_id': player_id, 'answers': [{'question_id': 'Q0001', 'user_answer': 'Paris'}]})
+
+        with pytest.raises(DataNotFoundError) as error:
+            quiz_business.evaluate_answer_sheets(answer_sheets)
+
+        assert error.value.code == 404
+        assert player_id in error.value.message
+        assert db_access.read(COUNT_SCORES) == [{'scores': 0}]
+
+    def test_evaluate_answer_sheets_invalid_sheet(self, quiz_business, db_access, answer_sheets):
+        '''Test method to test that a batch with a sheet answering a question twice or an unknown one saves nothing'''
+
+        answer_sheets[1]['answers'].append({'question_id': 'Q0003', 'user_answer': 'false'})
+        with pytest.raises(InvalidInputError) as duplicate:
+            quiz_business.evaluate_answer_sheets(answer_sheets)
+        answer_sheets[1]['answers'][-1]['question_id'] = 'Q0404'
+        with pytest.raises(DataNotFoundError) as unknown:
+            quiz_business.evaluate_answer_sheets(answer_sheets)
+
+        assert (duplicate.value.code, unknown.value.code) == (422, 404)
+        assert db_access.read(COUNT_SCORES) == [{'scores': 0}]
+
+    def test_evaluate_with_ticket(self, quiz_business, db_access, ticket):
+        '''Test method to test that answers are graded from the ticket, unanswered questions counting as wrong'''
+
+        answers = [{'question_id': 'Q0002', 'user_answer': 'rome'}]
+
+        result = quiz_business.evaluate_player_answers('P0001', answers, ticket)
+
+        assert result == {
+            'score': 50.0,
+            'responses': [{'question_id': 'Q0002', 'user_answer': 'rome', 'is_correct': True}]
+        }
+        assert db_access.read(Queries.GET_PLAYER_STATS, ('P0001', ))[0]['attempts'] == 1
+        assert db_access.read('SELECT category_id FROM scores') == [{'category_id': 'C0001'}]
+
+    def test_evaluate_with_ticket_once(self, quiz_business, ticket):
+        '''Test method to test that a ticket grades one submission'''
+
+        answers = [{'question_id': 'Q0001', 'user_answer': 'Paris'}]
+        quiz_business.evaluate_player_answers('P0001', answers, ticket)
+
+        with pytest.raises(DuplicateEntryError):
+            quiz_business.evaluate_player_answers('P0001', answers, ticket)
+
+    def test_evaluate_with_ticket_question_not_issued(self, quiz_business, db_access, ticket):
+        '''Test method to test that answers to questions not issued save nothing and leave the ticket usable'''
+
+        answers = [{'question_id': 'Q0001', 'user_answer': 'Paris'}, {'question_id': 'Q0003', 'user_answer': 'True'}]
+
+        with pytest.raises(InvalidInputError) as error:
+            quiz_business.evaluate_player_answers('P0001', answers, ticket)
+
+        assert error.value.code == 422
+        assert db_access.read(COUNT_SCORES) == [{'scores': 0}]
+        assert quiz_business.evaluate_player_answers('P0001', answers[:1], ticket)['score'] == 50.0
+
+    def test_evaluate_with_ticket_save_failed(self, quiz_business, ticket, mocker):
+        '''Test method to test that a ticket whose score could not be saved can be submitted again'''
+
+        answers = [{'question_id': 'Q0001', 'user_answer': 'Paris'}]
+        mocker.patch('business.quiz_business.score_writer.save', side_effect=[RuntimeError, None])
+
+        with pytest.raises(RuntimeError):
+            quiz_business.evaluate_player_answers('P0001', answers, ticket)
+
+        assert quiz_business.evaluate_player_answers('P0001', answers, ticket)['score'] == 50.0
@@ -0,0 +1,75 @@
+'''Test file for connection_pool.py'''
+
+import pytest
+
+from database.connection_pool import ConnectionPool, PoolTimeoutError
+
+
+class TestConnectionPool:
+    '''Test class containing test methods to test ConnectionPool class methods'''
+
+    @pytest.fixture
+    def mock_connect(self, mocker):
+        '''Test fixture returning a connection factory that creates mock connections'''
+
+        return mocker.Mock(side_effect=lambda: mocker.Mock())
+
+    def test_reuses_released_connection(self, mock_connect):
+        '''Test method to test that a released connection is checked out again'''
+
+        pool = ConnectionPool(mock_connect, size=2)
+        connection = pool.acquire()
+        pool.release(connection)
+
+        assert pool.acquire() is connection
+        assert mock_connect.call_count == 1
+
+    def test_overflow_connection_closed_on_release(self, mock_connect):
+        '''Test method to test that overflow connections are not kept idle'''
+
+        pool = ConnectionPool(mock_connect, size=1, overflow=1)
+        first, second = pool.acquire(), pool.acquire()
+        pool.release(first)
+        pool.release(second)
+
+        second.close.assert_called_once()
+        assert pool.stats()['idle'] == 1
+        assert pool.stats()['opened'] == 1
+
+    def test_acquire_timeout(self, mock_connect):
+        '''Test method to test that checkout fails once the pool is exhausted'''
+
+        pool = ConnectionPool(mock_connect, size=1, timeout=0.01)
+        pool.acquire()
+
+        with pytest.raises(PoolTimeoutError):
+            pool.acquire()
+        assert pool.stats()['timeouts'] == 1
+
+    def test_stale_connection_replaced(self, mock_connect):
+        '''Test method to test that idle connections failing validation are replaced'''
+
+        pool = ConnectionPool(mock_connect, size=1, validate=lambda connection: False, validate_after=0)
+        stale = pool.acquire()
+        pool.release(stale)
+
+        assert pool.acquire() is not stale
+        stale.close.assert_called_once()
+
+    def test_stats(self, mock_connect):
+        '''Test method to test in-use and checkout counters'''
+
+        pool = ConnectionPool(mock_connect, size=3)
+        connection = pool.acquire()
+        stats = pool.stats()
+
+        assert stats['in_use'] == 1
+        assert stats['checkouts'] == 1
+        pool.release(connection)
+        assert pool.stats()['in_use'] == 0
+
+    def test_invalid_size(self, mock_connect):
+        '''Test method to test that a pool cannot be created without connections'''
+
+        with pytest.raises(ValueError):
+            ConnectionPool(mock_connect, size=0)
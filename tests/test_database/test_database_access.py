@@ -5,6 +5,7 @@ import mysql.connector
 import pytest
 
 from database.database_access import DatabaseAccess
+from database.read_your_writes import ReadYourWrites
 
 
 class TestDatabaseAccess:
@@ -82,3 +83,216 @@ class TestDatabaseAccess:
         mock_connect.side_effect = mysql.connector.Error('Mocked error')
         with pytest.raises(mysql.connector.Error):
             DatabaseAccess()
+
+
+class TestDatabaseAccessWriteMany:
+    '''Test class containing test methods to test DatabaseAccess.write_many'''
+
+    query = 'INSERT INTO test_table VALUES (%s, %s)'
+    rows = [('id1', 'a'), ('id2', 'b'), ('id3', 'c')]
+
+    @pytest.fixture
+    def mock_cursor(self, mocker):
+        '''Test Fixture to mock the pooled connection and return its cursor'''
+
+        mock_cursor = mocker.Mock()
+        mock_connection = mocker.MagicMock()
+        mock_connection.__enter__.return_value.cursor.return_value = mock_cursor
+        mocker.patch('database.database_access.DatabaseConnection', return_value=mock_connection)
+
+        return mock_cursor
+
+    def test_write_many_chunks(self, mock_cursor):
+        '''Test method to test rows are sent in chunks through executemany'''
+
+        result = DatabaseAccess().write_many(self.query, self.rows, chunk_size=2)
+
+        assert mock_cursor.executemany.call_count == 2
+        mock_cursor.executemany.assert_called_with(self.query, self.rows[2:])
+        assert result == [True, True, True]
+
+    def test_write_many_empty(self, mock_cursor):
+        '''Test method to test that no statement is sent without rows'''
+
+        assert DatabaseAccess().write_many(self.query, []) == []
+        mock_cursor.executemany.assert_not_called()
+
+    def test_write_many_raises_integrity_error(self, mock_cursor):
+        '''Test method to test that an IntegrityError aborts the batch by default'''
+
+        mock_cursor.executemany.side_effect = mysql.connector.IntegrityError('Duplicate entry')
+
+        with pytest.raises(mysql.connector.IntegrityError):
+            DatabaseAccess().write_many(self.query, self.rows)
+
+    def test_write_many_skip_failed_rows(self, mock_cursor, caplog):
+        '''Test method to test per row outcomes when failing rows are skipped'''
+
+        mock_cursor.executemany.side_effect = mysql.connector.IntegrityError('Duplicate entry')
+        mock_cursor.execute.side_effect = [None, None, None, mysql.connector.IntegrityError('Duplicate entry'), None]
+
+        result = DatabaseAccess().write_many(self.query, self.rows, skip_failed_rows=True)
+
+        mock_cursor.execute.assert_any_call('ROLLBACK TO SAVEPOINT write_many')
+        assert result == [True, False, True]
+        assert 'Duplicate entry' in caplog.text
+
+
+class TestDatabaseAccessTransaction:
+    '''Test class containing test methods to test DatabaseAccess.transaction'''
+
+    query = 'INSERT INTO test_table VALUES (%s)'
+
+    @pytest.fixture
+    def mock_connection_class(self, mocker):
+        '''Test Fixture to mock the pooled connection context manager'''
+
+        mock_connection_class = mocker.patch('database.database_access.DatabaseConnection')
+        mock_connection = mock_connection_class.return_value
+        mock_connection.__exit__.return_value = False
+        mock_connection.__enter__.return_value.cursor.return_value.rowcount = 1
+
+        return mock_connection_class
+
+    def test_transaction_pins_one_connection(self, mock_connection_class):
+        '''Test method to test that calls inside a transaction share one checkout'''
+
+        db_access = DatabaseAccess()
+        with db_access.transaction():
+            db_access.read('SELECT 1')
+            db_access.write(self.query, ('id1', ))
+            db_access.write_many(self.query, [('id2', ), ('id3', )])
+
+        mock_connection_class.assert_called_once()
+
+    def test_nested_transaction_joins_outer(self, mock_connection_class):
+        '''Test method to test that nested transactions reuse the outer connection'''
+
+        db_access = DatabaseAccess()
+        with db_access.transaction():
+            with DatabaseAccess().transaction():
+                db_access.write(self.query, ('id1', ))
+
+        mock_connection_class.assert_called_once()
+
+    def test_transaction_releases_connection_on_error(self, mock_connection_class):
+        '''Test method to test that the pinned connection is released when the block raises'''
+
+        db_access = DatabaseAccess()
+        with pytest.raises(mysql.connector.IntegrityError):
+            with db_access.transaction():
+                raise mysql.connector.IntegrityError('Duplicate entry')
+
+        db_access.write(self.query, ('id1', ))
+        assert mock_connection_class.call_count == 2
+        assert mock_connection_class.return_value.__exit__.call_args_list[0].args[0] is mysql.connector.IntegrityError
+
+
+class TestDatabaseAccessIterRead:
+    '''Test class containing test methods to test DatabaseAccess.iter_read'''
+
+    query = 'SELECT * FROM test_table'
+
+    @pytest.fixture
+    def mock_connection(self, mocker):
+        '''Test Fixture to mock the pooled connection'''
+
+        mock_connection_class = mocker.patch('database.database_access.DatabaseConnection')
+        mock_connection_class.return_value.__exit__.return_value = False
+
+        return mock_connection_class.return_value.__enter__.return_value
+
+    def test_iter_read_batches(self, mock_connection):
+        '''Test method to test rows are fetched in batches and yielded one by one'''
+
+        mock_cursor = mock_connection.cursor.return_value
+        mock_cursor.fetchmany.side_effect = [[{'id': 1}, {'id': 2}], [{'id': 3}], []]
+
+        result = list(DatabaseAccess().iter_read(self.query, batch_size=2))
+
+        mock_connection.cursor.assert_called_once_with(dictionary=True, buffered=False)
+        mock_cursor.fetchmany.assert_called_with(2)
+        mock_connection.consume_results.assert_not_called()
+        assert result == [{'id': 1}, {'id': 2}, {'id': 3}]
+
+    def test_iter_read_closed_early(self, mock_connection):
+        '''Test method to test unread rows are discarded when the iterator is closed early'''
+
+        mock_cursor = mock_connection.cursor.return_value
+        mock_cursor.fetchmany.side_effect = [[{'id': 1}, {'id': 2}], [{'id': 3}], []]
+
+        rows = DatabaseAccess().iter_read(self.query, batch_size=2)
+        next(rows)
+        rows.close()
+
+        mock_connection.consume_results.assert_called_once()
+        mock_cursor.close.assert_called_once()
+
+
+class TestDatabaseAccessReadRouting:
+    '''Test class containing test methods to test routing between the primary and the replica'''
+
+    query = 'SELECT * FROM test_table'
+
+    @pytest.fixture
+    def mock_connection_class(self, mocker):
+        '''Test Fixture to mock the pooled connection context manager'''
+
+        mock_connection_class = mocker.patch('database.database_access.DatabaseConnection')
+        mock_connection = mock_connection_class.return_value
+        mock_connection.__exit__.return_value = False
+        mock_connection.__enter__.return_value.cursor.return_value.rowcount = 1
+        mock_connection.__enter__.return_value.cursor.return_value.fetchall.return_value = []
+
+        return mock_connection_class
+
+    @pytest.fixture
+    def tracker(self, mocker):
+        '''Test Fixture to isolate the read-your-writes state'''
+
+        tracker = ReadYourWrites(window=5)
+        mocker.patch('database.database_access.read_your_writes', tracker)
+        tracker.reset()
+
+        return tracker
+
+    def test_read_uses_replica(self, mock_connection_class, tracker):
+        '''Test method to test that reads go to the replica by default'''
+
+        DatabaseAccess().read(self.query)
+
+        mock_connection_class.assert_called_once_with(read_only=True)
+
+    def test_read_use_primary(self, mock_connection_class, tracker):
+        '''Test method to test that reads can ask for the primary'''
+
+        DatabaseAccess().read(self.query, use_primary=True)
+
+        mock_connection_class.assert_called_once_with(read_only=False)
+
+    def test_read_after_write_uses_primary(self, mock_connection_class, tracker):
+        '''Test method to test that a request reads from the primary after it wrote'''
+
+        db_access = DatabaseAccess()
+        db_access.write('INSERT INTO test_table VALUES (%s)', ('id1', ))
+        db_access.read(self.query)
+
+        assert mock_connection_class.call_args_list[0].kwargs == {'read_only': False}
+        assert mock_connection_class.call_args_list[1].kwargs == {'read_only': False}
+
+    def test_read_after_write_by_same_user(self, mock_connection_class, tracker):
+        '''Test method to test that a later request of the writing user reads from the primary'''
+
+        db_access = DatabaseAccess()
+        tracker.bind('P1234')
+        db_access.write('INSERT INTO test_table VALUES (%s)', ('id1', ))
+
+        tracker.reset()
+        tracker.bind('P1234')
+        db_access.read(self.query)
+        tracker.reset()
+        tracker.bind('P5678')
+        db_access.read(self.query)
+
+        assert mock_connection_class.call_args_list[1].kwargs == {'read_only': False}
+        assert mock_connection_class.call_args_list[2].kwargs == {'read_only': True}
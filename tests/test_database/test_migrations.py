@@ -0,0 +1,200 @@
+'''Test file for migrations.py'''
+
+from datetime import datetime
+from decimal import Decimal
+
+from config.queries import Queries
+from database.migrations import (
+    MIGRATIONS,
+    AddColumns,
+    CreateIndex,
+    DropTable,
+    Migration,
+    MigrationRunner,
+    ModifyColumns,
+    normalize_type
+)
+
+
+class TestMigrationRunner:
+    '''Test class containing test methods to test MigrationRunner class methods'''
+
+    def test_migrate(self, db_access):
+        '''Test method to test that pending migrations are applied and recorded'''
+
+        runner = MigrationRunner(db_access)
+
+        assert runner.migrate() == [migration.version for migration in MIGRATIONS]
+        assert runner.pending() == []
+        assert all(step.exists(db_access) for step in MIGRATIONS[0].steps if step.table_exists(db_access))
+
+    def test_migration_applied_at(self, db_access):
+        '''Test method to test that the time a migration was applied is stored as a DATETIME'''
+
+        MigrationRunner(db_access).migrate()
+
+        rows = db_access.read('SELECT applied_at FROM schema_migrations')
+        assert rows and all(isinstance(row['applied_at'], datetime) for row in rows)
+
+    def test_migrate_idempotent(self, db_access):
+        '''Test method to test that a second run applies nothing'''
+
+        MigrationRunner(db_access).migrate()
+
+        assert MigrationRunner(db_access).migrate() == []
+
+    def test_partially_applied_migration(self, db_access, caplog):
+        '''Test method to test that steps already in place are skipped'''
+
+        step = CreateIndex('scores', 'idx_scores_player', ('player_id', ))
+        step.apply(db_access)
+        migration = Migration(version=100, description='test', steps=(step, ))
+
+        assert MigrationRunner(db_access, migrations=(migration, )).migrate() == [100]
+        assert 'idx_scores_player' in caplog.text
+
+    def test_backfill_best_scores(self, db_access):
+        '''Test method to test that best scores are backfilled and then kept up to date by the upsert'''
+
+        db_access.write(Queries.INSERT_USER_DATA, ('P0001', 'Player', 'p@quiz.com', 'player', '2024-01-01'))
+        db_access.write(Queries.INSERT_CREDENTIALS, ('P0001', 'player', 'hash', 1))
+        db_access.write_many(Queries.INSERT_PLAYER_QUIZ_SCORE, [
+            ('S0001', 'P0001', 40, '2024-01-02 10:00:00', None, None),
+            ('S0002', 'P0001', 70, '2024-01-03 10:00:00', None, None)
+        ])
+        MigrationRunner(db_access).migrate()
+        db_access.write(Queries.UPSERT_PLAYER_BEST_SCORE, ('P0001', 50, '2024-01-04 10:00:00'))
+
+        assert db_access.read(Queries.GET_LEADERBOARD) == [{
+            'player_id': 'P0001',
+            'username': 'player',
+            'score': Decimal('70'),
+            'timestamp': datetime(2024, 1, 2, 10)
+        }]
+
+    def test_backfill_leaderboard_buckets(self, db_access):
+        '''Test method to test that daily and per category buckets are backfilled from the scores'''
+
+        db_access.write(Queries.INSERT_USER_DATA, ('P0001', 'Player', 'p@quiz.com', 'player', '2024-01-01'))
+        db_access.write(Queries.INSERT_CREDENTIALS, ('P0001', 'player', 'hash', 1))
+        db_access.write_many(Queries.INSERT_CATEGORY, [('C0001', 'A0001', 'Geography'), ('C0002', 'A0001', 'Science')])
+        db_access.write_many(Queries.INSERT_PLAYER_QUIZ_SCORE, [
+            ('S0001', 'P0001', 40, '2024-01-02 10:00:00', 'C0001', 'mcq'),
+            ('S0002', 'P0001', 70, '2024-01-02 12:00:00', None, None),
+            ('S0003', 'P0001', 90, '2024-01-03 10:00:00', 'C0002', 'mcq')
+        ])
+        MigrationRunner(db_access).migrate()
+
+        day = db_access.read(Queries.GET_BUCKET_LEADERBOARD, ('2024-01-02', '2024-01-02', '', 10))
+        week = db_access.read(Queries.GET_BUCKET_LEADERBOARD, ('2024-01-01', '2024-01-07', '', 10))
+        category = db_access.read(Queries.GET_BUCKET_LEADERBOARD, ('all', 'all', 'C0001', 10))
+
+        assert [(row['score'], row['timestamp']) for row in day] == [(Decimal('70'), datetime(2024, 1, 2, 10))]
+        assert [(row['score'], row['timestamp']) for row in week] == [(Decimal('90'), datetime(2024, 1, 2, 10))]
+        assert [(row['score'], row['timestamp']) for row in category] == [(Decimal('40'), datetime(2024, 1, 2, 10))]
+
+    def test_backfill_player_stats(self, db_access):
+        '''Test method to test that player stats are recounted from the scores, also when backfilled twice'''
+
+        db_access.write(Queries.INSERT_USER_DATA, ('P0001', 'Player', 'p@quiz.com', 'player', '2024-01-01'))
+        db_access.write_many(Queries.INSERT_PLAYER_QUIZ_SCORE, [
+            ('S0001', 'P0001', 40, '2024-01-02 10:00:00', None, None),
+            ('S0002', 'P0001', 70, '2024-01-03 10:00:00', None, None)
+        ])
+        MigrationRunner(db_access).migrate()
+        db_access.write(Queries.BACKFILL_PLAYER_STATS)
+
+        assert db_access.read(Queries.GET_PLAYER_STATS, ('P0001', )) == [{
+            'attempts': 2,
+            'average_score': 55.0,
+            'best_score': Decimal('70'),
+            'last_played': datetime(2024, 1, 3, 10)
+        }]
+
+    def test_create_index_missing_table(self, db_access, caplog):
+        '''Test method to test that the index of a table dropped since is skipped'''
+
+        step = CreateIndex('tokens', 'idx_tokens_user_status', ('user_id', 'status'))
+
+        step.apply(db_access)
+
+        assert not step.table_exists(db_access)
+        assert 'table tokens does not exist' in caplog.text
+
+    def test_migrate_legacy_tokens(self, db_access):
+        '''Test method to test that migration 1 indexes a legacy tokens table, then migration 7 drops it'''
+
+        db_access.write('CREATE TABLE tokens (user_id VARCHAR(10), status VARCHAR(10))')
+        step = MIGRATIONS[0].steps[2]
+
+        MigrationRunner(db_access, migrations=MIGRATIONS[:1]).migrate()
+        assert step.exists(db_access)
+        MigrationRunner(db_access).migrate()
+
+        assert not step.table_exists(db_access)
+
+    def test_add_columns(self, db_access, caplog):
+        '''Test method to test that only missing columns are added'''
+
+        db_access.write('CREATE TABLE legacy (legacy_id VARCHAR(10))')
+        step = AddColumns('legacy', (('legacy_id', 'VARCHAR(10)'), ('category_id', 'VARCHAR(10)')))
+
+        step.apply(db_access)
+
+        assert step.exists(db_access, 'category_id')
+        assert 'legacy.legacy_id' in caplog.text
+
+    def test_drop_table(self, db_access):
+        '''Test method to test that a table is dropped, also when applied twice'''
+
+        db_access.write('CREATE TABLE tokens (access_token VARCHAR(100) PRIMARY KEY)')
+        step = DropTable('tokens')
+
+        step.apply(db_access)
+        step.apply(db_access)
+
+        assert not db_access.read("SELECT name FROM sqlite_master WHERE name = 'tokens'")
+
+    def test_login_read(self, db_access):
+        '''Test method to test that the login read returns the credentials and role'''
+
+        MigrationRunner(db_access).migrate()
+        db_access.write(Queries.INSERT_USER_DATA, ('P0001', 'Player', 'p@quiz.com', 'player', '2024-01-01'))
+        db_access.write(Queries.INSERT_CREDENTIALS, ('P0001', 'player', 'hash', 1))
+
+        assert db_access.read(Queries.GET_CREDENTIALS_BY_USERNAME, ('player', )) == [
+            {'user_id': 'P0001', 'password': 'hash', 'role': 'player', 'isPasswordChanged': 1}
+        ]
+
+    def test_create_index_online_on_mysql(self, mocker):
+        '''Test method to test that MySQL indexes are built without locking the table'''
+
+        mock_db = mocker.Mock()
+        mock_db.read.side_effect = [[{'table_name': 'tokens'}], []]
+
+        CreateIndex('tokens', 'idx_tokens_user_status', ('user_id', 'status')).apply(mock_db)
+
+        mock_db.write.assert_called_once_with(
+            'CREATE INDEX idx_tokens_user_status ON tokens (user_id, status) ALGORITHM=INPLACE LOCK=NONE'
+        )
+
+    def test_modify_columns_on_mysql(self, mocker):
+        '''Test method to test that only columns with a different type are altered, in one statement'''
+
+        mock_db = mocker.Mock()
+        mock_db.read.side_effect = [[{'column_type': 'int'}], [{'column_type': 'datetime'}]]
+
+        ModifyColumns('scores', (('score', 'DECIMAL(5, 2)'), ('timestamp', 'DATETIME'))).apply(mock_db)
+
+        mock_db.write.assert_called_once_with('ALTER TABLE scores MODIFY score DECIMAL(5, 2)')
+
+    def test_modify_columns_already_applied(self, mocker):
+        '''Test method to test that nothing is altered when the types match'''
+
+        mock_db = mocker.Mock()
+        mock_db.read.return_value = [{'column_type': 'tinyint(3) unsigned'}]
+
+        ModifyColumns('options', (('isCorrect', 'TINYINT UNSIGNED'), )).apply(mock_db)
+
+        mock_db.write.assert_not_called()
+        assert normalize_type('DECIMAL(5, 2)') == normalize_type('decimal(5,2)')
@@ -0,0 +1,63 @@
+'''Test file for query_metrics.py'''
+
+from config.queries import Queries
+from database.query_metrics import QueryMetrics, estimate_size, is_explainable, name_query
+
+
+class TestQueryMetrics:
+    '''Test class containing test methods to test QueryMetrics class methods'''
+
+    def test_name_query(self):
+        '''Test method to test that statements are named after their Queries constant'''
+
+        in_list_query = Queries.GET_QUESTION_DATA_BY_QUESTION_ID % ', '.join(['%s'] * 3)
+
+        assert name_query(Queries.GET_LEADERBOARD) == 'GET_LEADERBOARD'
+        assert name_query(Queries.GET_QUIZ_DATA + ' WHERE c.category_id = %s') == 'GET_QUIZ_DATA'
+        assert name_query(in_list_query) == 'GET_QUESTION_DATA_BY_QUESTION_ID'
+        assert name_query('SELECT 1').startswith('AD_HOC')
+
+    def test_record_percentiles(self):
+        '''Test method to test call counts and latency percentiles'''
+
+        metrics = QueryMetrics(slow_threshold_ms=100)
+        for millis in range(1, 101):
+            metrics.record(Queries.GET_LEADERBOARD, millis / 1000, rows=10, fetched_bytes=100)
+
+        stats = metrics.snapshot()['queries']['GET_LEADERBOARD']
+        assert stats['calls'] == 100
+        assert stats['rows'] == 1000
+        assert stats['p50_ms'] == 50
+        assert stats['p95_ms'] == 95
+        assert stats['p99_ms'] == 99
+
+    def test_slow_query_log(self, caplog):
+        '''Test method to test slow statements are logged with their plan'''
+
+        metrics = QueryMetrics(slow_threshold_ms=100)
+        plan = [{'table': 'scores', 'type': 'ALL'}]
+
+        assert metrics.is_slow(0.2)
+        assert not metrics.is_slow(0.05)
+        metrics.record_slow_query(Queries.GET_LEADERBOARD, 0.2, plan)
+
+        slow_query = metrics.snapshot()['slow_queries'][0]
+        assert slow_query['query'] == 'GET_LEADERBOARD'
+        assert slow_query['plan'] == plan
+        assert 'GET_LEADERBOARD' in caplog.text
+
+    def test_reset(self):
+        '''Test method to test that reset clears all statistics'''
+
+        metrics = QueryMetrics(slow_threshold_ms=100)
+        metrics.record(Queries.GET_LEADERBOARD, 0.01)
+        metrics.reset()
+
+        assert metrics.snapshot()['queries'] == {}
+
+    def test_helpers(self):
+        '''Test method to test size estimation and explainable statements'''
+
+        assert estimate_size([{'name': 'abc', 'score': 10}]) == 11
+        assert is_explainable(Queries.GET_LEADERBOARD)
+        assert not is_explainable('CREATE TABLE test (id INTEGER)')
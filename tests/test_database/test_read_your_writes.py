@@ -0,0 +1,59 @@
+'''Test file for read_your_writes.py'''
+
+from database.read_your_writes import ReadYourWrites
+
+
+class TestReadYourWrites:
+    '''Test class containing test methods to test ReadYourWrites class methods'''
+
+    def test_fresh_request_uses_replica(self):
+        '''Test method to test that a request without writes may read from a replica'''
+
+        tracker = ReadYourWrites(window=5)
+        tracker.reset()
+        tracker.bind('P1234')
+
+        assert not tracker.needs_primary()
+
+    def test_request_write(self):
+        '''Test method to test that an anonymous request reads from the primary after it wrote'''
+
+        tracker = ReadYourWrites(window=5)
+        tracker.reset()
+        tracker.mark_write()
+
+        assert tracker.needs_primary()
+        tracker.reset()
+        assert not tracker.needs_primary()
+
+    def test_window_expires(self, mocker):
+        '''Test method to test that a user reads from replicas again once the window passed'''
+
+        mock_time = mocker.patch('database.read_your_writes.time.monotonic', return_value=100.0)
+        tracker = ReadYourWrites(window=5)
+        tracker.reset()
+        tracker.bind('P1234')
+        tracker.mark_write()
+        tracker.reset()
+        tracker.bind('P1234')
+
+        mock_time.return_value = 104.0
+        assert tracker.needs_primary()
+        mock_time.return_value = 106.0
+        assert not tracker.needs_primary()
+
+    def test_prune(self, mocker):
+        '''Test method to test that scopes outside the window are dropped'''
+
+        mock_time = mocker.patch('database.read_your_writes.time.monotonic', return_value=100.0)
+        mocker.patch.object(ReadYourWrites, 'MAX_TRACKED_SCOPES', 2)
+        tracker = ReadYourWrites(window=5)
+        for scope in ('P1', 'P2'):
+            tracker.bind(scope)
+            tracker.mark_write()
+
+        mock_time.return_value = 110.0
+        tracker.bind('P3')
+        tracker.mark_write()
+
+        assert list(tracker.last_writes) == ['P3']
@@ -0,0 +1,96 @@
+'''Test file for sqlite_backend.py'''
+
+import sqlite3
+from datetime import date, datetime
+from decimal import Decimal
+
+import pytest
+
+from config.queries import Queries
+from database.backends.sqlite_backend import translate
+from database.database_connection import DatabaseConnection
+
+
+class TestSQLiteBackend:
+    '''Test class containing test methods to test the SQLite backend'''
+
+    def test_translate(self):
+        '''Test method to test that MySQL constructs are rewritten'''
+
+        assert translate(Queries.GET_OPTIONS_FOR_MCQ).endswith('WHERE question_id = ? ORDER BY RANDOM()')
+        assert translate("SELECT GROUP_CONCAT(option_text SEPARATOR ';')") == "SELECT GROUP_CONCAT(option_text, ';')"
+        assert translate('INSERT IGNORE INTO t VALUES (%s)') == 'INSERT OR IGNORE INTO t VALUES (?)'
+
+    def test_pragmas(self, db_access):
+        '''Test method to test that connections use WAL and enforce foreign keys'''
+
+        with DatabaseConnection() as connection:
+            cursor = connection.cursor()
+            cursor.execute('PRAGMA journal_mode')
+            journal_mode = cursor.fetchall()
+            cursor.execute('PRAGMA foreign_keys')
+            foreign_keys = cursor.fetchall()
+
+        assert journal_mode == [('wal', )]
+        assert foreign_keys == [(1, )]
+
+    def test_read_write(self, db_access):
+        '''Test method to test reads and writes through DatabaseAccess'''
+
+        assert db_access.write(Queries.INSERT_USER_DATA, ('U1', 'User', 'user@quiz.com', 'player', '2024-01-01'))
+        db_access.write(Queries.INSERT_CREDENTIALS, ('U1', 'user', 'hash', 1))
+
+        assert db_access.read(Queries.GET_USER_ID_BY_USERNAME, ('user', )) == [{'user_id': 'U1'}]
+        assert list(db_access.iter_read(Queries.GET_USER_BY_ROLE, ('player', ), batch_size=1))[0]['username'] == 'user'
+
+    def test_integrity_error(self, db_access):
+        '''Test method to test that constraint violations raise the backend IntegrityError'''
+
+        db_access.write(Queries.INSERT_CATEGORY, ('C1', 'A1', 'Python'))
+
+        with pytest.raises(sqlite3.IntegrityError):
+            db_access.write(Queries.INSERT_CATEGORY, ('C2', 'A1', 'Python'))
+
+        rows = [('C2', 'A1', 'Python'), ('C3', 'A1', 'Java')]
+        assert db_access.write_many(Queries.INSERT_CATEGORY, rows, skip_failed_rows=True) == [False, True]
+
+    def test_transaction_rollback(self, db_access):
+        '''Test method to test that a failing unit of work is rolled back'''
+
+        with pytest.raises(sqlite3.IntegrityError):
+            with db_access.transaction():
+                db_access.write(Queries.INSERT_CATEGORY, ('C1', 'A1', 'Python'))
+                db_access.write(Queries.INSERT_CATEGORY, ('C2', 'A1', 'Python'))
+
+        assert db_access.read(Queries.GET_ALL_CATEGORIES) == []
+
+    def test_after_commit(self, db_access, mocker):
+        '''Test method to test that callbacks run after the outermost commit and are dropped on rollback'''
+
+        committed, rolled_back = mocker.Mock(), mocker.Mock()
+        with db_access.transaction():
+            with db_access.transaction():
+                db_access.write(Queries.INSERT_CATEGORY, ('C1', 'A1', 'Python'))
+                db_access.after_commit(committed)
+            committed.assert_not_called()
+        with pytest.raises(sqlite3.IntegrityError):
+            with db_access.transaction():
+                db_access.after_commit(rolled_back)
+                db_access.write(Queries.INSERT_CATEGORY, ('C2', 'A1', 'Python'))
+
+        committed.assert_called_once_with()
+        rolled_back.assert_not_called()
+
+    def test_typed_columns(self, db_access):
+        '''Test method to test that typed columns are read back as Python types'''
+
+        db_access.write(Queries.INSERT_USER_DATA, ('U1', 'User', 'user@quiz.com', 'player', '2024-01-02'))
+        db_access.write(Queries.INSERT_CREDENTIALS, ('U1', 'user', 'hash', 1))
+        db_access.write(Queries.INSERT_PLAYER_QUIZ_SCORE, ('S1', 'U1', 66.67, '2024-01-02 10:30:00', None, None))
+
+        score = db_access.read(Queries.GET_PLAYER_SCORES_BY_ID, ('U1', ))[0]
+        user = db_access.read(Queries.GET_USER_BY_USER_ID, ('U1', ))[0]
+
+        assert score['score'] == Decimal('66.67')
+        assert score['timestamp'] == datetime(2024, 1, 2, 10, 30)
+        assert user['registration_date'] == date(2024, 1, 2)
@@ -0,0 +1,70 @@
+'''Test file for statement_cache.py'''
+
+import pytest
+
+from config.queries import Queries
+from database.statement_cache import StatementCache
+
+
+class TestStatementCache:
+    '''Test class containing test methods to test StatementCache class methods'''
+
+    @pytest.fixture
+    def mock_connection(self, mocker):
+        '''Test Fixture to mock a connection handing out new prepared cursors'''
+
+        mock_connection = mocker.Mock(connection_id=1)
+        mock_connection.cursor.side_effect = lambda **kwargs: mocker.Mock()
+
+        return mock_connection
+
+    @pytest.fixture(autouse=True)
+    def reset_counters(self, mocker):
+        '''Test Fixture to isolate the shared counters'''
+
+        mocker.patch.dict(StatementCache.counters, {'hits': 0, 'misses': 0, 'evictions': 0, 'resets': 0})
+
+    def test_cursor_reused(self, mock_connection):
+        '''Test method to test that a query is prepared once per connection'''
+
+        cache = StatementCache(mock_connection, max_size=4)
+        first = cache.cursor(Queries.GET_USER_TOKEN_EPOCH)
+        second = cache.cursor(Queries.GET_USER_TOKEN_EPOCH)
+
+        assert first is second
+        mock_connection.cursor.assert_called_once_with(prepared=True)
+        assert StatementCache.stats()['hits'] == 1
+        assert StatementCache.stats()['misses'] == 1
+
+    def test_least_recently_used_evicted(self, mock_connection):
+        '''Test method to test that the least recently used statement is closed past the limit'''
+
+        cache = StatementCache(mock_connection, max_size=2)
+        oldest = cache.cursor(Queries.GET_USER_TOKEN_EPOCH)
+        cache.cursor(Queries.GET_TOKEN_REVOCATIONS)
+        cache.cursor(Queries.GET_CREDENTIALS_BY_USERNAME)
+
+        oldest.close.assert_called_once()
+        assert Queries.GET_USER_TOKEN_EPOCH not in cache.statements
+        assert StatementCache.stats()['evictions'] == 1
+
+    def test_reset_on_reconnect(self, mock_connection):
+        '''Test method to test that statements are prepared again after a reconnect'''
+
+        cache = StatementCache(mock_connection, max_size=4)
+        before = cache.cursor(Queries.GET_USER_TOKEN_EPOCH)
+        mock_connection.connection_id = 2
+
+        assert cache.cursor(Queries.GET_USER_TOKEN_EPOCH) is not before
+        assert StatementCache.stats()['resets'] == 1
+
+    def test_for_connection(self, mock_connection):
+        '''Test method to test that each connection keeps its own cache'''
+
+        assert StatementCache.for_connection(mock_connection) is StatementCache.for_connection(mock_connection)
+
+    def test_is_enabled_for(self):
+        '''Test method to test that only static queries are prepared'''
+
+        assert StatementCache.is_enabled_for(Queries.GET_USER_TOKEN_EPOCH)
+        assert not StatementCache.is_enabled_for('SELECT * FROM users WHERE user_id IN (%s, %s)')
@@ -0,0 +1,69 @@
+'''Test file for answer_key.py'''
+
+import pytest
+
+from helpers.answer_key import AnswerKey
+
+
+def row(question_id, category_id='C1'):
+    'Answer key row of a question'
+
+    return {
+        'question_id': question_id,
+        'question_text': f'Text {question_id}',
+        'category_id': category_id,
+        'question_type': 'one-word',
+        'correct_answer': f'answer {question_id}'
+    }
+
+
+class TestAnswerKey:
+    '''Test class containing test methods to test AnswerKey class methods'''
+
+    @pytest.fixture
+    def mock_db(self, mocker):
+        '''Test Fixture for a database returning the rows of the requested questions'''
+
+        mock_db = mocker.Mock()
+        mock_db.read.side_effect = lambda query, question_ids, **kwargs: [
+            row(question_id, 'C2' if question_id == 'Q3' else 'C1')
+            for question_id in question_ids if question_id != 'Q404'
+        ]
+        return mock_db
+
+    def test_misses_fetched_in_one_query(self, mock_db):
+        '''Test method to test that only the questions missing are fetched, with one query'''
+
+        answer_key = AnswerKey(max_size=10, ttl=300)
+        answer_key.lookup(mock_db, ['Q1', 'Q2'])
+
+        result = answer_key.lookup(mock_db, ['Q1', 'Q2', 'Q3', 'Q404'])
+
+        assert set(result) == {'Q1', 'Q2', 'Q3'}
+        assert mock_db.read.call_count == 2
+        assert mock_db.read.call_args.args[1] == ('Q3', 'Q404')
+        assert mock_db.read.call_args.kwargs == {'use_primary': True}
+
+    def test_cached_lookup_skips_database(self, mock_db):
+        '''Test method to test that a submission of cached questions does not read the database'''
+
+        answer_key = AnswerKey(max_size=10, ttl=300)
+        answer_key.lookup(mock_db, ['Q1', 'Q2'])
+        mock_db.read.reset_mock()
+
+        assert answer_key.lookup(mock_db, ['Q2', 'Q1']) == {'Q1': row('Q1'), 'Q2': row('Q2')}
+        mock_db.read.assert_not_called()
+        assert answer_key.stats()['hits'] == 2
+
+    def test_invalidate(self, mock_db):
+        '''Test method to test that updated questions and deleted categories are fetched again'''
+
+        answer_key = AnswerKey(max_size=10, ttl=300)
+        answer_key.lookup(mock_db, ['Q1', 'Q2', 'Q3'])
+        answer_key.invalidate('Q1')
+        answer_key.invalidate_category('C2')
+        mock_db.read.reset_mock()
+
+        answer_key.lookup(mock_db, ['Q1', 'Q2', 'Q3'])
+
+        assert mock_db.read.call_args.args[1] == ('Q1', 'Q3')
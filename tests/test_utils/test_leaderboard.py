@@ -0,0 +1,99 @@
+'''Test file for leaderboard.py'''
+
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+
+from helpers.leaderboard import Leaderboard
+
+
+def row(player_id, score, day):
+    'A GET_LEADERBOARD_RANKING row'
+
+    return {'player_id': player_id, 'username': player_id.lower(), 'score': Decimal(score), 'timestamp': datetime(2024, 1, day)}
+
+
+class TestLeaderboard:
+    '''Test class containing test methods to test Leaderboard class methods'''
+
+    @pytest.fixture
+    def mock_db(self, mocker):
+        '''Test Fixture for a database holding the best scores of five players'''
+
+        mock_db = mocker.Mock()
+        mock_db.iter_read.side_effect = lambda query: iter([
+            row('P2', '90', 2), row('P1', '90', 5), row('P3', '70', 1), row('P4', '50', 1), row('P5', '10', 1)
+        ])
+        mock_db.read.return_value = [{'username': 'p6'}]
+        return mock_db
+
+    @pytest.fixture
+    def leaderboard(self, mock_db):
+        '''Test Fixture for a loaded leaderboard'''
+
+        leaderboard = Leaderboard(ttl=300)
+        leaderboard.rebuild(mock_db)
+        return leaderboard
+
+    def test_top(self, leaderboard, mock_db):
+        '''Test method to test that ties on score are ranked by the earliest timestamp'''
+
+        top = leaderboard.top(mock_db, 3)
+
+        assert [(entry['rank'], entry['player_id']) for entry in top] == [(1, 'P2'), (2, 'P1'), (3, 'P3')]
+        assert top[0]['score'] == 90.0 and top[0]['username'] == 'p2'
+
+    def test_around(self, leaderboard, mock_db):
+        '''Test method to test the rank of a player with their neighbours'''
+
+        data = leaderboard.around(mock_db, 'P4', neighbors=2)
+
+        assert data['rank'] == 4 and data['total_players'] == 5
+        assert [entry['player_id'] for entry in data['neighbors']] == ['P1', 'P3', 'P4', 'P5']
+        assert [entry['player_id'] for entry in leaderboard.around(mock_db, 'P2', 1)['neighbors']] == ['P2', 'P1']
+        assert leaderboard.around(mock_db, 'P9') is None
+
+    def test_record(self, leaderboard, mock_db):
+        '''Test method to test that only a better score moves a player, keeping their first timestamp'''
+
+        leaderboard.record(mock_db, 'P5', 40.0, datetime(2024, 2, 1))
+        leaderboard.record(mock_db, 'P5', 95.0, datetime(2024, 2, 2))
+
+        top = leaderboard.top(mock_db, 1)[0]
+        assert (top['player_id'], top['score'], top['timestamp']) == ('P5', 95.0, datetime(2024, 1, 1))
+        mock_db.read.assert_not_called()
+
+    def test_record_new_player(self, leaderboard, mock_db):
+        '''Test method to test that a first score adds the player with their username'''
+
+        leaderboard.record(mock_db, 'P6', 60.0, datetime(2024, 2, 1))
+
+        data = leaderboard.around(mock_db, 'P6', 0)
+        assert data['rank'] == 4 and data['neighbors'][0]['username'] == 'p6'
+
+    def test_rename_and_remove(self, leaderboard, mock_db):
+        '''Test method to test username changes and player deletion'''
+
+        leaderboard.rename('P3', 'renamed')
+        leaderboard.remove('P2')
+
+        top = leaderboard.top(mock_db, 2)
+        assert [(entry['player_id'], entry['username']) for entry in top] == [('P1', 'p1'), ('P3', 'renamed')]
+
+    def test_verify(self, leaderboard, mock_db):
+        '''Test method to test the consistency check against the database ranking'''
+
+        assert leaderboard.verify(mock_db) == 0
+
+        leaderboard.record(mock_db, 'P5', 80.0, datetime(2024, 2, 1))
+        assert leaderboard.verify(mock_db) == 3
+
+    def test_rebuild_logs_drift(self, leaderboard, mock_db, caplog):
+        '''Test method to test that a rebuild repairs and reports a stale ranking'''
+
+        leaderboard.remove('P1')
+        leaderboard.rebuild(mock_db)
+
+        assert 'out of date for 1 players' in caplog.text
+        assert leaderboard.verify(mock_db) == 0
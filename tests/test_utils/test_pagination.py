@@ -0,0 +1,76 @@
+'''Test file for pagination.py'''
+
+import pytest
+
+from config.queries import Queries
+from database.migrations import MigrationRunner
+from utils.custom_error import InvalidInputError
+from utils.pagination import decode_cursor, encode_cursor, paginate
+
+
+class TestPagination:
+    '''Test class containing test methods to test the pagination functions'''
+
+    @pytest.fixture
+    def db_access(self, db_access):
+        '''Test Fixture for the SQLite database with one player and 7 scores, 4 at the same time'''
+
+        db_access.write(Queries.INSERT_USER_DATA, ('P0002', 'Player', 'p@quiz.com', 'player', '2024-01-01'))
+        db_access.write_many(Queries.INSERT_PLAYER_QUIZ_SCORE, [
+            (f'S000{i}', 'P0002', 50.0, f'2024-01-0{min(i, 5)} 10:00:00', None, None) for i in range(2, 9)
+        ])
+        return db_access
+
+    def test_cursor_round_trip(self):
+        '''Test method to test that a cursor decodes to the sort key it encodes'''
+
+        cursor = encode_cursor(['2024-01-02 10:00:00', 'S0002'])
+
+        assert '=' not in cursor
+        assert decode_cursor(cursor, 2) == ('2024-01-02 10:00:00', 'S0002')
+
+    @pytest.mark.parametrize('cursor', ['not a cursor', encode_cursor(['S0002']), encode_cursor([2, 'S0002'])])
+    def test_invalid_cursor(self, cursor):
+        '''Test method to test that malformed cursors and cursors of another sort key are rejected'''
+
+        with pytest.raises(InvalidInputError):
+            decode_cursor(cursor, 2)
+
+    def test_paginate(self):
+        '''Test method to test that a cursor is returned only when rows are left'''
+
+        rows = [{'user_id': f'U000{i}'} for i in range(2, 5)]
+
+        assert paginate(rows, 3, ('user_id', )) == (rows, None)
+        assert paginate(rows, 2, ('user_id', )) == (rows[:2], encode_cursor(['U0003']))
+
+    def test_score_pages(self, db_access):
+        '''Test method to test that walking the score pages returns every score once, newest first'''
+
+        score_ids, cursor = [], None
+        while True:
+            if cursor is None:
+                rows = db_access.read(Queries.GET_PLAYER_SCORES_PAGE, ('P0002', 3))
+            else:
+                timestamp, score_id = decode_cursor(cursor, 2)
+                rows = db_access.read(
+                    Queries.GET_PLAYER_SCORES_PAGE_AFTER, ('P0002', timestamp, timestamp, timestamp, score_id, 3)
+                )
+            page, cursor = paginate(rows, 2, ('timestamp', 'score_id'))
+            score_ids.extend(row['score_id'] for row in page)
+            if cursor is None:
+                break
+
+        assert score_ids == ['S0008', 'S0007', 'S0006', 'S0005', 'S0004', 'S0003', 'S0002']
+
+    def test_score_page_range(self, db_access):
+        '''Test method to test that a later score page seeks to the cursor in the index instead of scanning up to it'''
+
+        MigrationRunner(db_access).migrate()
+        timestamp, score_id = '2024-01-04 10:00:00', 'S0004'
+        plan = db_access.read(
+            'EXPLAIN QUERY PLAN ' + Queries.GET_PLAYER_SCORES_PAGE_AFTER,
+            ('P0002', timestamp, timestamp, timestamp, score_id, 3)
+        )
+
+        assert 'idx_scores_player_time (player_id=? AND timestamp<?)' in plan[0]['detail']
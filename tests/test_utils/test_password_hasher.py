@@ -1,20 +1,60 @@
 '''Test file for password_hasher.py'''
 
 import hashlib
-from utils.password_hasher import hash_password
+
+import pytest
+
+from utils import password_hasher
+from utils.password_hasher import PBKDF2KDF, ScryptKDF, hash_password, legacy_hash_password, verify_password
+
+
+@pytest.fixture(autouse=True)
+def cheap_kdf(mocker):
+    '''Test Fixture for a low cost scrypt as the configured key derivation function'''
+
+    mocker.patch.object(password_hasher, 'kdf', ScryptKDF(cost=4))
 
 
 def test_hash_password():
-    '''Test function to test hash_password function with known string'''
+    '''Test function to test that hash_password salts the configured key derivation function'''
 
     password = 'TestPassword123'
-    expected_hash = hashlib.sha256(password.encode('utf-8')).hexdigest()
-    assert hash_password(password) == expected_hash
+    hashed_password = hash_password(password)
+
+    assert hashed_password.startswith('scrypt$4$')
+    assert hashed_password != hash_password(password)
+    assert len(hashed_password) <= 100
+    assert verify_password(password, hashed_password) == (True, False)
 
 
 def test_hash_password_with_empty_string():
     '''Test function to test hash_password function with empty string'''
 
-    password = ''
-    expected_hash = hashlib.sha256(password.encode('utf-8')).hexdigest()
-    assert hash_password(password) == expected_hash
+    assert verify_password('', hash_password('')) == (True, False)
+    assert not verify_password('x', hash_password('')).valid
+
+
+def test_legacy_hash_password():
+    '''Test function to test legacy_hash_password function with known string'''
+
+    password = 'TestPassword123'
+    assert legacy_hash_password(password) == hashlib.sha256(password.encode('utf-8')).hexdigest()
+
+
+@pytest.mark.parametrize('stored_password', [
+    legacy_hash_password('TestPassword123'),
+    'TestPassword123',
+    PBKDF2KDF(cost=10).hash('TestPassword123'),
+    ScryptKDF(cost=5).hash('TestPassword123')
+])
+def test_verify_password_needs_rehash(stored_password):
+    '''Test function to test that legacy forms and other costs are accepted and flagged for rehashing'''
+
+    assert verify_password('TestPassword123', stored_password) == (True, True)
+    assert verify_password('WrongPassword123', stored_password) == (False, False)
+
+
+def test_verify_password_malformed():
+    '''Test function to test that a malformed hash is compared as a legacy password'''
+
+    assert not verify_password('TestPassword123', 'scrypt$4$not-base64!$key').valid
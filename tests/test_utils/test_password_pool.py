@@ -0,0 +1,58 @@
+'''Test file for password_pool.py'''
+
+import threading
+import time
+
+import pytest
+
+from helpers.password_pool import PasswordPool
+from utils import password_hasher
+from utils.custom_error import ServiceUnavailableError
+from utils.password_hasher import ScryptKDF, legacy_hash_password
+
+
+class TestPasswordPool:
+    '''Test class containing test methods to test PasswordPool class methods'''
+
+    @pytest.fixture
+    def pool(self, mocker):
+        '''Test Fixture for a pool of one worker and one queued hash, with a low cost scrypt'''
+
+        mocker.patch.object(password_hasher, 'kdf', ScryptKDF(cost=4))
+        pool = PasswordPool(workers=1, queue_size=1, admission_timeout=0.01)
+        yield pool
+        pool.stop()
+
+    def test_hash_and_verify(self, pool):
+        '''Test method to test that hashes made on the pool verify'''
+
+        hashed_password = pool.hash('Secret@123')
+
+        assert pool.verify('Secret@123', hashed_password) == (True, False)
+        assert pool.stats()['admitted'] == 2
+
+    def test_rehash_counted(self, pool):
+        '''Test method to test that verified legacy hashes are counted as rehashes'''
+
+        assert pool.verify('Secret@123', legacy_hash_password('Secret@123')).needs_rehash
+        assert pool.stats()['rehashes'] == 1
+
+    def test_admission_limit(self, pool, mocker):
+        '''Test method to test that hashes beyond the workers and queue are rejected'''
+
+        release = threading.Event()
+        mocker.patch('helpers.password_pool.hash_password', side_effect=lambda _: release.wait(5) and 'hash')
+        busy = [threading.Thread(target=pool.hash, args=('Secret@123', )) for _ in range(2)]
+        for thread in busy:
+            thread.start()
+        while pool.stats()['in_flight'] < 2:
+            time.sleep(0.001)
+
+        with pytest.raises(ServiceUnavailableError):
+            pool.hash('Secret@123')
+
+        release.set()
+        for thread in busy:
+            thread.join()
+        assert pool.hash('Secret@123') == 'hash'
+        assert pool.stats()['rejected'] == 1
@@ -0,0 +1,142 @@
+'''Test file for question_index.py'''
+
+import pytest
+
+from config.queries import Queries
+from helpers.question_index import QuestionIndex
+
+
+def rows(question_id, category_id, question_type, options):
+    'Index rows for one question, one per option'
+
+    return [
+        {
+            'question_id': question_id,
+            'category_id': category_id,
+            'question_text': f'Text {question_id}',
+            'question_type': question_type,
+            'option_text': option
+        }
+        for option in options or [None]
+    ]
+
+
+class TestQuestionIndex:
+    '''Test class containing test methods to test QuestionIndex class methods'''
+
+    @pytest.fixture
+    def index(self):
+        '''Test Fixture for an index holding MCQ and true/false questions in two categories'''
+
+        index = QuestionIndex(ttl=300)
+        data = []
+        for i in range(20):
+            data += rows(f'Q{i:03d}', f'C{i % 2}', 'mcq', ['a', 'b', 'c', 'd'])
+        for i in range(20, 30):
+            data += rows(f'Q{i:03d}', 'C0', 'true/false', ['True'])
+        index.load(data)
+        return index
+
+    @pytest.fixture
+    def mock_db(self, mocker):
+        '''Test Fixture for a database the index must not be rebuilt from'''
+
+        return mocker.Mock()
+
+    def test_sample_by_filter(self, index, mock_db):
+        '''Test method to test that samples are distinct and match the filter'''
+
+        questions = index.sample(mock_db, 'C0', 'mcq', 10)
+        question_ids = [question['question_id'] for question in questions]
+
+        assert len(set(question_ids)) == 10
+        assert all(int(question_id[1:]) % 2 == 0 and int(question_id[1:]) < 20 for question_id in question_ids)
+        assert all(sorted(question['options']) == ['a', 'b', 'c', 'd'] for question in questions)
+        mock_db.iter_read.assert_not_called()
+
+    def test_sample_non_mcq_without_options(self, index, mock_db):
+        '''Test method to test that only MCQ questions carry options'''
+
+        questions = index.sample(mock_db, question_type='TRUE/FALSE', limit=10)
+
+        assert len(questions) == 10
+        assert all(question['options'] == [] for question in questions)
+
+    def test_sample_fewer_than_limit(self, index, mock_db):
+        '''Test method to test that a small partition returns all of its questions'''
+
+        assert len(index.sample(mock_db, 'C1', 'true/false', 10)) == 0
+        assert len(index.sample(mock_db, 'C1', None, 50)) == 10
+        assert index.sample(mock_db, 'C9', None, 10) == []
+
+    def test_add(self, index, mock_db):
+        '''Test method to test that added questions are sampled'''
+
+        index.add('Q100', 'C2', 'New question', 'mcq', ['x', 'y', 'z', 'w'])
+
+        questions = index.sample(mock_db, 'C2', 'mcq', 5)
+        assert [question['question_id'] for question in questions] == ['Q100']
+        assert questions[0]['question_text'] == 'New question'
+
+    def test_update_text(self, index, mock_db):
+        '''Test method to test that updated text is returned'''
+
+        index.update_text('Q020', 'Updated')
+
+        questions = index.sample(mock_db, 'C0', 'true/false', 10)
+        assert {question['question_text'] for question in questions if question['question_id'] == 'Q020'} == {'Updated'}
+
+    def test_remove(self, index, mock_db):
+        '''Test method to test that removed questions are never sampled'''
+
+        for i in range(0, 20, 2):
+            index.remove(f'Q{i:03d}')
+
+        assert len(index.sample(mock_db, 'C0', 'mcq', 10)) == 0
+        assert len(index.sample(mock_db, None, None, 30)) == 20
+
+    def test_remove_compacts_partition(self, index, mock_db):
+        '''Test method to test that tombstones are dropped once enough pile up'''
+
+        for i in range(100, 200):
+            index.add(f'Q{i}', 'C3', 'Text', 'mcq', ['a'])
+        for i in range(100, 190):
+            index.remove(f'Q{i}')
+
+        assert len(index.partitions[('C3', 'mcq')].ids) < 100
+        assert len(index.sample(mock_db, 'C3', 'mcq', 20)) == 10
+
+    def test_remove_category(self, index, mock_db):
+        '''Test method to test that removing a category removes its questions'''
+
+        index.remove_category('C0')
+
+        assert index.sample(mock_db, 'C0', None, 10) == []
+        assert len(index.sample(mock_db, None, None, 30)) == 10
+
+    def test_lazy_load(self, mocker):
+        '''Test method to test that the index is loaded from the database on first use'''
+
+        index = QuestionIndex(ttl=300)
+        mock_db = mocker.Mock()
+        mock_db.iter_read.return_value = iter(rows('Q1', 'C1', 'mcq', ['a', 'b']))
+
+        assert len(index.sample(mock_db, 'C1', 'mcq', 1)) == 1
+        assert len(index.sample(mock_db, 'C1', 'mcq', 1)) == 1
+        mock_db.iter_read.assert_called_once_with(Queries.GET_QUESTION_INDEX_DATA)
+
+    def test_rebuild_replays_concurrent_changes(self, mocker):
+        '''Test method to test that changes made while rebuilding are kept'''
+
+        index = QuestionIndex(ttl=0)
+        mock_db = mocker.Mock()
+
+        def read(_query):
+            index.add('Q2', 'C1', 'Added during rebuild', 'mcq', ['a'])
+            index.remove('Q1')
+            yield from rows('Q1', 'C1', 'mcq', ['a'])
+
+        mock_db.iter_read.side_effect = read
+        index.rebuild(mock_db)
+
+        assert [question['question_id'] for question in index.sample(mock_db, 'C1', None, 5)] == ['Q2']
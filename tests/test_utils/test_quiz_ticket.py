@@ -0,0 +1,83 @@
+'''Test file for quiz_ticket.py'''
+
+import pytest
+
+from helpers.quiz_ticket import QuizTickets
+from utils.custom_error import DuplicateEntryError, InvalidInputError
+
+
+class TestQuizTickets:
+    '''Test class containing test methods to test QuizTickets class methods'''
+
+    @pytest.fixture
+    def tickets(self):
+        '''Test Fixture for tickets valid for a minute'''
+
+        return QuizTickets(ttl=60, secret='test-secret')
+
+    @pytest.fixture
+    def ticket(self, tickets):
+        '''Test Fixture for a ticket of two questions issued to a player'''
+
+        return tickets.issue('P0002', [('Q0002', 'Paris'), ('Q0003', 'true')], 'C0002', None)
+
+    def test_redeem_and_grade(self, db_access, tickets, ticket):
+        '''Test method to test that a redeemed ticket grades answers without the answer key'''
+
+        quiz = tickets.redeem(db_access, ticket, 'P0002', ['Q0002'])
+
+        assert list(quiz.digests) == ['Q0002', 'Q0003']
+        assert (quiz.category_id, quiz.question_type) == ('C0002', None)
+        assert tickets.is_correct(quiz, 'Q0002', 'paris')
+        assert not tickets.is_correct(quiz, 'Q0003', 'false')
+        assert 'Paris' not in ticket
+
+    def test_redeemed_once(self, db_access, tickets, ticket):
+        '''Test method to test that a ticket grades one submission'''
+
+        tickets.redeem(db_access, ticket, 'P0002', ['Q0002'])
+
+        with pytest.raises(DuplicateEntryError):
+            tickets.redeem(db_access, ticket, 'P0002', ['Q0002'])
+
+    def test_redeemed_once_across_processes(self, db_access, ticket):
+        '''Test method to test that a ticket redeemed by one process is rejected by the others'''
+
+        QuizTickets(ttl=60, secret='test-secret').redeem(db_access, ticket, 'P0002', ['Q0002'])
+
+        with pytest.raises(DuplicateEntryError):
+            QuizTickets(ttl=60, secret='test-secret').redeem(db_access, ticket, 'P0002', ['Q0002'])
+
+    def test_question_not_issued(self, db_access, tickets, ticket):
+        '''Test method to test that answers to questions not issued are rejected without redeeming the ticket'''
+
+        with pytest.raises(InvalidInputError):
+            tickets.redeem(db_access, ticket, 'P0002', ['Q0002', 'Q0004'])
+
+        assert tickets.redeem(db_access, ticket, 'P0002', ['Q0002', 'Q0003']).category_id == 'C0002'
+
+    @pytest.mark.parametrize('player_id, secret', [('P0003', 'test-secret'), ('P0002', 'other-secret')])
+    def test_invalid_ticket(self, db_access, ticket, player_id, secret):
+        '''Test method to test that tickets of another player or signed with another secret are rejected'''
+
+        with pytest.raises(InvalidInputError):
+            QuizTickets(ttl=60, secret=secret).redeem(db_access, ticket, player_id, ['Q0002'])
+
+    def test_tampered_ticket(self, db_access, tickets, ticket):
+        '''Test method to test that a ticket with a changed payload is rejected'''
+
+        payload, signature = ticket.split('.')
+        tampered = tickets.issue('P0002', [('Q0002', 'London')], 'C0002', None).split('.')[0]
+
+        with pytest.raises(InvalidInputError):
+            tickets.redeem(db_access, f'{tampered}.{signature}', 'P0002', ['Q0002'])
+        with pytest.raises(InvalidInputError):
+            tickets.redeem(db_access, f'{payload}.{signature}é', 'P0002', ['Q0002'])
+
+    def test_expired_ticket(self, db_access, tickets, ticket, mocker):
+        '''Test method to test that expired tickets are rejected'''
+
+        mocker.patch('helpers.quiz_ticket.time.time', return_value=2 ** 40)
+
+        with pytest.raises(InvalidInputError):
+            tickets.redeem(db_access, ticket, 'P0002', ['Q0002'])
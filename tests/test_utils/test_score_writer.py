@@ -0,0 +1,232 @@
+'''Test file for score_writer.py'''
+
+import json
+import os
+
+import pytest
+from flask import Flask
+
+from config.flask_configs import register_commands
+from config.queries import Queries
+from helpers.score_writer import ScoreWriter, write_scores
+
+COUNT_SCORES = 'SELECT COUNT(*) AS scores FROM scores'
+# The leaderboard aggregate player_best_scores replaced, and the table read the same way
+AGGREGATE_BEST_SCORES = '''
+    SELECT player_id, MAX(score) AS "score [DECIMAL]", MIN(timestamp) AS "timestamp [DATETIME]"
+    FROM scores GROUP BY player_id ORDER BY player_id
+'''
+GET_BEST_SCORES = 'SELECT player_id, score, timestamp FROM player_best_scores ORDER BY player_id'
+# The per player aggregate player_stats replaced
+AGGREGATE_PLAYER_SCORES = '''
+    SELECT COUNT(*) AS attempts, ROUND(AVG(score), 2) AS average_score, MAX(score) AS "best_score [DECIMAL]",
+           MAX(timestamp) AS "last_played [DATETIME]"
+    FROM scores WHERE player_id = %s
+'''
+
+
+def score(score_id, player_id='P0001', value=50.0):
+    'Score row of a player'
+
+    return (score_id, player_id, value, '2024-01-02 10:00:00', 'C0001', 'mcq')
+
+
+class TestScoreWriter:
+    '''Test class containing test methods to test ScoreWriter class methods'''
+
+    @pytest.fixture
+    def db_access(self, db_access):
+        '''Test Fixture for the SQLite database with one player'''
+
+        db_access.write(Queries.INSERT_USER_DATA, ('P0001', 'Player', 'p@quiz.com', 'player', '2024-01-01'))
+        db_access.write(Queries.INSERT_CREDENTIALS, ('P0001', 'player', 'hash', 1))
+        return db_access
+
+    @pytest.fixture
+    def attempts(self, db_access):
+        '''Test Fixture for the scores of three players over several batches, days and categories'''
+
+        db_access.write_many(Queries.INSERT_USER_DATA, [
+            ('P0002', 'Player', 'p2@quiz.com', 'player', '2024-01-01'),
+            ('P0003', 'Player', 'p3@quiz.com', 'player', '2024-01-01')
+        ])
+        batches = [
+            [('S0001', 'P0001', 66.67, '2024-01-02 10:00:00', 'C0001', 'mcq'),
+             ('S0002', 'P0002', 40.0, '2024-01-02 10:00:00', 'C0002', 'one word'),
+             ('S0003', 'P0001', 33.33, '2024-01-02 11:00:00', None, None)],
+            [('S0004', 'P0001', 66.67, '2024-01-03 09:00:00', 'C0002', 'mcq'),
+             ('S0005', 'P0003', 100.0, '2024-01-03 09:00:00', 'C0001', 'mcq')],
+            [('S0006', 'P0002', 90.0, '2024-01-04 12:00:00', 'C0001', 'true/false'),
+             ('S0007', 'P0002', 12.5, '2024-01-04 12:30:00', 'C0002', None),
+             ('S0008', 'P0001', 50.0, '2024-01-05 08:00:00', 'C0001', 'mcq')]
+        ]
+        for batch in batches:
+            write_scores(db_access, batch)
+
+    @pytest.fixture
+    def writer(self, tmp_path, mocker):
+        '''Test Fixture for a write-behind writer flushing batches of 3 scores'''
+
+        mocker.patch('helpers.score_writer.atexit.register')
+        return ScoreWriter(
+            enabled=True,
+            max_size=5,
+            flush_size=3,
+            flush_interval=60,
+            spool_path=str(tmp_path / 'spool.jsonl'),
+            fsync=False
+        )
+
+    def test_direct_write_when_disabled(self, db_access, tmp_path):
+        '''Test method to test that scores are written in the request without write-behind'''
+
+        writer = ScoreWriter(False, 5, 3, 60, str(tmp_path / 'spool.jsonl'))
+        writer.start(db_access)
+        writer.save(db_access, [score('S0001')])
+
+        assert db_access.read(COUNT_SCORES)[0]['scores'] == 1
+        assert writer.stats()['direct_writes'] == 1
+
+    def test_player_stats(self, db_access, tmp_path):
+        '''Test method to test that player stats add up the scores of every batch'''
+
+        writer = ScoreWriter(False, 5, 3, 60, str(tmp_path / 'spool.jsonl'))
+        writer.save(db_access, [score('S0001', value=40.0), score('S0002', value=90.0)])
+        writer.save(db_access, [score('S0003', value=51.0)])
+
+        stats = db_access.read(Queries.GET_PLAYER_STATS, ('P0001', ))[0]
+        assert (stats['attempts'], stats['average_score'], stats['best_score']) == (3, 60.33, 90)
+
+    @pytest.mark.usefixtures('attempts')
+    def test_best_scores_match_aggregate(self, db_access):
+        '''Test method to test that player_best_scores holds what the leaderboard aggregate over the scores returned'''
+
+        assert db_access.read(GET_BEST_SCORES) == db_access.read(AGGREGATE_BEST_SCORES)
+        assert len(db_access.read(GET_BEST_SCORES)) == 3
+
+    @pytest.mark.usefixtures('attempts')
+    @pytest.mark.parametrize('player_id', ['P0001', 'P0002', 'P0003'])
+    def test_player_stats_match_aggregate(self, db_access, player_id):
+        '''Test method to test that player_stats returns what the aggregate over the scores of a player returned'''
+
+        assert db_access.read(Queries.GET_PLAYER_STATS, (player_id, )) == db_access.read(
+            AGGREGATE_PLAYER_SCORES, (player_id, )
+        )
+
+    @pytest.mark.usefixtures('attempts')
+    def test_backfill_command_matches_aggregate(self, db_access, mocker):
+        '''Test method to test that the backfill-best-scores command rebuilds the best scores and player stats'''
+
+        db_access.write('DELETE FROM player_best_scores')
+        db_access.write("UPDATE player_stats SET attempts = 1, total_score = 0 WHERE player_id = 'P0001'")
+        db_access.write("DELETE FROM player_stats WHERE player_id = 'P0002'")
+        mocker.patch('config.flask_configs.db', db_access)
+        app = Flask(__name__)
+        register_commands(app)
+
+        result = app.test_cli_runner().invoke(args=['backfill-best-scores'])
+
+        assert result.exit_code == 0
+        assert db_access.read(GET_BEST_SCORES) == db_access.read(AGGREGATE_BEST_SCORES)
+        for player_id in ('P0001', 'P0002', 'P0003'):
+            assert db_access.read(Queries.GET_PLAYER_STATS, (player_id, )) == db_access.read(
+                AGGREGATE_PLAYER_SCORES, (player_id, )
+            )
+
+    def test_full_batch_flushed_and_drained(self, db_access, writer):
+        '''Test method to test that full batches are written and stop() drains the rest'''
+
+        writer.start(db_access)
+        writer.save(db_access, [score('S0001'), score('S0002'), score('S0003'), score('S0004')])
+        writer.stop()
+
+        stats = writer.stats()
+        assert db_access.read(COUNT_SCORES)[0]['scores'] == 4
+        assert (stats['written'], stats['flushes'], stats['depth']) == (4, 2, 0)
+        assert db_access.read(Queries.GET_BUCKET_LEADERBOARD, ('all', 'all', 'C0001', 10))
+
+    def test_full_queue_writes_directly(self, db_access, writer, mocker):
+        '''Test method to test that scores not fitting in the queue are written in the request'''
+
+        writer.start(db_access)
+        mocker.patch.object(writer, 'max_size', 0)
+        writer.save(db_access, [score('S0001')])
+        writer.stop()
+
+        assert writer.stats()['direct_writes'] == 1
+        assert writer.stats()['enqueued'] == 0
+
+    def test_replay_spool(self, db_access, writer):
+        '''Test method to test that scores after the last checkpoint are written on start, once'''
+
+        db_access.write(Queries.INSERT_PLAYER_QUIZ_SCORE, score('S0002'))
+        with open(writer.spool_path, 'w', encoding='utf-8') as spool:
+            spool.write(json.dumps({'seq': 1, 'score': score('S0001')}) + '\n')
+            spool.write(json.dumps({'flushed': 1}) + '\n')
+            spool.write(json.dumps({'seq': 2, 'score': score('S0002')}) + '\n')
+            spool.write(json.dumps({'seq': 3, 'score': score('S0003', value=90.0)}) + '\n')
+            spool.write('{"seq": 4, "sco')
+
+        writer.start(db_access)
+        writer.stop()
+
+        stats = writer.stats()
+        assert db_access.read(COUNT_SCORES)[0]['scores'] == 2
+        assert (stats['replayed'], stats['written'], stats['already_written'], stats['dropped']) == (2, 1, 1, 0)
+        assert db_access.read(Queries.GET_LEADERBOARD)[0]['score'] == 90
+        assert not os.path.getsize(writer.spool_path)
+
+    def test_replay_dropped_score(self, db_access, writer):
+        '''Test method to test that a replayed score of a deleted player is dropped'''
+
+        with open(writer.spool_path, 'w', encoding='utf-8') as spool:
+            spool.write(json.dumps({'seq': 1, 'score': score('S0001', player_id='P0009')}) + '\n')
+
+        writer.start(db_access)
+        writer.stop()
+
+        stats = writer.stats()
+        assert (stats['written'], stats['already_written'], stats['dropped']) == (0, 0, 1)
+
+    def test_failed_replay_keeps_spool(self, db_access, writer, mocker):
+        '''Test method to test that the spool is kept when its scores cannot be written on start'''
+
+        line = json.dumps({'seq': 1, 'score': score('S0001')}) + '\n'
+        with open(writer.spool_path, 'w', encoding='utf-8') as spool:
+            spool.write(line)
+        mocker.patch('helpers.score_writer.write_scores', side_effect=RuntimeError('database down'))
+
+        with pytest.raises(RuntimeError):
+            writer.start(db_access)
+
+        with open(writer.spool_path, encoding='utf-8') as spool:
+            assert spool.read() == line
+
+    def test_spool_per_process(self, db_access, writer, tmp_path):
+        '''Test method to test that a writer does not replay or truncate a spool another writer holds'''
+
+        other = ScoreWriter(True, 5, 3, 60, writer.spool_path, fsync=False)
+        writer.start(db_access)
+        writer.save(db_access, [score('S0001')])
+        other.start(db_access)
+        other.save(db_access, [score('S0002')])
+
+        with open(writer.spool_path, encoding='utf-8') as spool:
+            assert json.loads(spool.readline())['score'][0] == 'S0001'
+        with open(tmp_path / 'spool.1.jsonl', encoding='utf-8') as spool:
+            assert json.loads(spool.readline())['score'][0] == 'S0002'
+        other.stop()
+        writer.stop()
+        assert db_access.read(COUNT_SCORES)[0]['scores'] == 2
+
+    def test_every_spool_locked(self, db_access, writer, mocker):
+        '''Test method to test that scores are written in the request when no spool can be locked'''
+
+        mocker.patch.object(ScoreWriter, 'MAX_SPOOLS', 1)
+        other = ScoreWriter(True, 5, 3, 60, writer.spool_path, fsync=False)
+        other.start(db_access)
+        writer.start(db_access)
+        writer.save(db_access, [score('S0001')])
+        other.stop()
+
+        assert writer.stats()['direct_writes'] == 1
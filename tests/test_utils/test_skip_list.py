@@ -0,0 +1,61 @@
+'''Test file for skip_list.py'''
+
+import bisect
+import random
+
+import pytest
+
+from utils.skip_list import SkipList
+
+
+class TestSkipList:
+    '''Test class containing test methods to test SkipList class methods'''
+
+    def test_matches_sorted_list(self):
+        '''Test method to test rank, select and iterate against a sorted list under inserts and removes'''
+
+        random.seed(7)
+        skip_list, expected = SkipList(), []
+        for _ in range(3000):
+            if expected and random.random() < 0.4:
+                key = random.choice(expected)
+                expected.remove(key)
+                skip_list.remove(key)
+            else:
+                key = random.random()
+                bisect.insort(expected, key)
+                skip_list.insert(key)
+
+        assert len(skip_list) == len(expected)
+        assert list(skip_list.iterate()) == expected
+        for index in range(0, len(expected), 37):
+            assert skip_list.select(index) == expected[index]
+            assert skip_list.rank(expected[index]) == index
+            assert list(skip_list.iterate(index))[:3] == expected[index:index + 3]
+
+    def test_missing_key(self):
+        '''Test method to test that missing keys and positions raise'''
+
+        skip_list = SkipList()
+        skip_list.insert(1)
+
+        with pytest.raises(KeyError):
+            skip_list.rank(2)
+        with pytest.raises(KeyError):
+            skip_list.remove(2)
+        with pytest.raises(IndexError):
+            skip_list.select(1)
+        assert list(skip_list.iterate(5)) == []
+
+    def test_from_sorted(self):
+        '''Test method to test that a bulk built list supports every operation'''
+
+        skip_list = SkipList.from_sorted(range(0, 1000, 2))
+        skip_list.insert(501)
+        skip_list.remove(0)
+
+        assert len(skip_list) == 500
+        assert skip_list.select(250) == 501
+        assert skip_list.rank(502) == 251
+        assert list(skip_list.iterate(498)) == [996, 998]
+        assert len(SkipList.from_sorted([])) == 0
@@ -0,0 +1,129 @@
+'''Test file for token_cache.py'''
+
+import pytest
+
+from config.queries import Queries
+from helpers.token_cache import TokenCache
+from helpers.token_helper import TokenHelper
+
+SYNC_INTERVAL = 1
+INSERT_REVOCATION_VERSION = 'INSERT INTO token_revocations VALUES (%s, %s, %s, %s)'
+
+
+class TestTokenCache:
+    '''Test class containing test methods to test TokenCache class methods'''
+
+    @pytest.fixture
+    def clock(self, mocker):
+        '''Test Fixture for a monotonic clock moved by the tests'''
+
+        now = [1000.0]
+        mocker.patch('helpers.token_cache.time.monotonic', side_effect=lambda: now[0])
+        return now
+
+    @pytest.fixture
+    def db_access(self, db_access):
+        '''Test Fixture for the SQLite database with two players'''
+
+        for user_id in ('P0001', 'P0002'):
+            db_access.write(Queries.INSERT_USER_DATA, (user_id, 'Player', f'{user_id}@quiz.com', 'player', '2024-01-01'))
+        return db_access
+
+    @pytest.fixture
+    def caches(self, clock, db_access):
+        '''Test Fixture for the token caches of two processes'''
+
+        caches = [TokenCache(max_size=10, ttl=300, sync_interval=SYNC_INTERVAL) for _ in range(2)]
+        for cache in caches:
+            cache.sync(db_access)
+        return caches
+
+    def test_cached_checks_read_nothing(self, caches, db_access, mocker):
+        '''Test method to test that checking a token of a cached user does not read the database'''
+
+        cache = caches[0]
+        assert cache.is_active(db_access, 'P0001', 0)
+        read = mocker.spy(db_access, 'read')
+
+        assert all(cache.is_active(db_access, 'P0001', 0) for _ in range(5))
+        assert read.call_count == 0
+        assert cache.stats()['hits'] == 5
+
+    @pytest.mark.parametrize('user_id, epoch', [('P0001', None), ('P0001', 1), ('P0404', 0)])
+    def test_inactive_tokens(self, caches, db_access, user_id, epoch):
+        '''Test method to test that tokens without the current epoch or of deleted users are rejected'''
+
+        assert not caches[0].is_active(db_access, user_id, epoch)
+
+    def test_local_revocation_applies_at_once(self, caches, db_access, mocker):
+        '''Test method to test that a logout through the process revokes only the tokens issued before'''
+
+        cache = caches[0]
+        mocker.patch('helpers.token_helper.token_cache', cache)
+        assert cache.is_active(db_access, 'P0001', 0)
+        assert cache.is_active(db_access, 'P0002', 0)
+
+        TokenHelper(db_access).revoke_token('P0001')
+
+        assert not cache.is_active(db_access, 'P0001', 0)
+        assert cache.is_active(db_access, 'P0001', 1)
+        assert cache.is_active(db_access, 'P0002', 0)
+
+    def test_revocation_in_outer_transaction(self, caches, db_access, mocker):
+        '''Test method to test that a revocation joining a transaction evicts the epoch only once committed'''
+
+        cache = caches[0]
+        mocker.patch('helpers.token_helper.token_cache', cache)
+        assert cache.is_active(db_access, 'P0001', 0)
+
+        with db_access.transaction():
+            TokenHelper(db_access).revoke_token('P0001')
+            assert cache.stats()['invalidations'] == 0
+
+        assert cache.stats()['invalidations'] == 1
+        assert not cache.is_active(db_access, 'P0001', 0)
+
+    def test_deleted_user_revoked(self, caches, db_access, mocker):
+        '''Test method to test that the tokens of a deleted user are rejected at once'''
+
+        cache = caches[0]
+        mocker.patch('helpers.token_helper.token_cache', cache)
+        assert cache.is_active(db_access, 'P0001', 0)
+
+        db_access.write(Queries.DELETE_USER_BY_ID_ROLE, ('P0001', 'player'))
+        TokenHelper(db_access).revoke_deleted_user('P0001')
+
+        assert not cache.is_active(db_access, 'P0001', 0)
+
+    def test_remote_revocation_latency_bound(self, caches, clock, db_access, mocker):
+        '''Test method to test that a token revoked by another process is rejected within the sync interval'''
+
+        local, remote = caches
+        mocker.patch('helpers.token_helper.token_cache', remote)
+        assert local.is_active(db_access, 'P0001', 0)
+        assert local.is_active(db_access, 'P0002', 0)
+
+        TokenHelper(db_access).revoke_token('P0001')
+        clock[0] += SYNC_INTERVAL * 0.9
+        assert local.is_active(db_access, 'P0001', 0)
+
+        clock[0] += SYNC_INTERVAL * 0.1
+        assert not local.is_active(db_access, 'P0001', 0)
+        assert local.is_active(db_access, 'P0002', 0)
+        assert local.stats()['remote_revocations'] == 1
+
+    def test_revocation_committed_out_of_order(self, caches, clock, db_access):
+        '''Test method to test that a revocation numbered below one already seen is applied once committed'''
+
+        cache = caches[0]
+        assert cache.is_active(db_access, 'P0001', 0)
+        db_access.write(INSERT_REVOCATION_VERSION, (2, 'P0002', '2024-01-01 10:00:00', '2024-01-01 11:00:00'))
+        clock[0] += SYNC_INTERVAL
+        cache.sync(db_access)
+
+        db_access.write(Queries.BUMP_USER_TOKEN_EPOCH, ('P0001', ))
+        db_access.write(INSERT_REVOCATION_VERSION, (1, 'P0001', '2024-01-01 10:00:00', '2024-01-01 11:00:00'))
+        clock[0] += SYNC_INTERVAL
+
+        assert not cache.is_active(db_access, 'P0001', 0)
+        assert cache.version == 2 and not cache.gaps
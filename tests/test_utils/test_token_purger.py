@@ -0,0 +1,105 @@
+'''Test file for token_purger.py'''
+
+from datetime import date
+
+import pytest
+
+from config.queries import Queries
+from database.partitions import DayPartitions, to_days
+from helpers.token_purger import TokenPurger
+
+EXPIRED = '2024-01-01 10:00:00'
+ACTIVE = '2999-01-01 10:00:00'
+GET_USER_IDS = 'SELECT user_id FROM token_revocations ORDER BY version'
+GET_NONCES = 'SELECT nonce FROM redeemed_tickets'
+
+
+class TestTokenPurger:
+    '''Test class containing test methods to test TokenPurger class methods'''
+
+    @pytest.fixture
+    def db_access(self, db_access):
+        '''Test Fixture for the SQLite database with expired and active revocations and redeemed tickets'''
+
+        db_access.write_many(Queries.INSERT_TOKEN_REVOCATION, [
+            (f'P{i:04d}', EXPIRED, EXPIRED if i % 3 else ACTIVE) for i in range(10)
+        ])
+        db_access.write_many(Queries.INSERT_REDEEMED_TICKET, [('expired', EXPIRED), ('active', ACTIVE)])
+        return db_access
+
+    def test_purge_deletes_expired_in_batches(self, db_access):
+        '''Test method to test that only the expired revocations are deleted, a batch at a time'''
+
+        purger = TokenPurger(interval=0, batch_size=2, pause=0)
+
+        assert purger.purge(db_access) == 7
+        assert [row['user_id'] for row in db_access.read(GET_USER_IDS)] == ['P0000', 'P0003', 'P0006', 'P0009']
+        assert db_access.read(GET_NONCES) == [{'nonce': 'active'}]
+        assert purger.stats()['batches'] == 5
+        assert purger.stats()['partitions'] == 0
+
+    def test_purge_nothing_expired(self, db_access):
+        '''Test method to test that a purge with nothing expired sends a single delete per table'''
+
+        purger = TokenPurger(interval=0, batch_size=100, pause=0)
+        purger.purge(db_access)
+
+        assert purger.purge(db_access) == 0
+        assert purger.stats()['batches'] == 4
+        assert len(db_access.read(GET_USER_IDS)) == 4
+
+    def test_start_disabled(self, db_access):
+        '''Test method to test that an interval of 0 does not start the background purge'''
+
+        purger = TokenPurger(interval=0, batch_size=2, pause=0)
+        purger.start(db_access)
+
+        assert not purger.stats()['running']
+
+
+class TestDayPartitions:
+    '''Test class containing test methods to test DayPartitions class methods'''
+
+    @pytest.fixture
+    def db(self, mocker):
+        '''Test Fixture for a database partitioned up to 2024-03-02'''
+
+        db = mocker.MagicMock()
+        db.read.return_value = [
+            {'partition_name': 'p20240301', 'bound': str(to_days(date(2024, 3, 2)))},
+            {'partition_name': 'p20240302', 'bound': str(to_days(date(2024, 3, 3)))},
+            {'partition_name': 'pmax', 'bound': 'MAXVALUE'}
+        ]
+        return db
+
+    def test_to_days(self):
+        '''Test method to test that to_days matches MySQL TO_DAYS'''
+
+        assert to_days(date(2024, 1, 1)) == 739251
+
+    def test_extend(self, db):
+        '''Test method to test that the missing days are split out of the catch-all partition'''
+
+        days = DayPartitions('token_revocations', 'expires_at').extend(db, date(2024, 3, 4))
+
+        assert days == [date(2024, 3, 3), date(2024, 3, 4)]
+        db.write.assert_called_once_with(
+            'ALTER TABLE token_revocations REORGANIZE PARTITION pmax INTO ('
+            f'PARTITION p20240303 VALUES LESS THAN ({to_days(date(2024, 3, 4))}), '
+            f'PARTITION p20240304 VALUES LESS THAN ({to_days(date(2024, 3, 5))}), '
+            'PARTITION pmax VALUES LESS THAN MAXVALUE)'
+        )
+
+    def test_extend_up_to_date(self, db):
+        '''Test method to test that nothing is written when the partitions exist'''
+
+        assert not DayPartitions('token_revocations', 'expires_at').extend(db, date(2024, 3, 2))
+        db.write.assert_not_called()
+
+    def test_drop_before(self, db):
+        '''Test method to test that only the partitions of days that are over are dropped'''
+
+        names = DayPartitions('token_revocations', 'expires_at').drop_before(db, date(2024, 3, 2))
+
+        assert names == ['p20240301']
+        db.write.assert_called_once_with('ALTER TABLE token_revocations DROP PARTITION p20240301')
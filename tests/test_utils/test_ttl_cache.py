@@ -0,0 +1,70 @@
+'''Test file for ttl_cache.py'''
+
+from utils.ttl_cache import TTLCache
+
+
+class TestTTLCache:
+    '''Test class containing test methods to test TTLCache class methods'''
+
+    def test_get_many(self):
+        '''Test method to test that cached keys are found and the others reported missing'''
+
+        cache = TTLCache(max_size=10, ttl=300)
+        cache.put_many({'a': 1, 'b': 2})
+
+        found, missing, _ = cache.get_many(['a', 'c'])
+
+        assert found == {'a': 1}
+        assert missing == ['c']
+        assert cache.stats()['hit_rate'] == 0.5
+
+    def test_least_recently_used_evicted(self):
+        '''Test method to test that the least recently used key is evicted past the limit'''
+
+        cache = TTLCache(max_size=2, ttl=300)
+        cache.put_many({'a': 1, 'b': 2})
+        cache.get_many(['a'])
+        cache.put_many({'c': 3})
+
+        found, missing, _ = cache.get_many(['a', 'b', 'c'])
+
+        assert found == {'a': 1, 'c': 3}
+        assert missing == ['b']
+        assert cache.stats()['evictions'] == 1
+
+    def test_expired(self, mocker):
+        '''Test method to test that entries older than the ttl are missing'''
+
+        mock_monotonic = mocker.patch('utils.ttl_cache.time.monotonic', return_value=0)
+        cache = TTLCache(max_size=10, ttl=60, sizeof=len)
+        cache.put_many({'a': 'value'})
+        mock_monotonic.return_value = 61
+
+        found, missing, _ = cache.get_many(['a'])
+
+        assert (found, missing) == ({}, ['a'])
+        assert cache.stats()['expirations'] == 1
+        assert cache.stats()['bytes'] == 0
+
+    def test_stale_batch_not_stored(self):
+        '''Test method to test that values fetched before an invalidation are not cached'''
+
+        cache = TTLCache(max_size=10, ttl=300)
+        _, missing, generation = cache.get_many(['a'])
+        cache.invalidate(missing)
+        cache.put_many({'a': 'old'}, generation)
+
+        assert cache.get_many(['a'])[1] == ['a']
+
+    def test_invalidate_where(self):
+        '''Test method to test that only matching entries are invalidated'''
+
+        cache = TTLCache(max_size=10, ttl=300)
+        cache.put_many({'a': 1, 'b': 2, 'c': 3})
+        removed = cache.invalidate_where(lambda value: value % 2)
+
+        found, missing, _ = cache.get_many(['a', 'b', 'c'])
+
+        assert removed == ['a', 'c']
+        assert found == {'b': 2}
+        assert missing == ['a', 'c']